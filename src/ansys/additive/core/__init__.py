@@ -44,7 +44,10 @@ if not os.path.exists(EXAMPLES_PATH):  # pragma: no cover
     os.makedirs(EXAMPLES_PATH)
 
 from ansys.additive.core.additive import Additive
+from ansys.additive.core.async_additive import AsyncAdditive
+from ansys.additive.core.cancellation import CancellationToken
 from ansys.additive.core.geometry_file import BuildFile, MachineType, StlFile
+from ansys.additive.core.grain_statistics import MicrostructureStatistics, grain_statistics
 from ansys.additive.core.machine import AdditiveMachine, MachineConstants
 from ansys.additive.core.material import (
     AdditiveMaterial,
@@ -58,7 +61,14 @@ from ansys.additive.core.microstructure import (
     MicrostructureSummary,
 )
 from ansys.additive.core.porosity import PorosityInput, PorositySummary
-from ansys.additive.core.simulation import SimulationError, SimulationStatus, SimulationType
+from ansys.additive.core.retry import RetryPolicy
+from ansys.additive.core.simulation import (
+    SimulationCancelled,
+    SimulationError,
+    SimulationStatus,
+    SimulationTimeout,
+    SimulationType,
+)
 from ansys.additive.core.single_bead import (
     MeltPool,
     MeltPoolColumnNames,
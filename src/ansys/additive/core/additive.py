@@ -23,33 +23,49 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 import concurrent.futures
+from contextlib import nullcontext
+import copy
 from datetime import datetime
-import hashlib
+import functools
 import logging
 import os
+import threading
+import time
 import zipfile
 
 from ansys.api.additive import __version__ as api_version
-from ansys.api.additive.v0.additive_domain_pb2 import ProgressState
+from ansys.api.additive.v0.additive_domain_pb2 import Progress, ProgressState
 from ansys.api.additive.v0.additive_materials_pb2 import GetMaterialRequest
-from ansys.api.additive.v0.additive_simulation_pb2 import UploadFileRequest
+from ansys.api.additive.v0.additive_simulation_pb2 import SimulationResponse, UploadFileRequest
 from google.protobuf.empty_pb2 import Empty
 import grpc
 
 from ansys.additive.core import USER_DATA_PATH, __version__
-from ansys.additive.core.download import download_file
+from ansys.additive.core.autoscaler import Autoscaler
+from ansys.additive.core.cache import ExpiringCache, SimulationCache
+from ansys.additive.core.cancellation import CancellationToken, cancel_on
+from ansys.additive.core.dispatcher import SimulationDispatcher, simulation_type
+from ansys.additive.core.download import download_and_extract
 from ansys.additive.core.material import AdditiveMaterial
 from ansys.additive.core.material_tuning import MaterialTuningInput, MaterialTuningSummary
 from ansys.additive.core.microstructure import MicrostructureInput, MicrostructureSummary
 import ansys.additive.core.misc as misc
 from ansys.additive.core.porosity import PorosityInput, PorositySummary
 from ansys.additive.core.progress_logger import ProgressLogger
+from ansys.additive.core.retry import HealthMonitor, RetryPolicy, status_code
 from ansys.additive.core.server_connection import DEFAULT_PRODUCT_VERSION, ServerConnection
-from ansys.additive.core.simulation import SimulationError
+from ansys.additive.core.server_connection.server_connection import ServerStatistics
+from ansys.additive.core.simulation import (
+    DEFAULT_SIMULATION_DEADLINES,
+    SimulationCancelled,
+    SimulationError,
+    SimulationTimeout,
+)
 from ansys.additive.core.single_bead import SingleBeadInput, SingleBeadSummary
 from ansys.additive.core.thermal_history import ThermalHistoryInput, ThermalHistorySummary
+from ansys.additive.core.upload import UploadCache, file_upload_reader
 
 
 class Additive:
@@ -81,8 +97,43 @@ class Additive:
         Minimum severity level of messages to log.
     log_file: str, default: ""
         File name to write log messages to.
+    max_concurrency: int, default: 1
+        Maximum number of simulations to run on each server at the same time.
+    max_concurrency_by_type: dict[str, int], None
+        Maximum number of simulations in progress on a server when a simulation of a
+        given type is started, keyed by :class:`SimulationType` value. Types that are not
+        included use the ``max_concurrency`` value. For example,
+        ``{SimulationType.SINGLE_BEAD: 8}`` allows up to eight single bead simulations
+        per server while other simulation types run one at a time.
+    cache_dir: str, None
+        Folder of an on-disk cache of simulation results. If a simulation with the same
+        parameters was run before, its cached result is returned without contacting a
+        server. Several processes may share a cache folder. If ``None``, results are
+        not cached.
+    cache_max_size: int, default: 2 GiB
+        Maximum total size, in bytes, of the cached results. The least recently used
+        results are removed when the size is exceeded.
+    retry_policy: RetryPolicy, None
+        Policy for retrying simulations that fail with a transient gRPC error, such as
+        an unavailable server. A failed simulation is resubmitted to another server if
+        one is available. Servers that keep failing are taken out of rotation until
+        they respond again. If ``None``, failed simulations are not retried, which was
+        the behavior before retry policies were added.
+    deadlines: dict[str, float], None
+        Maximum duration, in seconds, of a simulation keyed by :class:`SimulationType`
+        value. A simulation that exceeds its deadline has its server calls cancelled and
+        returns a :class:`SimulationTimeout` result. Types that are not included use the
+        values of :data:`DEFAULT_SIMULATION_DEADLINES`. A value of ``None`` disables the
+        deadline of a type. Earlier versions had no deadlines, so pass ``None`` for every
+        type to let long simulations run to completion as before.
+    material_cache_ttl: float, default: 600
+        Time, in seconds, that materials and the list of material names retrieved from
+        the server are kept in memory. A value of ``0`` disables caching. Use
+        :meth:`invalidate_materials` to discard cached materials earlier.
     """
 
+    DEFAULT_MATERIAL_CACHE_TTL = 600.0
+
     DEFAULT_ADDITIVE_SERVICE_PORT = 50052
 
     def __init__(
@@ -94,6 +145,13 @@ class Additive:
         product_version: str = DEFAULT_PRODUCT_VERSION,
         log_level: str = "INFO",
         log_file: str = "",
+        max_concurrency: int = 1,
+        max_concurrency_by_type: dict[str, int] | None = None,
+        cache_dir: str | None = None,
+        cache_max_size: int = SimulationCache.DEFAULT_MAX_SIZE,
+        retry_policy: RetryPolicy | None = RetryPolicy(),
+        deadlines: dict[str, float | None] | None = None,
+        material_cache_ttl: float = DEFAULT_MATERIAL_CACHE_TTL,
     ) -> None:
         """Initialize server connections."""
         self._log = Additive._create_logger(log_file, log_level)
@@ -102,6 +160,21 @@ class Additive:
         self._servers = Additive._connect_to_servers(
             server_connections, host, port, nservers, product_version, self._log
         )
+        self._product_version = product_version
+        self._max_concurrency = max_concurrency
+        self._max_concurrency_by_type = max_concurrency_by_type
+        for server in self._servers:
+            self._configure_server(server)
+        self._servers_lock = threading.Lock()
+        self._dispatchers = []
+        self._autoscaler = None
+
+        self._cache = SimulationCache(cache_dir, cache_max_size, self._log) if cache_dir else None
+        self._retry_policy = retry_policy
+        self._health = HealthMonitor(retry_policy, log=self._log) if retry_policy else None
+        self._deadlines = {**DEFAULT_SIMULATION_DEADLINES, **(deadlines or {})}
+        self._materials = ExpiringCache(material_cache_ttl)
+        self._uploads = UploadCache()
 
         # Setup data directory
         self._user_data_path = USER_DATA_PATH
@@ -153,8 +226,13 @@ class Additive:
         elif os.getenv("ANSYS_ADDITIVE_ADDRESS"):
             connections.append(ServerConnection(addr=os.getenv("ANSYS_ADDITIVE_ADDRESS"), log=log))
         else:
-            for _ in range(nservers):
-                connections.append(ServerConnection(product_version=product_version, log=log))
+            # Start the servers concurrently. Each connection waits for its server to respond.
+            with concurrent.futures.ThreadPoolExecutor(nservers) as executor:
+                futures = [
+                    executor.submit(ServerConnection, product_version=product_version, log=log)
+                    for _ in range(nservers)
+                ]
+                connections = [future.result() for future in futures]
 
         return connections
 
@@ -169,9 +247,140 @@ class Additive:
             for server in self._servers:
                 print(server.status())
 
+    @property
+    def servers(self) -> list[ServerConnection]:
+        """Servers that simulations are run on."""
+        with self._servers_lock:
+            return list(self._servers)
+
+    def add_server(self, server_connection: str | grpc.Channel | None = None) -> ServerConnection:
+        """Connect to a server and add it to the servers that simulations are run on.
+
+        Simulations that are queued by a call to :meth:`simulate` or :meth:`simulate_iter`
+        in progress are also run on the new server.
+
+        Parameters
+        ----------
+        server_connection: str, grpc.Channel, None
+            Server to connect to, given as a ``host:port`` string or a connected
+            :class:`grpc.Channel <grpc.Channel>`. If ``None``, a server is started
+            using PyPIM, if configured, or on localhost.
+
+        Returns
+        -------
+        ServerConnection
+            Connection to the added server.
+        """
+        if isinstance(server_connection, grpc.Channel):
+            server = ServerConnection(channel=server_connection, log=self._log)
+        elif server_connection:
+            server = ServerConnection(addr=server_connection, log=self._log)
+        else:
+            server = ServerConnection(product_version=self._product_version, log=self._log)
+        self._configure_server(server)
+        with self._servers_lock:
+            self._servers.append(server)
+            dispatchers = list(self._dispatchers)
+        for dispatcher in dispatchers:
+            dispatcher.add_server(server)
+        self._log.info("Added server %s", server.channel_str)
+        return server
+
+    def remove_server(self, server: ServerConnection) -> None:
+        """Remove a server from the servers that simulations are run on.
+
+        Simulations in progress on the server are allowed to finish. The server
+        connection is not closed. Use :meth:`ServerConnection.close` to close it.
+
+        Parameters
+        ----------
+        server: ServerConnection
+            Server to remove.
+        """
+        with self._servers_lock:
+            if server not in self._servers:
+                raise ValueError(f"Server {server.channel_str} is not connected.")
+            if len(self._servers) == 1:
+                raise ValueError("The last server cannot be removed.")
+            self._servers.remove(server)
+            dispatchers = list(self._dispatchers)
+        for dispatcher in dispatchers:
+            dispatcher.remove_server(server)
+        self._log.info("Removed server %s", server.channel_str)
+
+    def pending_simulations(self) -> int:
+        """Get the number of queued simulations that have not started yet."""
+        with self._servers_lock:
+            dispatchers = list(self._dispatchers)
+        return sum(dispatcher.pending for dispatcher in dispatchers)
+
+    def autoscale(
+        self,
+        min_servers: int = 1,
+        max_servers: int = 4,
+        idle_cooldown: float = Autoscaler.DEFAULT_IDLE_COOLDOWN,
+        interval: float = Autoscaler.DEFAULT_INTERVAL,
+    ) -> Autoscaler:
+        """Start adding and removing servers based on the number of queued simulations.
+
+        Servers are started, using PyPIM if configured or on localhost, while more
+        simulations are queued than the servers can start. Started servers are shut
+        down after they have been idle for ``idle_cooldown`` seconds. Servers that
+        were connected when autoscaling started are never shut down.
+
+        Parameters
+        ----------
+        min_servers: int, default: 1
+            Minimum number of servers.
+        max_servers: int, default: 4
+            Maximum number of servers.
+        idle_cooldown: float, default: 300
+            Time, in seconds, that a started server must be idle before it is shut down.
+        interval: float, default: 5
+            Interval, in seconds, at which the number of servers is adjusted.
+
+        Returns
+        -------
+        Autoscaler
+            Running autoscaler. Call its ``stop`` method to stop autoscaling.
+        """
+        if self._autoscaler:
+            self._autoscaler.stop()
+        self._autoscaler = Autoscaler(
+            self, min_servers, max_servers, idle_cooldown, interval, log=self._log
+        )
+        self._autoscaler.start()
+        return self._autoscaler
+
+    def _configure_server(self, server: ServerConnection) -> None:
+        """Apply the concurrency limits of the client to a server."""
+        server.max_concurrency = self._max_concurrency
+        server.max_concurrency_by_type = self._max_concurrency_by_type
+
+    @property
+    def cache(self) -> SimulationCache | None:
+        """Cache of simulation results, or ``None`` if caching is disabled."""
+        return self._cache
+
+    def server_statistics(self) -> list[ServerStatistics]:
+        """Get simulation throughput statistics for each server.
+
+        Use the statistics to tune the ``max_concurrency`` values. For example, if
+        the throughput of a server does not increase when ``max_concurrency`` is
+        increased, the server is already fully loaded.
+
+        Returns
+        -------
+        list[ServerStatistics]
+            Statistics of each server in the order of the server connections.
+        """
+        return [server.statistics for server in self.servers]
+
     def simulate(
         self,
         inputs: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput | list,
+        longest_first: bool = False,
+        cancellation: CancellationToken | None = None,
     ) -> (
         SingleBeadSummary
         | PorositySummary
@@ -187,6 +396,13 @@ class Additive:
         inputs: SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput, list
             Parameters to use for simulations. A list of inputs may be provided to execute multiple
             simulations.
+        longest_first: bool, default: False
+            Whether to start the simulations with the longest expected duration first
+            when a list of inputs is provided. Starting long simulations first reduces
+            the time to complete a batch of mixed simulations.
+        cancellation: CancellationToken, None
+            Token to cancel the simulations with from another thread. Cancelled
+            simulations return a :class:`SimulationCancelled` result.
 
         Returns
         -------
@@ -197,45 +413,122 @@ class Additive:
         """
         if type(inputs) is not list:
             print("Single input")
-            return self._simulate(inputs, self._servers[0], show_progress=True)
-        else:
-            self._validate_inputs(inputs)
+            return list(self._run([inputs], show_progress=True, cancellation=cancellation))[0]
 
         summaries = []
+        results = self.simulate_iter(inputs, longest_first=longest_first, cancellation=cancellation)
         print(
             f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} Completed 0 of {len(inputs)} simulations",
             end="",
         )
-        with concurrent.futures.ThreadPoolExecutor(len(self._servers)) as executor:
-            futures = []
-            for i, input in enumerate(inputs):
-                server_id = i % len(self._servers)
-                futures.append(
-                    executor.submit(
-                        self._simulate,
-                        input=input,
-                        server=self._servers[server_id],
-                        show_progress=False,
-                    )
-                )
-            for future in concurrent.futures.as_completed(futures):
-                summary = future.result()
-                if isinstance(summary, SimulationError):
-                    print(f"\nError: {summary.message}")
-                summaries.append(summary)
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                print(
-                    f"\r{timestamp} Completed {len(summaries)} of {len(inputs)} simulations",
-                    end="",
-                )
+        for summary in results:
+            if isinstance(summary, SimulationError):
+                print(f"\nError: {summary.message}")
+            summaries.append(summary)
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(
+                f"\r{timestamp} Completed {len(summaries)} of {len(inputs)} simulations",
+                end="",
+            )
         print("")
         return summaries
 
+    def simulate_iter(
+        self,
+        inputs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+        longest_first: bool = False,
+        cancellation: CancellationToken | None = None,
+        on_start: Callable[[object], None] | None = None,
+    ) -> Iterator[
+        SingleBeadSummary
+        | PorositySummary
+        | MicrostructureSummary
+        | ThermalHistorySummary
+        | SimulationError
+    ]:
+        """Execute additive simulations and yield each summary as soon as it is available.
+
+        Unlike the :meth:`simulate` method, this method does not wait for the whole
+        batch to finish before returning results. Summaries are yielded in completion
+        order, which is not necessarily the order of ``inputs``. Use the ``id`` of the
+        summary input to match a summary to its input.
+
+        Servers take inputs from a shared queue. Each server starts its next
+        simulation as soon as one of its ``max_concurrency`` simulation slots frees up.
+        The inputs are validated when this method is called, before the first summary
+        is requested.
+
+        Parameters
+        ----------
+        inputs: list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+            Parameters to use for simulations.
+        longest_first: bool, default: False
+            Whether to start the simulations with the longest expected duration first.
+            For more information, see :func:`ansys.additive.core.dispatcher.expected_duration`.
+        cancellation: CancellationToken, None
+            Token to cancel the simulations with. When the token is cancelled, a
+            :class:`SimulationCancelled` result is yielded for each queued simulation
+            and the server calls of the simulations in progress are cancelled.
+        on_start: Callable, None
+            Function called with the input of each simulation when a server starts
+            it, for example to time the simulations. The function is called from a
+            worker thread.
+
+        Yields
+        ------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary, SimulationError
+            Summary of each simulation as it completes.
+        """
+        # Validate outside the generator so that invalid inputs raise immediately.
+        self._validate_inputs(inputs)
+
+        return self._run(
+            inputs, longest_first=longest_first, cancellation=cancellation, on_start=on_start
+        )
+
+    def _run(
+        self,
+        inputs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+        longest_first: bool = False,
+        show_progress: bool = False,
+        cancellation: CancellationToken | None = None,
+        on_start: Callable[[object], None] | None = None,
+    ) -> Iterator[
+        SingleBeadSummary
+        | PorositySummary
+        | MicrostructureSummary
+        | ThermalHistorySummary
+        | SimulationError
+    ]:
+        """Run simulations on the connected servers and yield summaries as they complete.
+
+        The dispatcher of the run is registered while it runs so that servers
+        added or removed in the meantime are taken into account.
+        """
+        with self._servers_lock:
+            dispatcher = SimulationDispatcher(
+                self._servers,
+                functools.partial(
+                    self._simulate, show_progress=show_progress, cancellation=cancellation
+                ),
+                self._retry_policy,
+                self._health,
+            )
+            self._dispatchers.append(dispatcher)
+        try:
+            yield from dispatcher.run(
+                inputs, longest_first=longest_first, cancellation=cancellation, on_start=on_start
+            )
+        finally:
+            with self._servers_lock:
+                self._dispatchers.remove(dispatcher)
+
     def _simulate(
         self,
         input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
         server: ServerConnection,
         show_progress: bool = False,
+        cancellation: CancellationToken | None = None,
     ):
         """Execute a single simulation.
 
@@ -250,10 +543,18 @@ class Additive:
         show_progress: bool, False
             Whether to send progress updates to the user interface.
 
+        cancellation: CancellationToken, None
+            Token that cancels the server calls of the simulation.
+
         Returns
         -------
         SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary,
         SimulationError
+
+        Raises
+        ------
+        grpc.RpcError
+            If the simulation failed with an error that the retry policy allows to be retried.
         """
         logger = None
         if show_progress:
@@ -262,44 +563,137 @@ class Additive:
         if input.material == AdditiveMaterial():
             raise ValueError("A material is not assigned to the simulation input")
 
+        if cancellation and cancellation.cancelled:
+            return SimulationCancelled(input)
+        deadline = self._deadlines.get(simulation_type(input))
+
         try:
-            request = None
+            cache_key = None
+            if self._cache:
+                cache_key = SimulationCache.key(input, self._uploads.digest)
+                summary = Additive._cached_summary(
+                    self._cache, cache_key, input, self._user_data_path
+                )
+                if summary:
+                    return summary
+
             if isinstance(input, ThermalHistoryInput):
-                return self._simulate_thermal_history(input, USER_DATA_PATH, server, logger)
-            else:
-                request = input._to_simulation_request()
+                return self._simulate_thermal_history(
+                    input,
+                    USER_DATA_PATH,
+                    server,
+                    logger,
+                    cache_key=cache_key,
+                    deadline=deadline,
+                    cancellation=cancellation,
+                )
 
-            for response in server.simulation_stub.Simulate(request):
-                if response.HasField("progress"):
-                    if logger:
-                        logger.log_progress(response.progress)  # pragma: no cover
-                    if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
-                        raise Exception(response.progress.message)
-                if response.HasField("melt_pool"):
-                    return SingleBeadSummary(input, response.melt_pool)
-                if response.HasField("porosity_result"):
-                    return PorositySummary(input, response.porosity_result)
-                if response.HasField("microstructure_result"):
-                    return MicrostructureSummary(
-                        input, response.microstructure_result, self._user_data_path
+            request = input._to_simulation_request()
+            call = server.simulation_stub.Simulate(request, timeout=deadline)
+            with cancel_on(cancellation, call):
+                for response in call:
+                    summary = Additive._summary_from_response(
+                        input, response, self._user_data_path, logger
                     )
+                    if summary:
+                        if cache_key:
+                            self._cache.put(cache_key, response.SerializeToString())
+                        return summary
+        except grpc.RpcError as e:
+            if cancellation and cancellation.cancelled:
+                return SimulationCancelled(input)
+            if deadline is not None and status_code(e) == grpc.StatusCode.DEADLINE_EXCEEDED:
+                return SimulationTimeout(input, deadline)
+            if self._retry_policy and self._retry_policy.is_retryable(e):
+                raise
+            return SimulationError(input, str(e))
         except Exception as e:
             return SimulationError(input, str(e))
 
+    @staticmethod
+    def _cached_summary(
+        cache: SimulationCache,
+        key: str,
+        input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
+        user_data_path: str,
+    ) -> SingleBeadSummary | PorositySummary | MicrostructureSummary | ThermalHistorySummary | None:
+        """Return the summary of a cached simulation result.
+
+        Results of thermal history simulations are cached as the ZIP file downloaded
+        from the server. Results of other simulations are cached as the serialized
+        ``SimulationResponse`` message that contains the result.
+
+        Returns
+        -------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary, None
+            Summary of the cached result, or ``None`` if the result is not cached.
+        """
+        f = cache.open(key)
+        if f is None:
+            return None
+        with f:
+            if isinstance(input, ThermalHistoryInput):
+                path = os.path.join(USER_DATA_PATH, input.id, "coax_ave_output")
+                with zipfile.ZipFile(f, "r") as zip:
+                    zip.extractall(path)
+                return ThermalHistorySummary(input, path)
+            response = SimulationResponse.FromString(f.read())
+        return Additive._summary_from_response(input, response, user_data_path)
+
+    @staticmethod
+    def _summary_from_response(
+        input: SingleBeadInput | PorosityInput | MicrostructureInput,
+        response: SimulationResponse,
+        user_data_path: str,
+        logger: ProgressLogger | None = None,
+    ) -> SingleBeadSummary | PorositySummary | MicrostructureSummary | None:
+        """Handle one ``SimulationResponse`` message of a simulation stream.
+
+        Returns
+        -------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, None
+            Summary if the response contains a simulation result, otherwise ``None``.
+        """
+        if response.HasField("progress"):
+            if logger:
+                logger.log_progress(response.progress)  # pragma: no cover
+            if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
+                raise Exception(response.progress.message)
+        if response.HasField("melt_pool"):
+            return SingleBeadSummary(input, response.melt_pool)
+        if response.HasField("porosity_result"):
+            return PorositySummary(input, response.porosity_result)
+        if response.HasField("microstructure_result"):
+            return MicrostructureSummary(input, response.microstructure_result, user_data_path)
+        return None
+
+    # Key of the list of material names in the material cache. Materials are
+    # cached under "material:<name>" keys.
+    _MATERIALS_LIST_KEY = "materials_list"
+
     def materials_list(self) -> list[str]:
         """Get a list of material names used in additive simulations.
 
+        The list is cached for ``material_cache_ttl`` seconds.
+
         Returns
         -------
         list[str]
             Names of available additive materials.
         """
-        response = self._servers[0].materials_stub.GetMaterialsList(Empty())
-        return [n for n in response.names]
+        names = self._materials.get(Additive._MATERIALS_LIST_KEY)
+        if names is None:
+            response = self._servers[0].materials_stub.GetMaterialsList(Empty())
+            names = [n for n in response.names]
+            self._materials.put(Additive._MATERIALS_LIST_KEY, names)
+        return list(names)
 
     def material(self, name: str) -> AdditiveMaterial:
         """Get a material for use in an additive simulation.
 
+        Materials are cached for ``material_cache_ttl`` seconds, so repeated calls
+        with the same name do not contact the server.
+
         Parameters
         ----------
 
@@ -310,9 +704,62 @@ class Additive:
         -------
         AdditiveMaterial
         """
-        request = GetMaterialRequest(name=name)
-        result = self._servers[0].materials_stub.GetMaterial(request)
-        return AdditiveMaterial._from_material_message(result)
+        return copy.deepcopy(self._material(name, self._servers[0]))
+
+    def prefetch_materials(self, names: list[str]) -> dict[str, AdditiveMaterial]:
+        """Get several materials, retrieving the ones that are not cached in parallel.
+
+        Each distinct name is requested from the server at most once. Retrieval is
+        spread over the connected servers.
+
+        Parameters
+        ----------
+        names: list[str]
+            Names of materials. Duplicates are ignored.
+
+        Returns
+        -------
+        dict[str, AdditiveMaterial]
+            Materials keyed by name. Names of materials that could not be retrieved
+            are not included.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        servers = self.servers
+        materials = {}
+        with concurrent.futures.ThreadPoolExecutor(min(len(names), 8)) as executor:
+            futures = {
+                name: executor.submit(self._material, name, servers[i % len(servers)])
+                for i, name in enumerate(names)
+            }
+        for name, future in futures.items():
+            try:
+                materials[name] = copy.deepcopy(future.result())
+            except Exception as e:
+                self._log.warning("Unable to get material %s: %s", name, e)
+        return materials
+
+    def invalidate_materials(self, name: str | None = None) -> None:
+        """Discard cached materials.
+
+        Parameters
+        ----------
+        name: str, None
+            Name of the material to discard. If ``None``, all cached materials and
+            the cached list of material names are discarded.
+        """
+        self._materials.invalidate(None if name is None else f"material:{name}")
+
+    def _material(self, name: str, server: ServerConnection) -> AdditiveMaterial:
+        """Get a material from the cache or from a server."""
+        material = self._materials.get(f"material:{name}")
+        if material is None:
+            request = GetMaterialRequest(name=name)
+            result = server.materials_stub.GetMaterial(request)
+            material = AdditiveMaterial._from_material_message(result)
+            self._materials.put(f"material:{name}", material)
+        return material
 
     @staticmethod
     def load_material(
@@ -369,6 +816,18 @@ class Additive:
         MaterialTuningSummary
             Summary of material tuning.
         """  # noqa: E501
+        out_dir = Additive._tuning_output_dir(input, out_dir)
+        request = input._to_request()
+
+        for response in self._servers[0].materials_stub.TuneMaterial(request):
+            if response.HasField("progress"):
+                Additive._print_tuning_progress(response.progress)
+            if response.HasField("result"):
+                return MaterialTuningSummary(input, response.result, out_dir)
+
+    @staticmethod
+    def _tuning_output_dir(input: MaterialTuningInput, out_dir: str) -> str:
+        """Assign a material tuning ID, if needed, and return a new output directory."""
         if input.id == "":
             input.id = misc.short_uuid()
         if out_dir == USER_DATA_PATH:
@@ -378,42 +837,27 @@ class Additive:
             raise ValueError(
                 f"Directory {out_dir} already exists. Delete or choose a different output directory."
             )
+        return out_dir
 
-        request = input._to_request()
-
-        for response in self._servers[0].materials_stub.TuneMaterial(request):
-            if response.HasField("progress"):
-                if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
-                    raise Exception(response.progress.message)
-                else:
-                    for m in response.progress.message.splitlines():
-                        if (
-                            "License successfully" in m
-                            or "Starting ThermalSolver" in m
-                            or "threads for solver" in m
-                        ):
-                            continue
-                        print(m)
-            if response.HasField("result"):
-                return MaterialTuningSummary(input, response.result, out_dir)
+    @staticmethod
+    def _print_tuning_progress(progress: Progress):
+        """Print material tuning progress messages, raising an exception on error."""
+        if progress.state == ProgressState.PROGRESS_STATE_ERROR:
+            raise Exception(progress.message)
+        for m in progress.message.splitlines():
+            if (
+                "License successfully" in m
+                or "Starting ThermalSolver" in m
+                or "threads for solver" in m
+            ):
+                continue
+            print(m)
 
     def __file_upload_reader(
-        self, file_name: str, chunk_size=2 * 1024**2
+        self, file_name: str, chunk_size: int | None = None
     ) -> Iterator[UploadFileRequest]:
         """Read a file and return an iterator of UploadFileRequests."""
-        file_size = os.path.getsize(file_name)
-        short_name = os.path.basename(file_name)
-        with open(file_name, mode="rb") as f:
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                yield UploadFileRequest(
-                    name=short_name,
-                    total_size=file_size,
-                    content=chunk,
-                    content_md5=hashlib.md5(chunk).hexdigest(),
-                )
+        return file_upload_reader(file_name, chunk_size)
 
     def _simulate_thermal_history(
         self,
@@ -421,9 +865,17 @@ class Additive:
         out_dir: str,
         server: ServerConnection,
         logger: ProgressLogger | None = None,
+        cache_key: str | None = None,
+        deadline: float | None = None,
+        cancellation: CancellationToken | None = None,
     ) -> ThermalHistorySummary:
         """Execute a thermal history simulation.
 
+        The geometry file is uploaded once per server. Simulations whose geometry
+        file has the same content use the file that was already uploaded. If the
+        server rejects that file before the simulation starts, for example because
+        the file was removed from the server, the geometry is uploaded again.
+
         Parameters
         ----------
         input: ThermalHistoryInput
@@ -434,6 +886,13 @@ class Additive:
             Server to use for the simulation.
         logger: ProgressLogger
             Log message handler.
+        cache_key: str, None
+            Key to store the downloaded result under in the simulation cache.
+        deadline: float, None
+            Maximum duration, in seconds, of the geometry upload and the simulation
+            together. If ``None``, the duration is not limited.
+        cancellation: CancellationToken, None
+            Token that cancels the server calls of the simulation.
 
         Returns
         -------
@@ -442,39 +901,117 @@ class Additive:
         if input.geometry is None or input.geometry.path == "":
             raise ValueError("The geometry path is not defined in the simulation input")
 
-        remote_geometry_path = ""
-        for response in server.simulation_stub.UploadFile(
-            self.__file_upload_reader(input.geometry.path)
-        ):
-            remote_geometry_path = response.remote_file_name
-            if logger:
-                logger.log_progress(response.progress)  # pragma: no cover
-            if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
-                raise Exception(response.progress.message)
+        end = time.monotonic() + deadline if deadline is not None else None
 
-        request = input._to_simulation_request(remote_geometry_path=remote_geometry_path)
-        for response in server.simulation_stub.Simulate(request):
-            if response.HasField("progress"):
-                if logger:
-                    logger.log_progress(response.progress)  # pragma: no cover
+        def remaining() -> float | None:
+            return max(end - time.monotonic(), 0) if end is not None else None
+
+        remote_geometry_path, reused = self._upload_geometry(
+            input.geometry.path, server, logger, remaining(), cancellation
+        )
+        while True:
+            # Whether the server accepted the geometry and started the simulation
+            started = False
+            request = input._to_simulation_request(remote_geometry_path=remote_geometry_path)
+            call = server.simulation_stub.Simulate(request, timeout=remaining())
+            try:
+                with cancel_on(cancellation, call):
+                    for response in call:
+                        if response.HasField("progress"):
+                            if logger:
+                                logger.log_progress(response.progress)  # pragma: no cover
+                            if (
+                                response.progress.state == ProgressState.PROGRESS_STATE_ERROR
+                                and "WARN" not in response.progress.message
+                            ):
+                                raise Exception(response.progress.message)
+                        started = True
+                        if response.HasField("thermal_history_result"):
+                            path = os.path.join(out_dir, input.id, "coax_ave_output")
+                            # Stream the archive into the cache as it is downloaded.
+                            with (
+                                self._cache.writer(cache_key) if cache_key else nullcontext()
+                            ) as archive:
+                                download_and_extract(
+                                    server.simulation_stub,
+                                    response.thermal_history_result.coax_ave_zip_file,
+                                    path,
+                                    archive=archive,
+                                )
+                            return ThermalHistorySummary(input, path)
+                return None
+            except Exception as e:
                 if (
-                    response.progress.state == ProgressState.PROGRESS_STATE_ERROR
-                    and "WARN" not in response.progress.message
+                    not reused
+                    or started
+                    or (cancellation and cancellation.cancelled)
+                    or status_code(e) == grpc.StatusCode.DEADLINE_EXCEEDED
                 ):
-                    raise Exception(response.progress.message)
-            if response.HasField("thermal_history_result"):
-                path = os.path.join(out_dir, input.id, "coax_ave_output")
-                local_zip = download_file(
-                    server.simulation_stub,
-                    response.thermal_history_result.coax_ave_zip_file,
-                    path,
+                    raise
+                # The server may no longer have the file that was uploaded earlier.
+                self._log.debug("Uploading %s again: %s", input.geometry.path, e)
+                remote_geometry_path, reused = self._upload_geometry(
+                    input.geometry.path,
+                    server,
+                    logger,
+                    remaining(),
+                    cancellation,
+                    stale=remote_geometry_path,
                 )
-                with zipfile.ZipFile(local_zip, "r") as zip:
-                    zip.extractall(path)
-                os.remove(local_zip)
-                return ThermalHistorySummary(input, path)
 
-    def _validate_inputs(self, inputs):
+    def _upload_geometry(
+        self,
+        file_name: str,
+        server: ServerConnection,
+        logger: ProgressLogger | None = None,
+        timeout: float | None = None,
+        cancellation: CancellationToken | None = None,
+        stale: str | None = None,
+    ) -> tuple[str, bool]:
+        """Upload a geometry file to a server unless the server already has it.
+
+        Parameters
+        ----------
+        file_name: str
+            Path of the local geometry file.
+        server: ServerConnection
+            Server to upload the file to.
+        logger: ProgressLogger, None
+            Log message handler.
+        timeout: float, None
+            Maximum duration, in seconds, of the upload.
+        cancellation: CancellationToken, None
+            Token that cancels the upload.
+        stale: str, None
+            Remote file name that the server rejected. It is not reused.
+
+        Returns
+        -------
+        tuple[str, bool]
+            Path of the file on the server, and whether it was uploaded earlier.
+        """
+        digest = self._uploads.digest(file_name)
+        with self._uploads.upload_lock(server, digest):
+            remote_file_name = self._uploads.get(server, digest)
+            if remote_file_name is not None and remote_file_name != stale:
+                return remote_file_name, True
+            self._uploads.discard(server, digest)
+            upload = server.simulation_stub.UploadFile(
+                self.__file_upload_reader(file_name), timeout=timeout
+            )
+            with cancel_on(cancellation, upload):
+                for response in upload:
+                    remote_file_name = response.remote_file_name
+                    if logger:
+                        logger.log_progress(response.progress)  # pragma: no cover
+                    if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
+                        raise Exception(response.progress.message)
+            if remote_file_name:
+                self._uploads.put(server, digest, remote_file_name)
+            return remote_file_name, False
+
+    @staticmethod
+    def _validate_inputs(inputs):
         ids = []
         for input in inputs:
             if input.id == "":
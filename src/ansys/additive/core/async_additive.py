@@ -0,0 +1,587 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides an ``asyncio`` client for interacting with the Additive service."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import logging
+import os
+import time
+
+from ansys.api.additive import __version__ as api_version
+from ansys.api.additive.v0.additive_domain_pb2 import ProgressState
+from ansys.api.additive.v0.additive_materials_pb2 import GetMaterialRequest
+from google.protobuf.empty_pb2 import Empty
+import grpc
+
+from ansys.additive.core import USER_DATA_PATH, __version__
+from ansys.additive.core.additive import Additive
+from ansys.additive.core.cache import SimulationCache
+from ansys.additive.core.dispatcher import max_slots, sort_longest_first, take_job
+from ansys.additive.core.download import download_and_extract_async, download_file_async
+from ansys.additive.core.material import AdditiveMaterial
+from ansys.additive.core.material_tuning import MaterialTuningInput, MaterialTuningSummary
+from ansys.additive.core.microstructure import MicrostructureInput, MicrostructureSummary
+from ansys.additive.core.porosity import PorosityInput, PorositySummary
+from ansys.additive.core.server_connection import DEFAULT_PRODUCT_VERSION, AsyncServerConnection
+from ansys.additive.core.server_connection.server_connection import ServerStatistics
+from ansys.additive.core.simulation import SimulationError
+from ansys.additive.core.single_bead import SingleBeadInput, SingleBeadSummary
+from ansys.additive.core.thermal_history import ThermalHistoryInput, ThermalHistorySummary
+from ansys.additive.core.upload import UploadCache, async_file_upload_reader
+
+
+class AsyncAdditive:
+    """Provides an ``asyncio`` client interface to one or more Additive services.
+
+    This class provides the same operations as :class:`Additive` as coroutines built
+    on :mod:`grpc.aio`. A single event loop can drive simulations on many servers
+    without blocking, which makes it suitable for Jupyter notebooks and Panel
+    applications.
+
+    Server connections are created when the object is initialized. Use the object
+    as an asynchronous context manager, or await the :meth:`connect` method, to
+    wait for the servers to become ready.
+
+    .. code::
+
+        async with AsyncAdditive(server_connections=["host1:50052", "host2:50052"]) as additive:
+            summaries = await additive.simulate(inputs)
+
+    Parameters
+    ----------
+    server_connections: list[str, grpc.aio.Channel], None
+        List of connection definitions for servers. The list may be a combination of strings and
+        connected :class:`grpc.aio.Channel <grpc.aio.Channel>` objects. Strings use the format
+        ``host:port`` to specify the server IPv4 address.
+    host: str, default: None
+        Host name or IPv4 address of the server. This parameter is ignored if the
+        ``server_connections`` parameter is other than ``None``.
+    port: int, default: 50052
+        Port number to use when connecting to the server.
+    nservers: int, default: 1
+        Number of Additive servers to start and connect to.
+        This parameter is ignored if the ``server_connections`` or ``host``
+        parameter is other than ``None``.
+    product_version: str
+        Version of the Ansys product installation in the form ``"YYR"``, where ``YY``
+        is the two-digit year and ``R`` is the release number. For example, the release
+        2024 R1 would be specified as ``241``. This parameter is only applicable in
+        PyPIM environments and on localhost.
+    log_level: str, default: "INFO"
+        Minimum severity level of messages to log.
+    log_file: str, default: ""
+        File name to write log messages to.
+    max_concurrency: int, default: 1
+        Maximum number of simulations to run on each server at the same time.
+    max_concurrency_by_type: dict[str, int], None
+        Per simulation type overrides of the ``max_concurrency`` value. For more
+        information, see :class:`Additive`.
+    cache_dir: str, None
+        Folder of an on-disk cache of simulation results. For more information, see
+        :class:`Additive`.
+    cache_max_size: int, default: 2 GiB
+        Maximum total size, in bytes, of the cached results.
+    """
+
+    DEFAULT_ADDITIVE_SERVICE_PORT = Additive.DEFAULT_ADDITIVE_SERVICE_PORT
+
+    def __init__(
+        self,
+        server_connections: list[str | grpc.aio.Channel] = None,
+        host: str | None = None,
+        port: int = DEFAULT_ADDITIVE_SERVICE_PORT,
+        nservers: int = 1,
+        product_version: str = DEFAULT_PRODUCT_VERSION,
+        log_level: str = "INFO",
+        log_file: str = "",
+        max_concurrency: int = 1,
+        max_concurrency_by_type: dict[str, int] | None = None,
+        cache_dir: str | None = None,
+        cache_max_size: int = SimulationCache.DEFAULT_MAX_SIZE,
+    ) -> None:
+        """Initialize server connections."""
+        self._log = Additive._create_logger(log_file, log_level)
+        self._log.debug("Logging set to %s", log_level)
+
+        self._servers = AsyncAdditive._connect_to_servers(
+            server_connections, host, port, nservers, product_version, self._log
+        )
+        for server in self._servers:
+            server.max_concurrency = max_concurrency
+            server.max_concurrency_by_type = max_concurrency_by_type
+
+        self._cache = SimulationCache(cache_dir, cache_max_size, self._log) if cache_dir else None
+        self._uploads = UploadCache()
+
+        # Setup data directory
+        self._user_data_path = USER_DATA_PATH
+        if not os.path.exists(self._user_data_path):  # pragma: no cover
+            os.makedirs(self._user_data_path)
+
+    @staticmethod
+    def _connect_to_servers(
+        server_connections: list[str | grpc.aio.Channel] = None,
+        host: str | None = None,
+        port: int = DEFAULT_ADDITIVE_SERVICE_PORT,
+        nservers: int = 1,
+        product_version: str = DEFAULT_PRODUCT_VERSION,
+        log: logging.Logger = None,
+    ) -> list[AsyncServerConnection]:
+        """Create connections to Additive servers, starting them if necessary."""
+        connections = []
+        if server_connections:
+            for target in server_connections:
+                if isinstance(target, grpc.aio.Channel):
+                    connections.append(AsyncServerConnection(channel=target, log=log))
+                else:
+                    connections.append(AsyncServerConnection(addr=target, log=log))
+        elif host:
+            connections.append(AsyncServerConnection(addr=f"{host}:{port}", log=log))
+        elif os.getenv("ANSYS_ADDITIVE_ADDRESS"):
+            connections.append(
+                AsyncServerConnection(addr=os.getenv("ANSYS_ADDITIVE_ADDRESS"), log=log)
+            )
+        else:
+            for _ in range(nservers):
+                connections.append(AsyncServerConnection(product_version=product_version, log=log))
+
+        return connections
+
+    async def __aenter__(self) -> AsyncAdditive:
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        """Wait for all servers to become ready.
+
+        Raises
+        ------
+        RuntimeError
+            If a server does not respond.
+        """
+        ready = await asyncio.gather(*[server.ready() for server in self._servers])
+        for server, is_ready in zip(self._servers, ready):
+            if not is_ready:
+                raise RuntimeError(f"Unable to connect to server {server.channel_str}")
+            self._log.info("Connected to %s in %.1f s", server.channel_str, server.startup_time)
+
+    async def close(self):
+        """Close the channels to all servers."""
+        await asyncio.gather(*[server.close() for server in self._servers])
+
+    async def about(self) -> None:
+        """Print information about the client and servers."""
+        print(f"Client {__version__}, API version: {api_version}")
+        for status in await asyncio.gather(*[server.status() for server in self._servers]):
+            print(status)
+
+    @property
+    def cache(self) -> SimulationCache | None:
+        """Cache of simulation results, or ``None`` if caching is disabled."""
+        return self._cache
+
+    def server_statistics(self) -> list[ServerStatistics]:
+        """Get simulation throughput statistics for each server.
+
+        Returns
+        -------
+        list[ServerStatistics]
+            Statistics of each server in the order of the server connections.
+        """
+        return [server.statistics for server in self._servers]
+
+    async def simulate(
+        self,
+        inputs: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput | list,
+        longest_first: bool = False,
+    ) -> (
+        SingleBeadSummary
+        | PorositySummary
+        | MicrostructureSummary
+        | ThermalHistorySummary
+        | SimulationError
+        | list
+    ):
+        """Execute additive simulations.
+
+        Parameters
+        ----------
+        inputs: SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput, list
+            Parameters to use for simulations. A list of inputs may be provided to execute multiple
+            simulations.
+        longest_first: bool, default: False
+            Whether to start the simulations with the longest expected duration first
+            when a list of inputs is provided.
+
+        Returns
+        -------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary, SimulationError,
+        list
+            One or more summaries of simulation results. If a list of inputs is provided, a
+            list is returned in completion order.
+        """
+        if type(inputs) is not list:
+            return await self._simulate(inputs, self._servers[0])
+        return [
+            summary async for summary in self.simulate_iter(inputs, longest_first=longest_first)
+        ]
+
+    async def simulate_iter(
+        self,
+        inputs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+        longest_first: bool = False,
+    ) -> AsyncIterator[
+        SingleBeadSummary
+        | PorositySummary
+        | MicrostructureSummary
+        | ThermalHistorySummary
+        | SimulationError
+    ]:
+        """Execute additive simulations and yield each summary as soon as it is available.
+
+        Servers take inputs from a shared queue. Each server starts its next
+        simulation as soon as one of its ``max_concurrency`` simulation slots frees up.
+
+        Parameters
+        ----------
+        inputs: list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+            Parameters to use for simulations.
+        longest_first: bool, default: False
+            Whether to start the simulations with the longest expected duration first.
+            For more information, see :func:`ansys.additive.core.dispatcher.expected_duration`.
+
+        Yields
+        ------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary, SimulationError
+            Summary of each simulation as it completes.
+        """
+        Additive._validate_inputs(inputs)
+
+        jobs = sort_longest_first(inputs) if longest_first else list(inputs)
+        completed = asyncio.Queue()
+        changed = asyncio.Condition()
+        in_progress = {id(server): 0 for server in self._servers}
+
+        async def worker(server: AsyncServerConnection):
+            while True:
+                async with changed:
+                    input = None
+                    while jobs:
+                        input = take_job(jobs, server, in_progress[id(server)])
+                        if input is not None:
+                            break
+                        await changed.wait()
+                    if input is None:
+                        return
+                    in_progress[id(server)] += 1
+                server._simulation_started()
+                start = time.monotonic()
+                error = True
+                try:
+                    summary = await self._simulate(input, server)
+                    error = isinstance(summary, SimulationError)
+                    await completed.put(summary)
+                except Exception as e:
+                    await completed.put(e)
+                finally:
+                    server._simulation_finished(time.monotonic() - start, error)
+                    async with changed:
+                        in_progress[id(server)] -= 1
+                        changed.notify_all()
+
+        workers = [
+            asyncio.create_task(worker(server))
+            for server in self._servers
+            for _ in range(max_slots(server))
+        ]
+        try:
+            for _ in range(len(inputs)):
+                summary = await completed.get()
+                if isinstance(summary, Exception):
+                    raise summary
+                yield summary
+        finally:
+            for task in workers:
+                task.cancel()
+
+    async def _simulate(
+        self,
+        input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
+        server: AsyncServerConnection,
+    ):
+        """Execute a single simulation.
+
+        Parameters
+        ----------
+        input: SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput
+            Parameters to use for simulation.
+
+        server: AsyncServerConnection
+            Server to use for the simulation.
+
+        Returns
+        -------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary,
+        SimulationError
+        """
+        if input.material == AdditiveMaterial():
+            raise ValueError("A material is not assigned to the simulation input")
+
+        try:
+            cache_key = None
+            if self._cache:
+                cache_key = await asyncio.to_thread(
+                    SimulationCache.key, input, self._uploads.digest
+                )
+                summary = await asyncio.to_thread(
+                    Additive._cached_summary, self._cache, cache_key, input, self._user_data_path
+                )
+                if summary:
+                    return summary
+
+            if isinstance(input, ThermalHistoryInput):
+                return await self._simulate_thermal_history(
+                    input, USER_DATA_PATH, server, cache_key=cache_key
+                )
+
+            request = input._to_simulation_request()
+            async for response in server.simulation_stub.Simulate(request):
+                summary = Additive._summary_from_response(input, response, self._user_data_path)
+                if summary:
+                    if cache_key:
+                        await asyncio.to_thread(
+                            self._cache.put, cache_key, response.SerializeToString()
+                        )
+                    return summary
+        except Exception as e:
+            return SimulationError(input, str(e))
+
+    async def _simulate_thermal_history(
+        self,
+        input: ThermalHistoryInput,
+        out_dir: str,
+        server: AsyncServerConnection,
+        cache_key: str | None = None,
+    ) -> ThermalHistorySummary:
+        """Execute a thermal history simulation.
+
+        The geometry file is uploaded once per server, as with
+        :meth:`Additive._simulate_thermal_history`.
+
+        Parameters
+        ----------
+        input: ThermalHistoryInput
+            Simulation input parameters.
+        out_dir: str
+            Folder path for output files.
+        server: AsyncServerConnection
+            Server to use for the simulation.
+        cache_key: str, None
+            Key to store the downloaded result under in the simulation cache.
+
+        Returns
+        -------
+        :class:`ThermalHistorySummary`
+        """
+        if input.geometry is None or input.geometry.path == "":
+            raise ValueError("The geometry path is not defined in the simulation input")
+
+        remote_geometry_path, reused = await self._upload_geometry(input.geometry.path, server)
+        while True:
+            # Whether the server accepted the geometry and started the simulation
+            started = False
+            request = input._to_simulation_request(remote_geometry_path=remote_geometry_path)
+            try:
+                async for response in server.simulation_stub.Simulate(request):
+                    if response.HasField("progress"):
+                        if (
+                            response.progress.state == ProgressState.PROGRESS_STATE_ERROR
+                            and "WARN" not in response.progress.message
+                        ):
+                            raise Exception(response.progress.message)
+                    started = True
+                    if response.HasField("thermal_history_result"):
+                        path = os.path.join(out_dir, input.id, "coax_ave_output")
+                        # Stream the archive into the cache as it is downloaded.
+                        archive = self._cache.writer(cache_key) if cache_key else None
+                        try:
+                            await download_and_extract_async(
+                                server.simulation_stub,
+                                response.thermal_history_result.coax_ave_zip_file,
+                                path,
+                                archive=archive,
+                            )
+                        except BaseException:
+                            if archive:
+                                archive.discard()
+                            raise
+                        if archive:
+                            await asyncio.to_thread(archive.commit)
+                        return ThermalHistorySummary(input, path)
+                return None
+            except Exception as e:
+                if not reused or started:
+                    raise
+                # The server may no longer have the file that was uploaded earlier.
+                self._log.debug("Uploading %s again: %s", input.geometry.path, e)
+                remote_geometry_path, reused = await self._upload_geometry(
+                    input.geometry.path, server, stale=remote_geometry_path
+                )
+
+    async def _upload_geometry(
+        self, file_name: str, server: AsyncServerConnection, stale: str | None = None
+    ) -> tuple[str, bool]:
+        """Upload a geometry file to a server unless the server already has it.
+
+        Parameters
+        ----------
+        file_name: str
+            Path of the local geometry file.
+        server: AsyncServerConnection
+            Server to upload the file to.
+        stale: str, None
+            Remote file name that the server rejected. It is not reused.
+
+        Returns
+        -------
+        tuple[str, bool]
+            Path of the file on the server, and whether it was uploaded earlier.
+        """
+        digest = await asyncio.to_thread(self._uploads.digest, file_name)
+        async with self._uploads.async_upload_lock(server, digest):
+            remote_file_name = self._uploads.get(server, digest)
+            if remote_file_name is not None and remote_file_name != stale:
+                return remote_file_name, True
+            self._uploads.discard(server, digest)
+            remote_file_name = await self.upload_file(file_name, server)
+            if remote_file_name:
+                self._uploads.put(server, digest, remote_file_name)
+            return remote_file_name, False
+
+    async def upload_file(self, file_name: str, server: AsyncServerConnection = None) -> str:
+        """Upload a file to a server.
+
+        Parameters
+        ----------
+        file_name: str
+            Path of the local file to upload.
+        server: AsyncServerConnection, default: None
+            Server to upload the file to. If this value is ``None``, the first server is used.
+
+        Returns
+        -------
+        str
+            Path of the uploaded file on the server.
+        """
+        server = server or self._servers[0]
+        remote_file_name = ""
+        async for response in server.simulation_stub.UploadFile(
+            async_file_upload_reader(file_name)
+        ):
+            remote_file_name = response.remote_file_name
+            if response.progress.state == ProgressState.PROGRESS_STATE_ERROR:
+                raise Exception(response.progress.message)
+        return remote_file_name
+
+    async def download_file(
+        self, remote_file_name: str, local_folder: str, server: AsyncServerConnection = None
+    ) -> str:
+        """Download a file from a server.
+
+        Parameters
+        ----------
+        remote_file_name: str
+            Path of the file on the server.
+        local_folder: str
+            Folder on your localhost to write the file to.
+        server: AsyncServerConnection, default: None
+            Server to download the file from. If this value is ``None``, the first server is used.
+
+        Returns
+        -------
+        str
+            Local path of the downloaded file.
+        """
+        server = server or self._servers[0]
+        return await download_file_async(server.simulation_stub, remote_file_name, local_folder)
+
+    async def materials_list(self) -> list[str]:
+        """Get a list of material names used in additive simulations.
+
+        Returns
+        -------
+        list[str]
+            Names of available additive materials.
+        """
+        response = await self._servers[0].materials_stub.GetMaterialsList(Empty())
+        return [n for n in response.names]
+
+    async def material(self, name: str) -> AdditiveMaterial:
+        """Get a material for use in an additive simulation.
+
+        Parameters
+        ----------
+
+        name: str
+            Name of material.
+
+        Returns
+        -------
+        AdditiveMaterial
+        """
+        request = GetMaterialRequest(name=name)
+        result = await self._servers[0].materials_stub.GetMaterial(request)
+        return AdditiveMaterial._from_material_message(result)
+
+    async def tune_material(
+        self, input: MaterialTuningInput, out_dir: str = USER_DATA_PATH
+    ) -> MaterialTuningSummary:
+        """Tune a custom material for use with additive simulations.
+
+        For more information, see the :meth:`Additive.tune_material` method.
+
+        Parameters
+        ----------
+        input: MaterialTuningInput
+            Input parameters for material tuning.
+        out_dir: str, default: USER_DATA_PATH
+            Folder path for output files.
+
+        Returns
+        -------
+        MaterialTuningSummary
+            Summary of material tuning.
+        """
+        out_dir = Additive._tuning_output_dir(input, out_dir)
+        request = input._to_request()
+
+        async for response in self._servers[0].materials_stub.TuneMaterial(request):
+            if response.HasField("progress"):
+                Additive._print_tuning_progress(response.progress)
+            if response.HasField("result"):
+                return MaterialTuningSummary(input, response.result, out_dir)
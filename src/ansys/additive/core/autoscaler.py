@@ -0,0 +1,191 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Adjusts the number of Additive servers to the number of queued simulations."""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import math
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from ansys.additive.core.dispatcher import max_slots
+from ansys.additive.core.server_connection import ServerConnection
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ansys.additive.core.additive import Additive
+
+
+class Autoscaler:
+    """Starts servers while simulations are queued and shuts down idle servers.
+
+    At every ``interval``, the autoscaler compares the number of queued simulations
+    with the number of free simulation slots of the servers of an :class:`Additive`
+    client. If more simulations are queued than can be started, servers are started
+    in parallel, up to ``max_servers``. Servers started by the autoscaler that have
+    been idle for ``idle_cooldown`` seconds are removed and shut down, down to
+    ``min_servers``. Servers that were connected before are never shut down.
+
+    Use :meth:`Additive.autoscale` to create an autoscaler.
+
+    Parameters
+    ----------
+    additive: Additive
+        Client whose servers are adjusted.
+    min_servers: int
+        Minimum number of servers.
+    max_servers: int
+        Maximum number of servers.
+    idle_cooldown: float
+        Time, in seconds, that a started server must be idle before it is shut down.
+    interval: float
+        Interval, in seconds, at which the number of servers is adjusted.
+    log: logging.Logger, None
+        Log to write scaling messages to.
+    """
+
+    DEFAULT_IDLE_COOLDOWN = 300.0
+    DEFAULT_INTERVAL = 5.0
+
+    def __init__(
+        self,
+        additive: Additive,
+        min_servers: int = 1,
+        max_servers: int = 4,
+        idle_cooldown: float = DEFAULT_IDLE_COOLDOWN,
+        interval: float = DEFAULT_INTERVAL,
+        log: logging.Logger = None,
+    ):
+        """Initialize the autoscaler."""
+        if min_servers < 1:
+            raise ValueError("min_servers must be at least 1.")
+        if max_servers < min_servers:
+            raise ValueError("max_servers must not be less than min_servers.")
+        if idle_cooldown < 0 or interval <= 0:
+            raise ValueError("idle_cooldown and interval must be positive.")
+        self._additive = additive
+        self._min_servers = min_servers
+        self._max_servers = max_servers
+        self._idle_cooldown = idle_cooldown
+        self._interval = interval
+        self._log = log if log else logging.getLogger(__name__)
+        # Servers started by the autoscaler and the last time each server was busy,
+        # keyed by server id
+        self._started = {}
+        self._last_busy = {}
+        # Removed servers that are shut down once their simulations finish
+        self._draining = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def started_servers(self) -> list[ServerConnection]:
+        """Servers started by the autoscaler that are in use."""
+        return list(self._started.values())
+
+    def start(self) -> None:
+        """Start adjusting the number of servers in a background thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop adjusting the number of servers.
+
+        Servers that were started by the autoscaler remain connected.
+        """
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        """Adjust the number of servers until stopped."""
+        while not self._stop.is_set():
+            try:
+                self.scale()
+            except Exception as e:
+                self._log.warning("Autoscaling failed: %s", e)
+            self._stop.wait(self._interval)
+
+    def scale(self) -> None:
+        """Adjust the number of servers once."""
+        now = time.monotonic()
+        self._close_drained()
+        servers = self._additive.servers
+        pending = self._additive.pending_simulations()
+        for server in servers:
+            if pending or server.statistics.in_progress:
+                self._last_busy[id(server)] = now
+
+        if len(servers) < self._min_servers:
+            self._launch(self._min_servers - len(servers))
+            return
+
+        free_slots = sum(
+            max(max_slots(server) - server.statistics.in_progress, 0) for server in servers
+        )
+        if pending > free_slots and len(servers) < self._max_servers:
+            slots_per_server = max(max_slots(server) for server in servers)
+            count = math.ceil((pending - free_slots) / slots_per_server)
+            self._launch(min(count, self._max_servers - len(servers)))
+            return
+
+        for server in list(self._started.values()):
+            if server not in servers:
+                # Removed by the user
+                del self._started[id(server)]
+                continue
+            if len(servers) <= self._min_servers:
+                break
+            if now - self._last_busy.get(id(server), now) >= self._idle_cooldown:
+                self._additive.remove_server(server)
+                servers.remove(server)
+                del self._started[id(server)]
+                self._last_busy.pop(id(server), None)
+                self._draining.append(server)
+                self._log.info("Removed idle server %s", server.channel_str)
+        self._close_drained()
+
+    def _launch(self, count: int) -> None:
+        """Start servers in parallel and add them to the client."""
+        self._log.info("Starting %d server(s)", count)
+        with concurrent.futures.ThreadPoolExecutor(count) as executor:
+            futures = [executor.submit(self._additive.add_server) for _ in range(count)]
+        now = time.monotonic()
+        for future in futures:
+            try:
+                server = future.result()
+            except Exception as e:
+                self._log.warning("Unable to start server: %s", e)
+                continue
+            self._started[id(server)] = server
+            self._last_busy[id(server)] = now
+
+    def _close_drained(self) -> None:
+        """Shut down removed servers once their simulations have finished."""
+        for server in list(self._draining):
+            if server.statistics.in_progress == 0:
+                server.close()
+                self._draining.remove(server)
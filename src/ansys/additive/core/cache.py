@@ -0,0 +1,521 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides an on-disk cache of simulation results and an in-memory cache of server data."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, BinaryIO, Callable
+
+from ansys.additive.core.microstructure import MicrostructureInput
+from ansys.additive.core.porosity import PorosityInput
+from ansys.additive.core.single_bead import SingleBeadInput
+from ansys.additive.core.thermal_history import ThermalHistoryInput
+
+CACHE_FORMAT_VERSION = 1
+"""Version of the cache key and entry format. Changing it invalidates existing entries."""
+
+_ENTRY_SUFFIX = ".bin"
+_TEMP_SUFFIX = ".tmp"
+#: Age, in seconds, after which an unmodified temporary file is left over from
+#: an interrupted write. Writers in progress update their file as data arrives.
+_STALE_TEMP_AGE = 60 * 60
+_GEOMETRY_PLACEHOLDER = "geometry"
+
+
+def file_digest(file_name: str, chunk_size: int = 1024**2) -> str:
+    """Return the SHA-256 digest of a file's content as a hexadecimal string.
+
+    Parameters
+    ----------
+    file_name: str
+        Path of the file.
+    chunk_size: int
+        Size, in bytes, of the blocks read from the file.
+    """
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    """Provides usage statistics of a simulation cache.
+
+    Parameters
+    ----------
+    hits: int
+        Number of lookups that found a cached result in this process.
+    misses: int
+        Number of lookups that did not find a cached result in this process.
+    bytes_read: int
+        Number of bytes read from cache entries in this process.
+    bytes_written: int
+        Number of bytes written to cache entries in this process.
+    entries: int
+        Number of entries in the cache directory.
+    size: int
+        Total size, in bytes, of the entries in the cache directory.
+    max_size: int
+        Maximum total size, in bytes, of the entries in the cache directory.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    entries: int = 0
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that found a cached result."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class SimulationCache:
+    """Provides a content-addressed, on-disk cache of simulation results.
+
+    Entries are keyed by a hash of the simulation request, excluding the simulation
+    ID, so identical simulations share an entry regardless of their IDs. Thermal
+    history simulations also include a digest of the geometry file in the key.
+
+    Entries are written to a temporary file and atomically renamed into place, so
+    several processes may share one cache directory. When the total size of the
+    entries exceeds ``max_size``, the least recently used entries are removed.
+
+    Parameters
+    ----------
+    cache_dir: str
+        Folder to store cache entries in. The folder is created if it does not exist.
+    max_size: int, default: 2 GiB
+        Maximum total size, in bytes, of the cache entries.
+    log: logging.Logger, None
+        Log to write cache messages to.
+    """
+
+    #: Default maximum total size of the cache entries in bytes.
+    DEFAULT_MAX_SIZE = 2 * 1024**3
+
+    def __init__(
+        self, cache_dir: str, max_size: int = DEFAULT_MAX_SIZE, log: logging.Logger = None
+    ):
+        """Initialize the cache."""
+        if max_size < 0:
+            raise ValueError("max_size must not be negative.")
+        self._cache_dir = os.path.abspath(cache_dir)
+        self._max_size = max_size
+        self._log = log if log else logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bytes_read = 0
+        self._bytes_written = 0
+        # Running total size of the entries, or None until the cache is scanned.
+        # Entries written by other processes are only counted by a scan.
+        self._size = None
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    @property
+    def cache_dir(self) -> str:
+        """Folder the cache entries are stored in."""
+        return self._cache_dir
+
+    @property
+    def max_size(self) -> int:
+        """Maximum total size, in bytes, of the cache entries."""
+        return self._max_size
+
+    @staticmethod
+    def key(
+        input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
+        digest_file: Callable[[str], str] | None = None,
+    ) -> str:
+        """Return the cache key of a simulation input.
+
+        Parameters
+        ----------
+        input: SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput
+            Simulation input.
+        digest_file: Callable[[str], str], None
+            Function returning the SHA-256 digest of the geometry file of a thermal
+            history simulation. Pass a memoizing function, such as
+            ``UploadCache.digest``, to reuse the digest computed for the upload. If
+            ``None``, the file is hashed with :func:`file_digest`.
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 digest of the simulation request without its ID.
+        """
+        digest = hashlib.sha256(f"v{CACHE_FORMAT_VERSION}".encode())
+        if isinstance(input, ThermalHistoryInput):
+            if input.geometry is None or input.geometry.path == "":
+                raise ValueError("The geometry path is not defined in the simulation input")
+            request = input._to_simulation_request(remote_geometry_path=_GEOMETRY_PLACEHOLDER)
+            digest_file = digest_file or file_digest
+            digest.update(digest_file(input.geometry.path).encode())
+        else:
+            request = input._to_simulation_request()
+        request.id = ""
+        digest.update(request.SerializeToString(deterministic=True))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, key[:2], key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached data for a key.
+
+        Parameters
+        ----------
+        key: str
+            Cache key returned by the :meth:`key` method.
+
+        Returns
+        -------
+        bytes, None
+            Cached data, or ``None`` if the key is not in the cache.
+        """
+        f = self.open(key)
+        if f is None:
+            return None
+        with f:
+            return f.read()
+
+    def open(self, key: str) -> BinaryIO | None:
+        """Open the cached data for a key for reading.
+
+        Use this method to read a large entry, such as an archive, without
+        loading all of it in memory. The caller must close the file.
+
+        Parameters
+        ----------
+        key: str
+            Cache key returned by the :meth:`key` method.
+
+        Returns
+        -------
+        BinaryIO, None
+            Binary file of the cached data, or ``None`` if the key is not in the cache.
+        """
+        path = self._entry_path(key)
+        try:
+            f = open(path, "rb")
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            size = os.fstat(f.fileno()).st_size
+            # Mark the entry as recently used.
+            os.utime(path)
+        except OSError:
+            # Evicted by another process after it was opened.
+            size = 0
+        with self._lock:
+            self._hits += 1
+            self._bytes_read += size
+        return f
+
+    def put(self, key: str, data: bytes) -> None:
+        """Store data in the cache.
+
+        Failures to write the cache entry are logged and otherwise ignored.
+
+        Parameters
+        ----------
+        key: str
+            Cache key returned by the :meth:`key` method.
+        data: bytes
+            Data to store.
+        """
+        writer = self.writer(key)
+        writer.write(data)
+        writer.commit()
+
+    def writer(self, key: str) -> CacheEntryWriter:
+        """Return a writer that streams data into a cache entry.
+
+        Use the writer to cache data that is received in chunks, such as a
+        downloaded archive, without holding all of it in memory.
+
+        Parameters
+        ----------
+        key: str
+            Cache key returned by the :meth:`key` method.
+
+        Returns
+        -------
+        CacheEntryWriter
+            Writer of the cache entry.
+        """
+        return CacheEntryWriter(self, key)
+
+    def _entry_written(self, size: int, replaced: int) -> None:
+        """Record a new entry, and evict entries if the cache is full."""
+        with self._lock:
+            self._bytes_written += size
+            if self._size is not None:
+                self._size += size - replaced
+            full = self._size is None or self._size > self._max_size
+        if full:
+            self._evict()
+
+    def _entries(self) -> list[os.DirEntry]:
+        """Return the cache entries, skipping files that are removed while scanning."""
+        entries = []
+        for subdir in os.scandir(self._cache_dir):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.endswith(_ENTRY_SUFFIX):
+                    entries.append(entry)
+        return entries
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in ``max_size``.
+
+        The cache folder is scanned, so this is only called when the running total
+        size exceeds ``max_size`` or is not known yet.
+        """
+        sized = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            sized.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in sized)
+        for _, size, path in sorted(sized):
+            if total <= self._max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                # Removed by another process or still open on Windows.
+                continue
+            total -= size
+        with self._lock:
+            self._size = total
+        self._remove_stale_temp_files()
+
+    def _remove_stale_temp_files(self) -> None:
+        """Remove temporary files left over by writes that were interrupted."""
+        expired = time.time() - _STALE_TEMP_AGE
+        for subdir in os.scandir(self._cache_dir):
+            if not subdir.is_dir():
+                continue
+            for entry in os.scandir(subdir.path):
+                if not entry.name.endswith(_TEMP_SUFFIX):
+                    continue
+                try:
+                    if entry.stat().st_mtime < expired:
+                        os.remove(entry.path)
+                except OSError:
+                    # Removed by another process or still open on Windows.
+                    continue
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        for subdir in os.scandir(self._cache_dir):
+            if subdir.is_dir():
+                shutil.rmtree(subdir.path, ignore_errors=True)
+        with self._lock:
+            self._size = None
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """Usage statistics of the cache."""
+        entries = 0
+        size = 0
+        for entry in self._entries():
+            try:
+                size += entry.stat().st_size
+            except OSError:
+                continue
+            entries += 1
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                bytes_read=self._bytes_read,
+                bytes_written=self._bytes_written,
+                entries=entries,
+                size=size,
+                max_size=self._max_size,
+            )
+
+
+class CacheEntryWriter:
+    """Streams data into an entry of a :class:`SimulationCache`.
+
+    The data is written to a temporary file in the cache folder, which
+    :meth:`commit` atomically renames into place. Failures to write the entry
+    are logged and otherwise ignored. Data larger than the cache's ``max_size``
+    is not cached. The writer can be used as a context manager, which commits
+    the entry if the context exits without an error and discards it otherwise.
+
+    Parameters
+    ----------
+    cache: SimulationCache
+        Cache to write the entry to.
+    key: str
+        Cache key returned by the :meth:`SimulationCache.key` method.
+    """
+
+    def __init__(self, cache: SimulationCache, key: str):
+        """Initialize the writer."""
+        self._cache = cache
+        self._path = cache._entry_path(key)
+        self._file = None
+        self._tmp_path = None
+        self._size = 0
+        self._discarded = False
+
+    def __enter__(self) -> CacheEntryWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def write(self, data: bytes) -> None:
+        """Append data to the entry."""
+        if self._discarded:
+            return
+        self._size += len(data)
+        if self._size > self._cache.max_size:
+            self.discard()
+            return
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                fd, self._tmp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(self._path), suffix=_TEMP_SUFFIX
+                )
+                self._file = os.fdopen(fd, "wb")
+            self._file.write(data)
+        except OSError as e:
+            self._cache._log.warning("Unable to write cache entry %s: %s", self._path, e)
+            self.discard()
+
+    def commit(self) -> None:
+        """Rename the written data into place as the cache entry."""
+        if self._discarded:
+            return
+        # Create the temporary file if no data was written.
+        self.write(b"")
+        if self._discarded:
+            return
+        try:
+            replaced = os.stat(self._path).st_size
+        except OSError:
+            replaced = 0
+        try:
+            self._file.close()
+            os.replace(self._tmp_path, self._path)
+        except OSError as e:
+            self._cache._log.warning("Unable to write cache entry %s: %s", self._path, e)
+            self.discard()
+            return
+        self._file = None
+        self._tmp_path = None
+        self._discarded = True
+        self._cache._entry_written(self._size, replaced)
+
+    def discard(self) -> None:
+        """Remove the written data without creating the cache entry."""
+        self._discarded = True
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._tmp_path is not None:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
+            self._tmp_path = None
+
+
+class ExpiringCache:
+    """Provides a thread-safe in-memory cache whose entries expire after a time to live.
+
+    Parameters
+    ----------
+    ttl: float
+        Time, in seconds, that an entry is valid after it is stored. A value of
+        ``0`` disables caching.
+    """
+
+    def __init__(self, ttl: float):
+        """Initialize the cache."""
+        if ttl < 0:
+            raise ValueError("ttl must not be negative.")
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        # Expiration time and value of each entry, keyed by entry key
+        self._entries = {}
+
+    @property
+    def ttl(self) -> float:
+        """Time, in seconds, that an entry is valid after it is stored."""
+        return self._ttl
+
+    def get(self, key: str) -> Any | None:
+        """Return the value of an entry, or ``None`` if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store an entry."""
+        if self._ttl == 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Remove an entry, or all entries if ``key`` is ``None``."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,103 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides cooperative cancellation of simulations."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import threading
+
+import grpc
+
+
+class CancellationToken:
+    """Provides a handle to cancel a batch of simulations.
+
+    Pass the token to :meth:`Additive.simulate` or :meth:`Additive.simulate_iter`
+    and call :meth:`cancel` from another thread to stop the batch. Queued simulations
+    are not started and simulations in progress have their server calls cancelled.
+    Each of these simulations returns a :class:`SimulationCancelled` result.
+    """
+
+    def __init__(self):
+        """Initialize the token."""
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks = []
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation was requested."""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Request cancellation.
+
+        Callbacks that were added to the token are called once. Calling this
+        method again has no effect.
+        """
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks = list(self._callbacks)
+            self._callbacks.clear()
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Add a function to call on cancellation.
+
+        The function is called immediately if cancellation was already requested.
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Remove a function added with :meth:`add_callback`."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+@contextmanager
+def cancel_on(token: CancellationToken | None, call: grpc.Future) -> Iterator[grpc.Future]:
+    """Cancel a gRPC call when a token is cancelled while the context is active.
+
+    Parameters
+    ----------
+    token: CancellationToken, None
+        Token to observe. If ``None``, the call is returned unchanged.
+    call: grpc.Future
+        Call returned by a gRPC stub method.
+    """
+    if token is None:
+        yield call
+        return
+    token.add_callback(call.cancel)
+    try:
+        yield call
+    finally:
+        token.remove_callback(call.cancel)
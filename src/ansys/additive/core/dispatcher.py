@@ -0,0 +1,448 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Distributes simulations over a set of Additive servers."""
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+import functools
+import queue
+import threading
+import time
+
+from ansys.additive.core.cancellation import CancellationToken
+from ansys.additive.core.microstructure import MicrostructureInput, MicrostructureSummary
+from ansys.additive.core.porosity import PorosityInput, PorositySummary
+from ansys.additive.core.retry import HealthMonitor, RetryPolicy
+from ansys.additive.core.server_connection import AsyncServerConnection, ServerConnection
+from ansys.additive.core.simulation import SimulationCancelled, SimulationError, SimulationType
+from ansys.additive.core.single_bead import SingleBeadInput, SingleBeadSummary
+from ansys.additive.core.thermal_history import ThermalHistoryInput, ThermalHistorySummary
+
+
+def expected_duration(
+    input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
+) -> tuple[int, float]:
+    """Estimate the relative duration of a simulation from its input.
+
+    Sizes of different simulation types are not comparable, so the estimate
+    ranks the simulation type first and the simulated size second. Thermal history
+    simulations rank highest, followed by microstructure, porosity, and single bead
+    simulations. Within a type, larger values of ``bead_length``, ``size_x * size_y * size_z``
+    or ``sample_size_x * sample_size_y * sample_size_z`` rank higher.
+
+    Parameters
+    ----------
+    input: SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput
+        Simulation input.
+
+    Returns
+    -------
+    tuple[int, float]
+        Sort key where larger values mean a longer expected duration.
+    """
+    if isinstance(input, ThermalHistoryInput):
+        return (3, 0.0)
+    if isinstance(input, MicrostructureInput):
+        return (2, input.sample_size_x * input.sample_size_y * input.sample_size_z)
+    if isinstance(input, PorosityInput):
+        return (1, input.size_x * input.size_y * input.size_z)
+    if isinstance(input, SingleBeadInput):
+        return (0, input.bead_length)
+    return (-1, 0.0)
+
+
+def sort_longest_first(
+    inputs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+) -> list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput]:
+    """Sort simulation inputs by decreasing expected duration.
+
+    Inputs with the same expected duration keep their original order.
+
+    Parameters
+    ----------
+    inputs: list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+        Simulation inputs.
+
+    Returns
+    -------
+    list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+        Sorted copy of ``inputs``.
+    """
+    return sorted(inputs, key=expected_duration, reverse=True)
+
+
+def simulation_type(
+    input: SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput,
+) -> str:
+    """Return the :class:`SimulationType` value of a simulation input."""
+    if isinstance(input, ThermalHistoryInput):
+        return SimulationType.THERMAL_HISTORY
+    if isinstance(input, MicrostructureInput):
+        return SimulationType.MICROSTRUCTURE
+    if isinstance(input, PorosityInput):
+        return SimulationType.POROSITY
+    return SimulationType.SINGLE_BEAD
+
+
+def max_slots(server: ServerConnection | AsyncServerConnection) -> int:
+    """Return the largest number of simulations that may run on a server at once."""
+    return max(
+        server.concurrency_limit(sim_type)
+        for sim_type in [
+            SimulationType.SINGLE_BEAD,
+            SimulationType.POROSITY,
+            SimulationType.MICROSTRUCTURE,
+            SimulationType.THERMAL_HISTORY,
+        ]
+    )
+
+
+def take_job(
+    jobs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+    server: ServerConnection | AsyncServerConnection,
+    in_progress: int,
+    eligible: Callable[..., bool] | None = None,
+) -> SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput | None:
+    """Remove and return the first job that a server may start.
+
+    Parameters
+    ----------
+    jobs: list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+        Queued simulation inputs.
+    server: ServerConnection, AsyncServerConnection
+        Server to start the job on.
+    in_progress: int
+        Number of simulations in progress on the server.
+    eligible: Callable, None
+        Function that is called with a queued input and returns whether the server
+        may start it. If ``None``, all queued inputs are eligible.
+
+    Returns
+    -------
+    SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput, None
+        Input of the job to start, or ``None`` if the concurrency limits of the server do
+        not allow any of the queued jobs to start.
+    """
+    for i, input in enumerate(jobs):
+        if in_progress < server.concurrency_limit(simulation_type(input)) and (
+            eligible is None or eligible(input)
+        ):
+            return jobs.pop(i)
+    return None
+
+
+class SimulationDispatcher:
+    """Runs simulations on a set of servers from a shared queue.
+
+    Each server takes the next input from the queue as soon as one of its simulation
+    slots frees up, so a server that draws long simulations does not hold up the
+    remaining inputs while other servers are idle. The number of slots of a server
+    is given by its ``max_concurrency`` and ``max_concurrency_by_type`` values.
+
+    If a retry policy is given, a simulation that fails with a retryable gRPC error
+    is put back in the queue after the backoff delay of the policy. The retry is
+    started on a server that has not failed the simulation yet if one is available.
+    Servers that keep failing are ejected by the health monitor and take no
+    simulations while other servers remain in rotation.
+
+    Servers may be added or removed while simulations run. A removed server
+    finishes the simulations it has started and takes no new ones.
+
+    Parameters
+    ----------
+    servers: list[ServerConnection]
+        Servers to run simulations on.
+    simulate: Callable
+        Function that runs one simulation. It is called with ``input`` and ``server``
+        keyword arguments and returns the simulation summary. Errors that may be
+        retried must be raised rather than returned as a :class:`SimulationError`.
+    retry_policy: RetryPolicy, None
+        Policy for retrying simulations that fail with a transient error. If ``None``,
+        simulations are not retried.
+    health: HealthMonitor, None
+        Monitor of failing servers. Share a monitor between dispatchers to keep servers
+        ejected across batches. If ``None`` and a retry policy is given, a new monitor
+        is created.
+    """
+
+    def __init__(
+        self,
+        servers: list[ServerConnection],
+        simulate: Callable[
+            ...,
+            SingleBeadSummary
+            | PorositySummary
+            | MicrostructureSummary
+            | ThermalHistorySummary
+            | SimulationError,
+        ],
+        retry_policy: RetryPolicy | None = None,
+        health: HealthMonitor | None = None,
+    ):
+        """Initialize the dispatcher."""
+        self._servers = list(servers)
+        self._simulate = simulate
+        self._lock = threading.Lock()
+        # Job queue, condition and worker launcher of each run in progress
+        self._runs = []
+        self._retry_policy = retry_policy
+        if retry_policy and health is None:
+            health = HealthMonitor(retry_policy)
+        self._health = health
+
+    @property
+    def pending(self) -> int:
+        """Number of queued simulations that have not started yet."""
+        with self._lock:
+            return sum(len(jobs) for jobs, _, _ in self._runs)
+
+    def add_server(self, server: ServerConnection) -> None:
+        """Add a server that takes simulations from the queue.
+
+        Parameters
+        ----------
+        server: ServerConnection
+            Server to add. Runs in progress start using the server immediately.
+        """
+        with self._lock:
+            if server in self._servers:
+                return
+            self._servers.append(server)
+            runs = list(self._runs)
+        for _, _, start_workers in runs:
+            start_workers(server)
+
+    def remove_server(self, server: ServerConnection) -> None:
+        """Stop starting simulations on a server.
+
+        Simulations in progress on the server are allowed to finish.
+
+        Parameters
+        ----------
+        server: ServerConnection
+            Server to remove.
+        """
+        with self._lock:
+            if server not in self._servers:
+                return
+            self._servers.remove(server)
+        self._notify_runs()
+
+    def _notify_runs(self) -> None:
+        """Wake up the workers of the runs in progress to check for jobs again."""
+        with self._lock:
+            runs = list(self._runs)
+        for _, changed, _ in runs:
+            with changed:
+                changed.notify_all()
+
+    def run(
+        self,
+        inputs: list[SingleBeadInput | PorosityInput | MicrostructureInput | ThermalHistoryInput],
+        longest_first: bool = False,
+        cancellation: CancellationToken | None = None,
+        on_start: Callable[[object], None] | None = None,
+    ) -> Iterator[
+        SingleBeadSummary
+        | PorositySummary
+        | MicrostructureSummary
+        | ThermalHistorySummary
+        | SimulationError
+    ]:
+        """Run simulations and yield each summary as soon as it is available.
+
+        If the consumer stops iterating early, or an exception is raised, no new
+        simulations are started. The simulations already in progress are allowed
+        to finish in the background, and the run returns without waiting for them.
+
+        If the cancellation token is cancelled, a :class:`SimulationCancelled` result
+        is yielded for each queued simulation right away. Cancelling the simulations
+        in progress is up to the ``simulate`` function.
+
+        Parameters
+        ----------
+        inputs: list[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput]
+            Parameters to use for simulations.
+        longest_first: bool, default: False
+            Whether to start the simulations with the longest expected duration first.
+            See :func:`expected_duration`.
+        cancellation: CancellationToken, None
+            Token to cancel the queued simulations with.
+        on_start: Callable, None
+            Function called with the input of each simulation when a server starts
+            it. Retried simulations are passed again. The function is called from
+            a worker thread, so it must be thread safe.
+
+        Yields
+        ------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, ThermalHistorySummary, SimulationError
+            Summary of each simulation in completion order.
+        """
+        jobs = sort_longest_first(inputs) if longest_first else list(inputs)
+        results = queue.Queue()
+        stop = False
+        changed = threading.Condition()
+        in_progress = {}
+        # Number of inputs without a final result. Failed simulations may be
+        # requeued until then, so workers keep waiting for jobs.
+        unfinished = len(jobs)
+        # Retry state of failed jobs keyed by the id of the input object
+        attempts = {}
+        failed_on = {}
+        not_before = {}
+
+        def in_rotation(server: ServerConnection) -> bool:
+            return self._health is None or not self._health.is_ejected(server)
+
+        def eligible(server: ServerConnection, input) -> bool:
+            key = id(input)
+            servers = list(self._servers)
+            if key not in attempts:
+                return in_rotation(server) or not any(map(in_rotation, servers))
+            if time.monotonic() < not_before[key]:
+                return False
+            preferred = [s for s in servers if in_rotation(s) and id(s) not in failed_on[key]]
+            if preferred:
+                return server in preferred
+            return in_rotation(server) or not any(map(in_rotation, servers))
+
+        def next_job(server: ServerConnection):
+            with changed:
+                while not stop and unfinished and server in self._servers:
+                    input = take_job(
+                        jobs,
+                        server,
+                        in_progress[id(server)],
+                        functools.partial(eligible, server) if self._retry_policy else None,
+                    )
+                    if input is not None:
+                        in_progress[id(server)] += 1
+                        return input
+                    # Wake up when the backoff delay of a queued retry expires.
+                    now = time.monotonic()
+                    delays = [
+                        not_before[id(job)] - now
+                        for job in jobs
+                        if not_before.get(id(job), now) > now
+                    ]
+                    changed.wait(min(delays) if delays else None)
+                return None
+
+        def retry(server: ServerConnection, input) -> bool:
+            key = id(input)
+            self._health.record_failure(server)
+            with changed:
+                if cancellation and cancellation.cancelled:
+                    return False
+                attempts[key] = attempts.get(key, 1)
+                if attempts[key] >= self._retry_policy.max_attempts:
+                    return False
+                failed_on.setdefault(key, set()).add(id(server))
+                not_before[key] = time.monotonic() + self._retry_policy.backoff(attempts[key])
+                attempts[key] += 1
+                jobs.insert(0, input)
+            return True
+
+        def worker(server: ServerConnection):
+            nonlocal unfinished
+            while (input := next_job(server)) is not None:
+                start = time.monotonic()
+                started = False
+                error = True
+                retried = False
+                try:
+                    if on_start:
+                        on_start(input)
+                    server._simulation_started()
+                    started = True
+                    summary = self._simulate(input=input, server=server)
+                    error = isinstance(summary, SimulationError)
+                    if self._health:
+                        self._health.record_success(server)
+                    results.put(summary)
+                except Exception as e:
+                    if started and self._retry_policy and self._retry_policy.is_retryable(e):
+                        retried = retry(server, input)
+                        if not retried and cancellation and cancellation.cancelled:
+                            results.put(SimulationCancelled(input))
+                        elif not retried:
+                            results.put(SimulationError(input, str(e)))
+                    else:
+                        results.put(e)
+                finally:
+                    if started:
+                        server._simulation_finished(time.monotonic() - start, error)
+                    with changed:
+                        in_progress[id(server)] -= 1
+                        if not retried:
+                            unfinished -= 1
+                        changed.notify_all()
+
+        def start_workers(server: ServerConnection):
+            with changed:
+                if stop:
+                    return
+                in_progress.setdefault(id(server), 0)
+                for _ in range(max_slots(server)):
+                    threading.Thread(target=worker, args=(server,), daemon=True).start()
+
+        def readmitted(server: ServerConnection):
+            # Workers waiting for an eligible server must see re-admitted servers.
+            with changed:
+                changed.notify_all()
+
+        def drain():
+            nonlocal unfinished
+            with changed:
+                for input in jobs:
+                    results.put(SimulationCancelled(input))
+                unfinished -= len(jobs)
+                jobs.clear()
+                changed.notify_all()
+
+        with self._lock:
+            self._runs.append((jobs, changed, start_workers))
+            servers = list(self._servers)
+        if cancellation:
+            cancellation.add_callback(drain)
+        if self._health:
+            self._health.add_callback(readmitted)
+        for server in servers:
+            start_workers(server)
+        try:
+            for _ in range(len(inputs)):
+                result = results.get()
+                if isinstance(result, Exception):
+                    raise result
+                yield result
+        finally:
+            if cancellation:
+                cancellation.remove_callback(drain)
+            if self._health:
+                self._health.remove_callback(readmitted)
+            with self._lock:
+                self._runs = [run for run in self._runs if run[0] is not jobs]
+            # Workers finish the simulations in progress and then exit, without
+            # the consumer waiting for them.
+            with changed:
+                stop = True
+                changed.notify_all()
@@ -20,8 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+"""Provides functions for downloading files from the server."""
+from __future__ import annotations
+
+import asyncio
 import hashlib
+import io
 import os
+import queue
+import struct
+import tempfile
+import threading
+from typing import BinaryIO
+import zipfile
+import zlib
 
 from ansys.api.additive.v0.additive_simulation_pb2 import DownloadFileRequest
 from ansys.api.additive.v0.additive_simulation_pb2_grpc import SimulationServiceStub
@@ -52,26 +64,532 @@ def download_file(
         Local path of downloaded file.
     """
 
-    if not os.path.isdir(local_folder):
-        os.makedirs(local_folder)
-
-    dest = os.path.join(local_folder, os.path.basename(remote_file_name))
+    dest = _prepare_destination(remote_file_name, local_folder)
     request = DownloadFileRequest(remote_file_name=remote_file_name)
 
     with open(dest, "wb") as f:
         for response in stub.DownloadFile(request):
-            if logger:
-                logger.log_progress(response.progress)  # pragma: no cover
-            if len(response.content) > 0:
-                md5 = hashlib.md5(response.content).hexdigest()
-                if md5 != response.content_md5:
-                    if logger:  # pragma: no cover
-                        logger.log_progress(
-                            Progress(
-                                state=ProgressState.PROGRESS_STATE_ERROR,
-                                message="Download error, MD5 sums did not match",
-                            )
-                        )
-                    raise ValueError("Download error, MD5 sums did not match")
-                f.write(response.content)
+            _write_content(f, response, logger)
+    return dest
+
+
+async def download_file_async(
+    stub: SimulationServiceStub,
+    remote_file_name: str,
+    local_folder: str,
+    logger: ProgressLogger = None,
+) -> str:
+    """Download a file from the server to the localhost using an ``asyncio`` stub.
+
+    Parameters
+    ----------
+    stub: SimulationServiceStub
+        Simulation service stub created from a :class:`grpc.aio.Channel`.
+    remote_file_name: str
+        Path to file on the server.
+    local_folder: str
+        Folder on your localhost to write your file to.
+    logger: ProgressLogger
+        Log message handler.
+
+    Returns
+    -------
+    str
+        Local path of downloaded file.
+    """
+    dest = _prepare_destination(remote_file_name, local_folder)
+    request = DownloadFileRequest(remote_file_name=remote_file_name)
+
+    with open(dest, "wb") as f:
+        async for response in stub.DownloadFile(request):
+            _write_content(f, response, logger)
     return dest
+
+
+def _prepare_destination(remote_file_name: str, local_folder: str) -> str:
+    """Create the local folder, if needed, and return the local file path."""
+    if not os.path.isdir(local_folder):
+        os.makedirs(local_folder)
+    return os.path.join(local_folder, os.path.basename(remote_file_name))
+
+
+def _write_content(f, response, logger: ProgressLogger = None):
+    """Verify and write the content of a ``DownloadFileResponse`` message."""
+    if logger:
+        logger.log_progress(response.progress)  # pragma: no cover
+    if len(response.content) > 0:
+        md5 = hashlib.md5(response.content).hexdigest()
+        if md5 != response.content_md5:
+            if logger:  # pragma: no cover
+                logger.log_progress(
+                    Progress(
+                        state=ProgressState.PROGRESS_STATE_ERROR,
+                        message="Download error, MD5 sums did not match",
+                    )
+                )
+            raise ValueError("Download error, MD5 sums did not match")
+        f.write(response.content)
+
+
+IN_MEMORY_EXTRACT_SIZE = 32 * 1024**2
+"""Size, in bytes, up to which a downloaded ZIP archive is held in memory and
+extracted once complete. Larger archives are extracted as they are received."""
+
+
+def download_and_extract(
+    stub: SimulationServiceStub,
+    remote_file_name: str,
+    local_folder: str,
+    logger: ProgressLogger = None,
+    archive: BinaryIO | None = None,
+) -> list[str]:
+    """Download a ZIP archive from the server and extract it to the localhost.
+
+    The archive is not written to disk. Small archives are held in memory until
+    they are complete, and larger ones are extracted as they are received, so
+    each extracted file is written once. The MD5 sums of the received chunks
+    are verified in a background thread.
+
+    Parameters
+    ----------
+    stub: SimulationServiceStub
+        Simulation service stub.
+    remote_file_name: str
+        Path to the ZIP archive on the server.
+    local_folder: str
+        Folder on your localhost to extract the archive to.
+    logger: ProgressLogger
+        Log message handler.
+    archive: BinaryIO, None
+        Stream to also write the downloaded archive to, for example to cache it.
+
+    Returns
+    -------
+    list[str]
+        Local paths of the extracted files. If the download fails, the files
+        extracted so far are removed.
+    """
+    request = DownloadFileRequest(remote_file_name=remote_file_name)
+    extractor = _ArchiveExtractor(local_folder, archive)
+    verifier = _ContentVerifier(logger)
+    try:
+        try:
+            for response in stub.DownloadFile(request):
+                if logger:
+                    logger.log_progress(response.progress)  # pragma: no cover
+                if len(response.content) > 0:
+                    verifier.submit(response.content, response.content_md5)
+                    extractor.write(response.content, response.total_size)
+        finally:
+            verifier.close()
+        return extractor.close()
+    finally:
+        extractor.abort()
+
+
+async def download_and_extract_async(
+    stub: SimulationServiceStub,
+    remote_file_name: str,
+    local_folder: str,
+    logger: ProgressLogger = None,
+    archive: BinaryIO | None = None,
+) -> list[str]:
+    """Download a ZIP archive from the server and extract it using an ``asyncio`` stub.
+
+    Files are written from a worker thread, so that extraction does not block
+    the event loop. For more information, see :func:`download_and_extract`.
+
+    Parameters
+    ----------
+    stub: SimulationServiceStub
+        Simulation service stub created from a :class:`grpc.aio.Channel`.
+    remote_file_name: str
+        Path to the ZIP archive on the server.
+    local_folder: str
+        Folder on your localhost to extract the archive to.
+    logger: ProgressLogger
+        Log message handler.
+    archive: BinaryIO, None
+        Stream to also write the downloaded archive to, for example to cache it.
+
+    Returns
+    -------
+    list[str]
+        Local paths of the extracted files.
+    """
+    request = DownloadFileRequest(remote_file_name=remote_file_name)
+    extractor = _ArchiveExtractor(local_folder, archive)
+    verifier = _ContentVerifier(logger)
+    try:
+        try:
+            async for response in stub.DownloadFile(request):
+                if logger:
+                    logger.log_progress(response.progress)  # pragma: no cover
+                if len(response.content) > 0:
+                    verifier.submit(response.content, response.content_md5)
+                    await asyncio.to_thread(extractor.write, response.content, response.total_size)
+        finally:
+            await asyncio.to_thread(verifier.close)
+        return await asyncio.to_thread(extractor.close)
+    finally:
+        await asyncio.to_thread(extractor.abort)
+
+
+def _md5_mismatch(logger: ProgressLogger = None) -> ValueError:
+    """Log and return the error raised when a downloaded chunk is corrupt."""
+    if logger:  # pragma: no cover
+        logger.log_progress(
+            Progress(
+                state=ProgressState.PROGRESS_STATE_ERROR,
+                message="Download error, MD5 sums did not match",
+            )
+        )
+    return ValueError("Download error, MD5 sums did not match")
+
+
+class _ContentVerifier:
+    """Verifies the MD5 sums of downloaded chunks in a background thread."""
+
+    # Number of chunks waiting to be verified before the download waits
+    _MAX_PENDING = 16
+
+    def __init__(self, logger: ProgressLogger = None):
+        self._logger = logger
+        self._chunks = queue.Queue(self._MAX_PENDING)
+        self._failed = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._verify, daemon=True)
+        self._thread.start()
+
+    def _verify(self):
+        while (chunk := self._chunks.get()) is not None:
+            content, md5 = chunk
+            if not self._failed.is_set() and hashlib.md5(content).hexdigest() != md5:
+                self._failed.set()
+
+    def submit(self, content: bytes, md5: str):
+        """Queue a chunk for verification, and raise if a chunk was corrupt."""
+        if self._failed.is_set():
+            raise _md5_mismatch(self._logger)
+        self._chunks.put((content, md5))
+
+    def close(self):
+        """Wait for the queued chunks to be verified, and raise if one was corrupt."""
+        if self._closed:
+            return
+        self._closed = True
+        self._chunks.put(None)
+        self._thread.join()
+        if self._failed.is_set():
+            raise _md5_mismatch(self._logger)
+
+
+class _ArchiveExtractor:
+    """Extracts a ZIP archive from the chunks of a download."""
+
+    def __init__(self, local_folder: str, archive: BinaryIO | None = None):
+        self._local_folder = local_folder
+        self._archive = archive
+        # Whole archive, for archives that are extracted once complete
+        self._buffer = None
+        self._stream = None
+        # Paths of the files extracted from the buffered archive
+        self._paths = []
+        self._completed = False
+
+    def write(self, content: bytes, total_size: int):
+        """Add the next chunk of the archive."""
+        if self._buffer is None and self._stream is None:
+            if total_size <= IN_MEMORY_EXTRACT_SIZE:
+                self._buffer = io.BytesIO()
+            else:
+                self._stream = _ZipStreamExtractor(self._local_folder)
+        if self._archive is not None:
+            self._archive.write(content)
+        if self._buffer is not None:
+            self._buffer.write(content)
+        else:
+            self._stream.write(content)
+
+    def close(self) -> list[str]:
+        """Finish the extraction and return the paths of the extracted files."""
+        if self._stream is not None:
+            paths = self._stream.close()
+        else:
+            os.makedirs(self._local_folder, exist_ok=True)
+            if self._buffer is None:
+                raise ValueError("Download error, the archive is empty")
+            with zipfile.ZipFile(self._buffer) as zip:
+                for member in zip.infolist():
+                    self._paths.append(zip.extract(member, self._local_folder))
+            paths = self._paths
+        self._completed = True
+        return paths
+
+    def abort(self):
+        """Close the open files and remove the files extracted so far, unless
+        the extraction completed."""
+        if self._completed:
+            return
+        if self._stream is not None:
+            self._stream.abort()
+        _remove_files(self._paths)
+
+
+def _remove_files(paths: list[str]):
+    """Remove files, skipping those that do not exist."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# ZIP record signatures and the local file header layout
+_LOCAL_FILE_HEADER = b"PK\x03\x04"
+_CENTRAL_DIRECTORY = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06")
+_DATA_DESCRIPTOR = b"PK\x07\x08"
+_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_ZIP64_EXTRA_ID = 1
+_STORED, _DEFLATED = zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED
+
+
+class _ZipStreamExtractor:
+    """Extracts the entries of a ZIP archive from its local file headers as the
+    archive is received.
+
+    Stored and deflated entries are supported, with or without data descriptors,
+    and with ZIP64 sizes. The central directory at the end of the archive is not
+    needed and is skipped. From the first entry in another layout, such as a
+    stored entry with a data descriptor, the rest of the archive is spooled to a
+    temporary file and extracted with :mod:`zipfile` once it is complete.
+    """
+
+    def __init__(self, local_folder: str):
+        self._local_folder = local_folder
+        self._data = bytearray()
+        self._paths = []
+        self._done = False
+        # Number of archive bytes received
+        self._received = 0
+        # Temporary file holding the rest of the archive at its original offset,
+        # and the offset of the first entry it holds
+        self._spool = None
+        self._spool_start = None
+        # State of the entry being extracted
+        self._file = None
+        self._remaining = None
+        self._decompressor = None
+        self._crc = 0
+        self._expected_crc = 0
+        self._zip64 = False
+        self._descriptor = False
+
+    def write(self, content: bytes):
+        """Extract the entries completed by the next chunk of the archive."""
+        if self._done:
+            return
+        self._received += len(content)
+        if self._spool is not None:
+            self._spool.write(content)
+            return
+        self._data += content
+        while self._step():
+            pass
+
+    def close(self) -> list[str]:
+        """Check that the archive was complete and return the extracted paths."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._spool is not None:
+            self._extract_spool()
+        elif not self._done:
+            raise ValueError("Download error, the archive is incomplete")
+        return self._paths
+
+    def abort(self):
+        """Close the entry being extracted and remove the extracted files."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+        _remove_files(self._paths)
+
+    def _start_spool(self, offset: int):
+        """Write the buffered data, starting with the local file header at
+        ``offset`` in the archive, to a temporary file at the same offset."""
+        self._spool = tempfile.TemporaryFile()
+        self._spool_start = offset
+        self._spool.seek(offset)
+        self._spool.write(self._data)
+        self._data.clear()
+
+    def _extract_spool(self):
+        """Extract the spooled entries with :mod:`zipfile`."""
+        spool, self._spool = self._spool, None
+        with spool:
+            try:
+                zip = zipfile.ZipFile(spool)
+            except zipfile.BadZipFile as e:
+                raise ValueError("Download error, the archive is incomplete") from e
+            with zip:
+                for member in zip.infolist():
+                    if member.header_offset < self._spool_start:
+                        continue
+                    path = zip.extract(member, self._local_folder)
+                    if not member.is_dir():
+                        self._paths.append(path)
+
+    def _step(self) -> bool:
+        """Process buffered data and return whether progress was made."""
+        if self._done:
+            return False
+        if self._file is None and self._remaining is None and not self._descriptor:
+            return self._read_header()
+        if self._decompressor is not None and self._remaining is None:
+            return self._read_until_end_of_stream()
+        if self._remaining is not None:
+            return self._read_sized_data()
+        return self._read_descriptor()
+
+    def _read_header(self) -> bool:
+        data = self._data
+        if len(data) < 4:
+            return False
+        if bytes(data[:4]) in _CENTRAL_DIRECTORY:
+            self._done = True
+            return False
+        if bytes(data[:4]) != _LOCAL_FILE_HEADER:
+            raise ValueError("Download error, the archive is not a valid ZIP file")
+        if len(data) < _HEADER.size:
+            return False
+        (
+            _,
+            _,
+            flags,
+            method,
+            _,
+            _,
+            crc,
+            compressed,
+            uncompressed,
+            name_length,
+            extra_length,
+        ) = _HEADER.unpack_from(data)
+        end = _HEADER.size + name_length + extra_length
+        if len(data) < end:
+            return False
+        name = bytes(data[_HEADER.size : _HEADER.size + name_length])
+        name = name.decode("utf-8" if flags & 0x800 else "cp437")
+        extra = bytes(data[_HEADER.size + name_length : end])
+
+        if flags & 0x1:
+            raise ValueError(f"Encrypted ZIP entries are not supported: {name}")
+        self._descriptor = bool(flags & 0x8)
+        if method not in (_STORED, _DEFLATED) or (self._descriptor and method == _STORED):
+            # The end of the entry cannot be found without the central directory.
+            self._descriptor = False
+            self._start_spool(self._received - len(data))
+            return False
+        del data[:end]
+        zip64 = self._zip64_sizes(extra, uncompressed, compressed)
+        self._zip64 = zip64 is not None
+        if zip64:
+            compressed = zip64[1]
+        self._expected_crc = crc
+        self._crc = 0
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if method == _DEFLATED else None
+        self._remaining = None if self._descriptor else compressed
+
+        path = self._target_path(name)
+        if name.endswith("/"):
+            os.makedirs(path, exist_ok=True)
+            self._remaining = None
+            self._decompressor = None
+            self._descriptor = False
+            return True
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "wb")
+        self._paths.append(path)
+        if self._remaining == 0:
+            self._finish_entry()
+        return True
+
+    @staticmethod
+    def _zip64_sizes(extra: bytes, uncompressed: int, compressed: int) -> tuple[int, int] | None:
+        """Return the uncompressed and compressed sizes of an entry with a ZIP64
+        extra field, or ``None`` if the entry has no ZIP64 extra field."""
+        offset = 0
+        while offset + 4 <= len(extra):
+            id, size = struct.unpack_from("<HH", extra, offset)
+            if id == _ZIP64_EXTRA_ID:
+                # The field holds the sizes that do not fit in the header, in order.
+                values = iter(struct.unpack_from(f"<{size // 8}Q", extra, offset + 4))
+                if uncompressed == 0xFFFFFFFF:
+                    uncompressed = next(values)
+                if compressed == 0xFFFFFFFF:
+                    compressed = next(values)
+                return uncompressed, compressed
+            offset += 4 + size
+        if compressed == 0xFFFFFFFF:
+            raise ValueError("Download error, the ZIP64 extra field is missing")
+        return None
+
+    def _target_path(self, name: str) -> str:
+        """Return the local path of an entry, keeping it inside the local folder."""
+        parts = [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+        return os.path.join(self._local_folder, *parts) + ("/" if name.endswith("/") else "")
+
+    def _write(self, content: bytes, flush: bool = False):
+        if self._decompressor is not None:
+            content = self._decompressor.decompress(content)
+            if flush:
+                content += self._decompressor.flush()
+        self._crc = zlib.crc32(content, self._crc)
+        self._file.write(content)
+
+    def _read_sized_data(self) -> bool:
+        if not self._data:
+            return False
+        size = min(self._remaining, len(self._data))
+        self._remaining -= size
+        self._write(bytes(self._data[:size]), flush=self._remaining == 0)
+        del self._data[:size]
+        if self._remaining == 0:
+            self._finish_entry()
+        return True
+
+    def _read_until_end_of_stream(self) -> bool:
+        if not self._data:
+            return False
+        content = bytes(self._data)
+        self._data.clear()
+        self._write(content)
+        if self._decompressor.eof:
+            self._data += self._decompressor.unused_data
+            self._decompressor = None
+        return True
+
+    def _read_descriptor(self) -> bool:
+        size = 20 if self._zip64 else 12
+        signed = bytes(self._data[:4]) == _DATA_DESCRIPTOR
+        if len(self._data) < size + (4 if signed else 0):
+            return False
+        if signed:
+            del self._data[:4]
+        self._expected_crc = struct.unpack_from("<I", self._data)[0]
+        del self._data[:size]
+        self._finish_entry()
+        return True
+
+    def _finish_entry(self):
+        self._file.close()
+        self._file = None
+        self._remaining = None
+        self._decompressor = None
+        self._descriptor = False
+        if self._crc != self._expected_crc:
+            raise ValueError(f"Download error, bad CRC-32 for {self._paths[-1]}")
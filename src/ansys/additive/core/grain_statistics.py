@@ -0,0 +1,247 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides statistics of the grains of microstructure simulations.
+
+The circle equivalence data of every plane of every summary is stacked into
+compact arrays, and each statistic is computed for all of them with a few
+array operations. Analyzing the microstructure simulations of a study does not
+loop over summaries or grains in Python.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike
+import pandas as pd
+
+from ansys.additive.core.microstructure import MicrostructureSummary
+
+#: Planes of the microstructure simulation results.
+PLANES = ("xy", "xz", "yz")
+
+#: Default area-weighted percentiles of the grain diameter.
+DEFAULT_PERCENTILES = (10, 50, 90)
+
+#: Default number of bins of the grain diameter histograms.
+DEFAULT_DIAMETER_BINS = 20
+
+#: Default number of bins of the grain orientation histograms.
+DEFAULT_ORIENTATION_BINS = 36
+
+
+@dataclass(frozen=True)
+class MicrostructureStatistics:
+    """Provides the grain statistics of microstructure simulations.
+
+    Statistics weight each grain by its area fraction. Diameters are in
+    micrometers and orientation angles in degrees, wrapped to ``[0, 360)``.
+
+    Parameters
+    ----------
+    data_frame: pd.DataFrame
+        Statistics of each simulation, indexed by simulation ID. For each plane
+        ``p`` in :data:`PLANES`, the columns are ``p_grain_count``, the number
+        of grains; ``p_average_grain_size``, the average grain size as given by
+        :class:`MicrostructureSummary`; and ``p_d<q>`` for each percentile ``q``,
+        the diameter below which grains cover ``q`` percent of the grain area,
+        for example ``xy_d50``. The ``xz_xy_anisotropy`` and ``yz_xy_anisotropy``
+        columns are the ratios of the average grain sizes of the XZ and YZ planes
+        to that of the XY plane.
+    diameter_bin_edges: np.ndarray
+        Edges of the bins of the diameter histograms.
+    diameter_histograms: dict[str, np.ndarray]
+        Diameter histogram of each plane. Each array has a row per simulation,
+        holding the fraction of the grain area in each bin.
+    orientation_bin_edges: np.ndarray
+        Edges of the bins of the orientation histograms.
+    orientation_histograms: dict[str, np.ndarray]
+        Orientation histogram of each plane. Each array has a row per
+        simulation, holding the fraction of the grain area in each bin.
+    """
+
+    data_frame: pd.DataFrame
+    diameter_bin_edges: np.ndarray
+    diameter_histograms: dict[str, np.ndarray]
+    orientation_bin_edges: np.ndarray
+    orientation_histograms: dict[str, np.ndarray]
+
+
+def grain_statistics(
+    summaries: MicrostructureSummary | Iterable[MicrostructureSummary],
+    percentiles: Iterable[float] = DEFAULT_PERCENTILES,
+    diameter_bins: int | ArrayLike = DEFAULT_DIAMETER_BINS,
+    orientation_bins: int = DEFAULT_ORIENTATION_BINS,
+) -> MicrostructureStatistics:
+    """Compute the grain statistics of microstructure simulations.
+
+    The statistics of all the planes of all the summaries are computed in one
+    pass.
+
+    Parameters
+    ----------
+    summaries: MicrostructureSummary, Iterable[MicrostructureSummary]
+        Summaries of the microstructure simulations.
+    percentiles: Iterable[float], default: (10, 50, 90)
+        Area-weighted percentiles of the grain diameter to compute, between
+        0 and 100.
+    diameter_bins: int, ArrayLike, default: 20
+        Number of diameter bins, evenly spaced from zero to the largest
+        diameter, or the bin edges in micrometers. Grains outside the edges are
+        not counted.
+    orientation_bins: int, default: 36
+        Number of orientation bins, evenly spaced from 0 to 360 degrees.
+
+    Returns
+    -------
+    MicrostructureStatistics
+        Grain statistics of the simulations, in the order of the summaries.
+    """
+    if isinstance(summaries, MicrostructureSummary):
+        summaries = [summaries]
+    summaries = list(summaries)
+    percentiles = np.asarray(list(percentiles), dtype=np.float64)
+    if np.any((percentiles < 0) | (percentiles > 100)):
+        raise ValueError("Percentiles must be between 0 and 100.")
+    if orientation_bins < 1:
+        raise ValueError("orientation_bins must be at least 1.")
+
+    grains = _Grains(summaries)
+    diameter_edges = _diameter_bin_edges(diameter_bins, grains.diameter)
+    orientation_edges = np.linspace(0.0, 360.0, orientation_bins + 1)
+
+    columns = {}
+    counts = grains.counts.reshape(-1, len(PLANES))
+    average = grains.weighted_sum(grains.diameter).reshape(-1, len(PLANES))
+    quantiles = grains.weighted_percentiles(grains.diameter, percentiles)
+    quantiles = quantiles.reshape(-1, len(PLANES), len(percentiles))
+    for i, plane in enumerate(PLANES):
+        columns[f"{plane}_grain_count"] = counts[:, i]
+        columns[f"{plane}_average_grain_size"] = average[:, i]
+        for j, q in enumerate(percentiles):
+            columns[f"{plane}_d{q:g}"] = quantiles[:, i, j]
+    for i, plane in enumerate(PLANES[1:], start=1):
+        columns[f"{plane}_xy_anisotropy"] = _ratio(average[:, i], average[:, 0])
+    data_frame = pd.DataFrame(
+        columns, index=pd.Index([s.input.id for s in summaries], dtype=object, name="id")
+    )
+
+    diameter = grains.histograms(grains.diameter, diameter_edges)
+    orientation = grains.histograms(np.mod(grains.orientation, 360.0), orientation_edges)
+    return MicrostructureStatistics(
+        data_frame=data_frame,
+        diameter_bin_edges=diameter_edges,
+        diameter_histograms={p: diameter[:, i] for i, p in enumerate(PLANES)},
+        orientation_bin_edges=orientation_edges,
+        orientation_histograms={p: orientation[:, i] for i, p in enumerate(PLANES)},
+    )
+
+
+class _Grains:
+    """Circle equivalence data of several planes, stacked into compact arrays.
+
+    The grains of each plane are contiguous. Planes are numbered in the order
+    of the summaries, then in the order of :data:`PLANES`.
+    """
+
+    def __init__(self, summaries: list[MicrostructureSummary]):
+        # The summaries hold the area fraction, diameter, and orientation angle
+        # of the grains of each plane as float32 arrays.
+        arrays = [s._grains[p] for s in summaries for p in PLANES]
+        self.planes = len(arrays)
+        self.counts = np.fromiter((len(a) for a in arrays), dtype=np.int64, count=self.planes)
+        # Index of the first grain of each plane, and of the end of the last one
+        self.offsets = np.concatenate(([0], np.cumsum(self.counts)))
+        self.plane = np.repeat(np.arange(self.planes, dtype=np.int32), self.counts)
+        grains = np.concatenate([np.empty((0, 3), np.float32), *arrays])
+        self.area = np.ascontiguousarray(grains[:, 0])
+        self.diameter = np.ascontiguousarray(grains[:, 1])
+        self.orientation = np.ascontiguousarray(grains[:, 2])
+        self.total_area = self.weighted_sum(np.ones_like(self.area))
+
+    def weighted_sum(self, values: np.ndarray) -> np.ndarray:
+        """Return the sum of a value over the grains of each plane, weighted by area."""
+        return np.bincount(
+            self.plane,
+            weights=values.astype(np.float64) * self.area,
+            minlength=self.planes,
+        )
+
+    def weighted_percentiles(self, values: np.ndarray, percentiles: np.ndarray) -> np.ndarray:
+        """Return area-weighted percentiles of a value for each plane.
+
+        The percentile ``q`` of a plane is the smallest value such that the
+        grains with lower or equal values cover ``q`` percent of the grain area.
+        Planes without grain area have ``NaN`` percentiles.
+        """
+        # Sort the grains of each plane by value. The planes stay contiguous.
+        order = np.lexsort((values, self.plane))
+        cumulative = np.cumsum(self.area[order], dtype=np.float64)
+        before = np.concatenate(([0.0], cumulative))[self.offsets[:-1]]
+        targets = before[:, None] + self.total_area[:, None] * (percentiles / 100)
+        indices = np.searchsorted(cumulative, targets, side="left")
+        first = self.offsets[:-1, None]
+        last = np.maximum(self.offsets[1:, None] - 1, first)
+        indices = np.clip(indices, first, last)
+        sorted_values = np.append(values[order], np.float32(np.nan))
+        result = sorted_values[indices].astype(np.float64)
+        result[self.total_area <= 0] = np.nan
+        return result
+
+    def histograms(self, values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        """Return the fraction of the grain area in each bin for each plane.
+
+        The result has a row per summary, a column per plane, and the bins on
+        its last axis.
+        """
+        bins = len(edges) - 1
+        index = np.searchsorted(edges, values, side="right") - 1
+        # Values equal to the last edge belong to the last bin.
+        index[values == edges[-1]] = bins - 1
+        inside = (index >= 0) & (index < bins)
+        area = np.bincount(
+            self.plane[inside].astype(np.int64) * bins + index[inside],
+            weights=self.area[inside],
+            minlength=self.planes * bins,
+        ).reshape(self.planes, bins)
+        return _ratio(area, self.total_area[:, None]).reshape(-1, len(PLANES), bins)
+
+
+def _diameter_bin_edges(bins: int | ArrayLike, diameters: np.ndarray) -> np.ndarray:
+    """Return the edges of the diameter histogram bins."""
+    if np.ndim(bins) == 0:
+        if bins < 1:
+            raise ValueError("diameter_bins must be at least 1.")
+        largest = float(diameters.max()) if len(diameters) else 0.0
+        return np.linspace(0.0, largest if largest > 0 else 1.0, int(bins) + 1)
+    edges = np.asarray(bins, dtype=np.float64)
+    if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) <= 0):
+        raise ValueError("diameter_bins edges must be increasing.")
+    return edges
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Divide arrays, with ``NaN`` where the denominator is zero."""
+    result = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
@@ -20,7 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import math
+import itertools
+import operator
 import os
 
 from ansys.api.additive.v0.additive_domain_pb2 import (
@@ -501,7 +502,14 @@ class CircleEquivalenceColumnNames:
 
 
 class MicrostructureSummary:
-    """Provides the summary of a microstructure simulation."""
+    """Provides the summary of a microstructure simulation.
+
+    The VTK files of the grain structure are written to ``user_data_path`` when
+    one of the :attr:`xy_vtk`, :attr:`xz_vtk`, or :attr:`yz_vtk` properties is
+    first read or when the :meth:`save` method is called. Until then, the VTK
+    data is held in memory, so a summary whose grain statistics only are used
+    does not write files.
+    """
 
     def __init__(
         self, input: MicrostructureInput, result: MicrostructureResult, user_data_path: str
@@ -515,27 +523,16 @@ class MicrostructureSummary:
             raise ValueError("Invalid user data path passed to init, " + self.__class__.__name__)
         self._input = input
         self._output_path = os.path.join(user_data_path, input.id)
-        if not os.path.exists(self._output_path):
-            os.makedirs(self._output_path)
         self._xy_vtk = os.path.join(self._output_path, "xy.vtk")
-        with open(self._xy_vtk, "wb") as xy_vtk:
-            xy_vtk.write(result.xy_vtk)
         self._xz_vtk = os.path.join(self._output_path, "xz.vtk")
-        with open(self._xz_vtk, "wb") as xz_vtk:
-            xz_vtk.write(result.xz_vtk)
         self._yz_vtk = os.path.join(self._output_path, "yz.vtk")
-        with open(self._yz_vtk, "wb") as yz_vtk:
-            yz_vtk.write(result.yz_vtk)
 
-        self._xy_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(
-            result.xy_circle_equivalence
-        )
-        self._xz_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(
-            result.xz_circle_equivalence
-        )
-        self._yz_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(
-            result.yz_circle_equivalence
-        )
+        xy_values = MicrostructureSummary._grain_values(result.xy_circle_equivalence)
+        xz_values = MicrostructureSummary._grain_values(result.xz_circle_equivalence)
+        yz_values = MicrostructureSummary._grain_values(result.yz_circle_equivalence)
+        self._xy_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(xy_values)
+        self._xz_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(xz_values)
+        self._yz_circle_equivalence = MicrostructureSummary._circle_equivalence_frame(yz_values)
         self._xy_average_grain_size = MicrostructureSummary._average_grain_size(
             self._xy_circle_equivalence
         )
@@ -545,6 +542,19 @@ class MicrostructureSummary:
         self._yz_average_grain_size = MicrostructureSummary._average_grain_size(
             self._yz_circle_equivalence
         )
+        # VTK data that is not written yet, by file path. A None value means
+        # the data was discarded.
+        self._vtk_data = {
+            self._xy_vtk: result.xy_vtk,
+            self._xz_vtk: result.xz_vtk,
+            self._yz_vtk: result.yz_vtk,
+        }
+        # Area fraction, diameter (µm), and orientation angle (degrees) of the
+        # grains of each plane, as compact arrays for the grain_statistics module
+        self._grains = {
+            plane: np.column_stack((v[:, 1], v[:, 2], np.degrees(v[:, 3]))).astype(np.float32)
+            for plane, v in (("xy", xy_values), ("xz", xz_values), ("yz", yz_values))
+        }
 
     @property
     def input(self):
@@ -557,20 +567,64 @@ class MicrostructureSummary:
     @property
     def xy_vtk(self) -> str:
         """Path to the VTK file containing the 2-D grain structure data in the
-        XY plane."""
-        return self._xy_vtk
+        XY plane.
+
+        The file is written when this property is first read.
+        """
+        return self._write_vtk(self._xy_vtk)
 
     @property
     def xz_vtk(self) -> str:
         """Path to the VTK file containing the 2-D grain structure data in the
-        XZ plane."""
-        return self._xz_vtk
+        XZ plane.
+
+        The file is written when this property is first read.
+        """
+        return self._write_vtk(self._xz_vtk)
 
     @property
     def yz_vtk(self) -> str:
         """Path to the VTK file containing the 2-D grain structure data in the
-        YZ plane."""
-        return self._yz_vtk
+        YZ plane.
+
+        The file is written when this property is first read.
+        """
+        return self._write_vtk(self._yz_vtk)
+
+    def save(self) -> str:
+        """Write the VTK files of the simulation.
+
+        Returns
+        -------
+        str
+            Folder containing the ``xy.vtk``, ``xz.vtk``, and ``yz.vtk`` files.
+        """
+        for path in (self._xy_vtk, self._xz_vtk, self._yz_vtk):
+            self._write_vtk(path)
+        return self._output_path
+
+    def discard_vtk(self):
+        """Release the VTK data that has not been written to files.
+
+        VTK files that were already written are kept. Reading the path of a VTK
+        file that was not written raises an exception.
+        """
+        self._vtk_data = dict.fromkeys(self._vtk_data)
+
+    def _write_vtk(self, path: str) -> str:
+        """Write a VTK file if it is not written yet, and return its path."""
+        if path in self._vtk_data:
+            data = self._vtk_data[path]
+            if data is None:
+                raise ValueError(
+                    f"The VTK data of simulation {self._input.id} was discarded before "
+                    "it was written."
+                )
+            os.makedirs(self._output_path, exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(data)
+            self._vtk_data.pop(path, None)
+        return path
 
     @property
     def xy_circle_equivalence(self) -> pd.DataFrame:
@@ -611,16 +665,41 @@ class MicrostructureSummary:
         """Average grain size (µm) for the YZ plane."""
         return self._yz_average_grain_size
 
+    # Fields of a GrainStatistics message, in circle equivalence column order
+    _GRAIN_FIELDS = operator.attrgetter(
+        "grain_number", "area_fraction", "diameter_um", "orientation_angle"
+    )
+
     @staticmethod
-    def _circle_equivalence_frame(src: RepeatedCompositeFieldContainer) -> pd.DataFrame:
-        d = {}
-        d[CircleEquivalenceColumnNames.GRAIN_NUMBER] = np.asarray([x.grain_number for x in src])
-        d[CircleEquivalenceColumnNames.AREA_FRACTION] = np.asarray([x.area_fraction for x in src])
-        d[CircleEquivalenceColumnNames.DIAMETER] = np.asarray([x.diameter_um for x in src])
-        d[CircleEquivalenceColumnNames.ORIENTATION_ANGLE] = np.asarray(
-            [math.degrees(x.orientation_angle) for x in src]
+    def _grain_values(src: RepeatedCompositeFieldContainer) -> np.ndarray:
+        """Read the grain statistics of a plane into an array with a row per grain.
+
+        The fields of all the grains are read in one pass. The columns are the
+        grain number, area fraction, diameter, and orientation angle in radians.
+        """
+        return np.fromiter(
+            itertools.chain.from_iterable(map(MicrostructureSummary._GRAIN_FIELDS, src)),
+            dtype=np.float64,
+            count=4 * len(src),
+        ).reshape(-1, 4)
+
+    @staticmethod
+    def _circle_equivalence_frame(values: np.ndarray) -> pd.DataFrame:
+        """Create the circle equivalence data frame of a plane.
+
+        Grain numbers are stored as ``int32`` values, and area fractions and
+        diameters as ``float32`` values, which hold the single precision values
+        of the message exactly. Orientation angles are converted to degrees and
+        stored as ``float64`` values.
+        """
+        return pd.DataFrame(
+            {
+                CircleEquivalenceColumnNames.GRAIN_NUMBER: values[:, 0].astype(np.int32),
+                CircleEquivalenceColumnNames.AREA_FRACTION: values[:, 1].astype(np.float32),
+                CircleEquivalenceColumnNames.DIAMETER: values[:, 2].astype(np.float32),
+                CircleEquivalenceColumnNames.ORIENTATION_ANGLE: np.degrees(values[:, 3]),
+            }
         )
-        return pd.DataFrame(d)
 
     @staticmethod
     def _average_grain_size(df: pd.DataFrame) -> float:
@@ -638,12 +717,14 @@ class MicrostructureSummary:
         """
 
         return (
-            df[CircleEquivalenceColumnNames.DIAMETER]
-            * df[CircleEquivalenceColumnNames.AREA_FRACTION]
+            df[CircleEquivalenceColumnNames.DIAMETER].to_numpy(np.float64)
+            * df[CircleEquivalenceColumnNames.AREA_FRACTION].to_numpy(np.float64)
         ).sum()
 
     def __repr__(self):
         repr = type(self).__name__ + "\n"
         for k in self.__dict__:
+            if k in ("_vtk_data", "_grains"):
+                continue
             repr += k.replace("_", "", 1) + ": " + str(getattr(self, k)) + "\n"
         return repr
@@ -22,6 +22,7 @@
 
 from ansys.additive.core.parametric_study.constants import (
     DEFAULT_ITERATION,
+    DEFAULT_LEASE,
     DEFAULT_PRIORITY,
     FORMAT_VERSION,
     ColumnNames,
@@ -29,3 +30,4 @@ from ansys.additive.core.parametric_study.constants import (
 from ansys.additive.core.parametric_study.parametric_runner import ParametricRunner
 from ansys.additive.core.parametric_study.parametric_study import ParametricStudy
 from ansys.additive.core.parametric_study.parametric_utils import build_rate, energy_density
+from ansys.additive.core.parametric_study.study_run import StudyRun, StudyRunProgress
@@ -119,6 +119,11 @@ class ColumnNames:
     """Average microstructure grain size in the YZ plane (µm)."""
     ERROR_MESSAGE = "Error Message"
     """Error message if simulation failed."""
+    LEASE_EXPIRATION = "Lease Expiration"
+    """Time, in seconds since the epoch, until which a running simulation is reserved
+    by the process running it."""
+    ELAPSED_TIME = "Elapsed Time (s)"
+    """Time from the start of the simulation until its result was received (s)."""
 
 
 DEFAULT_ITERATION = 0
@@ -127,3 +132,6 @@ DEFAULT_PRIORITY = 1
 """Default priority assigned to new simulations."""
 FORMAT_VERSION = 1
 """Parametric study file format version."""
+DEFAULT_LEASE = 300.0
+"""Default time, in seconds, that running simulations are reserved for a run
+between renewals of their lease."""
@@ -111,6 +111,7 @@ def __init_controls(df: pd.DataFrame) -> tuple[pn.widgets.MultiSelect, ...]:
     ]
     status_options = [
         SimulationStatus.PENDING,
+        SimulationStatus.RUNNING,
         SimulationStatus.COMPLETED,
         SimulationStatus.SKIP,
         SimulationStatus.ERROR,
@@ -22,6 +22,8 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
+
 import numpy as np
 import pandas as pd
 
@@ -34,6 +36,7 @@ from ansys.additive.core import (
     MicrostructureSummary,
     PorosityInput,
     PorositySummary,
+    SimulationError,
     SimulationStatus,
     SimulationType,
     SingleBeadInput,
@@ -73,6 +76,60 @@ class ParametricRunner:
         list[SingleBeadSummary, PorositySummary, MicrostructureSummary]
             List of simulation summaries.
         """
+        inputs = ParametricRunner._create_inputs(df, additive, type, priority)
+        return additive.simulate(inputs)
+
+    @staticmethod
+    def simulate_iter(
+        df: pd.DataFrame,
+        additive: Additive,
+        type: list[SimulationType] = None,
+        priority: int = None,
+        cancellation: CancellationToken = None,
+        on_start: Callable[[object], None] = None,
+    ) -> Iterator[SingleBeadSummary | PorositySummary | MicrostructureSummary | SimulationError]:
+        """Run the simulations in the parametric study with ``Status`` equal to ``Pending``
+        and yield each summary as soon as its simulation completes.
+
+        Simulations are submitted in the same order as the :meth:`simulate` method, but
+        summaries are yielded in completion order.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Parametric study data frame.
+        additive : Additive
+            Additive service connection to use for running simulations.
+        type : list, default: None
+            List of the simulation types to run. The default is ``None``, in which case all
+            simulation types are run.
+        priority : int, default: None
+            Priority of simulations to run. The default is ``None``, in which case
+            all priorities are run.
+        cancellation : CancellationToken, default: None
+            Token to cancel the simulations with.
+        on_start : Callable, default: None
+            Function called from a worker thread with the input of each simulation
+            when it starts.
+
+        Yields
+        ------
+        SingleBeadSummary, PorositySummary, MicrostructureSummary, SimulationError
+            Summary of each simulation as it completes.
+        """
+        inputs = ParametricRunner._create_inputs(df, additive, type, priority)
+        if not inputs:
+            return
+        yield from additive.simulate_iter(inputs, cancellation=cancellation, on_start=on_start)
+
+    @staticmethod
+    def _pending(
+        df: pd.DataFrame,
+        type: list[SimulationType] = None,
+        priority: int = None,
+    ) -> pd.DataFrame:
+        """Return the pending simulations of the given types and priority in a
+        parametric study data frame, sorted by priority."""
         if type is None:
             type = [
                 SimulationType.SINGLE_BEAD,
@@ -87,15 +144,28 @@ class ParametricRunner:
         ]
         if priority is not None:
             view = view[view[ColumnNames.PRIORITY] == priority]
-        view = view.sort_values(by=ColumnNames.PRIORITY, ascending=True)
+        return view.sort_values(by=ColumnNames.PRIORITY, ascending=True)
+
+    @staticmethod
+    def _create_inputs(
+        df: pd.DataFrame,
+        additive: Additive,
+        type: list[SimulationType] = None,
+        priority: int = None,
+    ) -> list[SingleBeadInput | PorosityInput | MicrostructureInput]:
+        """Create simulation inputs for the pending simulations in a parametric study
+        data frame, sorted by priority."""
+        view = ParametricRunner._pending(df, type, priority)
+
+        # Retrieve each distinct material once instead of once per row.
+        materials = additive.prefetch_materials(view[ColumnNames.MATERIAL].unique().tolist())
 
         inputs = []
         # NOTICE: We use iterrows() instead of itertuples() here to
         # access values by column name
         for _, row in view.iterrows():
-            try:
-                material = additive.material(row[ColumnNames.MATERIAL])
-            except Exception:
+            material = materials.get(row[ColumnNames.MATERIAL])
+            if material is None:
                 print(
                     f"Material {row[ColumnNames.MATERIAL]} not found, skipping {row[ColumnNames.ID]}"
                 )
@@ -114,11 +184,7 @@ class ParametricRunner:
                 )
                 continue
 
-        summaries = additive.simulate(inputs)
-
-        # TODO: Return the summaries one at a time, possibly as an iterator,
-        # so that the data frame can be updated as each simulation completes.
-        return summaries
+        return inputs
 
     @staticmethod
     def _create_machine(row: pd.Series) -> AdditiveMachine:
@@ -207,7 +273,7 @@ class ParametricRunner:
             melt_pool_depth=row[ColumnNames.MICRO_MELT_POOL_DEPTH]
             if not np.isnan(row[ColumnNames.MICRO_MELT_POOL_DEPTH])
             else MicrostructureInput.DEFAULT_MELT_POOL_DEPTH,
-            random_seed=row[ColumnNames.RANDOM_SEED]
-            if not np.isnan(row[ColumnNames.RANDOM_SEED])
+            random_seed=int(row[ColumnNames.RANDOM_SEED])
+            if not pd.isna(row[ColumnNames.RANDOM_SEED])
             else MicrostructureInput.DEFAULT_RANDOM_SEED,
         )
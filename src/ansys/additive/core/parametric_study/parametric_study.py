@@ -22,12 +22,17 @@
 
 from __future__ import annotations
 
+import atexit
+from contextlib import contextmanager
 from functools import wraps
 import os
 import pathlib
-import platform
+import socket
+import threading
+import time
+from typing import Callable, Iterable, Iterator
+import weakref
 
-import dill
 import numpy as np
 import pandas as pd
 
@@ -35,12 +40,14 @@ from ansys.additive.core import (
     Additive,
     AdditiveMachine,
     AdditiveMaterial,
+    CancellationToken,
     MachineConstants,
     MeltPoolColumnNames,
     MicrostructureInput,
     MicrostructureSummary,
     PorosityInput,
     PorositySummary,
+    SimulationCancelled,
     SimulationError,
     SimulationStatus,
     SimulationType,
@@ -49,18 +56,122 @@ from ansys.additive.core import (
 )
 import ansys.additive.core.misc as misc
 
-from .constants import DEFAULT_ITERATION, DEFAULT_PRIORITY, FORMAT_VERSION, ColumnNames
+from . import schema
+from .constants import (
+    DEFAULT_ITERATION,
+    DEFAULT_LEASE,
+    DEFAULT_PRIORITY,
+    FORMAT_VERSION,
+    ColumnNames,
+)
 from .parametric_runner import ParametricRunner
 from .parametric_utils import build_rate, energy_density
+from .storage import STORAGE_SUFFIXES, StudyStorage, storage_for
+from .study_run import StudyRun
+
+# Attributes that are rebuilt rather than pickled when a study is saved.
+_TRANSIENT_ATTRIBUTES = (
+    "_ids",
+    "_id_index",
+    "_running_ids",
+    "_save_lock",
+    "_save_depth",
+    "_save_pending",
+    "_save_timer",
+    "_last_save",
+    "_changed_ids",
+    "_removed_ids",
+)
+
+# Studies with a postponed save, flushed when the interpreter exits.
+_pending_saves = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_pending_saves():
+    """Save the studies whose automatic save is still postponed."""
+    for study in list(_pending_saves):
+        study.flush()
+
+
+# Identifier prefix for generated permutations of each simulation type.
+_ID_PREFIXES = {
+    SimulationType.SINGLE_BEAD: "sb",
+    SimulationType.POROSITY: "por",
+    SimulationType.MICROSTRUCTURE: "micro",
+}
+
+# Name, default value, and valid range of each machine parameter, keyed by column name.
+_MACHINE_PARAMETERS = {
+    ColumnNames.LASER_POWER: (
+        "laser_power",
+        MachineConstants.DEFAULT_LASER_POWER,
+        MachineConstants.MIN_LASER_POWER,
+        MachineConstants.MAX_LASER_POWER,
+    ),
+    ColumnNames.SCAN_SPEED: (
+        "scan_speed",
+        MachineConstants.DEFAULT_SCAN_SPEED,
+        MachineConstants.MIN_SCAN_SPEED,
+        MachineConstants.MAX_SCAN_SPEED,
+    ),
+    ColumnNames.HEATER_TEMPERATURE: (
+        "heater_temperature",
+        MachineConstants.DEFAULT_HEATER_TEMP,
+        MachineConstants.MIN_HEATER_TEMP,
+        MachineConstants.MAX_HEATER_TEMP,
+    ),
+    ColumnNames.LAYER_THICKNESS: (
+        "layer_thickness",
+        MachineConstants.DEFAULT_LAYER_THICKNESS,
+        MachineConstants.MIN_LAYER_THICKNESS,
+        MachineConstants.MAX_LAYER_THICKNESS,
+    ),
+    ColumnNames.BEAM_DIAMETER: (
+        "beam_diameter",
+        MachineConstants.DEFAULT_BEAM_DIAMETER,
+        MachineConstants.MIN_BEAM_DIAMETER,
+        MachineConstants.MAX_BEAM_DIAMETER,
+    ),
+    ColumnNames.START_ANGLE: (
+        "starting_layer_angle",
+        MachineConstants.DEFAULT_STARTING_LAYER_ANGLE,
+        MachineConstants.MIN_STARTING_LAYER_ANGLE,
+        MachineConstants.MAX_STARTING_LAYER_ANGLE,
+    ),
+    ColumnNames.ROTATION_ANGLE: (
+        "layer_rotation_angle",
+        MachineConstants.DEFAULT_LAYER_ROTATION_ANGLE,
+        MachineConstants.MIN_LAYER_ROTATION_ANGLE,
+        MachineConstants.MAX_LAYER_ROTATION_ANGLE,
+    ),
+    ColumnNames.HATCH_SPACING: (
+        "hatch_spacing",
+        MachineConstants.DEFAULT_HATCH_SPACING,
+        MachineConstants.MIN_HATCH_SPACING,
+        MachineConstants.MAX_HATCH_SPACING,
+    ),
+    ColumnNames.STRIPE_WIDTH: (
+        "slicing_stripe_width",
+        MachineConstants.DEFAULT_SLICING_STRIPE_WIDTH,
+        MachineConstants.MIN_SLICING_STRIPE_WIDTH,
+        MachineConstants.MAX_SLICING_STRIPE_WIDTH,
+    ),
+}
 
 
 def save_on_return(func):
-    """Decorator to save study file upon method return."""
+    """Decorator to save study file upon method return.
+
+    The save is postponed while a :meth:`ParametricStudy.deferred_save` context
+    is active or while the study's save interval has not elapsed.
+    """
 
     @wraps(func)
     def wrap(self, *args, **kwargs):
-        func(self, *args, **kwargs)
-        self.save(self.file_name)
+        result = func(self, *args, **kwargs)
+        self._autosave()
+        return result
 
     return wrap
 
@@ -68,7 +179,14 @@ def save_on_return(func):
 class ParametricStudy:
     """Provides data storage and utility methods for a parametric study."""
 
-    def __init__(self, study_name: str, study_dir: str | os.PathLike = "."):
+    def __init__(
+        self,
+        study_name: str,
+        study_dir: str | os.PathLike = ".",
+        save_interval: float = 0,
+        file_format: str = "ps",
+        keep_vtk: bool = True,
+    ):
         """Initialize the parametric study.
 
         Parameters
@@ -77,13 +195,162 @@ class ParametricStudy:
             Name of study.
         study_dir: str, os.PathLike, default: "."
             Directory where study will be stored.
+        save_interval: float, default: 0
+            Minimum time, in seconds, between automatic saves of the study file.
+            For more information, see the :attr:`save_interval` property.
+        file_format: str, default: "ps"
+            Format of the study file. Use ``"ps"`` for a file holding the pickled
+            study object, ``"db"`` for a SQLite database that is updated
+            incrementally and can be shared by several processes, or ``"arrow"``
+            for a columnar Arrow IPC file that can be read in part with
+            :meth:`load_data_frame`.
+            A SQLite database that already holds a study is not replaced. Use
+            :meth:`load` to open it.
+        keep_vtk: bool, default: True
+            Whether the VTK files of microstructure simulations run by the study
+            are written. For more information, see the :attr:`keep_vtk` property.
         """
-        self._file_name = pathlib.Path(study_dir).absolute() / f"{study_name}.ps"
-        columns = [getattr(ColumnNames, k) for k in ColumnNames.__dict__ if not k.startswith("_")]
-        self._data_frame = pd.DataFrame(columns=columns)
+        if f".{file_format}" not in STORAGE_SUFFIXES:
+            raise ValueError(f"Unsupported file format: {file_format}")
+        self._file_name = pathlib.Path(study_dir).absolute() / f"{study_name}.{file_format}"
+        self._data_frame = schema.empty_data_frame()
+        # index of the simulation IDs in the data frame, used to allocate unique IDs
+        self._ids = set()
+        # positional index of the ID column, built on demand to look up rows by ID
+        self._id_index = None
+        # IDs of the simulations being run by this object
+        self._running_ids = set()
+        self.save_interval = save_interval
+        self.keep_vtk = keep_vtk
+        self._init_save_state()
         self.save(self.file_name)
         print(f"Saving parametric study to {self.file_name}")
 
+    def __getstate__(self) -> dict:
+        """Return the state to pickle, excluding the derived ID indexes and
+        the autosave state."""
+        state = self.__dict__.copy()
+        for key in _TRANSIENT_ATTRIBUTES:
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        """Restore the pickled state, convert the data frame columns of older
+        studies to their types, and rebuild the ID indexes."""
+        self.__dict__.update(state)
+        self._data_frame = schema.apply_schema(schema.add_missing_columns(self._data_frame))
+        self.__dict__.setdefault("_save_interval", 0)
+        self.__dict__.setdefault("_keep_vtk", True)
+        self._ids = set(self._data_frame[ColumnNames.ID])
+        self._id_index = None
+        self._running_ids = set()
+        self._init_save_state()
+
+    def _init_save_state(self):
+        """Initialize the state used to defer and debounce automatic saves."""
+        # The lock also guards the data frame while a background run writes results.
+        self._save_lock = threading.RLock()
+        self._save_depth = 0
+        self._save_pending = False
+        self._save_timer = None
+        self._last_save = float("-inf")
+        # IDs of rows changed and removed since the last save, or None if the
+        # whole study must be written
+        self._changed_ids = None
+        self._removed_ids = set()
+
+    def _mark_changed(self, ids: Iterable[str]):
+        """Record that rows must be written by the next save."""
+        if self._changed_ids is not None:
+            self._changed_ids.update(ids)
+
+    @property
+    def save_interval(self) -> float:
+        """Minimum time, in seconds, between automatic saves of the study file.
+
+        Methods that change the study save it when they return. If the previous
+        save was less than this interval ago, the save is postponed until the
+        interval has elapsed, so a burst of changes is written once. A value of
+        ``0`` saves after every change.
+        """
+        return self._save_interval
+
+    @save_interval.setter
+    def save_interval(self, value: float):
+        if value < 0:
+            raise ValueError("save_interval must not be negative.")
+        self._save_interval = value
+
+    @property
+    def keep_vtk(self) -> bool:
+        """Whether the VTK files of microstructure simulations run by the study
+        are written.
+
+        The study only records the grain statistics of microstructure simulations.
+        If this value is ``True``, the ``xy.vtk``, ``xz.vtk``, and ``yz.vtk`` files
+        of each result are written under the simulation's user data path as the
+        result is received. If this value is ``False``, the VTK data is discarded
+        instead, so no VTK file is written.
+        """
+        return self._keep_vtk
+
+    @keep_vtk.setter
+    def keep_vtk(self, value: bool):
+        self._keep_vtk = bool(value)
+
+    @contextmanager
+    def deferred_save(self) -> Iterator[ParametricStudy]:
+        """Postpone automatic saves of the study file until the context exits.
+
+        Changes made inside the context are written to the study file once,
+        when the outermost context exits. Contexts may be nested.
+        """
+        with self._save_lock:
+            self._save_depth += 1
+        try:
+            yield self
+        finally:
+            with self._save_lock:
+                self._save_depth -= 1
+                if self._save_depth == 0 and self._save_pending:
+                    self._flush()
+
+    def _autosave(self):
+        """Save the study file unless saving is deferred or debounced."""
+        with self._save_lock:
+            self._save_pending = True
+            if self._save_depth > 0:
+                return
+            wait = self._last_save + self._save_interval - time.monotonic()
+            if wait <= 0:
+                self._flush()
+            elif self._save_timer is None:
+                self._save_timer = threading.Timer(wait, self._flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                _pending_saves.add(self)
+
+    def _flush(self):
+        """Save the study file if it has unsaved changes and saving is not deferred."""
+        with self._save_lock:
+            if self._save_depth == 0:
+                self.flush()
+
+    def flush(self):
+        """Save any changes whose automatic save is postponed.
+
+        Changes are written to the study file right away, regardless of
+        :attr:`save_interval`. Postponed saves are also flushed when the
+        interpreter exits.
+        """
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            _pending_saves.discard(self)
+            if self._save_pending:
+                self.save(self.file_name)
+
     @property
     def format_version(self) -> int:
         """Version of the parametric study file format."""
@@ -97,18 +364,22 @@ class ParametricStudy:
     @file_name.setter
     def file_name(self, value: str | os.PathLike):
         self._file_name = pathlib.Path(value)
+        # the whole study is written to a new file
+        self._changed_ids = None
 
     def data_frame(self) -> pd.DataFrame:
         """Return a :class:`DataFrame <pandas.DataFrame>` representing the
         parametric study.
 
         For the column names used in the returned data frame, see
-        the :class:`ColumnNames <constants.ColumnNames>` class.
+        the :class:`ColumnNames <constants.ColumnNames>` class. For the column
+        types, see the :mod:`schema <ansys.additive.core.parametric_study.schema>` module.
 
         .. note::
            Updating the returned data frame does not update this parametric study.
         """
-        return self._data_frame.copy()
+        with self._save_lock:
+            return self._data_frame.copy()
 
     @save_on_return
     def run_simulations(
@@ -116,12 +387,37 @@ class ParametricStudy:
         additive: Additive,
         type: list[SimulationType] | None = None,
         priority: int | None = None,
-    ):
+        cancellation: CancellationToken | None = None,
+        lease: float | None = None,
+        limit: int | None = None,
+        on_start: Callable[[object], None] | None = None,
+        on_result: Callable[[object], None] | None = None,
+    ) -> int:
         """Run the simulations in the parametric study with ``Pending`` for
         their ``Status`` values. Execution order is determined by their
         ``Priority`` values. Lower values are interpreted as having
         higher priority and are run first.
 
+        The simulations of the run are marked ``Running`` and the study is saved
+        before they start. Each result is written to the study as it is received,
+        and saved according to :attr:`save_interval`, together with the time the
+        simulation took in the ``Elapsed Time (s)`` column. Simulations that do not
+        finish, for example because the run is cancelled, are returned to ``Pending``.
+
+        If the process running the simulations stops without returning them to
+        ``Pending``, running the study again resumes the unfinished simulations.
+        Running simulations hold a lease, stored in the ``Lease Expiration`` column,
+        that is renewed from a background thread every third of the lease time
+        while the run is active. The unfinished simulations of a
+        ``.ps`` or Arrow study are resumed right away, because only one process
+        can run such a study. The unfinished simulations of a SQLite study are
+        resumed once their lease expires, because another process may still be
+        running them.
+
+        If the study is stored in a SQLite database, the pending simulations are
+        claimed in the database before they run. Several processes can then run
+        the same study, and each simulation is run by only one of them.
+
         Parameters
         ----------
         additive : Additive
@@ -132,14 +428,219 @@ class ParametricStudy:
         priority : int, default: None
             Priority of simulations to run. If this value is ``None``,
             all priorities are run.
+        cancellation : CancellationToken, default: None
+            Token to stop the run with from another thread. Simulations that are
+            cancelled are returned to ``Pending``.
+        lease : float, default: None
+            Time, in seconds, that the running simulations are reserved for this
+            run without renewing their lease. If this value is ``None``,
+            :data:`DEFAULT_LEASE <constants.DEFAULT_LEASE>` is used.
+        limit : int, default: None
+            Maximum number of simulations to run, taken in priority order. If this
+            value is ``None``, all the pending simulations are run.
+        on_start : Callable, default: None
+            Function called with each simulation input, from a worker thread,
+            before the simulation starts. The simulation waits for the function
+            to return.
+        on_result : Callable, default: None
+            Function called with each summary or error once it has been written
+            to the study.
+
+        Returns
+        -------
+        int
+            Number of simulations that finished, successfully or not.
         """
-        summaries = ParametricRunner.simulate(
-            self.data_frame(),
-            additive,
-            type=type,
-            priority=priority,
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1.")
+        storage = storage_for(self.file_name)
+        df = self.data_frame()
+        # Simulations left running by a run that stopped are run again.
+        interrupted = (df[ColumnNames.STATUS] == SimulationStatus.RUNNING) & ~df[
+            ColumnNames.ID
+        ].isin(self._running_ids)
+        df.loc[interrupted, ColumnNames.STATUS] = SimulationStatus.PENDING
+        df = ParametricRunner._pending(df, type, priority)
+        if df.empty:
+            return 0
+        if lease is None:
+            lease = DEFAULT_LEASE
+        owner = None
+        if storage.SHARED:
+            # Write unsaved rows so that they can be claimed, then run only the
+            # simulations that no other process has claimed.
+            self.save(self.file_name)
+            owner = f"{socket.gethostname()}:{os.getpid()}:{misc.short_uuid()}"
+            # Another process may still be running the interrupted simulations,
+            # so they are only claimed once their lease has expired.
+            ids = df[ColumnNames.ID].tolist()
+            expiration = time.time() + lease
+            claimed = []
+            start = 0
+            # Claim in priority order until enough simulations are claimed.
+            while start < len(ids) and (limit is None or len(claimed) < limit):
+                count = len(ids) - start if limit is None else limit - len(claimed)
+                claimed.extend(storage.claim(owner, ids[start : start + count], expiration))
+                start += count
+            df = df[df[ColumnNames.ID].isin(claimed)]
+            if df.empty:
+                return 0
+        elif limit is not None:
+            df = df.head(limit)
+        run_ids = set(df[ColumnNames.ID])
+        resumed = len(run_ids.intersection(self._data_frame.loc[interrupted, ColumnNames.ID]))
+        if resumed:
+            print(f"Resuming {resumed} interrupted simulations")
+        self._running_ids.update(run_ids)
+        started = {}
+        run_start = time.monotonic()
+        heartbeat_stopped = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._renew_leases_until,
+            args=(heartbeat_stopped, storage, owner, run_ids, lease),
+            daemon=True,
         )
-        self.update(summaries)
+
+        def start(input):
+            if on_start:
+                on_start(input)
+            started.setdefault(input.id, time.monotonic())
+
+        try:
+            with self._save_lock:
+                self._renew_leases(run_ids, lease)
+                self._set_values(
+                    self._row_positions(list(run_ids)),
+                    {ColumnNames.STATUS: SimulationStatus.RUNNING},
+                )
+                self.save(self.file_name)
+            heartbeat.start()
+            for summary in ParametricRunner.simulate_iter(
+                df,
+                additive,
+                type=type,
+                priority=priority,
+                cancellation=cancellation,
+                on_start=start,
+            ):
+                id = summary.input.id
+                if isinstance(summary, MicrostructureSummary):
+                    if self._keep_vtk:
+                        summary.save()
+                    else:
+                        summary.discard_vtk()
+                with self._save_lock:
+                    if not isinstance(summary, SimulationCancelled):
+                        self._running_ids.discard(id)
+                    start_time = started.get(id)
+                    self._set_values(
+                        self._row_positions([id]),
+                        {
+                            ColumnNames.LEASE_EXPIRATION: np.nan,
+                            ColumnNames.ELAPSED_TIME: (
+                                time.monotonic() - start_time if start_time is not None else np.nan
+                            ),
+                        },
+                    )
+                    self.update([summary])
+                if on_result:
+                    on_result(summary)
+        finally:
+            heartbeat_stopped.set()
+            if heartbeat.is_alive():
+                heartbeat.join()
+            with self._save_lock:
+                # Return the simulations that did not finish to the queue.
+                unfinished = list(run_ids & self._running_ids)
+                self._running_ids.difference_update(run_ids)
+                self._set_values(
+                    self._row_positions(unfinished),
+                    {
+                        ColumnNames.STATUS: SimulationStatus.PENDING,
+                        ColumnNames.LEASE_EXPIRATION: np.nan,
+                    },
+                )
+                # Save the last results, regardless of the save interval, and
+                # release the claims in the same transaction, so that other
+                # processes can claim the unfinished simulations.
+                self._save(release=owner)
+            print(
+                f"Ran {len(run_ids) - len(unfinished)} of {len(run_ids)} simulations "
+                f"in {time.monotonic() - run_start:.1f} seconds"
+            )
+        return len(run_ids) - len(unfinished)
+
+    def run_simulations_background(
+        self,
+        additive: Additive,
+        type: list[SimulationType] | None = None,
+        priority: int | None = None,
+        lease: float | None = None,
+        limit: int | None = None,
+        on_complete: Callable[[StudyRun], None] | None = None,
+    ) -> StudyRun:
+        """Run the pending simulations of the parametric study in a background
+        thread.
+
+        This method returns immediately, so notebooks and dashboards remain
+        responsive while the simulations run. The simulations are run as with
+        :meth:`run_simulations`, and each result is written to the study as it
+        is received. Use the returned handle to follow the progress of the run,
+        pause, resume, or cancel it, and wait for it to be done.
+
+        Parameters
+        ----------
+        additive : Additive
+            Additive service connection to use for running simulations.
+        type : list[SimulationType], default: None
+            Type of simulations to run. If this value is ``None``,
+            all simulation types are run.
+        priority : int, default: None
+            Priority of simulations to run. If this value is ``None``,
+            all priorities are run.
+        lease : float, default: None
+            Time, in seconds, that the running simulations are reserved for this
+            run without renewing their lease. For more information, see
+            :meth:`run_simulations`.
+        limit : int, default: None
+            Maximum number of simulations to run. If this value is ``None``,
+            all the pending simulations are run.
+        on_complete : Callable, default: None
+            Function called with the returned handle, from the background thread,
+            when the run is done.
+
+        Returns
+        -------
+        StudyRun
+            Handle to the run.
+        """
+        return StudyRun(self, additive, type, priority, lease, limit, on_complete)
+
+    def _renew_leases(self, ids: Iterable[str], lease: float) -> float:
+        """Extend the leases of running simulations and return their expiration time."""
+        expiration = time.time() + lease
+        self._set_values(self._row_positions(list(ids)), {ColumnNames.LEASE_EXPIRATION: expiration})
+        return expiration
+
+    def _renew_leases_until(
+        self,
+        stopped: threading.Event,
+        storage: StudyStorage,
+        owner: str | None,
+        run_ids: set[str],
+        lease: float,
+    ):
+        """Renew the leases of the simulations of a run every third of the lease
+        time until the run stops, writing them straight to the study file."""
+        while not stopped.wait(lease / 3):
+            with self._save_lock:
+                ids = list(run_ids & self._running_ids)
+                expiration = self._renew_leases(ids, lease)
+            try:
+                storage.renew(owner, ids, expiration)
+            except Exception as e:
+                # Try again at the next renewal, before the lease expires.
+                print(f"Failed to renew the leases of running simulations: {e}")
 
     def save(self, file_name: str | os.PathLike):
         """Save the parametric study to a file.
@@ -147,12 +648,40 @@ class ParametricStudy:
         Parameters
         ----------
         file_name : str, os.PathLike
-            Name of the file to save the parametric study to.
+            Name of the file to save the parametric study to. The file format is
+            determined by the suffix. Files ending in ``.db``, ``.sqlite``, or
+            ``.sqlite3`` are SQLite databases. Files ending in ``.arrow`` are Arrow
+            IPC files. Other files are ``.ps`` files.
+            Saving to a file other than :attr:`file_name` exports the whole study,
+            which converts it between formats. A SQLite database that already
+            holds a study is not replaced.
         """
 
-        pathlib.Path(file_name).parent.mkdir(parents=True, exist_ok=True)
-        with open(file_name, "wb") as f:
-            dill.dump(self, f)
+        path = pathlib.Path(file_name)
+        storage = storage_for(path)
+        with self._save_lock:
+            if path.absolute() != pathlib.Path(self.file_name).absolute():
+                storage.save(self)
+                return
+            self._save()
+
+    def _save(self, release: str | None = None):
+        """Write the changes since the last save to the study file.
+
+        Parameters
+        ----------
+        release : str, None
+            Identifier of the process whose claims are released in the same
+            transaction as the save.
+        """
+        with self._save_lock:
+            storage_for(self.file_name).save(
+                self, self._changed_ids, self._removed_ids, release=release
+            )
+            self._changed_ids = set()
+            self._removed_ids = set()
+            self._save_pending = False
+            self._last_save = time.monotonic()
 
     @staticmethod
     def load(file_name) -> ParametricStudy:
@@ -161,7 +690,8 @@ class ParametricStudy:
         Parameters
         ----------
         file_name : str, os.PathLike
-            Name of file to load the parametric study from.
+            Name of file to load the parametric study from. The ``.ps``, SQLite,
+            and Arrow IPC formats are supported.
 
         Returns
         -------
@@ -171,26 +701,7 @@ class ParametricStudy:
         if not pathlib.Path(file_name).is_file():
             raise ValueError(f"{file_name} is not a valid file.")
 
-        # Hack to allow for sharing study files cross-platform.
-        temp = None
-        if platform.system() == "Windows":
-            temp = pathlib.PosixPath
-            pathlib.PosixPath = pathlib.WindowsPath
-        else:
-            temp = pathlib.WindowsPath
-            pathlib.WindowsPath = pathlib.PosixPath
-
-        try:
-            with open(file_name, "rb") as f:
-                study = dill.load(f)
-        except Exception:
-            raise
-        finally:
-            # Undo hack
-            if platform.system() == "Windows":
-                pathlib.PosixPath = temp
-            else:
-                pathlib.WindowsPath = temp
+        study = storage_for(file_name).load(ParametricStudy)
 
         if not isinstance(study, ParametricStudy):
             raise ValueError(f"{file_name} is not a parametric study.")
@@ -202,8 +713,46 @@ class ParametricStudy:
             )
 
         study.file_name = file_name
+        # The loaded study matches its file, so the next save only writes changes.
+        study._changed_ids = set()
         return study
 
+    @staticmethod
+    def load_data_frame(
+        file_name: str | os.PathLike,
+        columns: list[str] | None = None,
+        filters: dict[str, object] | None = None,
+    ) -> pd.DataFrame:
+        """Read part of a parametric study data frame from a file.
+
+        This method reads the selected rows and columns without loading the study.
+        Arrow IPC files are memory mapped, and SQLite databases select the rows
+        in the query, so only the data that is used is read. Other files are
+        loaded in full before the selection is made.
+
+        Parameters
+        ----------
+        file_name : str, os.PathLike
+            Name of the study file.
+        columns : list[str], default: None
+            Columns to read. For column names, see the :class:`ColumnNames` class.
+            If this value is ``None``, all columns are read.
+        filters : dict[str, object], default: None
+            Values to select rows by. Each key is a column name, and each value is
+            either a single value or a list of values. Rows are read if, for every
+            key, the column holds one of the values. For example,
+            ``{ColumnNames.STATUS: SimulationStatus.COMPLETED}`` reads the
+            completed simulations.
+
+        Returns
+        -------
+        pd.DataFrame
+            Selected rows and columns, in study order.
+        """
+        if not pathlib.Path(file_name).is_file():
+            raise ValueError(f"{file_name} is not a valid file.")
+        return storage_for(file_name).read_data_frame(columns, filters)
+
     @save_on_return
     def add_summaries(
         self,
@@ -275,7 +824,7 @@ class ParametricStudy:
                 ColumnNames.MELT_POOL_REFERENCE_DEPTH_OVER_WIDTH: dw,
             }
         )
-        self._data_frame = pd.concat([self._data_frame, row.to_frame().T], ignore_index=True)
+        self._append_rows(row.to_frame().T)
 
     def _add_porosity_summary(self, summary: PorositySummary, iteration: int = DEFAULT_ITERATION):
         br = build_rate(
@@ -301,7 +850,7 @@ class ParametricStudy:
                 ColumnNames.RELATIVE_DENSITY: summary.relative_density,
             }
         )
-        self._data_frame = pd.concat([self._data_frame, row.to_frame().T], ignore_index=True)
+        self._append_rows(row.to_frame().T)
 
     def _add_microstructure_summary(
         self, summary: MicrostructureSummary, iteration: int = DEFAULT_ITERATION
@@ -348,7 +897,7 @@ class ParametricStudy:
                 ColumnNames.YZ_AVERAGE_GRAIN_SIZE: summary.yz_average_grain_size,
             }
         )
-        self._data_frame = pd.concat([self._data_frame, row.to_frame().T], ignore_index=True)
+        self._append_rows(row.to_frame().T)
 
     def _common_param_to_dict(
         self,
@@ -446,74 +995,30 @@ class ParametricStudy:
         priority : int, default: :obj:`DEFAULT_PRIORITY <constants.DEFAULT_PRIORITY>`
             Priority for this set of simulations.
         """  # noqa: E501
-        lt = (
-            layer_thicknesses
-            if layer_thicknesses is not None
-            else [MachineConstants.DEFAULT_LAYER_THICKNESS]
-        )
-        bd = (
-            beam_diameters
-            if beam_diameters is not None
-            else [MachineConstants.DEFAULT_BEAM_DIAMETER]
-        )
-        ht = (
-            heater_temperatures
-            if heater_temperatures is not None
-            else [MachineConstants.DEFAULT_HEATER_TEMP]
+        try:
+            SingleBeadInput(
+                bead_length=bead_length, machine=AdditiveMachine(), material=AdditiveMaterial()
+            )
+        except ValueError as e:
+            print(f"Invalid parameter combination: {e}")
+            return
+
+        self._add_permutations(
+            SimulationType.SINGLE_BEAD,
+            material_name,
+            {
+                ColumnNames.LASER_POWER: laser_powers,
+                ColumnNames.SCAN_SPEED: scan_speeds,
+                ColumnNames.LAYER_THICKNESS: layer_thicknesses,
+                ColumnNames.HEATER_TEMPERATURE: heater_temperatures,
+                ColumnNames.BEAM_DIAMETER: beam_diameters,
+            },
+            {ColumnNames.SINGLE_BEAD_LENGTH: bead_length},
+            min_energy_density=min_area_energy_density,
+            max_energy_density=max_area_energy_density,
+            iteration=iteration,
+            priority=priority,
         )
-        min_aed = min_area_energy_density or 0.0
-        max_aed = max_area_energy_density or float("inf")
-        for p in laser_powers:
-            for v in scan_speeds:
-                for l in lt:
-                    aed = energy_density(p, v, l)
-                    if aed < min_aed or aed > max_aed:
-                        continue
-
-                    for t in ht:
-                        for d in bd:
-                            # validate parameters by trying to create input objects
-                            try:
-                                machine = AdditiveMachine(
-                                    laser_power=p,
-                                    scan_speed=v,
-                                    heater_temperature=t,
-                                    layer_thickness=l,
-                                    beam_diameter=d,
-                                )
-                                sb_input = SingleBeadInput(
-                                    bead_length=bead_length,
-                                    machine=machine,
-                                    material=AdditiveMaterial(),
-                                )
-                            except ValueError as e:
-                                print(f"Invalid parameter combination: {e}")
-                                continue
-
-                            # add row to parametric study data frame
-                            row = pd.Series(
-                                {
-                                    ColumnNames.ITERATION: iteration,
-                                    ColumnNames.PRIORITY: priority,
-                                    ColumnNames.TYPE: SimulationType.SINGLE_BEAD,
-                                    ColumnNames.ID: self._create_unique_id(
-                                        prefix=f"sb_{iteration}"
-                                    ),
-                                    ColumnNames.STATUS: SimulationStatus.PENDING,
-                                    ColumnNames.MATERIAL: material_name,
-                                    ColumnNames.HEATER_TEMPERATURE: t,
-                                    ColumnNames.LAYER_THICKNESS: l,
-                                    ColumnNames.BEAM_DIAMETER: d,
-                                    ColumnNames.LASER_POWER: p,
-                                    ColumnNames.SCAN_SPEED: v,
-                                    ColumnNames.ENERGY_DENSITY: aed,
-                                    ColumnNames.BUILD_RATE: build_rate(v, l),
-                                    ColumnNames.SINGLE_BEAD_LENGTH: bead_length,
-                                }
-                            )
-                            self._data_frame = pd.concat(
-                                [self._data_frame, row.to_frame().T], ignore_index=True
-                            )
 
     @save_on_return
     def generate_porosity_permutations(
@@ -624,114 +1129,44 @@ class ParametricStudy:
         priority : int, default: :obj:`DEFAULT_PRIORITY <constants.DEFAULT_PRIORITY>`
             Priority for this set of simulations.
         """  # noqa: E501
-        lt = (
-            layer_thicknesses
-            if layer_thicknesses is not None
-            else [MachineConstants.DEFAULT_LAYER_THICKNESS]
-        )
-        bd = (
-            beam_diameters
-            if beam_diameters is not None
-            else [MachineConstants.DEFAULT_BEAM_DIAMETER]
-        )
-        ht = (
-            heater_temperatures
-            if heater_temperatures is not None
-            else [MachineConstants.DEFAULT_HEATER_TEMP]
-        )
-        sa = (
-            start_angles
-            if start_angles is not None
-            else [MachineConstants.DEFAULT_STARTING_LAYER_ANGLE]
-        )
-        ra = (
-            rotation_angles
-            if rotation_angles is not None
-            else [MachineConstants.DEFAULT_LAYER_ROTATION_ANGLE]
-        )
-        hs = (
-            hatch_spacings
-            if hatch_spacings is not None
-            else [MachineConstants.DEFAULT_HATCH_SPACING]
-        )
-        sw = (
-            stripe_widths
-            if stripe_widths is not None
-            else [MachineConstants.DEFAULT_SLICING_STRIPE_WIDTH]
+        try:
+            PorosityInput(
+                size_x=size_x,
+                size_y=size_y,
+                size_z=size_z,
+                machine=AdditiveMachine(),
+                material=AdditiveMaterial(),
+            )
+        except ValueError as e:
+            print(f"Invalid parameter combination: {e}")
+            return
+
+        self._add_permutations(
+            SimulationType.POROSITY,
+            material_name,
+            {
+                ColumnNames.LASER_POWER: laser_powers,
+                ColumnNames.SCAN_SPEED: scan_speeds,
+                ColumnNames.LAYER_THICKNESS: layer_thicknesses,
+                ColumnNames.HATCH_SPACING: hatch_spacings,
+                ColumnNames.HEATER_TEMPERATURE: heater_temperatures,
+                ColumnNames.BEAM_DIAMETER: beam_diameters,
+                ColumnNames.START_ANGLE: start_angles,
+                ColumnNames.ROTATION_ANGLE: rotation_angles,
+                ColumnNames.STRIPE_WIDTH: stripe_widths,
+            },
+            {
+                ColumnNames.POROSITY_SIZE_X: size_x,
+                ColumnNames.POROSITY_SIZE_Y: size_y,
+                ColumnNames.POROSITY_SIZE_Z: size_z,
+            },
+            min_energy_density=min_energy_density,
+            max_energy_density=max_energy_density,
+            min_build_rate=min_build_rate,
+            max_build_rate=max_build_rate,
+            iteration=iteration,
+            priority=priority,
         )
-        min_ed = min_energy_density or 0.0
-        max_ed = max_energy_density or float("inf")
-        min_br = min_build_rate or 0.0
-        max_br = max_build_rate or float("inf")
-        for p in laser_powers:
-            for v in scan_speeds:
-                for l in lt:
-                    for h in hs:
-                        br = build_rate(v, l, h)
-                        ed = energy_density(p, v, l, h)
-                        if br < min_br or br > max_br or ed < min_ed or ed > max_ed:
-                            continue
-
-                        for t in ht:
-                            for d in bd:
-                                for a in sa:
-                                    for r in ra:
-                                        for w in sw:
-                                            # validate parameters by trying to create input objects
-                                            try:
-                                                machine = AdditiveMachine(
-                                                    laser_power=p,
-                                                    scan_speed=v,
-                                                    heater_temperature=t,
-                                                    layer_thickness=l,
-                                                    beam_diameter=d,
-                                                    starting_layer_angle=a,
-                                                    layer_rotation_angle=r,
-                                                    hatch_spacing=h,
-                                                    slicing_stripe_width=w,
-                                                )
-                                                input = PorosityInput(
-                                                    size_x=size_x,
-                                                    size_y=size_y,
-                                                    size_z=size_z,
-                                                    machine=machine,
-                                                    material=AdditiveMaterial(),
-                                                )
-                                            except ValueError as e:
-                                                print(f"Invalid parameter combination: {e}")
-                                                continue
-
-                                            # add row to parametric study data frame
-                                            row = pd.Series(
-                                                {
-                                                    ColumnNames.ITERATION: iteration,
-                                                    ColumnNames.PRIORITY: priority,
-                                                    ColumnNames.TYPE: SimulationType.POROSITY,
-                                                    ColumnNames.ID: self._create_unique_id(
-                                                        prefix=f"por_{iteration}"
-                                                    ),
-                                                    ColumnNames.STATUS: SimulationStatus.PENDING,
-                                                    ColumnNames.MATERIAL: material_name,
-                                                    ColumnNames.HEATER_TEMPERATURE: t,
-                                                    ColumnNames.LAYER_THICKNESS: l,
-                                                    ColumnNames.BEAM_DIAMETER: d,
-                                                    ColumnNames.LASER_POWER: p,
-                                                    ColumnNames.SCAN_SPEED: v,
-                                                    ColumnNames.START_ANGLE: a,
-                                                    ColumnNames.ROTATION_ANGLE: r,
-                                                    ColumnNames.HATCH_SPACING: h,
-                                                    ColumnNames.STRIPE_WIDTH: w,
-                                                    ColumnNames.ENERGY_DENSITY: ed,
-                                                    ColumnNames.BUILD_RATE: br,
-                                                    ColumnNames.POROSITY_SIZE_X: size_x,
-                                                    ColumnNames.POROSITY_SIZE_Y: size_y,
-                                                    ColumnNames.POROSITY_SIZE_Z: size_z,
-                                                }
-                                            )
-                                            self._data_frame = pd.concat(
-                                                [self._data_frame, row.to_frame().T],
-                                                ignore_index=True,
-                                            )
 
     @save_on_return
     def generate_microstructure_permutations(
@@ -904,45 +1339,6 @@ class ParametricStudy:
         priority : int, default: :obj:`DEFAULT_PRIORITY <constants.DEFAULT_PRIORITY>`
             Priority for this set of simulations.
         """  # noqa
-        lt = (
-            layer_thicknesses
-            if layer_thicknesses is not None
-            else [MachineConstants.DEFAULT_LAYER_THICKNESS]
-        )
-        bd = (
-            beam_diameters
-            if beam_diameters is not None
-            else [MachineConstants.DEFAULT_BEAM_DIAMETER]
-        )
-        ht = (
-            heater_temperatures
-            if heater_temperatures is not None
-            else [MachineConstants.DEFAULT_HEATER_TEMP]
-        )
-        sa = (
-            start_angles
-            if start_angles is not None
-            else [MachineConstants.DEFAULT_STARTING_LAYER_ANGLE]
-        )
-        ra = (
-            rotation_angles
-            if rotation_angles is not None
-            else [MachineConstants.DEFAULT_LAYER_ROTATION_ANGLE]
-        )
-        hs = (
-            hatch_spacings
-            if hatch_spacings is not None
-            else [MachineConstants.DEFAULT_HATCH_SPACING]
-        )
-        sw = (
-            stripe_widths
-            if stripe_widths is not None
-            else [MachineConstants.DEFAULT_SLICING_STRIPE_WIDTH]
-        )
-        min_ed = min_energy_density or 0.0
-        max_ed = max_energy_density or float("inf")
-        min_br = min_build_rate or 0.0
-        max_br = max_build_rate or float("inf")
         # determine if the user provided thermal parameters
         use_thermal_params = (
             (cooling_rate is not None)
@@ -950,120 +1346,188 @@ class ParametricStudy:
             or (melt_pool_width is not None)
             or (melt_pool_depth is not None)
         )
+        # set any uninitialized thermal parameters to default values
+        cooling_rate = cooling_rate or MicrostructureInput.DEFAULT_COOLING_RATE
+        thermal_gradient = thermal_gradient or MicrostructureInput.DEFAULT_THERMAL_GRADIENT
+        melt_pool_width = melt_pool_width or MicrostructureInput.DEFAULT_MELT_POOL_WIDTH
+        melt_pool_depth = melt_pool_depth or MicrostructureInput.DEFAULT_MELT_POOL_DEPTH
+
+        # the sample and thermal parameters are the same for every permutation,
+        # so validate them once
+        try:
+            MicrostructureInput(
+                sample_min_x=min_x,
+                sample_min_y=min_y,
+                sample_min_z=min_z,
+                sample_size_x=size_x,
+                sample_size_y=size_y,
+                sample_size_z=size_z,
+                sensor_dimension=sensor_dimension,
+                use_provided_thermal_parameters=use_thermal_params,
+                cooling_rate=cooling_rate,
+                thermal_gradient=thermal_gradient,
+                melt_pool_width=melt_pool_width,
+                melt_pool_depth=melt_pool_depth,
+                random_seed=random_seed or MicrostructureInput.DEFAULT_RANDOM_SEED,
+                machine=AdditiveMachine(),
+                material=AdditiveMaterial(),
+            )
+        except ValueError as e:
+            print(f"Invalid parameter combination: {e}")
+            return
+
+        constants = {
+            ColumnNames.MICRO_MIN_X: min_x,
+            ColumnNames.MICRO_MIN_Y: min_y,
+            ColumnNames.MICRO_MIN_Z: min_z,
+            ColumnNames.MICRO_SIZE_X: size_x,
+            ColumnNames.MICRO_SIZE_Y: size_y,
+            ColumnNames.MICRO_SIZE_Z: size_z,
+            ColumnNames.MICRO_SENSOR_DIM: sensor_dimension,
+        }
+        # unset thermal parameters and random seed are left as NaN
         if use_thermal_params:
-            # set any uninitialized thermal parameters to default values
-            cooling_rate = cooling_rate or MicrostructureInput.DEFAULT_COOLING_RATE
-            thermal_gradient = thermal_gradient or MicrostructureInput.DEFAULT_THERMAL_GRADIENT
-            melt_pool_width = melt_pool_width or MicrostructureInput.DEFAULT_MELT_POOL_WIDTH
-            melt_pool_depth = melt_pool_depth or MicrostructureInput.DEFAULT_MELT_POOL_DEPTH
-
-        for p in laser_powers:
-            for v in scan_speeds:
-                for l in lt:
-                    for h in hs:
-                        br = build_rate(v, l, h)
-                        ed = energy_density(p, v, l, h)
-                        if br < min_br or br > max_br or ed < min_ed or ed > max_ed:
-                            continue
-
-                        for t in ht:
-                            for d in bd:
-                                for a in sa:
-                                    for r in ra:
-                                        for w in sw:
-                                            # validate parameters by trying to create input objects
-                                            try:
-                                                machine = AdditiveMachine(
-                                                    laser_power=p,
-                                                    scan_speed=v,
-                                                    heater_temperature=t,
-                                                    layer_thickness=l,
-                                                    beam_diameter=d,
-                                                    starting_layer_angle=a,
-                                                    layer_rotation_angle=r,
-                                                    hatch_spacing=h,
-                                                    slicing_stripe_width=w,
-                                                )
-                                                input = MicrostructureInput(
-                                                    sample_min_x=min_x,
-                                                    sample_min_y=min_y,
-                                                    sample_min_z=min_z,
-                                                    sample_size_x=size_x,
-                                                    sample_size_y=size_y,
-                                                    sample_size_z=size_z,
-                                                    sensor_dimension=sensor_dimension,
-                                                    use_provided_thermal_parameters=use_thermal_params,
-                                                    cooling_rate=MicrostructureInput.DEFAULT_COOLING_RATE
-                                                    if cooling_rate is None
-                                                    else cooling_rate,
-                                                    thermal_gradient=MicrostructureInput.DEFAULT_THERMAL_GRADIENT  # noqa: E501, line too long
-                                                    if thermal_gradient is None
-                                                    else thermal_gradient,
-                                                    melt_pool_width=MicrostructureInput.DEFAULT_MELT_POOL_WIDTH  # noqa: E501, line too long
-                                                    if melt_pool_width is None
-                                                    else melt_pool_width,
-                                                    melt_pool_depth=MicrostructureInput.DEFAULT_MELT_POOL_DEPTH  # noqa: E501, line too long
-                                                    if melt_pool_depth is None
-                                                    else melt_pool_depth,
-                                                    random_seed=random_seed
-                                                    or MicrostructureInput.DEFAULT_RANDOM_SEED,
-                                                    machine=machine,
-                                                    material=AdditiveMaterial(),
-                                                )
-                                            except ValueError as e:
-                                                print(f"Invalid parameter combination: {e}")
-                                                continue
-
-                                            # add row to parametric study data frame
-                                            row = pd.Series(
-                                                {
-                                                    ColumnNames.ITERATION: iteration,
-                                                    ColumnNames.PRIORITY: priority,
-                                                    ColumnNames.TYPE: SimulationType.MICROSTRUCTURE,
-                                                    ColumnNames.ID: self._create_unique_id(
-                                                        prefix=f"micro_{iteration}"
-                                                    ),
-                                                    ColumnNames.STATUS: SimulationStatus.PENDING,
-                                                    ColumnNames.MATERIAL: material_name,
-                                                    ColumnNames.HEATER_TEMPERATURE: t,
-                                                    ColumnNames.LAYER_THICKNESS: l,
-                                                    ColumnNames.BEAM_DIAMETER: d,
-                                                    ColumnNames.LASER_POWER: p,
-                                                    ColumnNames.SCAN_SPEED: v,
-                                                    ColumnNames.START_ANGLE: a,
-                                                    ColumnNames.ROTATION_ANGLE: r,
-                                                    ColumnNames.HATCH_SPACING: h,
-                                                    ColumnNames.STRIPE_WIDTH: w,
-                                                    ColumnNames.ENERGY_DENSITY: ed,
-                                                    ColumnNames.BUILD_RATE: br,
-                                                    ColumnNames.MICRO_MIN_X: min_x,
-                                                    ColumnNames.MICRO_MIN_Y: min_y,
-                                                    ColumnNames.MICRO_MIN_Z: min_z,
-                                                    ColumnNames.MICRO_SIZE_X: size_x,
-                                                    ColumnNames.MICRO_SIZE_Y: size_y,
-                                                    ColumnNames.MICRO_SIZE_Z: size_z,
-                                                    ColumnNames.MICRO_SENSOR_DIM: sensor_dimension,
-                                                    ColumnNames.COOLING_RATE: float("nan")
-                                                    if cooling_rate is None
-                                                    else cooling_rate,
-                                                    ColumnNames.THERMAL_GRADIENT: float("nan")
-                                                    if thermal_gradient is None
-                                                    else thermal_gradient,
-                                                    ColumnNames.MICRO_MELT_POOL_WIDTH: float("nan")
-                                                    if melt_pool_width is None
-                                                    else melt_pool_width,
-                                                    ColumnNames.MICRO_MELT_POOL_DEPTH: float("nan")
-                                                    if melt_pool_depth is None
-                                                    else melt_pool_depth,
-                                                    ColumnNames.RANDOM_SEED: float("nan")
-                                                    if random_seed is None
-                                                    else random_seed,
-                                                }
-                                            )
-                                            self._data_frame = pd.concat(
-                                                [self._data_frame, row.to_frame().T],
-                                                ignore_index=True,
-                                            )
+            constants[ColumnNames.COOLING_RATE] = cooling_rate
+            constants[ColumnNames.THERMAL_GRADIENT] = thermal_gradient
+            constants[ColumnNames.MICRO_MELT_POOL_WIDTH] = melt_pool_width
+            constants[ColumnNames.MICRO_MELT_POOL_DEPTH] = melt_pool_depth
+        if random_seed is not None:
+            constants[ColumnNames.RANDOM_SEED] = random_seed
+
+        self._add_permutations(
+            SimulationType.MICROSTRUCTURE,
+            material_name,
+            {
+                ColumnNames.LASER_POWER: laser_powers,
+                ColumnNames.SCAN_SPEED: scan_speeds,
+                ColumnNames.LAYER_THICKNESS: layer_thicknesses,
+                ColumnNames.HATCH_SPACING: hatch_spacings,
+                ColumnNames.HEATER_TEMPERATURE: heater_temperatures,
+                ColumnNames.BEAM_DIAMETER: beam_diameters,
+                ColumnNames.START_ANGLE: start_angles,
+                ColumnNames.ROTATION_ANGLE: rotation_angles,
+                ColumnNames.STRIPE_WIDTH: stripe_widths,
+            },
+            constants,
+            min_energy_density=min_energy_density,
+            max_energy_density=max_energy_density,
+            min_build_rate=min_build_rate,
+            max_build_rate=max_build_rate,
+            iteration=iteration,
+            priority=priority,
+        )
+
+    def _add_permutations(
+        self,
+        type: SimulationType,
+        material_name: str,
+        parameters: dict[str, list[float] | None],
+        constants: dict[str, any],
+        min_energy_density: float | None = None,
+        max_energy_density: float | None = None,
+        min_build_rate: float | None = None,
+        max_build_rate: float | None = None,
+        iteration: int = DEFAULT_ITERATION,
+        priority: int = DEFAULT_PRIORITY,
+    ):
+        """Add the permutations of machine parameters to the parametric study.
+
+        The Cartesian product of the parameter values is built as arrays. Permutations
+        outside the energy density and build rate limits, or with machine parameters
+        outside their valid ranges, are masked out. The remaining permutations are
+        appended to the data frame in one operation.
+
+        Parameters
+        ----------
+        type : SimulationType
+            Type of simulation to add.
+        material_name : str
+            Material name.
+        parameters : dict[str, list[float] | None]
+            Machine parameter values keyed by column name. Permutations vary the first
+            parameter slowest. A value of ``None`` is replaced by the parameter's default.
+            Energy density and build rate include the hatch spacing only if it is a key.
+        constants : dict[str, any]
+            Values, keyed by column name, that are the same for every permutation.
+        min_energy_density : float, default: None
+            Minimum energy density.
+        max_energy_density : float, default: None
+            Maximum energy density.
+        min_build_rate : float, default: None
+            Minimum build rate.
+        max_build_rate : float, default: None
+            Maximum build rate.
+        iteration : int, default: :obj:`DEFAULT_ITERATION <constants.DEFAULT_ITERATION>`
+            Iteration number for this set of simulations.
+        priority : int, default: :obj:`DEFAULT_PRIORITY <constants.DEFAULT_PRIORITY>`
+            Priority for this set of simulations.
+        """
+        values = [
+            np.asarray(
+                v if v is not None else [_MACHINE_PARAMETERS[k][1]],
+                dtype=float,
+            )
+            for k, v in parameters.items()
+        ]
+        grids = np.meshgrid(*values, indexing="ij")
+        columns = {k: g.ravel() for k, g in zip(parameters, grids)}
+
+        br = columns[ColumnNames.SCAN_SPEED] * columns[ColumnNames.LAYER_THICKNESS]
+        if ColumnNames.HATCH_SPACING in columns:
+            br = br * columns[ColumnNames.HATCH_SPACING]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ed = np.where(br != 0, columns[ColumnNames.LASER_POWER] / br, np.nan)
+        min_ed = min_energy_density or 0.0
+        max_ed = max_energy_density or float("inf")
+        min_br = min_build_rate or 0.0
+        max_br = max_build_rate or float("inf")
+        mask = ~((br < min_br) | (br > max_br) | (ed < min_ed) | (ed > max_ed))
+
+        for k, column in columns.items():
+            name, _, min, max = _MACHINE_PARAMETERS[k]
+            invalid = mask & ((column < min) | (column > max))
+            if invalid.any():
+                print(f"Invalid parameter combination: {name} must be between {min} and {max}.")
+                mask &= ~invalid
+
+        count = int(mask.sum())
+        if count == 0:
+            return
+
+        rows = pd.DataFrame(
+            {
+                ColumnNames.ITERATION: iteration,
+                ColumnNames.PRIORITY: priority,
+                ColumnNames.TYPE: type,
+                ColumnNames.ID: self._create_unique_ids(
+                    count, prefix=f"{_ID_PREFIXES[type]}_{iteration}"
+                ),
+                ColumnNames.STATUS: SimulationStatus.PENDING,
+                ColumnNames.MATERIAL: material_name,
+                **{k: column[mask] for k, column in columns.items()},
+                ColumnNames.ENERGY_DENSITY: ed[mask],
+                ColumnNames.BUILD_RATE: br[mask],
+                **constants,
+            }
+        )
+        self._append_rows(rows)
+
+    def _append_rows(self, rows: pd.DataFrame):
+        """Append rows to the parametric study data frame in one operation.
+
+        Parameters
+        ----------
+        rows : pd.DataFrame
+            Rows to append. Missing columns are filled with missing values and
+            the columns are converted to the types of the study data frame.
+        """
+        rows = schema.apply_schema(rows.reindex(columns=self._data_frame.columns))
+        self._id_index = None
+        self._mark_changed(rows[ColumnNames.ID])
+        if self._data_frame.empty:
+            self._data_frame = rows.reset_index(drop=True)
+        else:
+            self._data_frame = schema.concat(self._data_frame, rows)
 
     @save_on_return
     def update(self, summaries: list[SingleBeadSummary | PorositySummary | MicrostructureSummary]):
@@ -1077,79 +1541,157 @@ class ParametricStudy:
         summaries : list[SingleBeadSummary, PorositySummary, MicrostructureSummary, SimulationError]
              List of simulation summaries to use for updating the parametric study.
         """
+        single_bead = []
+        porosity = []
+        microstructure = []
+        errors = []
+        cancelled = []
         for summary in summaries:
             if isinstance(summary, SingleBeadSummary):
-                self._update_single_bead(summary)
+                single_bead.append(summary)
             elif isinstance(summary, PorositySummary):
-                self._update_porosity(summary)
+                porosity.append(summary)
             elif isinstance(summary, MicrostructureSummary):
-                self._update_microstructure(summary)
+                microstructure.append(summary)
+            elif isinstance(summary, SimulationCancelled):
+                # Cancelled simulations are pending so that they run next time.
+                cancelled.append(summary)
             elif isinstance(summary, SimulationError):
-                idx = self._data_frame[self._data_frame[ColumnNames.ID] == summary.input.id].index
-                self._data_frame.loc[idx, ColumnNames.STATUS] = SimulationStatus.ERROR
-                self._data_frame.loc[idx, ColumnNames.ERROR_MESSAGE] = summary.message
+                errors.append(summary)
             else:
                 raise TypeError(f"Invalid simulation summary type: {type(summary)}")
 
-    def _update_single_bead(self, summary: SingleBeadSummary):
-        """Update the results of a single bead simulation in the parametric
+        if single_bead:
+            self._update_single_bead(single_bead)
+        if porosity:
+            self._update_porosity(porosity)
+        if microstructure:
+            self._update_microstructure(microstructure)
+        if cancelled:
+            self._set_values(
+                self._row_positions([c.input.id for c in cancelled]),
+                {ColumnNames.STATUS: SimulationStatus.PENDING},
+            )
+        if errors:
+            self._set_values(
+                self._row_positions([e.input.id for e in errors]),
+                {
+                    ColumnNames.STATUS: SimulationStatus.ERROR,
+                    ColumnNames.ERROR_MESSAGE: [e.message for e in errors],
+                },
+            )
+
+    def _update_single_bead(self, summaries: list[SingleBeadSummary]):
+        """Update the results of single bead simulations in the parametric
         study data frame."""
-        median_df = summary.melt_pool.data_frame().median()
-        idx = self._data_frame[
-            (self._data_frame[ColumnNames.ID] == summary.input.id)
-            & (self._data_frame[ColumnNames.TYPE] == SimulationType.SINGLE_BEAD)
-        ].index
-        self._data_frame.loc[idx, ColumnNames.STATUS] = SimulationStatus.COMPLETED
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_WIDTH] = median_df[
-            MeltPoolColumnNames.WIDTH
-        ]
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_DEPTH] = median_df[
-            MeltPoolColumnNames.DEPTH
-        ]
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_LENGTH] = median_df[
-            MeltPoolColumnNames.LENGTH
-        ]
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_LENGTH_OVER_WIDTH] = (
-            median_df[MeltPoolColumnNames.LENGTH] / median_df[MeltPoolColumnNames.WIDTH]
-            if median_df[MeltPoolColumnNames.WIDTH] > 0
-            else np.nan
-        )
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_REFERENCE_DEPTH] = median_df[
-            MeltPoolColumnNames.REFERENCE_DEPTH
-        ]
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_REFERENCE_WIDTH] = median_df[
-            MeltPoolColumnNames.REFERENCE_WIDTH
-        ]
-        self._data_frame.loc[idx, ColumnNames.MELT_POOL_REFERENCE_DEPTH_OVER_WIDTH] = (
-            median_df[MeltPoolColumnNames.REFERENCE_DEPTH]
-            / median_df[MeltPoolColumnNames.REFERENCE_WIDTH]
-            if median_df[MeltPoolColumnNames.REFERENCE_WIDTH] > 0
-            else np.nan
+        medians = pd.DataFrame([s.melt_pool.data_frame().median() for s in summaries])
+        width = medians[MeltPoolColumnNames.WIDTH].to_numpy(dtype=float)
+        length = medians[MeltPoolColumnNames.LENGTH].to_numpy(dtype=float)
+        ref_width = medians[MeltPoolColumnNames.REFERENCE_WIDTH].to_numpy(dtype=float)
+        ref_depth = medians[MeltPoolColumnNames.REFERENCE_DEPTH].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            length_over_width = np.where(width > 0, length / width, np.nan)
+            ref_depth_over_width = np.where(ref_width > 0, ref_depth / ref_width, np.nan)
+        self._set_values(
+            self._row_positions([s.input.id for s in summaries], SimulationType.SINGLE_BEAD),
+            {
+                ColumnNames.STATUS: SimulationStatus.COMPLETED,
+                ColumnNames.MELT_POOL_WIDTH: width,
+                ColumnNames.MELT_POOL_DEPTH: medians[MeltPoolColumnNames.DEPTH].to_numpy(),
+                ColumnNames.MELT_POOL_LENGTH: length,
+                ColumnNames.MELT_POOL_LENGTH_OVER_WIDTH: length_over_width,
+                ColumnNames.MELT_POOL_REFERENCE_DEPTH: ref_depth,
+                ColumnNames.MELT_POOL_REFERENCE_WIDTH: ref_width,
+                ColumnNames.MELT_POOL_REFERENCE_DEPTH_OVER_WIDTH: ref_depth_over_width,
+            },
         )
 
-    def _update_porosity(self, summary: PorositySummary):
-        """Update the results of a porosity simulation in the parametric study
+    def _update_porosity(self, summaries: list[PorositySummary]):
+        """Update the results of porosity simulations in the parametric study
         data frame."""
-        idx = self._data_frame[
-            (self._data_frame[ColumnNames.ID] == summary.input.id)
-            & (self._data_frame[ColumnNames.TYPE] == SimulationType.POROSITY)
-        ].index
-
-        self._data_frame.loc[idx, ColumnNames.STATUS] = SimulationStatus.COMPLETED
-        self._data_frame.loc[idx, ColumnNames.RELATIVE_DENSITY] = summary.relative_density
+        self._set_values(
+            self._row_positions([s.input.id for s in summaries], SimulationType.POROSITY),
+            {
+                ColumnNames.STATUS: SimulationStatus.COMPLETED,
+                ColumnNames.RELATIVE_DENSITY: [s.relative_density for s in summaries],
+            },
+        )
 
-    def _update_microstructure(self, summary: MicrostructureSummary):
-        """Update the results of a microstructure simulation in the parametric
+    def _update_microstructure(self, summaries: list[MicrostructureSummary]):
+        """Update the results of microstructure simulations in the parametric
         study data frame."""
-        idx = self._data_frame[
-            (self._data_frame[ColumnNames.ID] == summary.input.id)
-            & (self._data_frame[ColumnNames.TYPE] == SimulationType.MICROSTRUCTURE)
-        ].index
+        self._set_values(
+            self._row_positions([s.input.id for s in summaries], SimulationType.MICROSTRUCTURE),
+            {
+                ColumnNames.STATUS: SimulationStatus.COMPLETED,
+                ColumnNames.XY_AVERAGE_GRAIN_SIZE: [s.xy_average_grain_size for s in summaries],
+                ColumnNames.XZ_AVERAGE_GRAIN_SIZE: [s.xz_average_grain_size for s in summaries],
+                ColumnNames.YZ_AVERAGE_GRAIN_SIZE: [s.yz_average_grain_size for s in summaries],
+            },
+        )
 
-        self._data_frame.loc[idx, ColumnNames.STATUS] = SimulationStatus.COMPLETED
-        self._data_frame.loc[idx, ColumnNames.XY_AVERAGE_GRAIN_SIZE] = summary.xy_average_grain_size
-        self._data_frame.loc[idx, ColumnNames.XZ_AVERAGE_GRAIN_SIZE] = summary.xz_average_grain_size
-        self._data_frame.loc[idx, ColumnNames.YZ_AVERAGE_GRAIN_SIZE] = summary.yz_average_grain_size
+    def _row_positions(self, ids: list[str], type: SimulationType | None = None) -> np.ndarray:
+        """Return the positions of simulations in the parametric study data frame.
+
+        Parameters
+        ----------
+        ids : list[str]
+            IDs of the simulations.
+        type : SimulationType, default: None
+            Type the simulations must have. If this value is ``None``,
+            the type is not checked.
+
+        Returns
+        -------
+        np.ndarray
+            Row position of each ID, or ``-1`` if the ID is not in the
+            study or its type does not match.
+        """
+        if self._id_index is None:
+            self._id_index = pd.Index(self._data_frame[ColumnNames.ID])
+        positions = self._id_index.get_indexer(ids)
+        if type is not None:
+            # compare category codes to avoid converting the column to strings
+            types = self._data_frame[ColumnNames.TYPE].cat
+            code = types.categories.get_indexer([type])[0]
+            found = positions >= 0
+            codes = types.codes.to_numpy()[positions[found]]
+            positions[found] = np.where((codes == code) & (code >= 0), positions[found], -1)
+        return positions
+
+    def _set_values(self, positions: np.ndarray, values: dict[str, any]):
+        """Write values to rows of the parametric study data frame.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            Row positions to write, as returned by :meth:`_row_positions`.
+            Rows with a position of ``-1`` are skipped.
+        values : dict[str, any]
+            Values keyed by column name. Each value is either a scalar written
+            to every row or a sequence with one value per position. Values are
+            converted to the type of their column.
+        """
+        found = positions >= 0
+        if not found.any():
+            return
+        self._mark_changed(self._data_frame[ColumnNames.ID].to_numpy()[positions[found]])
+        for column, value in values.items():
+            if np.isscalar(value) or value is None:
+                value = np.full(found.sum(), value, dtype=object)
+            else:
+                value = np.asarray(value, dtype=object)[found]
+            dtype = self._data_frame[column].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                dtype = pd.CategoricalDtype(
+                    schema.categories(column, dtype.categories, pd.unique(value[pd.notna(value)]))
+                )
+                self._data_frame[column] = schema.with_categories(
+                    self._data_frame[column], dtype.categories
+                )
+            self._data_frame.iloc[
+                positions[found], self._data_frame.columns.get_loc(column)
+            ] = pd.array(value, dtype=dtype)
 
     @save_on_return
     def add_inputs(
@@ -1172,6 +1714,7 @@ class ParametricStudy:
         priority : int, default: :obj:`DEFAULT_PRIORITY <constants.DEFAULT_PRIORITY>`
             Priority for the simulations.
         """
+        rows = []
         for input in inputs:
             dict = {}
             if isinstance(input, SingleBeadInput):
@@ -1216,10 +1759,10 @@ class ParametricStudy:
             dict[ColumnNames.ROTATION_ANGLE] = input.machine.layer_rotation_angle
             dict[ColumnNames.HATCH_SPACING] = input.machine.hatch_spacing
             dict[ColumnNames.STRIPE_WIDTH] = input.machine.slicing_stripe_width
+            rows.append(dict)
 
-            self._data_frame = pd.concat(
-                [self._data_frame, pd.Series(dict).to_frame().T], ignore_index=True
-            )
+        if rows:
+            self._append_rows(pd.DataFrame(rows))
 
     @save_on_return
     def remove(self, ids: str | list[str]):
@@ -1233,7 +1776,13 @@ class ParametricStudy:
         if isinstance(ids, str):
             ids = [ids]
         idx = self._data_frame.index[self._data_frame[ColumnNames.ID].isin(ids)].tolist()
+        removed = self._data_frame.loc[idx, ColumnNames.ID].tolist()
         self._data_frame.drop(index=idx, inplace=True)
+        self._ids.difference_update(ids)
+        self._id_index = None
+        self._removed_ids.update(removed)
+        if self._changed_ids is not None:
+            self._changed_ids.difference_update(removed)
 
     @save_on_return
     def set_status(self, ids: str | list[str], status: SimulationStatus):
@@ -1249,8 +1798,7 @@ class ParametricStudy:
         """
         if isinstance(ids, str):
             ids = [ids]
-        idx = self._data_frame.index[self._data_frame[ColumnNames.ID].isin(ids)]
-        self._data_frame.loc[idx, ColumnNames.STATUS] = status
+        self._set_values(self._row_positions(ids), {ColumnNames.STATUS: status})
 
     @save_on_return
     def set_priority(self, ids: str | list[str], priority: int):
@@ -1266,8 +1814,7 @@ class ParametricStudy:
         """
         if isinstance(ids, str):
             ids = [ids]
-        idx = self._data_frame.index[self._data_frame[ColumnNames.ID].isin(ids)]
-        self._data_frame.loc[idx, ColumnNames.PRIORITY] = priority
+        self._set_values(self._row_positions(ids), {ColumnNames.PRIORITY: priority})
 
     @save_on_return
     def set_iteration(self, ids: str | list[str], iteration: int):
@@ -1286,8 +1833,7 @@ class ParametricStudy:
         """
         if isinstance(ids, str):
             ids = [ids]
-        idx = self._data_frame.index[self._data_frame[ColumnNames.ID].isin(ids)]
-        self._data_frame.loc[idx, ColumnNames.ITERATION] = iteration
+        self._set_values(self._row_positions(ids), {ColumnNames.ITERATION: iteration})
 
     def _create_unique_id(self, prefix: str | None = None, id: str | None = None) -> str:
         """Create a unique simulation ID for a permutation.
@@ -1308,15 +1854,44 @@ class ParametricStudy:
             create a unique ID.
         """
 
-        if id is not None and not self._data_frame[ColumnNames.ID].str.match(f"{id}").any():
+        if id is not None and id not in self._ids:
+            self._ids.add(id)
             return id
-        _prefix = id or prefix or "sim"
-        uid = f"{_prefix}_{misc.short_uuid()}"
-        while self._data_frame[ColumnNames.ID].str.match(f"{uid}").any():
+        return self._create_unique_ids(1, prefix=id or prefix)[0]
+
+    def _create_unique_ids(self, count: int, prefix: str | None = None) -> list[str]:
+        """Create unique simulation IDs for a set of permutations.
+
+        The IDs are reserved in the study's ID index, so later calls
+        do not return them again.
+
+        Parameters
+        ----------
+        count : int
+            Number of IDs to create.
+        prefix : str, default: None
+            Prefix for the IDs.
+
+        Returns
+        -------
+        list[str]
+            Unique IDs of the form ``{prefix}_{suffix}``.
+        """
+        _prefix = prefix or "sim"
+        ids = []
+        while len(ids) < count:
             uid = f"{_prefix}_{misc.short_uuid()}"
-        return uid
+            if uid not in self._ids:
+                self._ids.add(uid)
+                ids.append(uid)
+        return ids
 
     @save_on_return
     def clear(self):
         """Remove all permutations from the parametric study."""
+        # Remove the rows rather than rewriting the file, so that a shared study
+        # keeps the rows that other processes added.
+        self._removed_ids.update(self._ids)
         self._data_frame = self._data_frame[0:0]
+        self._ids.clear()
+        self._id_index = None
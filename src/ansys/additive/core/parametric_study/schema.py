@@ -0,0 +1,219 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides the column types of the parametric study data frame.
+
+Physical quantities are stored as ``float64`` values, with ``NaN`` for missing
+values. Iteration, priority, and random seed are stored as nullable integers.
+Simulation type, status, and material are stored as categoricals, so each row
+holds a small integer code instead of a string.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from ansys.additive.core import SimulationStatus, SimulationType
+
+from .constants import ColumnNames
+
+
+def _values(cls: type) -> list[str]:
+    """Return the values of the public attributes of a constants class."""
+    return [v for k, v in vars(cls).items() if not k.startswith("_")]
+
+
+#: Data type of each column of the parametric study data frame. Columns that
+#: are not listed hold ``float64`` values.
+COLUMN_DTYPES = {
+    ColumnNames.ITERATION: pd.Int64Dtype(),
+    ColumnNames.PRIORITY: pd.Int64Dtype(),
+    ColumnNames.TYPE: pd.CategoricalDtype(_values(SimulationType)),
+    ColumnNames.ID: np.dtype(object),
+    ColumnNames.STATUS: pd.CategoricalDtype(_values(SimulationStatus)),
+    ColumnNames.MATERIAL: pd.CategoricalDtype(),
+    ColumnNames.RANDOM_SEED: pd.Int64Dtype(),
+    ColumnNames.ERROR_MESSAGE: np.dtype(object),
+}
+
+#: Names of the columns of the parametric study data frame.
+COLUMNS = _values(ColumnNames)
+
+
+def column_dtype(column: str) -> object:
+    """Return the data type of a parametric study column.
+
+    Parameters
+    ----------
+    column: str
+        Column name.
+
+    Returns
+    -------
+    numpy.dtype, pandas.api.extensions.ExtensionDtype
+        Data type of the column. Columns that are not in :class:`ColumnNames`
+        have no fixed type, and ``None`` is returned.
+    """
+    if column in COLUMN_DTYPES:
+        return COLUMN_DTYPES[column]
+    return np.dtype(float) if column in COLUMNS else None
+
+
+def empty_data_frame() -> pd.DataFrame:
+    """Return an empty parametric study data frame with typed columns."""
+    return apply_schema(pd.DataFrame(columns=COLUMNS))
+
+
+def add_missing_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the parametric study columns that a data frame lacks.
+
+    Studies saved by earlier versions lack the columns added since. The missing
+    columns are appended and hold missing values.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Data frame to complete.
+
+    Returns
+    -------
+    pd.DataFrame
+        Data frame with every column of :class:`ColumnNames`. If no column is
+        missing, ``df`` is returned.
+    """
+    missing = [c for c in COLUMNS if c not in df.columns]
+    return df.reindex(columns=[*df.columns, *missing]) if missing else df
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert the columns of a data frame to the parametric study column types.
+
+    Categorical columns keep the categories they already have, and values that
+    are not in the predefined categories are added as new categories.
+
+    Parameters
+    ----------
+    df: pd.DataFrame
+        Data frame to convert. Columns that are not in :class:`ColumnNames`
+        are not converted.
+
+    Returns
+    -------
+    pd.DataFrame
+        Data frame with typed columns. If no column needs to be converted,
+        ``df`` is returned.
+    """
+    dtypes = {}
+    for column in df.columns:
+        dtype = column_dtype(column)
+        if dtype is None:
+            continue
+        if isinstance(dtype, pd.CategoricalDtype):
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                observed = df[column].cat.categories
+            else:
+                observed = df[column].dropna().unique()
+            dtype = pd.CategoricalDtype(categories(column, observed))
+        if df[column].dtype != dtype:
+            dtypes[column] = dtype
+    return df.astype(dtypes) if dtypes else df
+
+
+def concat(first: pd.DataFrame, second: pd.DataFrame) -> pd.DataFrame:
+    """Concatenate two typed parametric study data frames.
+
+    The categories of the categorical columns are merged, so that the
+    concatenated columns remain categorical.
+
+    Parameters
+    ----------
+    first: pd.DataFrame
+        First data frame.
+    second: pd.DataFrame
+        Data frame to append to the first one. It must have the same columns.
+
+    Returns
+    -------
+    pd.DataFrame
+        Concatenated data frame with a new range index.
+    """
+    first = first.copy(deep=False)
+    second = second.copy(deep=False)
+    for column in first.columns:
+        if not isinstance(first[column].dtype, pd.CategoricalDtype):
+            continue
+        merged = categories(column, first[column].cat.categories, second[column].cat.categories)
+        first[column] = with_categories(first[column], merged)
+        second[column] = with_categories(second[column], merged)
+    return pd.concat([first, second], ignore_index=True)
+
+
+def with_categories(values: pd.Series, categories: pd.Index) -> pd.Series:
+    """Set the categories of a categorical series.
+
+    Parameters
+    ----------
+    values: pd.Series
+        Categorical series.
+    categories: pd.Index
+        Categories the series must have, in order. It must include every
+        value of the series.
+
+    Returns
+    -------
+    pd.Series
+        Series with the categories. If the series already has them, ``values``
+        is returned.
+    """
+    if values.cat.categories.equals(categories):
+        return values
+    return values.cat.set_categories(categories)
+
+
+def categories(column: str, *observed: Iterable) -> pd.Index:
+    """Return the categories of a categorical column.
+
+    The categories depend only on the values observed, not on the order in
+    which they were added, so that a study has the same categories however it
+    was built or loaded.
+
+    Parameters
+    ----------
+    column: str
+        Name of a categorical column.
+    observed: Iterable
+        Values that the column holds or will hold.
+
+    Returns
+    -------
+    pd.Index
+        Predefined categories of the column, followed by the other observed
+        values in sorted order.
+    """
+    values = set()
+    for v in observed:
+        values.update(v)
+    predefined = COLUMN_DTYPES[column].categories
+    if predefined is None:
+        return pd.Index(sorted(values), dtype=object)
+    return predefined.append(pd.Index(sorted(values.difference(predefined)), dtype=object))
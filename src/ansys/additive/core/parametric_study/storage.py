@@ -0,0 +1,809 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides the file formats used to store parametric studies."""
+from __future__ import annotations
+
+import math
+import os
+import pathlib
+import platform
+import sqlite3
+import tempfile
+import time
+from typing import Callable, Iterable
+
+import dill
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ansys.additive.core import SimulationStatus
+
+from .constants import FORMAT_VERSION, ColumnNames
+from .schema import apply_schema
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+"""First bytes of every SQLite database file."""
+ARROW_HEADER = b"ARROW1"
+"""First bytes of every Arrow IPC file."""
+
+
+class StudyStorage:
+    """Provides the base class for parametric study file formats.
+
+    Parameters
+    ----------
+    path: str, os.PathLike
+        Path of the study file.
+    """
+
+    #: Whether several processes can run simulations from the same file.
+    SHARED = False
+
+    def __init__(self, path: str | os.PathLike):
+        """Initialize the study storage."""
+        self._path = pathlib.Path(path)
+
+    @property
+    def path(self) -> pathlib.Path:
+        """Path of the study file."""
+        return self._path
+
+    def save(
+        self,
+        study: object,
+        changed_ids: set[str] | None = None,
+        removed_ids: Iterable[str] = (),
+        release: str | None = None,
+    ):
+        """Save a parametric study to the file.
+
+        Parameters
+        ----------
+        study: ParametricStudy
+            Study to save.
+        changed_ids: set[str], None
+            IDs of the rows added or changed since the study was last saved to
+            this file. If this value is ``None``, the whole study is written.
+            Formats that cannot write part of a study ignore this value.
+        removed_ids: Iterable[str]
+            IDs of the rows removed since the study was last saved to this file.
+        release: str, None
+            Identifier of the process whose claims are released in the same
+            transaction as the save, so that the claims cannot outlive the
+            results. Formats that are not shared between processes ignore
+            this value.
+        """
+        raise NotImplementedError
+
+    def load(self, study_class: type) -> object:
+        """Load a parametric study from the file.
+
+        Parameters
+        ----------
+        study_class: type
+            Class of the study to create.
+
+        Returns
+        -------
+        ParametricStudy
+            Loaded study.
+        """
+        raise NotImplementedError
+
+    def read_data_frame(
+        self,
+        columns: list[str] | None = None,
+        filters: dict[str, object] | None = None,
+    ) -> pd.DataFrame:
+        """Read part of the study data frame from the file.
+
+        Parameters
+        ----------
+        columns: list[str], None
+            Columns to read. If this value is ``None``, all columns are read.
+        filters: dict[str, object], None
+            Values to select rows by. Each key is a column name, and each value is
+            either a single value or a list of values. Rows are read if, for every
+            key, the column holds one of the values.
+
+        Returns
+        -------
+        pd.DataFrame
+            Selected rows and columns, in study order.
+        """
+        raise NotImplementedError
+
+    def claim(
+        self, owner: str, ids: Iterable[str], lease_expiration: float | None = None
+    ) -> list[str]:
+        """Claim ``Pending`` simulations for a process to run.
+
+        A claimed simulation is not returned by claims made by other owners
+        until it is released or its lease expires. ``Running`` simulations whose
+        lease has expired can be claimed, so that the simulations of a process
+        that stopped are resumed. Formats that are not shared between processes
+        grant every claim.
+
+        Parameters
+        ----------
+        owner: str
+            Identifier of the process claiming the simulations.
+        ids: Iterable[str]
+            IDs of the simulations to claim.
+        lease_expiration: float, None
+            Time, in seconds since the epoch, until which the claimed simulations
+            are reserved. If this value is ``None``, the claim does not expire.
+
+        Returns
+        -------
+        list[str]
+            IDs of the simulations that were claimed.
+        """
+        return list(ids)
+
+    def renew(self, owner: str, ids: Iterable[str], lease_expiration: float):
+        """Extend the leases of claimed simulations.
+
+        The leases are written to the file right away, so that other processes
+        see them. Formats that are not shared between processes ignore leases.
+
+        Parameters
+        ----------
+        owner: str
+            Identifier of the process that claimed the simulations. Simulations
+            claimed by other owners are not changed.
+        ids: Iterable[str]
+            IDs of the simulations to renew.
+        lease_expiration: float
+            Time, in seconds since the epoch, until which the simulations are
+            reserved.
+        """
+
+    def release(self, owner: str | None = None):
+        """Release claimed simulations.
+
+        Parameters
+        ----------
+        owner: str, None
+            Identifier of the process whose claims are released. If this
+            value is ``None``, all claims are released.
+        """
+
+
+class DillStorage(StudyStorage):
+    """Stores a parametric study as a single pickle of the study object.
+
+    This is the ``.ps`` format. Every save writes the whole study.
+    """
+
+    def save(
+        self,
+        study: object,
+        changed_ids: set[str] | None = None,
+        removed_ids: Iterable[str] = (),
+        release: str | None = None,
+    ):
+        """Save a parametric study to the file."""
+        _atomic_write(self.path, lambda f: dill.dump(study, f))
+
+    def load(self, study_class: type) -> object:
+        """Load a parametric study from the file."""
+        # Hack to allow for sharing study files cross-platform.
+        temp = None
+        if platform.system() == "Windows":
+            temp = pathlib.PosixPath
+            pathlib.PosixPath = pathlib.WindowsPath
+        else:
+            temp = pathlib.WindowsPath
+            pathlib.WindowsPath = pathlib.PosixPath
+
+        try:
+            with open(self.path, "rb") as f:
+                return dill.load(f)
+        finally:
+            # Undo hack
+            if platform.system() == "Windows":
+                pathlib.PosixPath = temp
+            else:
+                pathlib.WindowsPath = temp
+
+    def read_data_frame(
+        self,
+        columns: list[str] | None = None,
+        filters: dict[str, object] | None = None,
+    ) -> pd.DataFrame:
+        """Read part of the study data frame from the file.
+
+        The whole study is loaded, then the rows and columns are selected.
+        """
+        df = self.load(None)._data_frame
+        if filters:
+            mask = np.ones(len(df), dtype=bool)
+            for column, values in filters.items():
+                mask &= df[column].isin(_filter_values(values)).to_numpy()
+            df = df[mask]
+        if columns is not None:
+            df = df[list(columns)]
+        return df.reset_index(drop=True)
+
+
+class SqliteStorage(StudyStorage):
+    """Stores a parametric study in a SQLite database.
+
+    Each simulation is a row of the ``simulations`` table. Saves write only
+    the rows that changed, in one transaction. Several processes can claim
+    ``Pending`` simulations from the same file.
+
+    New databases use write-ahead logging, so readers do not block a process
+    that is updating the study. Write-ahead logging does not work on a network
+    file system, so a new database on a recognized network file system uses a
+    rollback journal instead. To share a study through a file system that is
+    not recognized, switch the database to a rollback journal with
+    :meth:`set_journal_mode` before other processes open it.
+    """
+
+    SHARED = True
+
+    #: Maximum time, in seconds, to wait for another process to finish writing.
+    BUSY_TIMEOUT = 30
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode for explicit transactions."""
+        return sqlite3.connect(self.path, timeout=self.BUSY_TIMEOUT, isolation_level=None)
+
+    def save(
+        self,
+        study: object,
+        changed_ids: set[str] | None = None,
+        removed_ids: Iterable[str] = (),
+        release: str | None = None,
+    ):
+        """Save a parametric study to the file."""
+        df = study._data_frame
+        columns = list(df.columns)
+        created = not self.path.is_file()
+        if created:
+            changed_ids = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connect()
+        try:
+            if created:
+                # The journal mode is stored in the database, so later saves keep
+                # the mode that was set with set_journal_mode.
+                mode = "DELETE" if _on_network_filesystem(self.path) else "WAL"
+                conn.execute(f"PRAGMA journal_mode={mode}")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._create_schema(conn, columns)
+                if changed_ids is None:
+                    # Other processes may share the study, so a whole study is only
+                    # written to a database without simulations.
+                    if not created and conn.execute("SELECT 1 FROM simulations LIMIT 1").fetchone():
+                        raise ValueError(
+                            f"{self.path} already holds a parametric study. Load it with "
+                            "ParametricStudy.load, or remove the file to replace it."
+                        )
+                    rows = df
+                else:
+                    rows = df[df[ColumnNames.ID].isin(changed_ids)]
+                conn.executemany(
+                    f"DELETE FROM simulations WHERE {_quote(ColumnNames.ID)} = ?",
+                    [(id,) for id in removed_ids],
+                )
+                names = ", ".join(_quote(c) for c in columns)
+                updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns)
+                conn.executemany(
+                    f"INSERT INTO simulations ({names}) "
+                    f"VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT({_quote(ColumnNames.ID)}) DO UPDATE SET {updates}",
+                    (tuple(_to_sql(v) for v in row) for row in rows.itertuples(index=False)),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                    [
+                        ("format_version", FORMAT_VERSION),
+                        ("save_interval", study.save_interval),
+                        ("keep_vtk", int(study.keep_vtk)),
+                    ],
+                )
+                if release is not None:
+                    conn.execute(
+                        "UPDATE simulations SET _claimed_by = NULL, _claimed_at = NULL "
+                        "WHERE _claimed_by = ?",
+                        (release,),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def set_journal_mode(self, mode: str) -> str:
+        """Set the journal mode of the database.
+
+        Use ``"DELETE"`` for a database on a network file system, which does not
+        support write-ahead logging, and ``"WAL"`` for a database on a local
+        disk. The mode is stored in the database, so later saves keep it. No other
+        process may have the database open while the mode is changed.
+
+        Parameters
+        ----------
+        mode: str
+            SQLite journal mode, such as ``"WAL"`` or ``"DELETE"``.
+
+        Returns
+        -------
+        str
+            Journal mode of the database, in lowercase.
+        """
+        conn = self._connect()
+        try:
+            return conn.execute(f"PRAGMA journal_mode={mode}").fetchone()[0]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection, columns: list[str]):
+        """Create the study tables and add columns missing from an older file."""
+        conn.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value)")
+        # Columns have no declared type so that values keep their Python type.
+        definitions = [
+            f"{_quote(c)} TEXT NOT NULL UNIQUE" if c == ColumnNames.ID else _quote(c)
+            for c in columns
+        ]
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS simulations ("
+            "_seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+            f"{', '.join(definitions)}, _claimed_by TEXT, _claimed_at REAL)"
+        )
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(simulations)")}
+        for c in columns:
+            if c not in existing:
+                conn.execute(f"ALTER TABLE simulations ADD COLUMN {_quote(c)}")
+
+    def load(self, study_class: type) -> object:
+        """Load a parametric study from the file."""
+        conn = self._connect()
+        try:
+            metadata = dict(conn.execute("SELECT key, value FROM metadata"))
+            version = metadata.get("format_version", FORMAT_VERSION)
+            if version > FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported version, study version = {version},"
+                    + f"current supported versions up to {FORMAT_VERSION}."
+                )
+            cursor = conn.execute("SELECT * FROM simulations ORDER BY _seq")
+            names = [d[0] for d in cursor.description]
+            keep = [i for i, name in enumerate(names) if not name.startswith("_")]
+            rows = [tuple(_from_sql(row[i]) for i in keep) for row in cursor]
+        finally:
+            conn.close()
+
+        columns = [names[i] for i in keep]
+        study = study_class.__new__(study_class)
+        study.__setstate__(
+            {
+                "_file_name": self.path,
+                "_data_frame": pd.DataFrame(rows, columns=columns, dtype=object),
+                "_save_interval": metadata.get("save_interval", 0),
+                "_keep_vtk": bool(metadata.get("keep_vtk", 1)),
+            }
+        )
+        return study
+
+    def read_data_frame(
+        self,
+        columns: list[str] | None = None,
+        filters: dict[str, object] | None = None,
+    ) -> pd.DataFrame:
+        """Read part of the study data frame from the file.
+
+        The rows and columns are selected by the database query.
+        """
+        where = []
+        params = []
+        for column, values in (filters or {}).items():
+            values = [_to_sql(v) for v in _filter_values(values)]
+            condition = f"{_quote(column)} IN ({', '.join('?' * len(values))})"
+            if any(v is None for v in values):
+                condition = f"({condition} OR {_quote(column)} IS NULL)"
+            where.append(condition)
+            params.extend(values)
+        names = "*" if columns is None else ", ".join(_quote(c) for c in columns)
+        query = f"SELECT {names} FROM simulations"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(query + " ORDER BY _seq", params)
+            names = [d[0] for d in cursor.description]
+            keep = [i for i, name in enumerate(names) if not name.startswith("_")]
+            rows = [tuple(_from_sql(row[i]) for i in keep) for row in cursor]
+        finally:
+            conn.close()
+        return apply_schema(pd.DataFrame(rows, columns=[names[i] for i in keep], dtype=object))
+
+    def claim(
+        self, owner: str, ids: Iterable[str], lease_expiration: float | None = None
+    ) -> list[str]:
+        """Claim ``Pending`` simulations for a process to run."""
+        ids = list(ids)
+        claimed = []
+        id_column = _quote(ColumnNames.ID)
+        lease_column = _quote(ColumnNames.LEASE_EXPIRATION)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Claim in chunks to stay below SQLite's limit on query parameters.
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start : start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    available = [
+                        row[0]
+                        for row in conn.execute(
+                            f"SELECT {id_column} FROM simulations "
+                            f"WHERE {id_column} IN ({placeholders}) "
+                            f"AND {_quote(ColumnNames.STATUS)} IN (?, ?) "
+                            "AND (_claimed_by IS NULL OR _claimed_by = ? "
+                            f"OR {lease_column} < ?)",
+                            [
+                                *chunk,
+                                SimulationStatus.PENDING,
+                                SimulationStatus.RUNNING,
+                                owner,
+                                now,
+                            ],
+                        )
+                    ]
+                    conn.executemany(
+                        "UPDATE simulations SET _claimed_by = ?, _claimed_at = ?, "
+                        f"{lease_column} = ? WHERE {id_column} = ?",
+                        [(owner, now, lease_expiration, id) for id in available],
+                    )
+                    claimed.extend(available)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+        order = {id: i for i, id in enumerate(ids)}
+        return sorted(claimed, key=order.__getitem__)
+
+    def renew(self, owner: str, ids: Iterable[str], lease_expiration: float):
+        """Extend the leases of claimed simulations."""
+        ids = list(ids)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start : start + 500]
+                    conn.execute(
+                        f"UPDATE simulations SET {_quote(ColumnNames.LEASE_EXPIRATION)} = ? "
+                        f"WHERE {_quote(ColumnNames.ID)} IN ({', '.join('?' * len(chunk))}) "
+                        "AND _claimed_by = ?",
+                        [lease_expiration, *chunk, owner],
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def release(self, owner: str | None = None):
+        """Release claimed simulations."""
+        conn = self._connect()
+        try:
+            if owner is None:
+                conn.execute("UPDATE simulations SET _claimed_by = NULL, _claimed_at = NULL")
+            else:
+                conn.execute(
+                    "UPDATE simulations SET _claimed_by = NULL, _claimed_at = NULL "
+                    "WHERE _claimed_by = ?",
+                    (owner,),
+                )
+        finally:
+            conn.close()
+
+
+class ArrowStorage(StudyStorage):
+    """Stores a parametric study in an Arrow IPC file.
+
+    The study data frame is stored column by column with a fixed schema, and the
+    format version is stored in the schema metadata. Files are memory mapped when
+    read, so reading a few columns or rows of a large study only touches the
+    parts of the file that are used. Every save writes the whole study.
+    """
+
+    #: Schema metadata key of the file format version.
+    FORMAT_VERSION_KEY = b"pyadditive.format_version"
+    #: Schema metadata key of the study save interval.
+    SAVE_INTERVAL_KEY = b"pyadditive.save_interval"
+    #: Schema metadata key of whether microstructure VTK data is kept.
+    KEEP_VTK_KEY = b"pyadditive.keep_vtk"
+
+    def save(
+        self,
+        study: object,
+        changed_ids: set[str] | None = None,
+        removed_ids: Iterable[str] = (),
+        release: str | None = None,
+    ):
+        """Save a parametric study to the file."""
+        df = study._data_frame
+        arrays = [_to_arrow(df[c], _ARROW_TYPES.get(c, pa.float64())) for c in df.columns]
+        table = pa.Table.from_arrays(
+            arrays,
+            names=list(df.columns),
+            metadata={
+                self.FORMAT_VERSION_KEY: str(FORMAT_VERSION),
+                self.SAVE_INTERVAL_KEY: repr(study.save_interval),
+                self.KEEP_VTK_KEY: str(int(study.keep_vtk)),
+            },
+        )
+
+        def write(f):
+            with pa.ipc.new_file(f, table.schema) as writer:
+                writer.write_table(table)
+
+        _atomic_write(self.path, write)
+
+    def _read(self, read: Callable[[pa.Table], object]) -> object:
+        """Memory map the file and pass its table to a function.
+
+        The table must not be used after the function returns.
+        """
+        with pa.memory_map(str(self.path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+            metadata = table.schema.metadata or {}
+            version = int(metadata.get(self.FORMAT_VERSION_KEY, FORMAT_VERSION))
+            if version > FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported version, study version = {version},"
+                    + f"current supported versions up to {FORMAT_VERSION}."
+                )
+            return read(table)
+
+    def load(self, study_class: type) -> object:
+        """Load a parametric study from the file."""
+        table_metadata = {}
+
+        def read(table: pa.Table) -> pd.DataFrame:
+            table_metadata.update(table.schema.metadata or {})
+            return _frame_from_arrow(table)
+
+        df = self._read(read)
+        study = study_class.__new__(study_class)
+        study.__setstate__(
+            {
+                "_file_name": self.path,
+                "_data_frame": df,
+                "_save_interval": float(table_metadata.get(self.SAVE_INTERVAL_KEY, 0)),
+                "_keep_vtk": bool(int(table_metadata.get(self.KEEP_VTK_KEY, 1))),
+            }
+        )
+        return study
+
+    def read_data_frame(
+        self,
+        columns: list[str] | None = None,
+        filters: dict[str, object] | None = None,
+    ) -> pd.DataFrame:
+        """Read part of the study data frame from the file.
+
+        Only the filter columns are scanned to select the rows, and only the
+        selected rows of the requested columns are converted.
+        """
+
+        def read(table: pa.Table) -> pd.DataFrame:
+            if columns is not None:
+                # Project before filtering so that only the requested and filter
+                # columns of the selected rows are built.
+                table = table.select(list(dict.fromkeys([*columns, *(filters or {})])))
+            if filters:
+                mask = None
+                for column, values in filters.items():
+                    values = _filter_values(values)
+                    field = table.schema.field(column).type
+                    if pa.types.is_dictionary(field):
+                        field = field.value_type
+                    nulls = any(_to_sql(v) is None for v in values)
+                    value_set = pa.array([v for v in values if _to_sql(v) is not None], field)
+                    selected = pc.is_in(table[column], value_set=value_set)
+                    if nulls:
+                        selected = pc.or_(selected, pc.is_null(table[column]))
+                    mask = selected if mask is None else pc.and_(mask, selected)
+                table = table.filter(mask)
+                if columns is not None:
+                    table = table.select(list(columns))
+            return _frame_from_arrow(table)
+
+        return self._read(read)
+
+
+#: Storage class for each study file suffix. Files with other suffixes use
+#: :class:`DillStorage`.
+STORAGE_SUFFIXES = {
+    ".ps": DillStorage,
+    ".arrow": ArrowStorage,
+    ".db": SqliteStorage,
+    ".sqlite": SqliteStorage,
+    ".sqlite3": SqliteStorage,
+}
+
+
+def storage_for(path: str | os.PathLike) -> StudyStorage:
+    """Return the storage for a study file.
+
+    Existing files are identified by their contents. New files are identified
+    by their suffix.
+
+    Parameters
+    ----------
+    path: str, os.PathLike
+        Path of the study file.
+
+    Returns
+    -------
+    StudyStorage
+        Storage for the file.
+    """
+    path = pathlib.Path(path)
+    if path.is_file():
+        with open(path, "rb") as f:
+            header = f.read(len(SQLITE_HEADER))
+        if header == SQLITE_HEADER:
+            return SqliteStorage(path)
+        if header.startswith(ARROW_HEADER):
+            return ArrowStorage(path)
+    return STORAGE_SUFFIXES.get(path.suffix.lower(), DillStorage)(path)
+
+
+#: Arrow types of the study columns that do not hold floating point values.
+_ARROW_TYPES = {
+    ColumnNames.ITERATION: pa.int64(),
+    ColumnNames.PRIORITY: pa.int64(),
+    ColumnNames.TYPE: pa.dictionary(pa.int32(), pa.string()),
+    ColumnNames.ID: pa.string(),
+    ColumnNames.STATUS: pa.dictionary(pa.int32(), pa.string()),
+    ColumnNames.MATERIAL: pa.dictionary(pa.int32(), pa.string()),
+    ColumnNames.RANDOM_SEED: pa.int64(),
+    ColumnNames.ERROR_MESSAGE: pa.string(),
+}
+
+
+def _atomic_write(path: pathlib.Path, write: Callable[[object], None]):
+    """Write a file through a temporary file.
+
+    The temporary file is renamed to ``path`` once it is complete, so that an
+    interrupted save does not corrupt an existing study file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        pathlib.Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+#: File system types, as listed in ``/proc/mounts``, that do not support
+#: SQLite write-ahead logging.
+_NETWORK_FILESYSTEMS = {
+    "nfs",
+    "nfs4",
+    "cifs",
+    "smb3",
+    "smbfs",
+    "9p",
+    "afs",
+    "ceph",
+    "glusterfs",
+    "lustre",
+    "gpfs",
+    "fuse.sshfs",
+}
+
+
+def _on_network_filesystem(path: pathlib.Path) -> bool:
+    """Return whether a file is on a network file system.
+
+    Only Linux mount types and Windows network drives are recognized.
+    """
+    path = path.resolve()
+    if platform.system() == "Windows":
+        if str(path).startswith("\\\\"):
+            return True
+        import ctypes
+
+        DRIVE_REMOTE = 4
+        return ctypes.windll.kernel32.GetDriveTypeW(path.anchor) == DRIVE_REMOTE
+    try:
+        with open("/proc/self/mounts") as f:
+            mounts = [line.split()[1:3] for line in f]
+    except OSError:
+        return False
+    # The file is on the longest mount point that contains it.
+    fstype = None
+    length = -1
+    for mount_point, type in mounts:
+        mount_point = mount_point.replace("\\040", " ")
+        if path.is_relative_to(mount_point) and len(mount_point) > length:
+            fstype, length = type, len(mount_point)
+    return fstype in _NETWORK_FILESYSTEMS
+
+
+def _filter_values(values: object) -> list:
+    """Return the list of values to select rows by."""
+    if isinstance(values, (list, tuple, set, frozenset, np.ndarray, pd.Series)):
+        return list(values)
+    return [values]
+
+
+def _to_arrow(values: pd.Series, type: pa.DataType) -> pa.Array:
+    """Convert a data frame column to an Arrow array."""
+    if pa.types.is_floating(type):
+        return pa.array(pd.to_numeric(values, errors="coerce").astype(float), type)
+    return pa.Array.from_pandas(values, type=type)
+
+
+def _frame_from_arrow(table: pa.Table) -> pd.DataFrame:
+    """Convert an Arrow table to a study data frame with typed columns.
+
+    Missing strings are converted to ``nan``, as in the data frame of a new study.
+    """
+    df = table.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+    for name in df.columns:
+        if df[name].dtype == object:
+            df[name] = df[name].where(df[name].notna(), np.nan)
+    return apply_schema(df)
+
+
+def _quote(name: str) -> str:
+    """Quote a column name for use in an SQL statement."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_sql(value: object) -> object:
+    """Convert a data frame value to a value SQLite can store."""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def _from_sql(value: object) -> object:
+    """Convert a value read from SQLite to a data frame value."""
+    return np.nan if value is None else value
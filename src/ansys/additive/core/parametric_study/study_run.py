@@ -0,0 +1,249 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Runs the simulations of a parametric study in a background thread."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+from ansys.additive.core import Additive, CancellationToken, SimulationCancelled, SimulationType
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .parametric_study import ParametricStudy
+
+
+@dataclass(frozen=True)
+class StudyRunProgress:
+    """Provides the progress of a background run of a parametric study.
+
+    Parameters
+    ----------
+    total: int
+        Number of simulations selected for the run.
+    finished: int
+        Number of simulations that finished, successfully or not.
+    running: int
+        Number of simulations in progress.
+    elapsed_time: float
+        Time, in seconds, since the run started.
+    """
+
+    total: int = 0
+    finished: int = 0
+    running: int = 0
+    elapsed_time: float = 0.0
+
+    @property
+    def fraction(self) -> float:
+        """Fraction of the simulations of the run that finished."""
+        return self.finished / self.total if self.total > 0 else 0.0
+
+
+class StudyRun:
+    """Provides a handle to the simulations of a parametric study running in a
+    background thread.
+
+    The simulations run as with :meth:`ParametricStudy.run_simulations`. Results
+    are written to the study as they are received, so :meth:`ParametricStudy.data_frame`
+    and the display functions show the partially completed study while the run is in
+    progress. Do not change the study in other ways until the run is done.
+
+    Use :meth:`ParametricStudy.run_simulations_background` to create a run.
+
+    Parameters
+    ----------
+    study: ParametricStudy
+        Study to run.
+    additive: Additive
+        Additive service connection to use for running simulations.
+    type: list[SimulationType], None
+        Type of simulations to run. If this value is ``None``,
+        all simulation types are run.
+    priority: int, None
+        Priority of simulations to run. If this value is ``None``,
+        all priorities are run.
+    lease: float, None
+        Time, in seconds, that the running simulations are reserved for this run
+        without renewing their lease. For more information, see
+        :meth:`ParametricStudy.run_simulations`.
+    limit: int, None
+        Maximum number of simulations to run. If this value is ``None``,
+        all the pending simulations are run.
+    on_complete: Callable, None
+        Function called with the run, from the background thread, when the run
+        is done, whether it finished, was cancelled, or failed.
+    log: logging.Logger, None
+        Log to write errors of the ``on_complete`` function to.
+    """
+
+    def __init__(
+        self,
+        study: ParametricStudy,
+        additive: Additive,
+        type: list[SimulationType] | None = None,
+        priority: int | None = None,
+        lease: float | None = None,
+        limit: int | None = None,
+        on_complete: Callable[[StudyRun], None] | None = None,
+        log: logging.Logger = None,
+    ):
+        """Initialize the run and start it."""
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be at least 1.")
+        self._study = study
+        self._on_complete = on_complete
+        self._log = log if log else logging.getLogger(__name__)
+        self._cancellation = CancellationToken()
+        # Set while simulations may start
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._lock = threading.Lock()
+        self._started = set()
+        self._finished = set()
+        self._result = None
+        self._exception = None
+        self._start_time = time.monotonic()
+        self._end_time = None
+        self._done = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(additive, type, priority, lease, limit),
+            daemon=True,
+        )
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        """Whether the run finished, was cancelled, or failed."""
+        return self._done.is_set()
+
+    @property
+    def paused(self) -> bool:
+        """Whether the run is paused."""
+        return not self._resumed.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation of the run was requested."""
+        return self._cancellation.cancelled
+
+    def progress(self) -> StudyRunProgress:
+        """Return the progress of the run."""
+        # The study holds the simulations of the run that have not finished.
+        with self._study._save_lock:
+            unfinished = len(self._study._running_ids)
+        with self._lock:
+            finished = len(self._finished)
+            running = len(self._started - self._finished)
+        end = self._end_time if self._end_time is not None else time.monotonic()
+        return StudyRunProgress(
+            total=finished + unfinished,
+            finished=finished,
+            running=running,
+            elapsed_time=end - self._start_time,
+        )
+
+    def pause(self) -> None:
+        """Stop starting simulations.
+
+        Simulations in progress continue and their results are written to the
+        study. The other simulations wait until :meth:`resume` is called.
+        """
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        """Start simulations again after :meth:`pause`."""
+        self._resumed.set()
+
+    def cancel(self) -> None:
+        """Cancel the run.
+
+        Simulations that have not finished are returned to ``Pending``.
+        """
+        self._cancellation.cancel()
+        self._resumed.set()
+
+    def wait(self, timeout: float | None = None) -> int:
+        """Wait for the run to be done.
+
+        Parameters
+        ----------
+        timeout: float, default: None
+            Maximum time, in seconds, to wait. If this value is ``None``,
+            wait until the run is done.
+
+        Returns
+        -------
+        int
+            Number of simulations that finished, successfully or not.
+
+        Raises
+        ------
+        TimeoutError
+            The run is not done after ``timeout`` seconds.
+        Exception
+            The exception that stopped the run.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("The parametric study run is not done.")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def _on_start(self, input) -> None:
+        """Hold a simulation while the run is paused."""
+        self._resumed.wait()
+        with self._lock:
+            self._started.add(input.id)
+
+    def _on_result(self, summary) -> None:
+        """Count a simulation that finished."""
+        if isinstance(summary, SimulationCancelled):
+            return
+        with self._lock:
+            self._finished.add(summary.input.id)
+
+    def _run(self, additive, type, priority, lease, limit) -> None:
+        """Run the simulations and call the completion function."""
+        try:
+            self._result = self._study.run_simulations(
+                additive,
+                type=type,
+                priority=priority,
+                cancellation=self._cancellation,
+                lease=lease,
+                limit=limit,
+                on_start=self._on_start,
+                on_result=self._on_result,
+            )
+        except Exception as e:
+            self._exception = e
+        self._end_time = time.monotonic()
+        self._done.set()
+        if self._on_complete:
+            try:
+                self._on_complete(self)
+            except Exception as e:
+                self._log.warning("Run completion function failed: %s", e)
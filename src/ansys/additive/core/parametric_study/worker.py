@@ -0,0 +1,248 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides a worker that runs the simulations of a shared parametric study.
+
+Start workers on one or more machines with the ``pyadditive-worker`` command,
+giving each the same SQLite study file. Each worker claims a batch of pending
+simulations, runs them on its own Additive servers, and writes the results back
+to the study. If a worker stops, the simulations it claimed are run by another
+worker once their lease expires.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import threading
+
+from ansys.additive.core import Additive, SimulationStatus, SimulationType
+from ansys.additive.core.cancellation import CancellationToken
+from ansys.additive.core.server_connection import DEFAULT_PRODUCT_VERSION
+
+from .constants import ColumnNames
+from .parametric_study import ParametricStudy
+from .storage import storage_for
+
+#: Default number of simulations a worker claims at a time.
+DEFAULT_BATCH_SIZE = 10
+
+#: Default time, in seconds, a worker waits before checking the study for
+#: simulations again.
+DEFAULT_POLL_INTERVAL = 60.0
+
+
+def run_worker(
+    study_file: str | os.PathLike,
+    additive: Additive,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    type: list[SimulationType] | None = None,
+    priority: int | None = None,
+    lease: float | None = None,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    wait: bool = False,
+    cancellation: CancellationToken | None = None,
+) -> int:
+    """Run the pending simulations of a shared parametric study.
+
+    The study is loaded again for each batch, so that the worker sees the
+    results written by other workers. Simulations that other workers are
+    running are not claimed. If they are the only unfinished simulations, the
+    worker waits for them, and runs those whose lease expires.
+
+    Parameters
+    ----------
+    study_file: str, os.PathLike
+        Name of the study file. The study must be stored in a SQLite database.
+    additive: Additive
+        Additive service connection to use for running simulations.
+    batch_size: int, default: DEFAULT_BATCH_SIZE
+        Maximum number of simulations to claim at a time.
+    type: list[SimulationType], default: None
+        Type of simulations to run. If this value is ``None``,
+        all simulation types are run.
+    priority: int, default: None
+        Priority of simulations to run. If this value is ``None``,
+        all priorities are run.
+    lease: float, default: None
+        Time, in seconds, that claimed simulations are reserved for this worker
+        without renewing their lease. For more information, see
+        :meth:`ParametricStudy.run_simulations`.
+    poll_interval: float, default: DEFAULT_POLL_INTERVAL
+        Time, in seconds, to wait before checking the study again when no
+        simulation can be claimed.
+    wait: bool, default: False
+        Whether to keep waiting for new simulations once the study has no
+        pending or running simulations. If ``False``, the worker returns.
+    cancellation: CancellationToken, default: None
+        Token to stop the worker with from another thread. The simulations that
+        are running are returned to ``Pending``.
+
+    Returns
+    -------
+    int
+        Number of simulations the worker ran.
+    """
+    if not storage_for(study_file).SHARED:
+        raise ValueError(f"{study_file} is not a SQLite study and cannot be shared.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    filters = {ColumnNames.STATUS: [SimulationStatus.PENDING, SimulationStatus.RUNNING]}
+    if type is not None:
+        filters[ColumnNames.TYPE] = type
+    if priority is not None:
+        filters[ColumnNames.PRIORITY] = priority
+
+    stopped = threading.Event()
+    if cancellation is not None:
+        cancellation.add_callback(stopped.set)
+    total = 0
+    try:
+        while not stopped.is_set():
+            study = ParametricStudy.load(study_file)
+            count = study.run_simulations(
+                additive,
+                type=type,
+                priority=priority,
+                cancellation=cancellation,
+                lease=lease,
+                limit=batch_size,
+            )
+            total += count
+            if count:
+                continue
+            unfinished = ParametricStudy.load_data_frame(
+                study_file, columns=[ColumnNames.STATUS], filters=filters
+            )
+            if unfinished.empty and not wait:
+                break
+            stopped.wait(poll_interval)
+    finally:
+        if cancellation is not None:
+            cancellation.remove_callback(stopped.set)
+    return total
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``pyadditive-worker`` command.
+
+    Parameters
+    ----------
+    argv: list[str], default: None
+        Command line arguments. If this value is ``None``, the arguments of the
+        process are used.
+
+    Returns
+    -------
+    int
+        Exit status of the command.
+    """
+    parser = argparse.ArgumentParser(
+        prog="pyadditive-worker",
+        description="Run the pending simulations of a parametric study stored in a "
+        "SQLite database. Several workers can run the same study.",
+    )
+    parser.add_argument("study_file", help="SQLite parametric study file.")
+    parser.add_argument(
+        "--server",
+        action="append",
+        dest="servers",
+        metavar="HOST:PORT",
+        help="Address of an Additive server. Repeat to use several servers. "
+        "If no server is given, local servers are started.",
+    )
+    parser.add_argument("--nservers", type=int, default=1, help="Number of local servers to start.")
+    parser.add_argument(
+        "--product-version",
+        default=DEFAULT_PRODUCT_VERSION,
+        help="Version of the Ansys product installation, such as 241.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=1,
+        help="Maximum number of simulations to run on each server at the same time.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Maximum number of simulations to claim at a time.",
+    )
+    parser.add_argument(
+        "--type",
+        action="append",
+        dest="types",
+        choices=[
+            SimulationType.SINGLE_BEAD,
+            SimulationType.POROSITY,
+            SimulationType.MICROSTRUCTURE,
+        ],
+        help="Type of simulations to run. Repeat to run several types.",
+    )
+    parser.add_argument("--priority", type=int, help="Priority of simulations to run.")
+    parser.add_argument(
+        "--lease",
+        type=float,
+        help="Time, in seconds, that claimed simulations are reserved without renewing "
+        "their lease.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Time, in seconds, to wait when no simulation can be claimed.",
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep waiting for new simulations when the study is finished.",
+    )
+    parser.add_argument("--cache-dir", help="Directory of the simulation result cache.")
+    parser.add_argument("--log-level", default="INFO", help="Logging level.")
+    args = parser.parse_args(argv)
+
+    if not storage_for(args.study_file).SHARED:
+        parser.error(f"{args.study_file} is not a SQLite study.")
+
+    additive = Additive(
+        server_connections=args.servers,
+        nservers=args.nservers,
+        product_version=args.product_version,
+        log_level=args.log_level,
+        max_concurrency=args.max_concurrency,
+        cache_dir=args.cache_dir,
+    )
+    cancellation = CancellationToken()
+    signal.signal(signal.SIGTERM, lambda signum, frame: cancellation.cancel())
+    run_worker(
+        args.study_file,
+        additive,
+        batch_size=args.batch_size,
+        type=args.types,
+        priority=args.priority,
+        lease=args.lease,
+        poll_interval=args.poll_interval,
+        wait=args.wait,
+        cancellation=cancellation,
+    )
+    return 0
@@ -0,0 +1,219 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+"""Provides retry and failover of simulations on transient server failures."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import logging
+import threading
+
+import grpc
+
+from ansys.additive.core.server_connection import ServerConnection
+
+
+def status_code(error: BaseException) -> grpc.StatusCode | None:
+    """Return the status code of a failed gRPC call, or ``None`` for other errors."""
+    code = getattr(error, "code", None)
+    if isinstance(error, grpc.RpcError) and callable(code):
+        return code()
+    return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Provides the policy for retrying simulations that fail with a transient error.
+
+    A simulation that fails with one of the ``retryable_codes`` is resubmitted,
+    preferably to a server that has not failed it yet. A server that fails
+    ``eject_after`` simulations in a row is ejected from rotation until a
+    background health probe finds that it responds again.
+
+    A simulation that exceeds its client deadline is never retried, because a
+    retry would take as long again. It returns a :class:`SimulationTimeout`
+    result instead. Adding ``DEADLINE_EXCEEDED`` to ``retryable_codes`` only
+    retries simulations that have no client deadline, when a server reports
+    that code itself.
+
+    Parameters
+    ----------
+    max_attempts: int, default: 3
+        Maximum number of times to run a simulation, including the first attempt.
+    initial_backoff: float, default: 1.0
+        Delay, in seconds, before the first retry.
+    max_backoff: float, default: 30.0
+        Maximum delay, in seconds, before a retry.
+    backoff_multiplier: float, default: 2.0
+        Factor the delay is multiplied by after each retry.
+    retryable_codes: tuple[grpc.StatusCode], default: (UNAVAILABLE,)
+        gRPC status codes that cause a simulation to be retried.
+    eject_after: int, default: 2
+        Number of consecutive retryable failures after which a server is ejected.
+    probe_interval: float, default: 10.0
+        Interval, in seconds, at which ejected servers are checked for recovery.
+    """
+
+    max_attempts: int = 3
+    initial_backoff: float = 1.0
+    max_backoff: float = 30.0
+    backoff_multiplier: float = 2.0
+    retryable_codes: tuple[grpc.StatusCode, ...] = (grpc.StatusCode.UNAVAILABLE,)
+    eject_after: int = 2
+    probe_interval: float = 10.0
+
+    def __post_init__(self):
+        """Validate the policy."""
+        if self.max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1.")
+        if self.eject_after < 1:
+            raise ValueError("eject_after must be at least 1.")
+        if self.initial_backoff < 0 or self.max_backoff < 0 or self.backoff_multiplier < 1:
+            raise ValueError("Invalid backoff parameters.")
+        if self.probe_interval <= 0:
+            raise ValueError("probe_interval must be positive.")
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Return whether an error is a transient gRPC failure that should be retried."""
+        code = getattr(error, "code", None)
+        return (
+            isinstance(error, grpc.RpcError) and callable(code) and code() in self.retryable_codes
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay, in seconds, before retrying after the given failed attempt.
+
+        Parameters
+        ----------
+        attempt: int
+            Number of the failed attempt, starting at 1.
+        """
+        return min(
+            self.initial_backoff * self.backoff_multiplier ** (attempt - 1), self.max_backoff
+        )
+
+
+class HealthMonitor:
+    """Tracks failing servers and re-admits ejected servers when they recover.
+
+    While at least one server is ejected, a background thread calls the ``probe``
+    function on each ejected server every ``probe_interval`` seconds. A server is
+    re-admitted when the probe returns ``True``, and the functions registered with
+    :meth:`add_callback` are called with it.
+
+    Parameters
+    ----------
+    policy: RetryPolicy
+        Policy that defines when servers are ejected and how often they are probed.
+    probe: Callable[[ServerConnection], bool], None
+        Function that returns whether a server responds. By default, the ``ready``
+        method of the server is called.
+    log: logging.Logger, None
+        Log to write health messages to.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        probe: Callable[[ServerConnection], bool] | None = None,
+        log: logging.Logger = None,
+    ):
+        """Initialize the monitor."""
+        self._policy = policy
+        self._probe = probe if probe else lambda server: server.ready(timeout=policy.probe_interval)
+        self._log = log if log else logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._failures = {}
+        self._ejected = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._callbacks = []
+
+    def add_callback(self, callback: Callable[[ServerConnection], None]) -> None:
+        """Register a function to call with each server that is re-admitted.
+
+        The function is called from the probing thread.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[ServerConnection], None]) -> None:
+        """Unregister a function registered with :meth:`add_callback`."""
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def is_ejected(self, server: ServerConnection) -> bool:
+        """Return whether a server is ejected from rotation."""
+        with self._lock:
+            return id(server) in self._ejected
+
+    def ejected(self) -> list[ServerConnection]:
+        """Return the servers that are ejected from rotation."""
+        with self._lock:
+            return list(self._ejected.values())
+
+    def record_success(self, server: ServerConnection) -> None:
+        """Record that a server completed a simulation."""
+        with self._lock:
+            self._failures.pop(id(server), None)
+
+    def record_failure(self, server: ServerConnection) -> None:
+        """Record a retryable failure of a server and eject it if it keeps failing."""
+        with self._lock:
+            failures = self._failures.get(id(server), 0) + 1
+            self._failures[id(server)] = failures
+            if failures < self._policy.eject_after or id(server) in self._ejected:
+                return
+            self._ejected[id(server)] = server
+            self._log.warning(
+                "Ejected server %s after %d consecutive failures", server.channel_str, failures
+            )
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._probe_ejected, daemon=True)
+                self._thread.start()
+
+    def _probe_ejected(self) -> None:
+        """Probe ejected servers until all of them have recovered."""
+        while not self._stop.wait(self._policy.probe_interval):
+            for server in self.ejected():
+                try:
+                    recovered = self._probe(server)
+                except Exception:
+                    recovered = False
+                if recovered:
+                    with self._lock:
+                        self._ejected.pop(id(server), None)
+                        self._failures.pop(id(server), None)
+                        callbacks = list(self._callbacks)
+                    self._log.info("Re-admitted server %s", server.channel_str)
+                    for callback in callbacks:
+                        callback(server)
+            with self._lock:
+                if not self._ejected:
+                    self._thread = None
+                    return
+
+    def stop(self) -> None:
+        """Stop probing ejected servers."""
+        self._stop.set()
@@ -21,5 +21,6 @@
 # SOFTWARE.
 """Server connection definition and utilities."""
 
+from ansys.additive.core.server_connection.async_server_connection import AsyncServerConnection
 from ansys.additive.core.server_connection.constants import DEFAULT_PRODUCT_VERSION
 from ansys.additive.core.server_connection.server_connection import ServerConnection
@@ -0,0 +1,158 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from ansys.api.additive.v0.about_pb2_grpc import AboutServiceStub
+from ansys.api.additive.v0.additive_materials_pb2_grpc import MaterialsServiceStub
+from ansys.api.additive.v0.additive_simulation_pb2_grpc import SimulationServiceStub
+from google.protobuf.empty_pb2 import Empty
+import grpc
+
+from ansys.additive.core.server_connection.constants import (
+    DEFAULT_PRODUCT_VERSION,
+    DEFAULT_READY_TIMEOUT,
+)
+from ansys.additive.core.server_connection.network_utils import create_async_channel
+from ansys.additive.core.server_connection.server_connection import (
+    ServerConnectionStatus,
+    _ServerConnectionBase,
+)
+
+
+class AsyncServerConnection(_ServerConnectionBase):
+    """Provides an ``asyncio`` connection to an Additive server.
+
+    This class is the :mod:`grpc.aio` counterpart of :class:`ServerConnection`.
+    The service stubs return awaitable calls, so many simulations can be driven
+    from one event loop without an operating system thread per call.
+
+    If neither ``channel`` nor ``addr`` are provided, an attempt will be
+    made to start an Additive server and connect to it, in the same way
+    as :class:`ServerConnection`.
+
+    Unlike :class:`ServerConnection`, the connection is not checked during
+    initialization. Await the :meth:`ready` method before use.
+
+    .. note::
+       Create instances of this class from within a running event loop.
+
+    Parameters
+    ----------
+    channel: grpc.aio.Channel, None
+        ``asyncio`` gRPC channel connected to server.
+    addr: str, None
+        IPv4 address of server of the form ``host:port``.
+    product_version: str
+        Version of the Ansys product installation in the form ``"YYR"``, where ``YY``
+        is the two-digit year and ``R`` is the release number. For example, the release
+        2024 R1 would be specified as ``241``. This parameter is only applicable in
+        PyPIM environments and on localhost.
+    log: logging.Logger, None
+        Log to write connection messages to.
+    max_concurrency: int, default: 1
+        Maximum number of simulations to run on the server at the same time.
+    max_concurrency_by_type: dict[str, int], None
+        Per simulation type overrides of the ``max_concurrency`` value. For more
+        information, see :class:`ServerConnection`.
+    """
+
+    def __init__(
+        self,
+        channel: grpc.aio.Channel | None = None,
+        addr: str | None = None,
+        product_version: str = DEFAULT_PRODUCT_VERSION,
+        log: logging.Logger = None,
+        max_concurrency: int = 1,
+        max_concurrency_by_type: dict[str, int] | None = None,
+    ) -> None:
+        """Initialize an ``asyncio`` server connection."""
+
+        if channel is not None and addr is not None:
+            raise ValueError("Both 'channel' and 'addr' cannot both be specified.")
+
+        self._log = log if log else logging.getLogger(__name__)
+        self._init_concurrency(max_concurrency, max_concurrency_by_type)
+        self._start_time = time.monotonic()
+        self._startup_time = None
+
+        if channel:
+            self._channel = channel
+            self._target = ""
+        else:
+            self._target = addr if addr else self._start_server(product_version)
+            self._channel = create_async_channel(self._target)
+
+        # assign service stubs
+        self._materials_stub = MaterialsServiceStub(self._channel)
+        self._simulation_stub = SimulationServiceStub(self._channel)
+        self._about_stub = AboutServiceStub(self._channel)
+
+    @property
+    def channel_str(self) -> str:
+        """GRPC channel target.
+
+        The form is generally ``"ip:port"``. For example, ``"127.0.0.1:50052"``.
+        An empty string is returned if the connection was created from a channel.
+        """
+        return self._target
+
+    async def status(self) -> ServerConnectionStatus:
+        """Return the server connection status."""
+        try:
+            response = await self._about_stub.About(Empty())
+        except grpc.RpcError:
+            return ServerConnectionStatus(False, self.channel_str)
+        metadata = {}
+        for key in response.metadata:
+            metadata[key] = response.metadata[key]
+        return ServerConnectionStatus(True, self.channel_str, metadata)
+
+    async def ready(self, timeout: float = DEFAULT_READY_TIMEOUT) -> bool:
+        """Return whether the server is ready.
+
+        Parameters
+        ----------
+        timeout: float
+            Maximum time, in seconds, to wait for the server to respond.
+
+        Returns
+        -------
+        bool:
+            True means server is ready. False means the server did not respond
+            within the timeout.
+        """
+        try:
+            await asyncio.wait_for(self._channel.channel_ready(), timeout)
+            await self._about_stub.About(Empty(), timeout=timeout)
+        except (asyncio.TimeoutError, grpc.RpcError):
+            return False
+        if self._startup_time is None:
+            self._startup_time = time.monotonic() - self._start_time
+        return True
+
+    async def close(self):
+        """Close the channel to the server."""
+        await self._channel.close()
@@ -28,3 +28,5 @@ PIM_PRODUCT_NAME = "additive"
 DEFAULT_PRODUCT_VERSION = "242"
 ADDITIVE_SERVER_EXE_NAME = "additiveserver"
 ADDITIVE_SERVER_SUBDIR = Path("Additive") / "additiveserver"
+DEFAULT_READY_TIMEOUT = 30
+"""Default time, in seconds, to wait for a server to respond."""
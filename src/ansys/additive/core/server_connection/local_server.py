@@ -27,7 +27,6 @@ import os
 from pathlib import Path
 import socket
 import subprocess
-import time
 
 from ansys.additive.core import USER_DATA_PATH
 from ansys.additive.core.server_connection.constants import (
@@ -61,6 +60,10 @@ class LocalServer:
         -------
         process: subprocess.Popen
             Server process. To stop the server, call the ``kill()`` method on the returned object.
+
+        .. note::
+            This method does not wait for the server to accept connections. Use the
+            :meth:`ServerConnection.ready` method to wait for the server.
         """
         server_exe = ""
         if os.name == "nt":
@@ -97,7 +100,8 @@ class LocalServer:
 
         start_time = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        with open(os.path.join(cwd, f"additiveserver_{start_time}.log"), "w") as log_file:
+        log_name = f"additiveserver_{start_time}_{port}.log"
+        with open(os.path.join(cwd, log_name), "w") as log_file:
             server_process = subprocess.Popen(
                 f'"{server_exe}" --port {port}',
                 shell=os.name != "nt",  # use shell on Linux
@@ -105,7 +109,7 @@ class LocalServer:
                 stdout=log_file,
                 stderr=subprocess.STDOUT,
             )
-            time.sleep(2)  # wait for server to start
+            # Readiness is detected by the server connection. Only catch immediate failures here.
             if server_process.poll():
                 raise Exception(f"Server exited with code {server_process.returncode}")
 
@@ -28,6 +28,9 @@ import grpc
 
 MAX_RCV_MSG_LEN = 256 * 1024**2
 
+SERVER_MAX_RCV_MSG_LEN = 4 * 1024**2
+"""Size, in bytes, of the largest message a server receives. This is the gRPC default."""
+
 
 def check_valid_ip(ip):
     """Check for valid IP address."""
@@ -62,7 +65,36 @@ def create_channel(target: str, max_rcv_msg_len: int = MAX_RCV_MSG_LEN):
     channel: grpc.Channel
         Insecure gRPC channel.
     """
+    _validate_target(target)
+    return grpc.insecure_channel(
+        target, options=[("grpc.max_receive_message_length", max_rcv_msg_len)]
+    )
 
+
+def create_async_channel(target: str, max_rcv_msg_len: int = MAX_RCV_MSG_LEN):
+    """Create an insecure ``asyncio`` gRPC channel.
+
+    Parameters
+    ----------
+    target: str
+        IP address of the host to connect to, of the form ``host:port``.
+    max_rcv_msg_len: int
+        Size, in bytes, of the buffer used to receive messages. Default is
+        :obj:`MAX_RCV_MSG_LEN`.
+
+    Returns
+    -------
+    channel: grpc.aio.Channel
+        Insecure ``asyncio`` gRPC channel.
+    """
+    _validate_target(target)
+    return grpc.aio.insecure_channel(
+        target, options=[("grpc.max_receive_message_length", max_rcv_msg_len)]
+    )
+
+
+def _validate_target(target: str):
+    """Check that a target string is of the form ``host:port``."""
     (host, port_str) = target.split(":")
     if not host:
         raise ValueError(
@@ -71,7 +103,3 @@ def create_channel(target: str, max_rcv_msg_len: int = MAX_RCV_MSG_LEN):
     ip = socket.gethostbyname(host)
     check_valid_ip(ip)
     check_valid_port(int(port_str))
-
-    return grpc.insecure_channel(
-        target, options=[("grpc.max_receive_message_length", max_rcv_msg_len)]
-    )
@@ -22,9 +22,11 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 import logging
+import threading
 import time
+import warnings
 
 from ansys.api.additive.v0.about_pb2_grpc import AboutServiceStub
 from ansys.api.additive.v0.additive_materials_pb2_grpc import MaterialsServiceStub
@@ -35,11 +37,16 @@ import grpc
 
 from ansys.additive.core.server_connection.constants import (
     DEFAULT_PRODUCT_VERSION,
+    DEFAULT_READY_TIMEOUT,
     LOCALHOST,
     PIM_PRODUCT_NAME,
 )
 from ansys.additive.core.server_connection.local_server import LocalServer
 from ansys.additive.core.server_connection.network_utils import create_channel
+from ansys.additive.core.simulation import SimulationType
+
+PROCESS_POLL_INTERVAL = 0.5
+"""Interval, in seconds, at which a local server process is checked while waiting for it."""
 
 
 @dataclass(frozen=True)
@@ -61,7 +68,214 @@ class ServerConnectionStatus:
     metadata: dict = None
 
 
-class ServerConnection:
+@dataclass(frozen=True)
+class ServerStatistics:
+    """Provides simulation throughput statistics for a server.
+
+    Parameters
+    ----------
+    channel_str: str
+        Hostname and port of server connection in the form ``host:port``.
+    finished: int
+        Number of simulations that have finished, including those that errored.
+    errors: int
+        Number of simulations that finished with an error.
+    in_progress: int
+        Number of simulations currently in progress.
+    busy_time: float
+        Time, in seconds, during which at least one simulation was in progress.
+    simulation_time: float
+        Sum of the durations, in seconds, of the finished simulations.
+    """
+
+    channel_str: str = None
+    finished: int = 0
+    errors: int = 0
+    in_progress: int = 0
+    busy_time: float = 0.0
+    simulation_time: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Finished simulations per hour of busy time."""
+        return self.finished * 3600 / self.busy_time if self.busy_time > 0 else 0.0
+
+    @property
+    def mean_duration(self) -> float:
+        """Mean duration, in seconds, of the finished simulations."""
+        return self.simulation_time / self.finished if self.finished > 0 else 0.0
+
+    @property
+    def mean_concurrency(self) -> float:
+        """Mean number of simulations in progress while the server was busy.
+
+        A value well below the configured maximum concurrency means that the
+        server did not receive enough work to fill its simulation slots.
+        """
+        return self.simulation_time / self.busy_time if self.busy_time > 0 else 0.0
+
+
+class _ServerConnectionBase:
+    """Provides the server startup, concurrency limits, and statistics shared by
+    :class:`ServerConnection` and :class:`AsyncServerConnection`.
+
+    Subclasses assign the ``_log``, ``_startup_time``, ``_materials_stub`` and
+    ``_simulation_stub`` attributes and provide the ``channel_str`` property.
+    """
+
+    def _start_server(self, product_version: str) -> str:
+        """Start an Additive server using PyPIM, if configured, or on localhost.
+
+        Parameters
+        ----------
+        product_version: str
+            Version of the Ansys product installation in the form ``"YYR"``.
+
+        Returns
+        -------
+        str
+            Target of the started server in the form ``host:port``.
+        """
+        if pypim.is_configured():
+            pim = pypim.connect()
+            self._server_instance = pim.create_instance(
+                product_name=PIM_PRODUCT_NAME, product_version=product_version
+            )
+            self._log.info("Waiting for server to initialize")
+            self._server_instance.wait_for_ready()
+            (_, target) = self._server_instance.services["grpc"].uri.split(":", 1)
+        else:
+            port = LocalServer.find_open_port()
+            self._server_process = LocalServer.launch(port, product_version=product_version)
+            target = f"{LOCALHOST}:{port}"
+        return target
+
+    def _init_concurrency(
+        self, max_concurrency: int, max_concurrency_by_type: dict[str, int] | None
+    ) -> None:
+        """Initialize the concurrency limits and simulation statistics."""
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_by_type = max_concurrency_by_type
+        self._stats_lock = threading.Lock()
+        self._stats = ServerStatistics()
+        self._busy_since = None
+
+    @property
+    def max_concurrency(self) -> int:
+        """Maximum number of simulations to run on the server at the same time."""
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, value: int):
+        if value < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self._max_concurrency = value
+
+    @property
+    def max_concurrency_by_type(self) -> dict[str, int]:
+        """Per simulation type overrides of the ``max_concurrency`` value.
+
+        Keys are :class:`SimulationType` values.
+        """
+        return self._max_concurrency_by_type
+
+    @max_concurrency_by_type.setter
+    def max_concurrency_by_type(self, value: dict[str, int] | None):
+        value = dict(value) if value else {}
+        valid_types = [
+            SimulationType.SINGLE_BEAD,
+            SimulationType.POROSITY,
+            SimulationType.MICROSTRUCTURE,
+            SimulationType.THERMAL_HISTORY,
+        ]
+        for sim_type, limit in value.items():
+            if sim_type not in valid_types:
+                raise ValueError(f"Invalid simulation type: {sim_type}")
+            if limit < 1:
+                raise ValueError(f"max_concurrency for {sim_type} must be at least 1.")
+        self._max_concurrency_by_type = value
+
+    def concurrency_limit(self, simulation_type: str) -> int:
+        """Return the maximum number of simulations in progress for starting a simulation.
+
+        A simulation of type ``simulation_type`` is only started on the server while
+        fewer than this number of simulations, of any type, are in progress.
+
+        Parameters
+        ----------
+        simulation_type: str
+            :class:`SimulationType` value of the simulation to start.
+        """
+        return self._max_concurrency_by_type.get(simulation_type, self._max_concurrency)
+
+    @property
+    def statistics(self) -> ServerStatistics:
+        """Simulation throughput statistics of the server."""
+        with self._stats_lock:
+            busy_time = self._stats.busy_time
+            if self._busy_since is not None:
+                busy_time += time.monotonic() - self._busy_since
+            return replace(self._stats, channel_str=self.channel_str, busy_time=busy_time)
+
+    def _simulation_started(self) -> None:
+        """Record the start of a simulation."""
+        with self._stats_lock:
+            if self._stats.in_progress == 0:
+                self._busy_since = time.monotonic()
+            self._stats = replace(self._stats, in_progress=self._stats.in_progress + 1)
+
+    def _simulation_finished(self, duration: float, error: bool = False) -> None:
+        """Record the end of a simulation.
+
+        Parameters
+        ----------
+        duration: float
+            Duration of the simulation in seconds.
+        error: bool, default: False
+            Whether the simulation finished with an error.
+        """
+        with self._stats_lock:
+            stats = self._stats
+            busy_time = stats.busy_time
+            if stats.in_progress == 1:
+                busy_time += time.monotonic() - self._busy_since
+                self._busy_since = None
+            self._stats = replace(
+                stats,
+                finished=stats.finished + 1,
+                errors=stats.errors + int(error),
+                in_progress=stats.in_progress - 1,
+                busy_time=busy_time,
+                simulation_time=stats.simulation_time + duration,
+            )
+
+    def __del__(self):
+        """Destructor for cleaning up server connection."""
+        if hasattr(self, "_server_instance") and self._server_instance:
+            self._server_instance.delete()
+        if hasattr(self, "_server_process") and self._server_process:
+            self._server_process.kill()
+
+    @property
+    def startup_time(self) -> float | None:
+        """Time, in seconds, from initialization until the server was ready.
+
+        This includes the time to start the server if it was started by this connection.
+        """
+        return self._startup_time
+
+    @property
+    def materials_stub(self) -> MaterialsServiceStub:
+        """Materials service stub."""
+        return self._materials_stub
+
+    @property
+    def simulation_stub(self) -> SimulationServiceStub:
+        """Simulation service stub."""
+        return self._simulation_stub
+
+
+class ServerConnection(_ServerConnectionBase):
     """Provides connection to Additive server.
 
     If neither ``channel`` nor ``addr`` are provided, an attempt will be
@@ -83,6 +297,12 @@ class ServerConnection:
         PyPIM environments and on localhost.
     log: logging.Logger, None
         Log to write connection messages to.
+    max_concurrency: int, default: 1
+        Maximum number of simulations to run on the server at the same time.
+    max_concurrency_by_type: dict[str, int], None
+        Maximum number of simulations in progress on the server when a simulation of
+        a given type is started, keyed by :class:`SimulationType` value. Types that are
+        not included use the ``max_concurrency`` value.
     """
 
     def __init__(
@@ -91,6 +311,8 @@ class ServerConnection:
         addr: str | None = None,
         product_version: str = DEFAULT_PRODUCT_VERSION,
         log: logging.Logger = None,
+        max_concurrency: int = 1,
+        max_concurrency_by_type: dict[str, int] | None = None,
     ) -> None:
         """Initialize a server connection."""
 
@@ -98,24 +320,17 @@ class ServerConnection:
             raise ValueError("Both 'channel' and 'addr' cannot both be specified.")
 
         self._log = log if log else logging.getLogger(__name__)
+        self._init_concurrency(max_concurrency, max_concurrency_by_type)
+        start_time = time.monotonic()
+        self._startup_time = None
 
         if channel:
             self._channel = channel
         else:
             if addr:
                 target = addr
-            elif pypim.is_configured():
-                pim = pypim.connect()
-                self._server_instance = pim.create_instance(
-                    product_name=PIM_PRODUCT_NAME, product_version=product_version
-                )
-                self._log.info("Waiting for server to initialize")
-                self._server_instance.wait_for_ready()
-                (_, target) = self._server_instance.services["grpc"].uri.split(":", 1)
             else:
-                port = LocalServer.find_open_port()
-                self._server_process = LocalServer.launch(port, product_version=product_version)
-                target = f"{LOCALHOST}:{port}"
+                target = self._start_server(product_version)
             self._channel = create_channel(target)
 
         # assign service stubs
@@ -126,14 +341,15 @@ class ServerConnection:
         if not self.ready():
             raise RuntimeError(f"Unable to connect to server {self.channel_str}")
 
-        self._log.info("Connected to %s", self.channel_str)
+        self._startup_time = time.monotonic() - start_time
+        self._log.info("Connected to %s in %.1f s", self.channel_str, self._startup_time)
 
-    def __del__(self):
-        """Destructor for cleaning up server connection."""
-        if hasattr(self, "_server_instance") and self._server_instance:
-            self._server_instance.delete()
-        if hasattr(self, "_server_process") and self._server_process:
-            self._server_process.kill()
+    def close(self) -> None:
+        """Close the channel and shut down the server if it was started by this connection."""
+        self._channel.close()
+        self.__del__()
+        self._server_instance = None
+        self._server_process = None
 
     @property
     def channel_str(self) -> str:
@@ -145,16 +361,6 @@ class ServerConnection:
             return self._channel._channel.target().decode()
         return ""
 
-    @property
-    def materials_stub(self) -> MaterialsServiceStub:
-        """Materials service stub."""
-        return self._materials_stub
-
-    @property
-    def simulation_stub(self) -> SimulationServiceStub:
-        """Simulation service stub."""
-        return self._simulation_stub
-
     def status(self) -> ServerConnectionStatus:
         """Return the server connection status."""
         if not hasattr(self, "_channel") or self._channel is None:
@@ -168,28 +374,55 @@ class ServerConnection:
             metadata[key] = response.metadata[key]
         return ServerConnectionStatus(True, self.channel_str, metadata)
 
-    def ready(self, retries: int = 5) -> bool:
+    def ready(self, timeout: float = DEFAULT_READY_TIMEOUT, *, retries: int | None = None) -> bool:
         """Return whether the server is ready.
 
+        Wait for the channel to connect and then call the ``About`` service method to
+        confirm that the Additive service responds. The server is reported ready as
+        soon as it responds. If this connection started a local server process and the
+        process exits, waiting stops early.
+
         Parameters
         ----------
-        retries: int
-            Number of times to retry before giving up. An linearly increasing delay
-            is used between each retry.
+        timeout: float
+            Maximum time, in seconds, to wait for the server to respond.
+        retries: int, None
+            Deprecated, use ``timeout`` instead. Number of times to retry, which waited
+            one second more before each retry. If this value is given, ``timeout`` is
+            the total time those retries waited.
 
         Returns
         -------
         bool:
-            True means server is ready. False means the number of retries was exceeded
-            without receiving a response from the server.
+            True means server is ready. False means the server did not respond within
+            the timeout.
         """
-        ready = False
-        for i in range(retries + 1):
-            try:
-                self._about_stub.About(Empty())
-                ready = True
-                break
-            except grpc.RpcError:
-                time.sleep(i + 1)
-
-        return ready
+        if retries is not None:
+            warnings.warn(
+                "The 'retries' parameter of ready() is deprecated, use 'timeout' instead.",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            timeout = (retries + 1) * (retries + 2) / 2
+        deadline = time.monotonic() + timeout
+        future = grpc.channel_ready_future(self._channel)
+        try:
+            while True:
+                remaining = max(deadline - time.monotonic(), 0)
+                try:
+                    future.result(timeout=min(remaining, PROCESS_POLL_INTERVAL))
+                    break
+                except grpc.FutureTimeoutError:
+                    if remaining == 0 or self._server_exited():
+                        return False
+            self._about_stub.About(Empty(), timeout=timeout)
+        except grpc.RpcError:
+            return False
+        finally:
+            future.cancel()
+        return True
+
+    def _server_exited(self) -> bool:
+        """Return whether a server process started by this connection has exited."""
+        process = getattr(self, "_server_process", None)
+        return process is not None and process.poll() is not None
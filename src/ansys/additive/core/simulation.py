@@ -37,6 +37,18 @@ class SimulationType:
     POROSITY = "Porosity"
     #: Microstructure simulation.
     MICROSTRUCTURE = "Microstructure"
+    #: Thermal history simulation.
+    THERMAL_HISTORY = "ThermalHistory"
+
+
+#: Default maximum duration, in seconds, of each simulation type. The server calls
+#: of a simulation are cancelled when its deadline is exceeded.
+DEFAULT_SIMULATION_DEADLINES = {
+    SimulationType.SINGLE_BEAD: 60 * 60,
+    SimulationType.POROSITY: 4 * 60 * 60,
+    SimulationType.MICROSTRUCTURE: 12 * 60 * 60,
+    SimulationType.THERMAL_HISTORY: 24 * 60 * 60,
+}
 
 
 class SimulationStatus:
@@ -44,6 +56,8 @@ class SimulationStatus:
 
     #: Simulation is awaiting execution.
     PENDING = "Pending"
+    #: Simulation is being executed. Only applies to parametric studies.
+    RUNNING = "Running"
     #: Simulation was executed.
     COMPLETED = "Completed"
     #: Simulation errored.
@@ -74,3 +88,31 @@ class SimulationError:
     def message(self) -> str:
         """Provides simulation error message."""
         return self._message
+
+
+class SimulationCancelled(SimulationError):
+    """Provides the result of a simulation that was cancelled before it completed."""
+
+    def __init__(
+        self,
+        input: Union[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput],
+        message: str = "Simulation was cancelled.",
+    ):
+        super().__init__(input, message)
+
+
+class SimulationTimeout(SimulationError):
+    """Provides the result of a simulation that did not complete within its deadline."""
+
+    def __init__(
+        self,
+        input: Union[SingleBeadInput, PorosityInput, MicrostructureInput, ThermalHistoryInput],
+        deadline: float,
+    ):
+        super().__init__(input, f"Simulation did not complete within {deadline} seconds.")
+        self._deadline = deadline
+
+    @property
+    def deadline(self) -> float:
+        """Deadline, in seconds, that the simulation exceeded."""
+        return self._deadline
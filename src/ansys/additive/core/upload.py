@@ -0,0 +1,286 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Provides functions for uploading files to the server."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+import hashlib
+import mmap
+import os
+import queue
+import threading
+import time
+import weakref
+
+from ansys.api.additive.v0.additive_simulation_pb2 import UploadFileRequest
+
+from ansys.additive.core.cache import file_digest
+from ansys.additive.core.server_connection.network_utils import SERVER_MAX_RCV_MSG_LEN
+
+DEFAULT_UPLOAD_CHUNK_SIZE = 2 * 1024**2
+"""Size, in bytes, of the first file chunk sent to the server when chunks are sized
+adaptively."""
+
+MIN_UPLOAD_CHUNK_SIZE = 256 * 1024
+"""Minimum size, in bytes, of adaptively sized file chunks."""
+
+MAX_UPLOAD_CHUNK_SIZE = SERVER_MAX_RCV_MSG_LEN - 64 * 1024
+"""Maximum size, in bytes, of adaptively sized file chunks. Room is left for the
+other fields of the request within the message size the server accepts."""
+
+TARGET_CHUNK_TIME = 0.1
+"""Time, in seconds, that sending one adaptively sized chunk should take."""
+
+_READ_AHEAD = 4
+"""Number of requests prepared ahead of the request being sent."""
+
+
+class _ChunkSizer:
+    """Sizes file chunks from the observed send throughput."""
+
+    def __init__(self, chunk_size: int | None):
+        """Initialize the sizer with a fixed chunk size, or ``None`` to adapt it."""
+        self._fixed = chunk_size
+        self._throughput = None
+
+    @property
+    def size(self) -> int:
+        """Size, in bytes, of the next chunk."""
+        if self._fixed is not None:
+            return self._fixed
+        if self._throughput is None:
+            return DEFAULT_UPLOAD_CHUNK_SIZE
+        size = int(self._throughput * TARGET_CHUNK_TIME)
+        return min(max(size, MIN_UPLOAD_CHUNK_SIZE), MAX_UPLOAD_CHUNK_SIZE)
+
+    def record(self, size: int, duration: float) -> None:
+        """Record the time taken to send a chunk."""
+        if duration <= 0:
+            return
+        throughput = size / duration
+        if self._throughput is None:
+            self._throughput = throughput
+        else:
+            # Smooth out variations between chunks.
+            self._throughput = 0.5 * self._throughput + 0.5 * throughput
+
+
+def file_upload_reader(
+    file_name: str, chunk_size: int | None = None
+) -> Iterator[UploadFileRequest]:
+    """Read a file and return an iterator of ``UploadFileRequest`` messages.
+
+    The file is memory mapped, and a background thread slices and hashes the
+    chunks ahead of the request being sent, so that reading the file overlaps
+    with the transfer.
+
+    Parameters
+    ----------
+    file_name: str
+        Path of the file to upload.
+    chunk_size: int, None
+        Maximum size, in bytes, of the file content in each request. If this
+        value is ``None``, chunks are sized so that each takes about
+        :obj:`TARGET_CHUNK_TIME` to send, between :obj:`MIN_UPLOAD_CHUNK_SIZE`
+        and :obj:`MAX_UPLOAD_CHUNK_SIZE`.
+
+    Returns
+    -------
+    Iterator[UploadFileRequest]
+        Requests to send to the ``UploadFile`` service method.
+    """
+    file_size = os.path.getsize(file_name)
+    if file_size == 0:
+        return
+    short_name = os.path.basename(file_name)
+    sizer = _ChunkSizer(chunk_size)
+    requests = queue.Queue(_READ_AHEAD)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                requests.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def read():
+        try:
+            with open(file_name, mode="rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped:
+                offset = 0
+                while offset < file_size:
+                    # The slice is the only copy of the chunk. The request keeps it.
+                    chunk = mapped[offset : offset + sizer.size]
+                    offset += len(chunk)
+                    request = UploadFileRequest(
+                        name=short_name,
+                        total_size=file_size,
+                        content=chunk,
+                        content_md5=hashlib.md5(chunk).hexdigest(),
+                    )
+                    if not put(request):
+                        return
+            put(None)
+        except Exception as e:
+            put(e)
+
+    thread = threading.Thread(target=read, daemon=True)
+    thread.start()
+    try:
+        while (request := requests.get()) is not None:
+            if isinstance(request, Exception):
+                raise request
+            start = time.monotonic()
+            yield request
+            # The next request is asked for once this one has been sent.
+            sizer.record(len(request.content), time.monotonic() - start)
+    finally:
+        stop.set()
+
+
+async def async_file_upload_reader(
+    file_name: str, chunk_size: int | None = None
+) -> AsyncIterator[UploadFileRequest]:
+    """Read a file and return an asynchronous iterator of ``UploadFileRequest`` messages.
+
+    The requests of :func:`file_upload_reader` are taken from a worker thread,
+    so that reading the file does not block the event loop.
+
+    Parameters
+    ----------
+    file_name: str
+        Path of the file to upload.
+    chunk_size: int, None
+        Maximum size, in bytes, of the file content in each request. For more
+        information, see :func:`file_upload_reader`.
+
+    Returns
+    -------
+    AsyncIterator[UploadFileRequest]
+        Requests to send to the ``UploadFile`` service method.
+    """
+    requests = file_upload_reader(file_name, chunk_size)
+    try:
+        while (request := await asyncio.to_thread(next, requests, None)) is not None:
+            yield request
+    finally:
+        try:
+            requests.close()
+        except ValueError:
+            # The generator is still running in the worker thread, because the
+            # upload was cancelled while a request was being read.
+            pass
+
+
+class UploadCache:
+    """Remembers the files uploaded to each server, so that identical files are
+    uploaded once.
+
+    Files are identified by the SHA-256 digest of their content. The digest of a
+    file is computed once as long as the file's size and modification time do not
+    change. Entries of a server are dropped when the server connection is deleted.
+    """
+
+    def __init__(self):
+        """Initialize the cache."""
+        self._lock = threading.Lock()
+        # Remote file names keyed by content digest, for each server
+        self._remote = weakref.WeakKeyDictionary()
+        # Locks that serialize the upload of a file to a server
+        self._upload_locks = weakref.WeakKeyDictionary()
+        # Locks that serialize the upload of a file to a server from coroutines
+        self._async_upload_locks = weakref.WeakKeyDictionary()
+        # Content digests keyed by (path, size, modification time)
+        self._digests = {}
+
+    def digest(self, file_name: str) -> str:
+        """Return the SHA-256 digest of a file's content.
+
+        Parameters
+        ----------
+        file_name: str
+            Path of the file.
+        """
+        stat = os.stat(file_name)
+        key = (os.path.abspath(file_name), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(key)
+        if digest is None:
+            digest = file_digest(file_name)
+            with self._lock:
+                self._digests[key] = digest
+        return digest
+
+    def get(self, server: object, digest: str) -> str | None:
+        """Return the remote name of a file uploaded to a server.
+
+        Parameters
+        ----------
+        server: ServerConnection, AsyncServerConnection
+            Server the file was uploaded to.
+        digest: str
+            Digest of the file content, as returned by :meth:`digest`.
+
+        Returns
+        -------
+        str, None
+            Path of the file on the server, or ``None`` if it was not uploaded.
+        """
+        with self._lock:
+            return self._remote.get(server, {}).get(digest)
+
+    def put(self, server: object, digest: str, remote_file_name: str) -> None:
+        """Record that a file was uploaded to a server."""
+        with self._lock:
+            self._remote.setdefault(server, {})[digest] = remote_file_name
+
+    def discard(self, server: object, digest: str) -> None:
+        """Forget a file uploaded to a server, for example because the server
+        no longer has it."""
+        with self._lock:
+            self._remote.get(server, {}).pop(digest, None)
+
+    def upload_lock(self, server: object, digest: str) -> threading.Lock:
+        """Return the lock to hold while uploading a file to a server.
+
+        Simulations that share a file wait for the upload in progress instead of
+        uploading the file again.
+        """
+        with self._lock:
+            return self._upload_locks.setdefault(server, {}).setdefault(digest, threading.Lock())
+
+    def async_upload_lock(self, server: object, digest: str) -> asyncio.Lock:
+        """Return the lock to hold while uploading a file to a server from a coroutine.
+
+        Coroutines that share a file wait for the upload in progress instead of
+        uploading the file again.
+        """
+        with self._lock:
+            return self._async_upload_locks.setdefault(server, {}).setdefault(
+                digest, asyncio.Lock()
+            )
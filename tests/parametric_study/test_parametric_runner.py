@@ -292,7 +292,7 @@ def test_simulate_sorts_by_priority(tmp_path: pytest.TempPathFactory):
     study.add_inputs([ms], priority=3)
     inputs = [sb, p, ms]
     mock_additive = create_autospec(Additive)
-    mock_additive.material.return_value = material
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
 
     # act
     pr.simulate(study.data_frame(), mock_additive)
@@ -313,7 +313,7 @@ def test_simulate_filters_by_priority(tmp_path: pytest.TempPathFactory):
     study.add_inputs([ms], priority=3)
     inputs = [sb]
     mock_additive = create_autospec(Additive)
-    mock_additive.material.return_value = material
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
 
     # act
     pr.simulate(study.data_frame(), mock_additive, priority=1)
@@ -334,7 +334,7 @@ def test_simulate_filters_by_single_simulation_type(tmp_path: pytest.TempPathFac
     study.add_inputs([ms], priority=3)
     inputs = [p]
     mock_additive = create_autospec(Additive)
-    mock_additive.material.return_value = material
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
 
     # act
     pr.simulate(study.data_frame(), mock_additive, type=SimulationType.POROSITY)
@@ -355,7 +355,7 @@ def test_simulate_filters_by_simulation_type_list(tmp_path: pytest.TempPathFacto
     study.add_inputs([ms], priority=3)
     inputs = [p, ms]
     mock_additive = create_autospec(Additive)
-    mock_additive.material.return_value = material
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
 
     # act
     pr.simulate(
@@ -373,17 +373,53 @@ def test_simulate_skips_simulations_with_missing_materials(tmp_path: pytest.Temp
     study = ps.ParametricStudy("test_study", tmp_path)
     material = AdditiveMaterial(name="test_material")
     sb = SingleBeadInput(id="test_1", material=material)
-    p = PorosityInput(id="test_2", material=material)
+    p = PorosityInput(id="test_2", material=AdditiveMaterial(name="missing_material"))
     ms = MicrostructureInput(id="test_3", material=material)
     study.add_inputs([sb], priority=1)
     study.add_inputs([p], priority=2)
     study.add_inputs([ms], priority=3)
-    inputs = [sb, p, ms]
     mock_additive = create_autospec(Additive)
-    mock_additive.material.side_effect = [material, Exception(), material]
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
 
     # act
     pr.simulate(study.data_frame(), mock_additive)
 
     # assert
+    mock_additive.prefetch_materials.assert_called_once_with(["test_material", "missing_material"])
     mock_additive.simulate.assert_called_once_with([sb, ms])
+
+
+def test_simulate_iter_yields_summaries_from_additive(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    material = AdditiveMaterial(name="test_material")
+    sb = SingleBeadInput(id="test_1", material=material)
+    p = PorosityInput(id="test_2", material=material)
+    study.add_inputs([sb], priority=2)
+    study.add_inputs([p], priority=1)
+    mock_additive = create_autospec(Additive)
+    mock_additive.prefetch_materials.return_value = {"test_material": material}
+    mock_additive.simulate_iter.return_value = iter(["summary1", "summary2"])
+
+    # act
+    summaries = pr.simulate_iter(study.data_frame(), mock_additive)
+
+    # assert
+    mock_additive.simulate_iter.assert_not_called()
+    assert list(summaries) == ["summary1", "summary2"]
+    mock_additive.simulate_iter.assert_called_once_with([p, sb], cancellation=None, on_start=None)
+
+
+def test_simulate_iter_does_not_call_additive_when_nothing_pending(
+    tmp_path: pytest.TempPathFactory,
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    mock_additive = create_autospec(Additive)
+
+    # act
+    summaries = list(pr.simulate_iter(study.data_frame(), mock_additive))
+
+    # assert
+    assert summaries == []
+    mock_additive.simulate_iter.assert_not_called()
@@ -20,7 +20,11 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import pathlib
 import platform
+import subprocess
+import sys
+import time
 from unittest.mock import PropertyMock, create_autospec, patch
 import uuid
 
@@ -45,6 +49,7 @@ from ansys.additive.core import (
     MicrostructureSummary,
     PorosityInput,
     PorositySummary,
+    SimulationCancelled,
     SimulationError,
     SimulationStatus,
     SimulationType,
@@ -151,6 +156,117 @@ def test_save_and_load_returns_original_object(tmp_path: pytest.TempPathFactory)
     assert study2.file_name == test_path
 
 
+def test_save_leaves_existing_file_intact_when_interrupted(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="id_1")])
+    original = study.file_name.read_bytes()
+
+    # act
+    with patch("dill.dump", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            study.add_inputs([SingleBeadInput(id="id_2")])
+
+    # assert
+    assert study.file_name.read_bytes() == original
+    assert list(tmp_path.iterdir()) == [study.file_name]
+
+
+def test_deferred_save_saves_once_on_exit(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="id_1")])
+
+    # act
+    with patch("dill.dump", wraps=dill.dump) as mock_dump:
+        with study.deferred_save():
+            for _ in range(10):
+                study.set_priority("id_1", 3)
+            with study.deferred_save():
+                study.set_status("id_1", SimulationStatus.SKIP)
+            saves_in_context = mock_dump.call_count
+
+    # assert
+    assert saves_in_context == 0
+    assert mock_dump.call_count == 1
+    study2 = ps.ParametricStudy.load(study.file_name)
+    assert study2.data_frame().loc[0, ps.ColumnNames.PRIORITY] == 3
+    assert study2.data_frame().loc[0, ps.ColumnNames.STATUS] == SimulationStatus.SKIP
+
+
+def test_deferred_save_does_not_save_without_changes(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act
+    with patch("dill.dump") as mock_dump:
+        with study.deferred_save():
+            pass
+
+    # assert
+    mock_dump.assert_not_called()
+
+
+def test_save_interval_debounces_saves(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, save_interval=0.2)
+    study.add_inputs([SingleBeadInput(id="id_1")])
+
+    # act
+    with patch("dill.dump", wraps=dill.dump) as mock_dump:
+        for priority in range(5):
+            study.set_priority("id_1", priority)
+        saves_before_interval = mock_dump.call_count
+        time.sleep(0.5)
+
+    # assert
+    assert saves_before_interval == 0
+    assert mock_dump.call_count == 1
+    study2 = ps.ParametricStudy.load(study.file_name)
+    assert study2.data_frame().loc[0, ps.ColumnNames.PRIORITY] == 4
+    assert study2.save_interval == 0.2
+
+
+def test_flush_saves_postponed_changes(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, save_interval=30)
+    study.add_inputs([SingleBeadInput(id="id_1")])
+
+    # act
+    study.flush()
+
+    # assert
+    assert study._save_timer is None
+    assert ps.ParametricStudy.load(study.file_name).data_frame()[ps.ColumnNames.ID].tolist() == [
+        "id_1"
+    ]
+
+
+def test_postponed_saves_are_flushed_when_interpreter_exits(tmp_path: pytest.TempPathFactory):
+    # arrange
+    script = (
+        "import ansys.additive.core.parametric_study as ps\n"
+        "from ansys.additive.core import SingleBeadInput\n"
+        f"study = ps.ParametricStudy('test_study', {str(tmp_path)!r}, save_interval=30)\n"
+        "study.add_inputs([SingleBeadInput(id=f'id_{i}') for i in range(3)])\n"
+    )
+
+    # act
+    subprocess.run([sys.executable, "-c", script], check=True, capture_output=True)
+
+    # assert
+    assert len(ps.ParametricStudy.load(tmp_path / "test_study.ps").data_frame()) == 3
+
+
+def test_save_interval_raises_for_negative_value(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act, assert
+    with pytest.raises(ValueError, match="save_interval"):
+        study.save_interval = -1
+
+
 def test_add_summaries_with_porosity_summary_adds_row(tmp_path: pytest.TempPathFactory):
     # arrange
     study = ps.ParametricStudy("test_study", tmp_path)
@@ -605,6 +721,59 @@ def test_generate_porosity_permutations_only_adds_valid_permutations(
     assert df.loc[0, ps.ColumnNames.SCAN_SPEED] == MachineConstants.DEFAULT_SCAN_SPEED
 
 
+def test_generate_porosity_permutations_orders_rows_by_parameter(
+    tmp_path: pytest.TempPathFactory,
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    powers = [50, 100]
+    scan_speeds = [0.5, 1]
+    start_angles = [0, 10]
+
+    # act
+    study.generate_porosity_permutations("material", powers, scan_speeds, start_angles=start_angles)
+
+    # assert
+    df = study.data_frame()
+    assert df[ps.ColumnNames.LASER_POWER].tolist() == [50, 50, 50, 50, 100, 100, 100, 100]
+    assert df[ps.ColumnNames.SCAN_SPEED].tolist() == [0.5, 0.5, 1, 1, 0.5, 0.5, 1, 1]
+    assert df[ps.ColumnNames.START_ANGLE].tolist() == [0, 10, 0, 10, 0, 10, 0, 10]
+    assert df[ps.ColumnNames.ID].is_unique
+    assert all(df[ps.ColumnNames.ID].str.startswith("por_0_"))
+
+
+def test_generate_porosity_permutations_reports_invalid_parameters_once(
+    tmp_path: pytest.TempPathFactory, capsys: pytest.CaptureFixture[str]
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    powers = [MachineConstants.MAX_LASER_POWER + 1, MachineConstants.DEFAULT_LASER_POWER]
+    scan_speeds = [0.5, 1, 1.5]
+
+    # act
+    study.generate_porosity_permutations("material", powers, scan_speeds)
+
+    # assert
+    assert len(study.data_frame()) == 3
+    assert capsys.readouterr().out.count("laser_power must be between") == 1
+
+
+def test_generate_porosity_permutations_adds_nothing_for_invalid_sample_size(
+    tmp_path: pytest.TempPathFactory, capsys: pytest.CaptureFixture[str]
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act
+    study.generate_porosity_permutations(
+        "material", [50, 100], [1], size_x=PorosityInput.MAX_SAMPLE_SIZE + 1
+    )
+
+    # assert
+    assert len(study.data_frame()) == 0
+    assert "Invalid parameter combination" in capsys.readouterr().out
+
+
 def test_generate_microstructure_permutations_creates_permutations(
     tmp_path: pytest.TempPathFactory,
 ):
@@ -732,7 +901,7 @@ def test_generate_microstructure_permutations_converts_Nones_to_NANs_in_datafram
     assert np.isnan(df.loc[0, ps.ColumnNames.THERMAL_GRADIENT])
     assert np.isnan(df.loc[0, ps.ColumnNames.MICRO_MELT_POOL_WIDTH])
     assert np.isnan(df.loc[0, ps.ColumnNames.MICRO_MELT_POOL_DEPTH])
-    assert np.isnan(df.loc[0, ps.ColumnNames.RANDOM_SEED])
+    assert pd.isna(df.loc[0, ps.ColumnNames.RANDOM_SEED])
 
 
 def test_generate_microstructure_permutations_filters_by_energy_density(
@@ -839,6 +1008,21 @@ def test_update_updates_error_status(tmp_path: pytest.TempPathFactory):
     assert df2.loc[0, ps.ColumnNames.ERROR_MESSAGE] == "error message"
 
 
+def test_update_keeps_cancelled_simulations_pending(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_single_bead_permutations("material", [50], [1])
+    id = study.data_frame().loc[0, ps.ColumnNames.ID]
+
+    # act
+    study.update([SimulationCancelled(SingleBeadInput(id=id))])
+
+    # assert
+    df = study.data_frame()
+    assert df.loc[0, ps.ColumnNames.STATUS] == SimulationStatus.PENDING
+    assert pd.isna(df.loc[0, ps.ColumnNames.ERROR_MESSAGE])
+
+
 def test_update_updates_single_bead_permutation(tmp_path: pytest.TempPathFactory):
     # arrange
     study = ps.ParametricStudy("test_study", tmp_path)
@@ -903,6 +1087,70 @@ def test_update_updates_porosity_permutation(tmp_path: pytest.TempPathFactory):
     assert df2.loc[0, ps.ColumnNames.RELATIVE_DENSITY] == 12
 
 
+def test_update_applies_batch_of_summaries(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_porosity_permutations("material", [50, 100, 150], [1])
+    ids = study.data_frame()[ps.ColumnNames.ID].tolist()
+    result = PorosityResult(void_ratio=10, powder_ratio=11, solid_ratio=12)
+    summaries = [
+        PorositySummary(PorosityInput(id=ids[2]), result),
+        SimulationError(PorosityInput(id=ids[0]), "error message"),
+        PorositySummary(PorosityInput(id="unknown"), result),
+    ]
+
+    # act
+    study.update(summaries)
+
+    # assert
+    df = study.data_frame()
+    assert df[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.ERROR,
+        SimulationStatus.PENDING,
+        SimulationStatus.COMPLETED,
+    ]
+    assert df.loc[0, ps.ColumnNames.ERROR_MESSAGE] == "error message"
+    assert np.isnan(df.loc[1, ps.ColumnNames.RELATIVE_DENSITY])
+    assert df.loc[2, ps.ColumnNames.RELATIVE_DENSITY] == 12
+
+
+def test_update_ignores_summary_of_different_type(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_single_bead_permutations("material", [50], [1])
+    id = study.data_frame().loc[0, ps.ColumnNames.ID]
+    result = PorosityResult(void_ratio=10, powder_ratio=11, solid_ratio=12)
+
+    # act
+    study.update([PorositySummary(PorosityInput(id=id), result)])
+
+    # assert
+    df = study.data_frame()
+    assert df.loc[0, ps.ColumnNames.STATUS] == SimulationStatus.PENDING
+    assert np.isnan(df.loc[0, ps.ColumnNames.RELATIVE_DENSITY])
+
+
+def test_update_finds_rows_after_remove(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_porosity_permutations("material", [50, 100, 150], [1])
+    ids = study.data_frame()[ps.ColumnNames.ID].tolist()
+    study.set_priority(ids[2], 5)
+    result = PorosityResult(void_ratio=10, powder_ratio=11, solid_ratio=12)
+
+    # act
+    study.remove(ids[0])
+    study.update([PorositySummary(PorosityInput(id=ids[2]), result)])
+
+    # assert
+    df = study.data_frame()
+    assert len(df) == 2
+    row = df[df[ps.ColumnNames.ID] == ids[2]].iloc[0]
+    assert row[ps.ColumnNames.STATUS] == SimulationStatus.COMPLETED
+    assert row[ps.ColumnNames.PRIORITY] == 5
+    assert row[ps.ColumnNames.RELATIVE_DENSITY] == 12
+
+
 def test_update_updates_microstructure_permutation(tmp_path: pytest.TempPathFactory):
     # arrange
     study = ps.ParametricStudy("test_study", tmp_path)
@@ -994,8 +1242,8 @@ def test_add_inputs_assigns_common_params_correctly(tmp_path: pytest.TempPathFac
     hatch_spacing = 110e-6
     stripe_width = 5e-3
     status = SimulationStatus.SKIP
-    iteration = (7,)
-    priority = (8,)
+    iteration = 7
+    priority = 8
     machine = AdditiveMachine(
         laser_power=power,
         scan_speed=speed,
@@ -1138,7 +1386,7 @@ def test_add_inputs_assigns_unspecified_microstructure_params_correctly(
     assert np.isnan(df.loc[0, ps.ColumnNames.THERMAL_GRADIENT])
     assert np.isnan(df.loc[0, ps.ColumnNames.MICRO_MELT_POOL_WIDTH])
     assert np.isnan(df.loc[0, ps.ColumnNames.MICRO_MELT_POOL_DEPTH])
-    assert np.isnan(df.loc[0, ps.ColumnNames.RANDOM_SEED])
+    assert pd.isna(df.loc[0, ps.ColumnNames.RANDOM_SEED])
 
 
 def test_run_simulations_calls_simulate_correctly(monkeypatch, tmp_path: pytest.TempPathFactory):
@@ -1150,8 +1398,8 @@ def test_run_simulations_calls_simulate_correctly(monkeypatch, tmp_path: pytest.
     study.add_inputs([sb, p, ms])
     mock_additive = create_autospec(Additive)
     # mock_additive.material.return_value = material
-    patched_simulate = create_autospec(ParametricRunner.simulate, return_value=[])
-    monkeypatch.setattr(ParametricRunner, "simulate", patched_simulate)
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter, return_value=iter([]))
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
 
     # act
     study.run_simulations(mock_additive)
@@ -1161,6 +1409,226 @@ def test_run_simulations_calls_simulate_correctly(monkeypatch, tmp_path: pytest.
     assert patched_simulate.call_args[0][1] == mock_additive
 
 
+def test_run_simulations_saves_each_summary_as_it_completes(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    material = test_utils.get_test_material()
+    sb = SingleBeadInput(id="sb", material=material)
+    p = PorosityInput(id="p", material=material)
+    study.add_inputs([sb, p])
+    saved_statuses = []
+
+    def simulate_iter(*args, **kwargs):
+        yield PorositySummary(p, PorosityResult(solid_ratio=0.5))
+        saved_statuses.append(
+            ps.ParametricStudy.load(study.file_name).data_frame()[ps.ColumnNames.STATUS].tolist()
+        )
+        yield SimulationError(sb, "error message")
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+
+    # act
+    study.run_simulations(create_autospec(Additive))
+
+    # assert
+    assert saved_statuses == [[SimulationStatus.RUNNING, SimulationStatus.COMPLETED]]
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.ERROR,
+        SimulationStatus.COMPLETED,
+    ]
+    assert df.loc[1, ps.ColumnNames.RELATIVE_DENSITY] == 0.5
+
+
+def test_run_simulations_saves_last_results_regardless_of_save_interval(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, save_interval=30)
+    p = PorosityInput(id="p", material=test_utils.get_test_material())
+    study.add_inputs([p])
+    monkeypatch.setattr(
+        ParametricRunner,
+        "simulate_iter",
+        lambda *args, **kwargs: [PorositySummary(p, PorosityResult(solid_ratio=0.5))],
+    )
+
+    # act
+    study.run_simulations(create_autospec(Additive))
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df.loc[0, ps.ColumnNames.STATUS] == SimulationStatus.COMPLETED
+    assert df.loc[0, ps.ColumnNames.RELATIVE_DENSITY] == 0.5
+
+
+@pytest.mark.parametrize("keep_vtk", [True, False])
+def test_run_simulations_writes_microstructure_vtk_files_unless_discarded(
+    keep_vtk, monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path / "study", keep_vtk=keep_vtk)
+    input = MicrostructureInput(id="micro", material=test_utils.get_test_material())
+    study.add_inputs([input])
+    result = MicrostructureResult(xy_vtk=b"xy", xz_vtk=b"xz", yz_vtk=b"yz")
+    summary = MicrostructureSummary(input, result, str(tmp_path / "results"))
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", lambda *args, **kwargs: [summary])
+    results = []
+
+    # act
+    study.run_simulations(create_autospec(Additive), on_result=results.append)
+
+    # assert
+    assert results == [summary]
+    assert study.data_frame().loc[0, ps.ColumnNames.STATUS] == SimulationStatus.COMPLETED
+    if keep_vtk:
+        for plane in ("xy", "xz", "yz"):
+            vtk = tmp_path / "results" / "micro" / f"{plane}.vtk"
+            assert vtk.read_bytes() == plane.encode()
+    else:
+        assert not (tmp_path / "results").exists()
+        with pytest.raises(ValueError, match="discarded"):
+            summary.save()
+
+
+def test_keep_vtk_is_saved_with_study(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act
+    study.keep_vtk = False
+    study.save(study.file_name)
+
+    # assert
+    assert ps.ParametricStudy.load(study.file_name).keep_vtk is False
+
+
+def test_run_simulations_marks_running_simulations_and_records_elapsed_time(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    material = test_utils.get_test_material()
+    sb = SingleBeadInput(id="sb", material=material)
+    p = PorosityInput(id="p", material=material)
+    study.add_inputs([sb, p])
+    in_flight = []
+
+    def simulate_iter(*args, on_start=None, **kwargs):
+        on_start(p)
+        in_flight.append(ps.ParametricStudy.load(study.file_name).data_frame())
+        yield PorositySummary(p, PorosityResult(solid_ratio=0.5))
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    start = time.time()
+
+    # act
+    study.run_simulations(create_autospec(Additive), lease=100)
+
+    # assert
+    running = in_flight[0]
+    assert running[ps.ColumnNames.STATUS].tolist() == [SimulationStatus.RUNNING] * 2
+    assert (running[ps.ColumnNames.LEASE_EXPIRATION] >= start + 100).all()
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    # the single bead simulation did not finish, so it returns to the queue
+    assert df[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.PENDING,
+        SimulationStatus.COMPLETED,
+    ]
+    assert df[ps.ColumnNames.LEASE_EXPIRATION].isna().all()
+    assert np.isnan(df.loc[0, ps.ColumnNames.ELAPSED_TIME])
+    assert 0 <= df.loc[1, ps.ColumnNames.ELAPSED_TIME] < time.time() - start
+
+
+def test_run_simulations_returns_simulations_to_pending_when_run_fails(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="sb"), PorosityInput(id="p")])
+
+    def simulate_iter(*args, **kwargs):
+        yield SimulationCancelled(PorosityInput(id="p"))
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+
+    # act
+    with pytest.raises(RuntimeError):
+        study.run_simulations(create_autospec(Additive))
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.STATUS].tolist() == [SimulationStatus.PENDING] * 2
+
+
+def test_run_simulations_resumes_simulations_of_interrupted_run(
+    monkeypatch, capsys: pytest.CaptureFixture[str], tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id=id) for id in ["running", "pending", "done"]])
+    # simulate a run that stopped while simulations were in progress
+    study.set_status("running", SimulationStatus.RUNNING)
+    study.set_status("done", SimulationStatus.COMPLETED)
+    study2 = ps.ParametricStudy.load(study.file_name)
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter, return_value=iter([]))
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    study2.run_simulations(create_autospec(Additive))
+
+    # assert
+    df = patched_simulate.call_args[0][0]
+    assert sorted(df[ps.ColumnNames.ID]) == ["pending", "running"]
+    assert "Resuming 1 interrupted simulations" in capsys.readouterr().out
+    assert study2.data_frame()[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.PENDING,
+        SimulationStatus.PENDING,
+        SimulationStatus.COMPLETED,
+    ]
+
+
+def test_run_simulations_runs_limited_number_of_simulations_in_priority_order(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="low")], priority=3)
+    study.add_inputs([SingleBeadInput(id="high")], priority=1)
+    study.add_inputs([SingleBeadInput(id="mid")], priority=2)
+
+    def simulate_iter(df, *args, **kwargs):
+        for id in df[ps.ColumnNames.ID]:
+            yield SimulationError(SingleBeadInput(id=id), "error message")
+
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter, side_effect=simulate_iter)
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    count = study.run_simulations(create_autospec(Additive), limit=2)
+
+    # assert
+    assert count == 2
+    assert patched_simulate.call_args[0][0][ps.ColumnNames.ID].tolist() == ["high", "mid"]
+    assert study.data_frame()[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.PENDING,
+        SimulationStatus.ERROR,
+        SimulationStatus.ERROR,
+    ]
+
+
+def test_run_simulations_raises_for_invalid_limit(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act, assert
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        study.run_simulations(create_autospec(Additive), limit=0)
+
+
 def test_remove_deletes_multiple_rows_from_dataframe(tmp_path: pytest.TempPathFactory):
     # arrange
     study = ps.ParametricStudy("test_study", tmp_path)
@@ -1252,6 +1720,80 @@ def test_create_unique_id_returns_unique_id(tmp_path: pytest.TempPathFactory):
     assert len(id2) > len("sim_")
 
 
+def test_create_unique_id_reserves_provided_id(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act
+    id = study._create_unique_id(id="my_id")
+    id2 = study._create_unique_id(id="my_id")
+
+    # assert
+    assert id == "my_id"
+    assert id2.startswith("my_id_")
+
+
+def test_create_unique_ids_returns_requested_number_of_unique_ids(
+    tmp_path: pytest.TempPathFactory,
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    existing = study._create_unique_ids(100, prefix="sb")
+
+    # act
+    ids = study._create_unique_ids(1000, prefix="sb")
+
+    # assert
+    assert len(ids) == 1000
+    assert len(set(ids)) == 1000
+    assert set(ids).isdisjoint(existing)
+    assert all(id.startswith("sb_") for id in ids)
+
+
+@patch("ansys.additive.core.misc.short_uuid")
+def test_create_unique_ids_retries_on_collision(mock_uuid, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="sim_aaaaaaaa")])
+    mock_uuid.side_effect = ["aaaaaaaa", "aaaaaaaa", "bbbbbbbb"]
+
+    # act
+    ids = study._create_unique_ids(1)
+
+    # assert
+    assert ids == ["sim_bbbbbbbb"]
+    assert mock_uuid.call_count == 3
+
+
+def test_remove_and_clear_release_ids(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="id_1"), SingleBeadInput(id="id_2")])
+
+    # act
+    study.remove("id_1")
+    id = study._create_unique_id(id="id_1")
+    study.clear()
+    id2 = study._create_unique_id(id="id_2")
+
+    # assert
+    assert id == "id_1"
+    assert id2 == "id_2"
+
+
+def test_load_rebuilds_id_index(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="id_1")])
+
+    # act
+    study2 = ps.ParametricStudy.load(study.file_name)
+
+    # assert
+    assert study2._ids == {"id_1"}
+    assert study2._create_unique_id(id="id_1") != "id_1"
+
+
 def test_clear_removes_all_rows_but_not_columns(tmp_path: pytest.TempPathFactory):
     # arrange
     study = ps.ParametricStudy("test_study", tmp_path)
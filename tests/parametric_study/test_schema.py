@@ -0,0 +1,181 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import dill
+import numpy as np
+import pandas as pd
+import pytest
+
+from ansys.additive.core import (
+    AdditiveMaterial,
+    MicrostructureInput,
+    SimulationStatus,
+    SimulationType,
+    SingleBeadInput,
+)
+import ansys.additive.core.parametric_study as ps
+from ansys.additive.core.parametric_study.schema import (
+    COLUMN_DTYPES,
+    apply_schema,
+    categories,
+    concat,
+    empty_data_frame,
+)
+
+ColumnNames = ps.ColumnNames
+
+
+def _assert_typed(df: pd.DataFrame):
+    assert df[ColumnNames.ITERATION].dtype == "Int64"
+    assert df[ColumnNames.PRIORITY].dtype == "Int64"
+    assert df[ColumnNames.RANDOM_SEED].dtype == "Int64"
+    assert isinstance(df[ColumnNames.TYPE].dtype, pd.CategoricalDtype)
+    assert isinstance(df[ColumnNames.STATUS].dtype, pd.CategoricalDtype)
+    assert isinstance(df[ColumnNames.MATERIAL].dtype, pd.CategoricalDtype)
+    assert df[ColumnNames.ID].dtype == object
+    assert df[ColumnNames.LASER_POWER].dtype == np.float64
+    assert df[ColumnNames.RELATIVE_DENSITY].dtype == np.float64
+
+
+def test_empty_data_frame_has_typed_columns():
+    # act
+    df = empty_data_frame()
+
+    # assert
+    _assert_typed(df)
+    assert len(df) == 0
+    assert list(df[ColumnNames.STATUS].cat.categories) == [
+        SimulationStatus.PENDING,
+        SimulationStatus.RUNNING,
+        SimulationStatus.COMPLETED,
+        SimulationStatus.ERROR,
+        SimulationStatus.SKIP,
+    ]
+
+
+def test_apply_schema_converts_object_columns():
+    # arrange
+    df = pd.DataFrame(
+        {
+            ColumnNames.ITERATION: [1, np.nan],
+            ColumnNames.TYPE: [SimulationType.POROSITY, SimulationType.SINGLE_BEAD],
+            ColumnNames.MATERIAL: ["b", "a"],
+            ColumnNames.LASER_POWER: [100, None],
+            "Other": ["x", 1],
+        },
+        dtype=object,
+    )
+
+    # act
+    result = apply_schema(df)
+
+    # assert
+    assert result[ColumnNames.ITERATION].tolist() == [1, pd.NA]
+    assert result[ColumnNames.ITERATION].dtype == "Int64"
+    assert result[ColumnNames.TYPE].tolist() == [
+        SimulationType.POROSITY,
+        SimulationType.SINGLE_BEAD,
+    ]
+    assert list(result[ColumnNames.MATERIAL].cat.categories) == ["a", "b"]
+    assert result[ColumnNames.LASER_POWER].dtype == np.float64
+    assert np.isnan(result[ColumnNames.LASER_POWER][1])
+    assert result["Other"].dtype == object
+
+
+def test_apply_schema_returns_typed_frame_unchanged():
+    # arrange
+    df = empty_data_frame()
+
+    # act, assert
+    assert apply_schema(df) is df
+
+
+def test_categories_are_independent_of_insertion_order():
+    # act, assert
+    assert list(categories(ColumnNames.MATERIAL, ["c", "a"], ["b", "a"])) == ["a", "b", "c"]
+    assert list(categories(ColumnNames.TYPE, ["Other"]))[-1] == "Other"
+    assert list(categories(ColumnNames.TYPE)) == list(COLUMN_DTYPES[ColumnNames.TYPE].categories)
+
+
+def test_concat_merges_categories():
+    # arrange
+    first = apply_schema(pd.DataFrame({ColumnNames.MATERIAL: ["b"], ColumnNames.PRIORITY: [1]}))
+    second = apply_schema(pd.DataFrame({ColumnNames.MATERIAL: ["a"], ColumnNames.PRIORITY: [2]}))
+
+    # act
+    result = concat(first, second)
+
+    # assert
+    assert result[ColumnNames.MATERIAL].tolist() == ["b", "a"]
+    assert list(result[ColumnNames.MATERIAL].cat.categories) == ["a", "b"]
+    assert result[ColumnNames.PRIORITY].dtype == "Int64"
+    assert list(first[ColumnNames.MATERIAL].cat.categories) == ["b"]
+
+
+def test_study_mutations_keep_column_types(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act
+    study.generate_single_bead_permutations("material1", [50, 100], [1])
+    study.add_inputs(
+        [
+            MicrostructureInput(id="micro", random_seed=5),
+            SingleBeadInput(id="sb", material=AdditiveMaterial(name="material2")),
+        ],
+        priority=4,
+    )
+    study.set_status("sb", SimulationStatus.COMPLETED)
+    study.set_status("micro", "Custom")
+    study.set_priority("sb", 2)
+    study.set_iteration("sb", 3)
+    study.remove(study.data_frame()[ColumnNames.ID][0])
+
+    # assert
+    df = study.data_frame()
+    _assert_typed(df)
+    assert list(df[ColumnNames.MATERIAL].cat.categories) == ["", "material1", "material2"]
+    row = df.set_index(ColumnNames.ID).loc["sb"]
+    assert row[ColumnNames.STATUS] == SimulationStatus.COMPLETED
+    assert row[ColumnNames.PRIORITY] == 2
+    assert row[ColumnNames.ITERATION] == 3
+    micro = df.set_index(ColumnNames.ID).loc["micro"]
+    assert micro[ColumnNames.STATUS] == "Custom"
+    assert micro[ColumnNames.RANDOM_SEED] == 5
+
+
+def test_load_converts_columns_of_older_study(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_porosity_permutations("material", [50, 100], [1])
+    expected = study.data_frame()
+    # studies saved by earlier versions hold every column as objects
+    study._data_frame = study._data_frame.astype(object)
+    with open(study.file_name, "wb") as f:
+        dill.dump(study, f)
+
+    # act
+    study2 = ps.ParametricStudy.load(study.file_name)
+
+    # assert
+    _assert_typed(study2.data_frame())
+    pd.testing.assert_frame_equal(study2.data_frame(), expected)
@@ -0,0 +1,546 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pathlib
+import platform
+import sqlite3
+import time
+from unittest.mock import create_autospec, mock_open, patch
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from ansys.additive.core import (
+    Additive,
+    PorosityInput,
+    SimulationStatus,
+    SimulationType,
+    SingleBeadInput,
+)
+import ansys.additive.core.parametric_study as ps
+from ansys.additive.core.parametric_study.parametric_runner import ParametricRunner
+from ansys.additive.core.parametric_study.storage import (
+    ArrowStorage,
+    DillStorage,
+    SqliteStorage,
+    _on_network_filesystem,
+    storage_for,
+)
+
+
+def test_storage_for_selects_storage_by_suffix(tmp_path: pytest.TempPathFactory):
+    # act, assert
+    assert isinstance(storage_for(tmp_path / "study.ps"), DillStorage)
+    assert isinstance(storage_for(tmp_path / "study.db"), SqliteStorage)
+    assert isinstance(storage_for(tmp_path / "study.SQLITE"), SqliteStorage)
+    assert isinstance(storage_for(tmp_path / "study.arrow"), ArrowStorage)
+    assert isinstance(storage_for(tmp_path / "study.other"), DillStorage)
+
+
+def test_storage_for_detects_sqlite_file_by_contents(tmp_path: pytest.TempPathFactory):
+    # arrange
+    filename = tmp_path / "study.ps"
+    sqlite3.connect(filename).execute("CREATE TABLE t (a)")
+
+    # act, assert
+    assert isinstance(storage_for(filename), SqliteStorage)
+
+
+def test_storage_for_detects_arrow_file_by_contents(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="arrow")
+    filename = tmp_path / "study.ps"
+    study.file_name.rename(filename)
+
+    # act, assert
+    assert isinstance(storage_for(filename), ArrowStorage)
+
+
+def test_init_raises_for_unsupported_file_format(tmp_path: pytest.TempPathFactory):
+    # act, assert
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        ps.ParametricStudy("test_study", tmp_path, file_format="txt")
+
+
+def test_sqlite_study_saves_and_loads(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.generate_porosity_permutations("material", [50, 100], [1])
+    study.add_inputs([SingleBeadInput(id="sb")], priority=3)
+    study.save_interval = 2
+    study.keep_vtk = False
+    study.save(study.file_name)
+
+    # act
+    study2 = ps.ParametricStudy.load(study.file_name)
+
+    # assert
+    assert study.file_name.suffix == ".db"
+    pd.testing.assert_frame_equal(study2.data_frame(), study.data_frame())
+    df = study2.data_frame()
+    assert df.loc[2, ps.ColumnNames.PRIORITY] == 3
+    assert df[ps.ColumnNames.PRIORITY].dtype == "Int64"
+    assert np.isnan(df.loc[2, ps.ColumnNames.RELATIVE_DENSITY])
+    assert study2.save_interval == 2
+    assert study2.keep_vtk is False
+
+
+def test_sqlite_study_save_only_writes_changed_rows(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b"), SingleBeadInput(id="c")])
+    # another process completes simulation "a"
+    with sqlite3.connect(study.file_name) as conn:
+        conn.execute(
+            'UPDATE simulations SET "Status" = ? WHERE "ID" = ?',
+            (SimulationStatus.COMPLETED, "a"),
+        )
+
+    # act
+    study.set_priority("b", 5)
+    study.remove("c")
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.ID].tolist() == ["a", "b"]
+    assert df[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.COMPLETED,
+        SimulationStatus.PENDING,
+    ]
+    assert df[ps.ColumnNames.PRIORITY].tolist() == [1, 5]
+
+
+def test_sqlite_study_clear_removes_rows(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")])
+
+    # act
+    study.clear()
+    study.add_inputs([SingleBeadInput(id="b")])
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.ID].tolist() == ["b"]
+
+
+def test_sqlite_study_clear_keeps_rows_added_by_other_process(
+    tmp_path: pytest.TempPathFactory,
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")])
+    other = ps.ParametricStudy.load(study.file_name)
+    other.add_inputs([SingleBeadInput(id="b")])
+
+    # act
+    study.clear()
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.ID].tolist() == ["b"]
+
+
+def test_sqlite_study_is_not_replaced_by_new_study(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    study.set_status("a", SimulationStatus.COMPLETED)
+    storage = storage_for(study.file_name)
+    storage.claim("worker", ["b"], time.time() + 1000)
+
+    # act
+    with pytest.raises(ValueError, match="already holds a parametric study"):
+        ps.ParametricStudy("test_study", tmp_path, file_format="db")
+
+    # assert
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.COMPLETED,
+        SimulationStatus.PENDING,
+    ]
+    assert storage.claim("other", ["b"]) == []
+
+
+def test_save_converts_between_formats(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.generate_single_bead_permutations("material", [50, 100], [1])
+    study.add_inputs([PorosityInput(id="p")], priority=2)
+
+    # act
+    study.save(tmp_path / "export.db")
+    study2 = ps.ParametricStudy.load(tmp_path / "export.db")
+    study2.save(tmp_path / "export.ps")
+    study3 = ps.ParametricStudy.load(tmp_path / "export.ps")
+
+    # assert
+    pd.testing.assert_frame_equal(study2.data_frame(), study.data_frame())
+    pd.testing.assert_frame_equal(study3.data_frame(), study.data_frame())
+    assert study.file_name == tmp_path / "test_study.ps"
+
+
+def test_sqlite_load_raises_exception_when_version_too_great(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    with sqlite3.connect(study.file_name) as conn:
+        conn.execute(
+            "UPDATE metadata SET value = ? WHERE key = 'format_version'", (ps.FORMAT_VERSION + 1,)
+        )
+
+    # act, assert
+    with pytest.raises(ValueError, match="Unsupported version"):
+        ps.ParametricStudy.load(study.file_name)
+
+
+def test_arrow_study_saves_and_loads(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="arrow")
+    study.generate_porosity_permutations("material", [50, 100], [1])
+    study.add_inputs([SingleBeadInput(id="sb")], priority=3)
+    study.save_interval = 2
+    study.keep_vtk = False
+    study.save(study.file_name)
+
+    # act
+    study2 = ps.ParametricStudy.load(study.file_name)
+
+    # assert
+    pd.testing.assert_frame_equal(study2.data_frame(), study.data_frame())
+    df = study2.data_frame()
+    assert df[ps.ColumnNames.PRIORITY].dtype == "Int64"
+    assert np.isnan(df.loc[0, ps.ColumnNames.ERROR_MESSAGE])
+    assert df.loc[0, ps.ColumnNames.MATERIAL] == "material"
+    assert study2.save_interval == 2
+    assert study2.keep_vtk is False
+    schema = pa.ipc.open_file(study.file_name).schema
+    assert schema.field(ps.ColumnNames.LASER_POWER).type == pa.float64()
+    assert pa.types.is_dictionary(schema.field(ps.ColumnNames.STATUS).type)
+
+
+def test_arrow_load_raises_exception_when_version_too_great(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="arrow")
+    table = pa.ipc.open_file(study.file_name).read_all()
+    table = table.replace_schema_metadata(
+        {ArrowStorage.FORMAT_VERSION_KEY: str(ps.FORMAT_VERSION + 1)}
+    )
+    with pa.OSFile(str(study.file_name), "wb") as f:
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    # act, assert
+    with pytest.raises(ValueError, match="Unsupported version"):
+        ps.ParametricStudy.load(study.file_name)
+
+
+@pytest.mark.parametrize("file_format", ["ps", "db", "arrow"])
+def test_load_data_frame_selects_rows_and_columns(
+    file_format: str, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format=file_format)
+    study.generate_single_bead_permutations("material", [50, 100, 150], [1])
+    study.add_inputs([PorosityInput(id="por")])
+    ids = study.data_frame()[ps.ColumnNames.ID].tolist()
+    study.set_status(ids[1], SimulationStatus.COMPLETED)
+    study.set_status(ids[2], SimulationStatus.ERROR)
+    study.save(study.file_name)
+    columns = [ps.ColumnNames.ID, ps.ColumnNames.LASER_POWER]
+
+    # act
+    completed = ps.ParametricStudy.load_data_frame(
+        study.file_name,
+        columns=columns,
+        filters={
+            ps.ColumnNames.TYPE: SimulationType.SINGLE_BEAD,
+            ps.ColumnNames.STATUS: [SimulationStatus.COMPLETED, SimulationStatus.ERROR],
+        },
+    )
+    porosity = ps.ParametricStudy.load_data_frame(
+        study.file_name, filters={ps.ColumnNames.SINGLE_BEAD_LENGTH: [np.nan]}
+    )
+    types = ps.ParametricStudy.load_data_frame(
+        study.file_name,
+        columns=[ps.ColumnNames.TYPE, ps.ColumnNames.ID],
+        filters={ps.ColumnNames.TYPE: SimulationType.POROSITY},
+    )
+    everything = ps.ParametricStudy.load_data_frame(study.file_name)
+
+    # assert
+    assert list(completed.columns) == columns
+    assert completed[ps.ColumnNames.ID].tolist() == ids[1:3]
+    assert completed[ps.ColumnNames.LASER_POWER].tolist() == [100, 150]
+    assert porosity[ps.ColumnNames.ID].tolist() == ["por"]
+    assert list(types.columns) == [ps.ColumnNames.TYPE, ps.ColumnNames.ID]
+    assert types[ps.ColumnNames.ID].tolist() == ["por"]
+    pd.testing.assert_frame_equal(everything, study.data_frame())
+
+
+def test_load_data_frame_raises_for_missing_file(tmp_path: pytest.TempPathFactory):
+    # act, assert
+    with pytest.raises(ValueError, match="is not a valid file"):
+        ps.ParametricStudy.load_data_frame(tmp_path / "missing.arrow")
+
+
+def test_sqlite_claim_grants_pending_simulations_to_one_owner(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    study.add_inputs([SingleBeadInput(id="c")], status=SimulationStatus.COMPLETED)
+    storage = storage_for(study.file_name)
+
+    # act
+    claimed1 = storage.claim("owner1", ["b", "a", "c"])
+    claimed2 = storage.claim("owner2", ["a", "b", "c"])
+    storage.release("owner1")
+    claimed3 = storage.claim("owner2", ["a", "b", "c"])
+
+    # assert
+    assert claimed1 == ["b", "a"]
+    assert claimed2 == []
+    assert claimed3 == ["a", "b"]
+
+
+def test_sqlite_claim_grants_simulations_with_expired_lease(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    storage = storage_for(study.file_name)
+    storage.claim("owner1", ["a"], time.time() - 1)
+    storage.claim("owner1", ["b"], time.time() + 1000)
+
+    # act
+    claimed = storage.claim("owner2", ["a", "b"], time.time() + 10)
+
+    # assert
+    assert claimed == ["a"]
+
+
+def test_sqlite_save_releases_claims_in_same_transaction(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    storage = SqliteStorage(study.file_name)
+    storage.claim("owner1", ["a"])
+    storage.claim("owner2", ["b"])
+
+    # act
+    storage.save(study, {"a"}, release="owner1")
+
+    # assert
+    assert storage.claim("owner3", ["a", "b"]) == ["a"]
+
+
+def test_sqlite_renew_extends_leases_of_owner(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    storage = storage_for(study.file_name)
+    storage.claim("owner1", ["a"], 1.0)
+    storage.claim("owner2", ["b"], 1.0)
+
+    # act
+    storage.renew("owner1", ["a", "b"], 5.0)
+
+    # assert
+    df = storage.read_data_frame([ps.ColumnNames.ID, ps.ColumnNames.LEASE_EXPIRATION])
+    assert df[ps.ColumnNames.LEASE_EXPIRATION].tolist() == [5.0, 1.0]
+
+
+def test_run_simulations_renews_sqlite_leases_while_simulations_run(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")])
+    leases = []
+
+    def simulate_iter(*args, **kwargs):
+        for _ in range(2):
+            leases.append(
+                ps.ParametricStudy.load_data_frame(study.file_name).loc[
+                    0, ps.ColumnNames.LEASE_EXPIRATION
+                ]
+            )
+            time.sleep(0.3)
+        yield from ()
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+
+    # act
+    study.run_simulations(create_autospec(Additive), lease=0.3)
+
+    # assert
+    assert leases[1] > leases[0]
+    assert np.isnan(study.data_frame().loc[0, ps.ColumnNames.LEASE_EXPIRATION])
+
+
+def test_run_simulations_uses_default_lease(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")])
+    leases = []
+
+    def simulate_iter(*args, **kwargs):
+        leases.append(
+            ps.ParametricStudy.load_data_frame(study.file_name).loc[
+                0, ps.ColumnNames.LEASE_EXPIRATION
+            ]
+        )
+        yield from ()
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    start = time.time()
+
+    # act
+    study.run_simulations(create_autospec(Additive))
+
+    # assert
+    assert start + ps.DEFAULT_LEASE <= leases[0] <= time.time() + ps.DEFAULT_LEASE
+
+
+def test_run_simulations_resumes_sqlite_simulations_once_lease_expires(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id=id) for id in ["expired", "leased", "pending"]])
+    study.set_status(["expired", "leased"], SimulationStatus.RUNNING)
+    storage = storage_for(study.file_name)
+    storage.claim("stopped", ["expired"], time.time() - 1)
+    storage.claim("alive", ["leased"], time.time() + 1000)
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter, return_value=iter([]))
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    study.run_simulations(create_autospec(Additive))
+
+    # assert
+    df = patched_simulate.call_args[0][0]
+    assert sorted(df[ps.ColumnNames.ID]) == ["expired", "pending"]
+    assert study.data_frame()[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.PENDING,
+        SimulationStatus.RUNNING,
+        SimulationStatus.PENDING,
+    ]
+
+
+def test_dill_claim_grants_all_simulations(tmp_path: pytest.TempPathFactory):
+    # arrange
+    storage = DillStorage(tmp_path / "study.ps")
+
+    # act, assert
+    assert storage.claim("owner", ["a", "b"]) == ["a", "b"]
+
+
+def test_run_simulations_only_runs_unclaimed_simulations_of_sqlite_study(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    storage = storage_for(study.file_name)
+    storage.claim("other", ["a"])
+    claims = []
+
+    def simulate_iter(df, *args, **kwargs):
+        with sqlite3.connect(study.file_name) as conn:
+            claims.extend(conn.execute('SELECT "ID", _claimed_by FROM simulations ORDER BY _seq'))
+        yield from ()
+
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter, side_effect=simulate_iter)
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    study.run_simulations(create_autospec(Additive))
+
+    # assert
+    df = patched_simulate.call_args[0][0]
+    assert df[ps.ColumnNames.ID].tolist() == ["b"]
+    assert claims[0] == ("a", "other")
+    assert claims[1][0] == "b" and claims[1][1] not in (None, "other")
+    assert storage.claim("third", ["b"]) == ["b"]
+
+
+def test_sqlite_study_uses_write_ahead_logging_by_default(tmp_path: pytest.TempPathFactory):
+    # act
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+
+    # assert
+    with sqlite3.connect(study.file_name) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@patch("ansys.additive.core.parametric_study.storage._on_network_filesystem", return_value=True)
+def test_sqlite_study_uses_rollback_journal_on_network_filesystem(
+    _, tmp_path: pytest.TempPathFactory
+):
+    # act
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+
+    # assert
+    with sqlite3.connect(study.file_name) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+
+
+@pytest.mark.skipif(platform.system() == "Windows", reason="Test only valid on Linux.")
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("/mnt/share/study.db", True),
+        ("/mnt/share/local/study.db", False),
+        ("/mnt/shared/study.db", False),
+        ("/home/user/study.db", False),
+    ],
+)
+def test_on_network_filesystem_uses_longest_mount_point(path: str, expected: bool):
+    # arrange
+    mounts = (
+        "/dev/sda1 / ext4 rw 0 0\n"
+        "server:/export /mnt/share nfs4 rw 0 0\n"
+        "/dev/sdb1 /mnt/share/local ext4 rw 0 0\n"
+    )
+
+    # act
+    with patch("builtins.open", mock_open(read_data=mounts)):
+        result = _on_network_filesystem(pathlib.Path(path))
+
+    # assert
+    assert result == expected
+
+
+def test_sqlite_set_journal_mode_is_kept_by_later_saves(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    storage = SqliteStorage(study.file_name)
+
+    # act
+    mode = storage.set_journal_mode("DELETE")
+    study.add_inputs([SingleBeadInput(id="a")])
+
+    # assert
+    assert mode == "delete"
+    with sqlite3.connect(study.file_name) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
@@ -0,0 +1,223 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import threading
+from unittest.mock import Mock, create_autospec
+
+import pytest
+
+from ansys.additive.core import (
+    Additive,
+    SimulationCancelled,
+    SimulationError,
+    SimulationStatus,
+    SingleBeadInput,
+)
+import ansys.additive.core.parametric_study as ps
+from ansys.additive.core.parametric_study.parametric_runner import ParametricRunner
+
+
+def error(id: str) -> SimulationError:
+    return SimulationError(SingleBeadInput(id=id), "error message")
+
+
+def test_run_simulations_background_writes_results_and_calls_on_complete(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+
+    def simulate_iter(df, *args, on_start=None, **kwargs):
+        for id in df[ps.ColumnNames.ID]:
+            on_start(SingleBeadInput(id=id))
+            yield error(id)
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    on_complete = Mock()
+
+    # act
+    run = study.run_simulations_background(create_autospec(Additive), on_complete=on_complete)
+    count = run.wait(timeout=10)
+
+    # assert
+    assert count == 2
+    assert run.done
+    on_complete.assert_called_once_with(run)
+    assert study.data_frame()[ps.ColumnNames.STATUS].tolist() == [SimulationStatus.ERROR] * 2
+    progress = run.progress()
+    assert (progress.total, progress.finished, progress.running) == (2, 2, 0)
+    assert progress.fraction == 1
+
+
+def test_progress_reports_partially_completed_run(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id=id) for id in ["a", "b", "c"]])
+    received = threading.Event()
+    release = threading.Event()
+
+    def simulate_iter(df, *args, on_start=None, **kwargs):
+        on_start(SingleBeadInput(id="a"))
+        on_start(SingleBeadInput(id="b"))
+        yield error("a")
+        received.set()
+        release.wait(10)
+        yield error("b")
+        yield error("c")
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    run = study.run_simulations_background(create_autospec(Additive))
+    received.wait(10)
+
+    # act
+    progress = run.progress()
+    statuses = study.data_frame()[ps.ColumnNames.STATUS].tolist()
+    release.set()
+    run.wait(timeout=10)
+
+    # assert
+    assert (progress.total, progress.finished, progress.running) == (3, 1, 1)
+    assert progress.fraction == pytest.approx(1 / 3)
+    assert statuses == [
+        SimulationStatus.ERROR,
+        SimulationStatus.RUNNING,
+        SimulationStatus.RUNNING,
+    ]
+
+
+def test_pause_holds_simulations_until_resume(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="a")])
+    ready = threading.Event()
+    started = threading.Event()
+
+    def simulate_iter(df, *args, on_start=None, **kwargs):
+        ready.wait(10)
+        on_start(SingleBeadInput(id="a"))
+        started.set()
+        yield error("a")
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    run = study.run_simulations_background(create_autospec(Additive))
+
+    # act
+    run.pause()
+    ready.set()
+    started_while_paused = started.wait(0.2)
+    paused = run.paused
+    run.resume()
+    count = run.wait(timeout=10)
+
+    # assert
+    assert paused
+    assert not started_while_paused
+    assert not run.paused
+    assert count == 1
+
+
+def test_cancel_returns_simulations_to_pending(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="a"), SingleBeadInput(id="b")])
+    running = threading.Event()
+
+    def simulate_iter(df, *args, cancellation=None, on_start=None, **kwargs):
+        on_start(SingleBeadInput(id="a"))
+        running.set()
+        yield error("a")
+        cancelled = threading.Event()
+        cancellation.add_callback(cancelled.set)
+        cancelled.wait(10)
+        yield SimulationCancelled(SingleBeadInput(id="b"))
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    run = study.run_simulations_background(create_autospec(Additive))
+    running.wait(10)
+    run.pause()
+
+    # act
+    run.cancel()
+    count = run.wait(timeout=10)
+
+    # assert
+    assert run.cancelled
+    assert not run.paused
+    assert count == 1
+    assert study.data_frame()[ps.ColumnNames.STATUS].tolist() == [
+        SimulationStatus.ERROR,
+        SimulationStatus.PENDING,
+    ]
+
+
+def test_wait_raises_exception_of_run(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="a")])
+    patched_simulate = create_autospec(
+        ParametricRunner.simulate_iter, side_effect=RuntimeError("connection lost")
+    )
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+    log = Mock()
+    on_complete = Mock(side_effect=ValueError("callback failed"))
+
+    # act
+    run = ps.StudyRun(study, create_autospec(Additive), on_complete=on_complete, log=log)
+
+    # assert
+    with pytest.raises(RuntimeError, match="connection lost"):
+        run.wait(timeout=10)
+    on_complete.assert_called_once_with(run)
+    log.warning.assert_called_once()
+    assert study.data_frame()[ps.ColumnNames.STATUS].tolist() == [SimulationStatus.PENDING]
+
+
+def test_wait_raises_timeout_error_while_run_is_in_progress(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+    study.add_inputs([SingleBeadInput(id="a")])
+    release = threading.Event()
+
+    def simulate_iter(*args, **kwargs):
+        release.wait(10)
+        yield error("a")
+
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", simulate_iter)
+    run = study.run_simulations_background(create_autospec(Additive))
+
+    # act, assert
+    with pytest.raises(TimeoutError):
+        run.wait(timeout=0.01)
+    assert not run.done
+    release.set()
+    assert run.wait(timeout=10) == 1
+
+
+def test_study_run_raises_for_invalid_limit(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act, assert
+    with pytest.raises(ValueError, match="limit must be at least 1"):
+        study.run_simulations_background(create_autospec(Additive), limit=0)
@@ -0,0 +1,209 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import sqlite3
+import time
+from unittest.mock import Mock, create_autospec, patch
+
+import pytest
+
+from ansys.additive.core import (
+    Additive,
+    SimulationError,
+    SimulationStatus,
+    SimulationType,
+    SingleBeadInput,
+)
+from ansys.additive.core.cancellation import CancellationToken
+import ansys.additive.core.parametric_study as ps
+from ansys.additive.core.parametric_study import worker
+from ansys.additive.core.parametric_study.parametric_runner import ParametricRunner
+from ansys.additive.core.parametric_study.storage import SqliteStorage, storage_for
+
+
+def failing_simulate_iter(df, *args, **kwargs):
+    for id in df[ps.ColumnNames.ID]:
+        yield SimulationError(SingleBeadInput(id=id), "failed")
+
+
+def test_run_worker_raises_for_study_that_cannot_be_shared(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act, assert
+    with pytest.raises(ValueError, match="cannot be shared"):
+        worker.run_worker(study.file_name, create_autospec(Additive))
+
+
+def test_run_worker_raises_for_invalid_batch_size(tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+
+    # act, assert
+    with pytest.raises(ValueError, match="batch_size must be at least 1"):
+        worker.run_worker(study.file_name, create_autospec(Additive), batch_size=0)
+
+
+def test_run_worker_runs_simulations_in_batches(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id=str(i)) for i in range(5)])
+    patched_simulate = create_autospec(
+        ParametricRunner.simulate_iter, side_effect=failing_simulate_iter
+    )
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    count = worker.run_worker(study.file_name, create_autospec(Additive), batch_size=2)
+
+    # assert
+    assert count == 5
+    assert [len(c[0][0]) for c in patched_simulate.call_args_list] == [2, 2, 1]
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert (df[ps.ColumnNames.STATUS] == SimulationStatus.ERROR).all()
+
+
+def test_run_worker_waits_for_lease_of_other_worker_to_expire(
+    monkeypatch, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")], status=SimulationStatus.RUNNING)
+    storage_for(study.file_name).claim("stopped", ["a"], time.time() + 0.2)
+    patched_simulate = create_autospec(
+        ParametricRunner.simulate_iter, side_effect=failing_simulate_iter
+    )
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    count = worker.run_worker(study.file_name, create_autospec(Additive), poll_interval=0.05)
+
+    # assert
+    assert count == 1
+    assert patched_simulate.call_count == 1
+    df = ps.ParametricStudy.load(study.file_name).data_frame()
+    assert df[ps.ColumnNames.STATUS].tolist() == [SimulationStatus.ERROR]
+
+
+def test_run_worker_only_checks_selected_simulations(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")], priority=2)
+    patched_simulate = create_autospec(ParametricRunner.simulate_iter)
+    monkeypatch.setattr(ParametricRunner, "simulate_iter", patched_simulate)
+
+    # act
+    count = worker.run_worker(
+        study.file_name,
+        create_autospec(Additive),
+        type=[SimulationType.SINGLE_BEAD],
+        priority=1,
+    )
+
+    # assert
+    assert count == 0
+    patched_simulate.assert_not_called()
+
+
+def test_run_worker_stops_when_cancelled(monkeypatch, tmp_path: pytest.TempPathFactory):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    study.add_inputs([SingleBeadInput(id="a")], status=SimulationStatus.RUNNING)
+    storage_for(study.file_name).claim("alive", ["a"], time.time() + 1000)
+    cancellation = CancellationToken()
+    patched_wait = Mock(side_effect=lambda timeout: cancellation.cancel())
+    monkeypatch.setattr(worker.threading.Event, "wait", patched_wait)
+
+    # act
+    count = worker.run_worker(
+        study.file_name, create_autospec(Additive), wait=True, cancellation=cancellation
+    )
+
+    # assert
+    assert count == 0
+    patched_wait.assert_called_once_with(worker.DEFAULT_POLL_INTERVAL)
+
+
+@patch("ansys.additive.core.parametric_study.worker.run_worker")
+@patch("ansys.additive.core.parametric_study.worker.Additive")
+def test_main_runs_worker_with_arguments(
+    mock_additive, mock_run_worker, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path, file_format="db")
+    argv = [
+        str(study.file_name),
+        "--server",
+        "host1:50052",
+        "--server",
+        "host2:50052",
+        "--max-concurrency",
+        "4",
+        "--batch-size",
+        "3",
+        "--type",
+        SimulationType.POROSITY,
+        "--priority",
+        "2",
+        "--lease",
+        "100",
+        "--poll-interval",
+        "5",
+        "--wait",
+    ]
+
+    # act
+    status = worker.main(argv)
+
+    # assert
+    assert status == 0
+    mock_additive.assert_called_once_with(
+        server_connections=["host1:50052", "host2:50052"],
+        nservers=1,
+        product_version=worker.DEFAULT_PRODUCT_VERSION,
+        log_level="INFO",
+        max_concurrency=4,
+        cache_dir=None,
+    )
+    args, kwargs = mock_run_worker.call_args
+    assert args == (str(study.file_name), mock_additive.return_value)
+    assert kwargs["batch_size"] == 3
+    assert kwargs["type"] == [SimulationType.POROSITY]
+    assert kwargs["priority"] == 2
+    assert kwargs["lease"] == 100
+    assert kwargs["poll_interval"] == 5
+    assert kwargs["wait"] is True
+    assert isinstance(kwargs["cancellation"], CancellationToken)
+    with sqlite3.connect(study.file_name) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+@patch("ansys.additive.core.parametric_study.worker.Additive")
+def test_main_exits_for_study_that_cannot_be_shared(
+    mock_additive, tmp_path: pytest.TempPathFactory
+):
+    # arrange
+    study = ps.ParametricStudy("test_study", tmp_path)
+
+    # act, assert
+    with pytest.raises(SystemExit):
+        worker.main([str(study.file_name)])
+    mock_additive.assert_not_called()
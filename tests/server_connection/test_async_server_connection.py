@@ -0,0 +1,187 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+from unittest.mock import ANY, AsyncMock, Mock, create_autospec
+
+from ansys.api.additive.v0.about_pb2 import AboutResponse
+from ansys.api.additive.v0.about_pb2_grpc import AboutServiceStub
+from ansys.api.additive.v0.additive_materials_pb2_grpc import MaterialsServiceStub
+from ansys.api.additive.v0.additive_simulation_pb2_grpc import SimulationServiceStub
+import grpc
+import pytest
+
+from ansys.additive.core.server_connection.async_server_connection import AsyncServerConnection
+from ansys.additive.core.server_connection.constants import LOCALHOST
+import ansys.additive.core.server_connection.local_server
+from ansys.additive.core.server_connection.server_connection import ServerConnectionStatus
+
+
+def test_init_raises_exception_if_channel_and_addr_provided():
+    # arrange
+    channel = Mock(grpc.aio.Channel)
+    addr = "server.address"
+
+    # act, assert
+    with pytest.raises(ValueError, match="Both 'channel' and 'addr' cannot both be specified"):
+        AsyncServerConnection(channel, addr)
+
+
+def test_init_connects_with_channel():
+    # arrange
+    channel = Mock(grpc.aio.Channel)
+
+    # act
+    server = AsyncServerConnection(channel=channel)
+
+    # assert
+    assert server._channel == channel
+    assert server.channel_str == ""
+    assert isinstance(server.materials_stub, MaterialsServiceStub)
+    assert isinstance(server.simulation_stub, SimulationServiceStub)
+    assert isinstance(server._about_stub, AboutServiceStub)
+
+
+def test_init_connects_with_addr():
+    # arrange
+    addr = "1.2.3.4:1234"
+
+    async def connect():
+        return AsyncServerConnection(addr=addr)
+
+    # act
+    server = asyncio.run(connect())
+
+    # assert
+    assert server.channel_str == addr
+    assert isinstance(server._channel, grpc.aio.Channel)
+    assert hasattr(server, "_server_instance") == False
+
+
+def test_init_starts_local_server(monkeypatch):
+    # arrange
+    mock_launch = create_autospec(
+        ansys.additive.core.server_connection.local_server.LocalServer.launch, return_value=None
+    )
+    monkeypatch.setattr(
+        ansys.additive.core.server_connection.local_server.LocalServer, "launch", mock_launch
+    )
+
+    async def connect():
+        return AsyncServerConnection(product_version="123")
+
+    # act
+    server = asyncio.run(connect())
+
+    # assert
+    assert LOCALHOST in server.channel_str
+    mock_launch.assert_called_with(ANY, product_version="123")
+
+
+def test_ready_returns_true_when_about_succeeds():
+    # arrange
+    channel = Mock(grpc.aio.Channel)
+    channel.channel_ready = AsyncMock()
+    server = AsyncServerConnection(channel=channel)
+    server._about_stub = Mock(AboutServiceStub)
+    server._about_stub.About = AsyncMock(return_value=AboutResponse())
+
+    # act
+    ready = asyncio.run(server.ready(timeout=1))
+
+    # assert
+    assert ready == True
+    server._about_stub.About.assert_awaited_once_with(ANY, timeout=1)
+    assert server.startup_time >= 0
+
+
+def test_ready_returns_false_when_channel_not_ready():
+    # arrange
+    async def never_ready():
+        await asyncio.sleep(10)
+
+    channel = Mock(grpc.aio.Channel)
+    channel.channel_ready = never_ready
+    server = AsyncServerConnection(channel=channel)
+
+    # act
+    ready = asyncio.run(server.ready(timeout=0.01))
+
+    # assert
+    assert ready == False
+    assert server.startup_time is None
+
+
+def test_ready_returns_false_when_about_fails():
+    # arrange
+    channel = Mock(grpc.aio.Channel)
+    channel.channel_ready = AsyncMock()
+    server = AsyncServerConnection(channel=channel)
+    server._about_stub = Mock(AboutServiceStub)
+    server._about_stub.About = AsyncMock(side_effect=grpc.RpcError())
+
+    # act
+    ready = asyncio.run(server.ready(timeout=1))
+
+    # assert
+    assert ready == False
+
+
+def test_status_returns_server_metadata():
+    # arrange
+    response = AboutResponse()
+    response.metadata["key1"] = "value1"
+    server = AsyncServerConnection(channel=Mock(grpc.aio.Channel))
+    server._about_stub = Mock(AboutServiceStub)
+    server._about_stub.About = AsyncMock(return_value=response)
+
+    # act
+    status = asyncio.run(server.status())
+
+    # assert
+    assert status == ServerConnectionStatus(True, "", {"key1": "value1"})
+
+
+def test_status_returns_not_connected_when_about_fails():
+    # arrange
+    server = AsyncServerConnection(channel=Mock(grpc.aio.Channel))
+    server._about_stub = Mock(AboutServiceStub)
+    server._about_stub.About = AsyncMock(side_effect=grpc.RpcError())
+
+    # act
+    status = asyncio.run(server.status())
+
+    # assert
+    assert status.connected == False
+
+
+def test_close_closes_channel():
+    # arrange
+    channel = Mock(grpc.aio.Channel)
+    channel.close = AsyncMock()
+    server = AsyncServerConnection(channel=channel)
+
+    # act
+    asyncio.run(server.close())
+
+    # assert
+    channel.close.assert_awaited_once()
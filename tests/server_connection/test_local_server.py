@@ -133,7 +133,7 @@ def test_launch_calls_popen_as_expected_win(mock_popen, tmp_path: pathlib.Path):
         stdout=ANY,
         stderr=subprocess.STDOUT,
     )
-    assert len(glob.glob(str(tmp_path / "additiveserver_*.log"))) == 1
+    assert len(glob.glob(str(tmp_path / f"additiveserver_*_{TEST_VALID_PORT}.log"))) == 1
 
 
 @pytest.mark.skipif(os.name == "nt", reason="Test only valid on linux")
@@ -166,7 +166,7 @@ def test_launch_calls_popen_as_expected_linux(
         stdout=ANY,
         stderr=subprocess.STDOUT,
     )
-    assert len(glob.glob(str(tmp_path / "additiveserver_*.log"))) == 1
+    assert len(glob.glob(str(tmp_path / f"additiveserver_*_{TEST_VALID_PORT}.log"))) == 1
 
 
 @pytest.mark.skipif(os.name == "posix", reason="Test only valid on Windows")
@@ -27,6 +27,7 @@ import pytest
 from ansys.additive.core.server_connection.network_utils import (
     check_valid_ip,
     check_valid_port,
+    create_async_channel,
     create_channel,
 )
 
@@ -114,3 +115,28 @@ def test_create_channel_sets_max_rcv_msg_len(monkeypatch):
     mock_insecure_channel.assert_called_with(
         target, options=[("grpc.max_receive_message_length", msg_len)]
     )
+
+
+def test_create_async_channel_sets_max_rcv_msg_len(monkeypatch):
+    # arrange
+    mock_insecure_channel = create_autospec(grpc.aio.insecure_channel, return_value=None)
+    monkeypatch.setattr(grpc.aio, "insecure_channel", mock_insecure_channel)
+    msg_len = 8 * 1024**2
+    target = "1.2.3.4:1234"
+
+    # act
+    create_async_channel(target, msg_len)
+
+    # assert
+    mock_insecure_channel.assert_called_with(
+        target, options=[("grpc.max_receive_message_length", msg_len)]
+    )
+
+
+def test_create_async_channel_raises_exception_for_bad_port():
+    # arrange
+    target = "1.2.3.4:123"
+
+    # act, assert
+    with pytest.raises(ValueError):
+        create_async_channel(target)
@@ -38,7 +38,9 @@ import ansys.additive.core.server_connection.server_connection
 from ansys.additive.core.server_connection.server_connection import (
     ServerConnection,
     ServerConnectionStatus,
+    ServerStatistics,
 )
+from ansys.additive.core.simulation import SimulationType
 
 
 def test_init_raises_exception_if_channel_and_addr_provided():
@@ -177,12 +179,15 @@ def test_init_starts_local_server(monkeypatch):
     mock_launch.assert_called_with(ANY, product_version="123")
 
 
-def test_ready_returns_true_when_about_succeeds():
+def test_ready_returns_true_when_about_succeeds(monkeypatch):
     # assert
     mock_server_connection = Mock(ServerConnection)
     mock_server_connection.ready = ServerConnection.ready
+    mock_server_connection._channel = Mock(grpc.Channel)
+    mock_future = Mock(grpc.Future)
+    monkeypatch.setattr(grpc, "channel_ready_future", Mock(return_value=mock_future))
 
-    def mock_about_endpoint(request: Empty):
+    def mock_about_endpoint(request: Empty, timeout=None):
         response = AboutResponse()
         response.metadata["key1"] = "value1"
         response.metadata["key2"] = "value2"
@@ -199,14 +204,18 @@ def test_ready_returns_true_when_about_succeeds():
     # assert
     assert ready == True
     mock_stub.About.assert_called_once()
+    grpc.channel_ready_future.assert_called_once_with(mock_server_connection._channel)
+    mock_future.cancel.assert_called_once()
 
 
-def test_ready_returns_false_when_about_fails():
+def test_ready_returns_false_when_about_fails(monkeypatch):
     # assert
     mock_server_connection = Mock(ServerConnection)
     mock_server_connection.ready = ServerConnection.ready
+    mock_server_connection._channel = Mock(grpc.Channel)
+    monkeypatch.setattr(grpc, "channel_ready_future", Mock(return_value=Mock(grpc.Future)))
 
-    def mock_about_endpoint(request: Empty):
+    def mock_about_endpoint(request: Empty, timeout=None):
         raise grpc.RpcError
 
     mock_stub = Mock(AboutServiceStub)
@@ -221,6 +230,107 @@ def test_ready_returns_false_when_about_fails():
     mock_stub.About.assert_called_once()
 
 
+def test_ready_returns_false_when_channel_does_not_connect_within_timeout():
+    # arrange
+    mock_server_connection = Mock(ServerConnection)
+    mock_server_connection.ready = ServerConnection.ready
+    mock_server_connection._server_exited = Mock(return_value=False)
+    mock_server_connection._channel = grpc.insecure_channel("127.0.0.1:1")
+    mock_server_connection._about_stub = Mock()
+
+    # act
+    ready = mock_server_connection.ready(mock_server_connection, 0.1)
+
+    # assert
+    assert ready == False
+    mock_server_connection._about_stub.About.assert_not_called()
+
+
+def test_ready_returns_false_without_waiting_when_server_process_exits(monkeypatch):
+    # arrange
+    mock_server_connection = Mock(ServerConnection)
+    mock_server_connection.ready = ServerConnection.ready
+    mock_server_connection._server_exited = Mock(return_value=True)
+    mock_server_connection._channel = Mock(grpc.Channel)
+    mock_future = Mock(grpc.Future)
+    mock_future.result.side_effect = grpc.FutureTimeoutError()
+    monkeypatch.setattr(grpc, "channel_ready_future", Mock(return_value=mock_future))
+
+    # act
+    ready = mock_server_connection.ready(mock_server_connection, 1000)
+
+    # assert
+    assert ready == False
+    mock_future.result.assert_called_once()
+
+
+def test_ready_maps_deprecated_retries_to_timeout(monkeypatch):
+    # arrange
+    mock_server_connection = Mock(ServerConnection)
+    mock_server_connection._channel = Mock(grpc.Channel)
+    mock_future = Mock(grpc.Future)
+    monkeypatch.setattr(grpc, "channel_ready_future", Mock(return_value=mock_future))
+    mock_server_connection._about_stub = Mock()
+
+    # act
+    with pytest.warns(DeprecationWarning, match="retries"):
+        ready = ServerConnection.ready(mock_server_connection, retries=2)
+
+    # assert
+    assert ready == True
+    mock_server_connection._about_stub.About.assert_called_once_with(ANY, timeout=6)
+
+
+@pytest.mark.parametrize("returncode, expected", [(None, False), (1, True)])
+def test_server_exited_returns_whether_local_process_exited(returncode, expected):
+    # arrange
+    mock_server_connection = Mock(ServerConnection)
+    mock_server_connection._server_process = Mock()
+    mock_server_connection._server_process.poll.return_value = returncode
+
+    # act, assert
+    assert ServerConnection._server_exited(mock_server_connection) == expected
+
+
+def test_server_exited_returns_false_without_local_process():
+    # arrange, act, assert
+    assert ServerConnection._server_exited(Mock(ServerConnection)) == False
+
+
+def test_init_records_startup_time(monkeypatch):
+    # arrange
+    mock_ready = create_autospec(ServerConnection.ready, return_value=True)
+    monkeypatch.setattr(ServerConnection, "ready", mock_ready)
+
+    # act
+    server = ServerConnection(addr="1.2.3.4:1234")
+
+    # assert
+    assert server.startup_time >= 0
+
+
+def test_close_closes_channel_and_stops_started_server(monkeypatch):
+    # arrange
+    mock_ready = create_autospec(ServerConnection.ready, return_value=True)
+    monkeypatch.setattr(ServerConnection, "ready", mock_ready)
+    process = Mock()
+    monkeypatch.setattr(
+        ansys.additive.core.server_connection.local_server.LocalServer,
+        "launch",
+        Mock(return_value=process),
+    )
+    server = ServerConnection()
+    server._channel = Mock()
+
+    # act
+    server.close()
+    server.close()
+
+    # assert
+    assert server._channel.close.call_count == 2
+    process.kill.assert_called_once()
+
+
 def test_status_with_no_channel_returns_expected_status():
     # arrange
     mock_server_connection = Mock(ServerConnection)
@@ -304,3 +414,107 @@ def test_status_when_not_connected_returns_expected_status():
     assert status.connected == False
     assert status.channel_str == "channel_str"
     assert status.metadata == None
+
+
+def _server_connection(monkeypatch, **kwargs) -> ServerConnection:
+    mock_ready = create_autospec(ServerConnection.ready, return_value=True)
+    monkeypatch.setattr(ServerConnection, "ready", mock_ready)
+    return ServerConnection(channel=grpc.insecure_channel("target"), **kwargs)
+
+
+def test_init_sets_default_concurrency(monkeypatch):
+    # act
+    server = _server_connection(monkeypatch)
+
+    # assert
+    assert server.max_concurrency == 1
+    assert server.max_concurrency_by_type == {}
+    assert server.concurrency_limit(SimulationType.MICROSTRUCTURE) == 1
+
+
+def test_concurrency_limit_returns_override_for_simulation_type(monkeypatch):
+    # arrange
+    server = _server_connection(
+        monkeypatch,
+        max_concurrency=2,
+        max_concurrency_by_type={SimulationType.SINGLE_BEAD: 8},
+    )
+
+    # act, assert
+    assert server.concurrency_limit(SimulationType.SINGLE_BEAD) == 8
+    assert server.concurrency_limit(SimulationType.POROSITY) == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_concurrency": 0},
+        {"max_concurrency_by_type": {SimulationType.POROSITY: 0}},
+        {"max_concurrency_by_type": {"bogus": 2}},
+    ],
+)
+def test_init_raises_exception_for_invalid_concurrency(monkeypatch, kwargs):
+    # act, assert
+    with pytest.raises(ValueError):
+        _server_connection(monkeypatch, **kwargs)
+
+
+def test_statistics_records_finished_simulations(monkeypatch):
+    # arrange
+    server = _server_connection(monkeypatch)
+    times = iter([100.0, 130.0])
+    monkeypatch.setattr(
+        ansys.additive.core.server_connection.server_connection.time,
+        "monotonic",
+        lambda: next(times),
+    )
+
+    # act
+    server._simulation_started()
+    server._simulation_started()
+    server._simulation_finished(10.0)
+    server._simulation_finished(30.0, error=True)
+
+    # assert
+    stats = server.statistics
+    assert stats == ServerStatistics(
+        channel_str="target",
+        finished=2,
+        errors=1,
+        in_progress=0,
+        busy_time=30.0,
+        simulation_time=40.0,
+    )
+    assert stats.throughput == 240.0
+    assert stats.mean_duration == 20.0
+    assert stats.mean_concurrency == pytest.approx(4 / 3)
+
+
+def test_statistics_includes_current_busy_period(monkeypatch):
+    # arrange
+    server = _server_connection(monkeypatch)
+    times = iter([100.0, 105.0])
+    monkeypatch.setattr(
+        ansys.additive.core.server_connection.server_connection.time,
+        "monotonic",
+        lambda: next(times),
+    )
+    server._simulation_started()
+
+    # act
+    stats = server.statistics
+
+    # assert
+    assert stats.in_progress == 1
+    assert stats.busy_time == 5.0
+    assert stats.throughput == 0.0
+
+
+def test_server_statistics_defaults_report_no_throughput():
+    # act
+    stats = ServerStatistics()
+
+    # assert
+    assert stats.throughput == 0.0
+    assert stats.mean_duration == 0.0
+    assert stats.mean_concurrency == 0.0
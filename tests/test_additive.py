@@ -25,6 +25,7 @@ import logging
 import os
 import pathlib
 import shutil
+import threading
 from unittest.mock import ANY, MagicMock, Mock, call, create_autospec, patch
 
 from ansys.api.additive import __version__ as api_version
@@ -44,6 +45,7 @@ from ansys.api.additive.v0.additive_materials_pb2 import (
     TuneMaterialResponse,
 )
 from ansys.api.additive.v0.additive_simulation_pb2 import (
+    DownloadFileRequest,
     SimulationResponse,
     UploadFileRequest,
     UploadFileResponse,
@@ -54,22 +56,31 @@ import pytest
 from ansys.additive.core import (
     USER_DATA_PATH,
     Additive,
+    CancellationToken,
     MicrostructureInput,
     MicrostructureSummary,
     PorosityInput,
     PorositySummary,
+    RetryPolicy,
+    SimulationCancelled,
     SimulationError,
+    SimulationTimeout,
+    SimulationType,
     SingleBeadInput,
     SingleBeadSummary,
     StlFile,
     ThermalHistoryInput,
+    ThermalHistorySummary,
     __version__,
 )
 import ansys.additive.core.additive
+from ansys.additive.core.cache import file_digest
 from ansys.additive.core.material import AdditiveMaterial
 from ansys.additive.core.material_tuning import MaterialTuningInput
 from ansys.additive.core.server_connection import ServerConnection
 import ansys.additive.core.server_connection.server_connection
+from ansys.additive.core.server_connection.server_connection import ServerStatistics
+from ansys.additive.core.simulation import DEFAULT_SIMULATION_DEADLINES
 
 from . import test_utils
 
@@ -184,6 +195,27 @@ def test_connect_to_servers_with_nservers_creates_server_connections(mock_connec
     mock_connection.assert_called_with(product_version=product_version, log=log)
 
 
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_connect_to_servers_with_nservers_starts_servers_concurrently(mock_connection):
+    # arrange
+    nservers = 4
+    barrier = threading.Barrier(nservers, timeout=5)
+
+    def start_server(product_version, log):
+        # Each server waits until all servers are starting.
+        barrier.wait()
+        return test_utils.get_mock_server_connection()
+
+    mock_connection.side_effect = start_server
+
+    # act
+    servers = Additive._connect_to_servers(nservers=nservers)
+
+    # assert
+    assert len(servers) == nservers
+    assert mock_connection.call_count == nservers
+
+
 def test_create_logger_raises_exception_for_invalid_log_level():
     # arrange, act, assert
     with pytest.raises(ValueError, match="Invalid log level"):
@@ -257,12 +289,13 @@ def test_about_prints_server_status_messages(capsys: pytest.CaptureFixture[str])
 )
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
-def test_simulate_with_single_input_calls_internal_simulate_once(_, input):
+def test_simulate_with_single_input_calls_internal_simulate_once(mock_connection, input):
     # arrange
     input.material = test_utils.get_test_material()
     expected_summary = test_utils.get_test_SingleBeadSummary()
     with patch("ansys.additive.core.additive.Additive._simulate") as _simulate_patch:
         _simulate_patch.return_value = expected_summary
+    mock_connection.return_value = test_utils.get_mock_server_connection()
     additive = Additive()
     additive._simulate = _simulate_patch
 
@@ -272,13 +305,15 @@ def test_simulate_with_single_input_calls_internal_simulate_once(_, input):
     # assert
     assert isinstance(summary, SingleBeadSummary)
     assert summary == expected_summary
-    _simulate_patch.assert_called_once_with(input, ANY, show_progress=True)
+    _simulate_patch.assert_called_once_with(
+        input=input, server=ANY, show_progress=True, cancellation=None
+    )
 
 
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
 def test_simulate_prints_error_message_when_SimulationError_returned(
-    _, capsys: pytest.CaptureFixture[str]
+    mock_connection, capsys: pytest.CaptureFixture[str]
 ):
     # arrange
     input = SingleBeadInput(material=test_utils.get_test_material())
@@ -286,6 +321,7 @@ def test_simulate_prints_error_message_when_SimulationError_returned(
     simulation_error = SimulationError(input, error_msg)
     with patch("ansys.additive.core.additive.Additive._simulate") as _simulate_patch:
         _simulate_patch.return_value = simulation_error
+    mock_connection.return_value = test_utils.get_mock_server_connection()
     additive = Additive()
     additive._simulate = _simulate_patch
 
@@ -296,15 +332,18 @@ def test_simulate_prints_error_message_when_SimulationError_returned(
     assert isinstance(summaries[0], SimulationError)
     captured = capsys.readouterr()
     assert error_msg in captured.out
-    _simulate_patch.assert_called_once_with(input=input, server=ANY, show_progress=False)
+    _simulate_patch.assert_called_once_with(
+        input=input, server=ANY, show_progress=False, cancellation=None
+    )
 
 
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
-def test_simulate_with_input_list_calls_internal_simulate_n_times(_):
+def test_simulate_with_input_list_calls_internal_simulate_n_times(mock_connection):
     # arrange
     with patch("ansys.additive.core.additive.Additive._simulate") as _simulate_patch:
         _simulate_patch.return_value = None
+    mock_connection.return_value = test_utils.get_mock_server_connection()
     additive = Additive()
     additive._simulate = _simulate_patch
     inputs = [
@@ -322,10 +361,257 @@ def test_simulate_with_input_list_calls_internal_simulate_n_times(_):
     # assert
     assert _simulate_patch.call_count == len(inputs)
     print(_simulate_patch.call_args_list)
-    calls = [call(input=i, server=ANY, show_progress=False) for i in inputs]
+    calls = [call(input=i, server=ANY, show_progress=False, cancellation=None) for i in inputs]
     _simulate_patch.assert_has_calls(calls, any_order=True)
 
 
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_iter_yields_summaries_as_they_complete(_):
+    # arrange
+    slow_input = SingleBeadInput(id="slow")
+    fast_input = PorosityInput(id="fast")
+    release_slow = threading.Event()
+
+    def _simulate(input, server, show_progress, cancellation):
+        if input is slow_input:
+            assert release_slow.wait(5)
+        return input.id
+
+    additive = Additive()
+    additive._servers = [
+        test_utils.get_mock_server_connection(),
+        test_utils.get_mock_server_connection(),
+    ]
+    additive._simulate = _simulate
+
+    # act
+    results = additive.simulate_iter([slow_input, fast_input])
+
+    # assert
+    assert next(results) == "fast"
+    release_slow.set()
+    assert next(results) == "slow"
+    with pytest.raises(StopIteration):
+        next(results)
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_init_sets_concurrency_of_servers(mock_connection):
+    # arrange
+    mock_connection.side_effect = [
+        test_utils.get_mock_server_connection(),
+        test_utils.get_mock_server_connection(),
+    ]
+    by_type = {SimulationType.SINGLE_BEAD: 4}
+
+    # act
+    additive = Additive(nservers=2, max_concurrency=2, max_concurrency_by_type=by_type)
+
+    # assert
+    for server in additive._servers:
+        assert server.max_concurrency == 2
+        assert server.max_concurrency_by_type == by_type
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_server_statistics_returns_statistics_of_each_server(mock_connection):
+    # arrange
+    servers = [test_utils.get_mock_server_connection(), test_utils.get_mock_server_connection()]
+    servers[0].statistics = ServerStatistics("server1", finished=1)
+    servers[1].statistics = ServerStatistics("server2", finished=2)
+    mock_connection.side_effect = servers
+    additive = Additive(nservers=2)
+
+    # act
+    result = additive.server_statistics()
+
+    # assert
+    assert result == [servers[0].statistics, servers[1].statistics]
+
+
+@pytest.mark.parametrize(
+    "server_connection,expected_kwargs",
+    [
+        ("host:50052", {"addr": "host:50052"}),
+        (None, {"product_version": "241"}),
+    ],
+)
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_add_server_connects_and_configures_server(
+    mock_connection, server_connection, expected_kwargs
+):
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    new_server = test_utils.get_mock_server_connection()
+    mock_connection.side_effect = [server, new_server]
+    additive = Additive(product_version="241", max_concurrency=3)
+
+    # act
+    result = additive.add_server(server_connection)
+
+    # assert
+    assert result is new_server
+    assert additive.servers == [server, new_server]
+    assert new_server.max_concurrency == 3
+    mock_connection.assert_called_with(**expected_kwargs, log=ANY)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_add_server_with_channel_connects_to_channel(mock_connection):
+    # arrange
+    channel = grpc.insecure_channel("host:50052")
+    mock_connection.side_effect = [
+        test_utils.get_mock_server_connection(),
+        test_utils.get_mock_server_connection(),
+    ]
+    additive = Additive()
+
+    # act
+    additive.add_server(channel)
+
+    # assert
+    mock_connection.assert_called_with(channel=channel, log=ANY)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_add_server_runs_queued_simulations_on_new_server(mock_connection):
+    # arrange
+    server = test_utils.get_mock_server_connection(channel_str="server")
+    new_server = test_utils.get_mock_server_connection(channel_str="new")
+    mock_connection.side_effect = [server, new_server]
+    additive = Additive()
+    started = threading.Event()
+    release = threading.Event()
+    assignments = {}
+
+    def _simulate(input, server, show_progress, cancellation):
+        assignments[input.id] = server
+        if server is not new_server:
+            started.set()
+            release.wait(5)
+        return input.id
+
+    additive._simulate = _simulate
+    inputs = [
+        SingleBeadInput(id=f"id{i}", material=test_utils.get_test_material()) for i in range(3)
+    ]
+    results = additive.simulate_iter(inputs)
+    completed = []
+    results_thread = threading.Thread(target=lambda: completed.extend(results))
+
+    # act
+    results_thread.start()
+    assert started.wait(5)
+    pending = additive.pending_simulations()
+    additive.add_server()
+    for _ in range(500):
+        if len(completed) == 2:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    results_thread.join(5)
+
+    # assert
+    assert pending == 2
+    assert [assignments[id] for id in completed[:2]] == [new_server, new_server]
+    assert additive.pending_simulations() == 0
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_remove_server_removes_server(mock_connection):
+    # arrange
+    servers = [test_utils.get_mock_server_connection(), test_utils.get_mock_server_connection()]
+    mock_connection.side_effect = servers
+    additive = Additive(nservers=2)
+
+    # act
+    additive.remove_server(servers[0])
+
+    # assert
+    assert additive.servers == [servers[1]]
+    servers[0].close.assert_not_called()
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_remove_server_with_unknown_or_last_server_raises_exception(mock_connection):
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    mock_connection.return_value = server
+    additive = Additive()
+
+    # act, assert
+    with pytest.raises(ValueError, match="is not connected"):
+        additive.remove_server(test_utils.get_mock_server_connection())
+    with pytest.raises(ValueError, match="last server"):
+        additive.remove_server(server)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.Autoscaler")
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_autoscale_replaces_running_autoscaler(_, mock_autoscaler):
+    # arrange
+    first, second = Mock(), Mock()
+    mock_autoscaler.side_effect = [first, second]
+    additive = Additive()
+
+    # act
+    additive.autoscale(min_servers=1, max_servers=2)
+    result = additive.autoscale(min_servers=2, max_servers=3, idle_cooldown=10, interval=1)
+
+    # assert
+    assert result is second
+    first.stop.assert_called_once()
+    second.start.assert_called_once()
+    mock_autoscaler.assert_called_with(additive, 2, 3, 10, 1, log=ANY)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_with_longest_first_starts_longest_simulations_first(_):
+    # arrange
+    started = []
+
+    def _simulate(input, server, show_progress, cancellation):
+        started.append(input.id)
+        return input.id
+
+    additive = Additive()
+    additive._servers = [test_utils.get_mock_server_connection()]
+    additive._simulate = _simulate
+    inputs = [
+        SingleBeadInput(id="sb"),
+        PorosityInput(id="p"),
+        MicrostructureInput(id="ms"),
+        ThermalHistoryInput(id="th"),
+    ]
+
+    # act
+    summaries = additive.simulate(inputs, longest_first=True)
+
+    # assert
+    assert started == ["th", "ms", "p", "sb"]
+    assert summaries == started
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_iter_with_duplicate_simulation_ids_raises_exception(_):
+    # arrange
+    additive = Additive()
+    inputs = [SingleBeadInput(id="id"), PorosityInput(id="id")]
+
+    # act, assert
+    with pytest.raises(ValueError, match="Duplicate simulation ID"):
+        additive.simulate_iter(inputs)
+
+
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
 def test_simulate_with_duplicate_simulation_ids_raises_exception(_):
@@ -346,6 +632,21 @@ def test_simulate_with_duplicate_simulation_ids_raises_exception(_):
         additive.simulate(inputs)
 
 
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_with_invalid_inputs_does_not_print_progress(_, capsys: pytest.CaptureFixture):
+    # arrange
+    additive = Additive()
+    inputs = [SingleBeadInput(id="id"), PorosityInput(id="id")]
+
+    # act
+    with pytest.raises(ValueError):
+        additive.simulate(inputs)
+
+    # assert
+    assert "Completed" not in capsys.readouterr().out
+
+
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
 def test_internal_simulate_with_thermal_history_without_geometry_returns_SimulationError(
@@ -450,7 +751,7 @@ def test_exception_during_interal_simulation_returns_SimulationError(_, input):
     )
     sim_response = SimulationResponse(id="id", progress=progress_msg)
 
-    def iterable_with_exception(_):
+    def iterable_with_exception(_, timeout=None):
         yield sim_response
         raise Exception(error_msg)
 
@@ -481,7 +782,7 @@ def test_server_error_during_interal_simulation_returns_SimulationError(_):
     sim_response = SimulationResponse(id="id", progress=progress_msg)
     input = SingleBeadInput(material=test_utils.get_test_material())
 
-    def iterable_response(_):
+    def iterable_response(_, timeout=None):
         yield sim_response
 
     mock_connection_with_stub = Mock()
@@ -496,6 +797,241 @@ def test_server_error_during_interal_simulation_returns_SimulationError(_):
     assert error_msg in result.message
 
 
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_raises_retryable_server_error(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.simulation_stub.Simulate.side_effect = test_utils.RpcError(
+        grpc.StatusCode.UNAVAILABLE
+    )
+    additive = Additive()
+
+    # act, assert
+    with pytest.raises(grpc.RpcError):
+        additive._simulate(input, mock_connection_with_stub)
+
+
+@pytest.mark.parametrize(
+    "retry_policy,code",
+    [
+        (None, grpc.StatusCode.UNAVAILABLE),
+        (RetryPolicy(), grpc.StatusCode.INVALID_ARGUMENT),
+    ],
+)
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_returns_SimulationError_for_server_error_that_is_not_retried(
+    _, retry_policy, code
+):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.simulation_stub.Simulate.side_effect = test_utils.RpcError(code)
+    additive = Additive(retry_policy=retry_policy)
+
+    # act
+    result = additive._simulate(input, mock_connection_with_stub)
+
+    # assert
+    assert isinstance(result, SimulationError)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_retries_simulation_on_another_server(mock_connection):
+    # arrange
+    failing_server = test_utils.get_mock_server_connection(channel_str="failing")
+    failing_server.simulation_stub.Simulate.side_effect = test_utils.RpcError(
+        grpc.StatusCode.UNAVAILABLE
+    )
+    healthy_server = test_utils.get_mock_server_connection(channel_str="healthy")
+    healthy_server.simulation_stub.Simulate.return_value = [
+        SimulationResponse(id="id", melt_pool=test_utils.get_test_melt_pool_message())
+    ]
+    mock_connection.side_effect = [failing_server, healthy_server]
+    input = SingleBeadInput(id="id", material=test_utils.get_test_material())
+    additive = Additive(
+        server_connections=["failing:50052", "healthy:50052"],
+        retry_policy=RetryPolicy(initial_backoff=0),
+    )
+
+    # act
+    summary = additive.simulate(input)
+
+    # assert
+    assert isinstance(summary, SingleBeadSummary)
+    healthy_server.simulation_stub.Simulate.assert_called_once()
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_does_not_retry_simulation_that_exceeds_its_deadline(mock_connection):
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    server.simulation_stub.Simulate.side_effect = test_utils.RpcError(
+        grpc.StatusCode.DEADLINE_EXCEEDED
+    )
+    mock_connection.return_value = server
+    input = SingleBeadInput(id="id", material=test_utils.get_test_material())
+    policy = RetryPolicy(
+        initial_backoff=0,
+        retryable_codes=(grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED),
+    )
+    additive = Additive(retry_policy=policy, deadlines={SimulationType.SINGLE_BEAD: 10})
+
+    # act
+    summary = additive.simulate(input)
+
+    # assert
+    assert isinstance(summary, SimulationTimeout)
+    server.simulation_stub.Simulate.assert_called_once()
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_raises_deadline_exceeded_without_deadline_when_retryable(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    server = Mock()
+    server.simulation_stub.Simulate.side_effect = test_utils.RpcError(
+        grpc.StatusCode.DEADLINE_EXCEEDED
+    )
+    policy = RetryPolicy(
+        retryable_codes=(grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+    )
+    additive = Additive(retry_policy=policy, deadlines={SimulationType.SINGLE_BEAD: None})
+
+    # act, assert
+    with pytest.raises(grpc.RpcError):
+        additive._simulate(input, server)
+
+
+@pytest.mark.parametrize(
+    "input,sim_type",
+    [
+        (SingleBeadInput(), SimulationType.SINGLE_BEAD),
+        (PorosityInput(), SimulationType.POROSITY),
+        (MicrostructureInput(), SimulationType.MICROSTRUCTURE),
+    ],
+)
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_passes_deadline_of_simulation_type(_, input, sim_type):
+    # arrange
+    input.material = test_utils.get_test_material()
+    server = Mock()
+    server.simulation_stub.Simulate.return_value = iter([])
+    additive = Additive(deadlines={sim_type: 42})
+
+    # act
+    additive._simulate(input, server)
+
+    # assert
+    server.simulation_stub.Simulate.assert_called_once_with(ANY, timeout=42)
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_uses_default_deadlines(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    server = Mock()
+    server.simulation_stub.Simulate.return_value = iter([])
+    additive = Additive(deadlines={SimulationType.POROSITY: None})
+
+    # act
+    additive._simulate(input, server)
+
+    # assert
+    server.simulation_stub.Simulate.assert_called_once_with(
+        ANY, timeout=DEFAULT_SIMULATION_DEADLINES[SimulationType.SINGLE_BEAD]
+    )
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_returns_SimulationTimeout_when_deadline_exceeded(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    server = Mock()
+    server.simulation_stub.Simulate.side_effect = test_utils.RpcError(
+        grpc.StatusCode.DEADLINE_EXCEEDED
+    )
+    additive = Additive(deadlines={SimulationType.SINGLE_BEAD: 10})
+
+    # act
+    result = additive._simulate(input, server)
+
+    # assert
+    assert isinstance(result, SimulationTimeout)
+    assert result.deadline == 10
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_with_cancelled_token_returns_SimulationCancelled(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    server = Mock()
+    token = CancellationToken()
+    token.cancel()
+    additive = Additive()
+
+    # act
+    result = additive._simulate(input, server, cancellation=token)
+
+    # assert
+    assert isinstance(result, SimulationCancelled)
+    server.simulation_stub.Simulate.assert_not_called()
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_cancels_call_in_progress(_):
+    # arrange
+    input = SingleBeadInput(material=test_utils.get_test_material())
+    token = CancellationToken()
+
+    class Call:
+        def __iter__(self):
+            token.cancel()
+            raise test_utils.RpcError(grpc.StatusCode.CANCELLED)
+
+        cancel = Mock()
+
+    call = Call()
+    server = Mock()
+    server.simulation_stub.Simulate.return_value = call
+    additive = Additive()
+
+    # act
+    result = additive._simulate(input, server, cancellation=token)
+
+    # assert
+    assert isinstance(result, SimulationCancelled)
+    call.cancel.assert_called_once_with()
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_with_cancelled_token_returns_cancelled_results(mock_connection):
+    # arrange
+    mock_connection.return_value = test_utils.get_mock_server_connection()
+    material = test_utils.get_test_material()
+    inputs = [SingleBeadInput(id=f"id{i}", material=material) for i in range(3)]
+    token = CancellationToken()
+    token.cancel()
+    additive = Additive()
+
+    # act
+    summaries = additive.simulate(inputs, cancellation=token)
+
+    # assert
+    assert len(summaries) == 3
+    assert all(isinstance(summary, SimulationCancelled) for summary in summaries)
+
+
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
 def test_materials_list_returns_list_of_material_names(mock_connection):
@@ -536,6 +1072,138 @@ def test_get_material_returns_material(mock_connection):
     )
 
 
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_material_caches_material_and_returns_copies(mock_connection):
+    # arrange
+    material = test_utils.get_test_material()
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.materials_stub.GetMaterial.return_value = (
+        material._to_material_message()
+    )
+    mock_connection.return_value = mock_connection_with_stub
+    additive = Additive()
+
+    # act
+    first = additive.material(material.name)
+    first.elastic_modulus = 1
+    second = additive.material(material.name)
+
+    # assert
+    assert second == material
+    mock_connection_with_stub.materials_stub.GetMaterial.assert_called_once()
+
+
+@pytest.mark.parametrize("name", ["test-material", None])
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_invalidate_materials_discards_cached_material(mock_connection, name):
+    # arrange
+    material = test_utils.get_test_material()
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.materials_stub.GetMaterial.return_value = (
+        material._to_material_message()
+    )
+    mock_connection.return_value = mock_connection_with_stub
+    additive = Additive()
+    additive.material("test-material")
+
+    # act
+    additive.invalidate_materials(name)
+    additive.material("test-material")
+
+    # assert
+    assert mock_connection_with_stub.materials_stub.GetMaterial.call_count == 2
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_material_with_zero_ttl_does_not_cache(mock_connection):
+    # arrange
+    material = test_utils.get_test_material()
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.materials_stub.GetMaterial.return_value = (
+        material._to_material_message()
+    )
+    mock_connection.return_value = mock_connection_with_stub
+    additive = Additive(material_cache_ttl=0)
+
+    # act
+    additive.material("test-material")
+    additive.material("test-material")
+
+    # assert
+    assert mock_connection_with_stub.materials_stub.GetMaterial.call_count == 2
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_materials_list_is_cached_until_invalidated(mock_connection):
+    # arrange
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.materials_stub.GetMaterialsList.return_value = (
+        GetMaterialsListResponse(names=["material1"])
+    )
+    mock_connection.return_value = mock_connection_with_stub
+    additive = Additive()
+
+    # act
+    first = additive.materials_list()
+    first.append("modified")
+    second = additive.materials_list()
+    additive.invalidate_materials()
+    additive.materials_list()
+
+    # assert
+    assert second == ["material1"]
+    assert mock_connection_with_stub.materials_stub.GetMaterialsList.call_count == 2
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_prefetch_materials_gets_each_distinct_material_once(mock_connection):
+    # arrange
+    servers = [Mock(), Mock()]
+    for server in servers:
+        server.materials_stub.GetMaterial.side_effect = lambda request: AdditiveMaterial(
+            name=request.name
+        )._to_material_message()
+    mock_connection.side_effect = servers
+    additive = Additive(nservers=2)
+    additive.material("cached")
+
+    # act
+    materials = additive.prefetch_materials(["a", "b", "a", "cached"])
+
+    # assert
+    assert sorted(materials) == ["a", "b", "cached"]
+    assert all(material.name == name for name, material in materials.items())
+    requested = [
+        call.args[0].name
+        for server in servers
+        for call in server.materials_stub.GetMaterial.call_args_list
+    ]
+    assert sorted(requested) == ["a", "b", "cached"]
+    assert all(server.materials_stub.GetMaterial.called for server in servers)
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_prefetch_materials_omits_materials_that_cannot_be_retrieved(mock_connection):
+    # arrange
+    def get_material(request):
+        if request.name == "missing":
+            raise Exception("not found")
+        return AdditiveMaterial(name=request.name)._to_material_message()
+
+    mock_connection_with_stub = Mock()
+    mock_connection_with_stub.materials_stub.GetMaterial.side_effect = get_material
+    mock_connection.return_value = mock_connection_with_stub
+    additive = Additive()
+
+    # act
+    materials = additive.prefetch_materials(["found", "missing"])
+    empty = additive.prefetch_materials([])
+
+    # assert
+    assert list(materials) == ["found"]
+    assert empty == {}
+
+
 def test_load_material_returns_material():
     # arrange
     parameters_file = test_utils.get_test_file_path(pathlib.Path("Material") / "material-data.json")
@@ -600,7 +1268,7 @@ def test_tune_material_raises_exception_for_progress_error(mock_connection, tmp_
         id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message=message)
     )
 
-    def iterable_response(_):
+    def iterable_response(_, timeout=None):
         yield response
 
     mock_connection_with_stub = Mock()
@@ -647,7 +1315,7 @@ def test_tune_material_filters_progress_messages(
         id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_EXECUTING, message=text)
     )
 
-    def iterable_response(_):
+    def iterable_response(_, timeout=None):
         yield response
 
     mock_connection_with_stub = Mock()
@@ -765,7 +1433,7 @@ def test_simulate_thermal_history_with_progress_error_during_upload_raises_excep
         progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message=message),
     )
 
-    def iterable_response(_):
+    def iterable_response(_, timeout=None):
         yield response
 
     mock_connection_with_stub = Mock()
@@ -817,20 +1485,16 @@ def test_simulate_thermal_history_with_progress_error_during_simulation_raises_e
         additive._simulate_thermal_history(input, None, mock_connection_with_stub)
     mock_connection_with_stub.simulation_stub.UploadFile.assert_called_once()
     # The Simulate method is called once and returns an iterator for the two responses above
-    mock_connection_with_stub.simulation_stub.Simulate.assert_called_once_with(simulation_request)
+    mock_connection_with_stub.simulation_stub.Simulate.assert_called_once_with(
+        simulation_request, timeout=ANY
+    )
 
 
 # patch needed for Additive() call
 @patch("ansys.additive.core.additive.ServerConnection")
-@patch("ansys.additive.core.additive.download_file")
-def test_simulate_thermal_history_returns_expected_summary(
-    mock_download_file, _, tmp_path: pathlib.Path
-):
+def test_simulate_thermal_history_returns_expected_summary(_, tmp_path: pathlib.Path):
     # arrange
-    results_file = tmp_path / "results.zip"
     out_dir = tmp_path / "out_dir"
-    shutil.copyfile(test_utils.get_test_file_path("thermal_history_results.zip"), str(results_file))
-    mock_download_file.side_effect = lambda a, b, c: str(results_file)
 
     id = "thermal-history-test"
     input = ThermalHistoryInput(
@@ -849,6 +1513,9 @@ def test_simulate_thermal_history_returns_expected_summary(
     mock_connection_with_stub = Mock()
     mock_connection_with_stub.simulation_stub.UploadFile.return_value = [upload_response]
     mock_connection_with_stub.simulation_stub.Simulate.return_value = [simulation_response]
+    mock_connection_with_stub.simulation_stub.DownloadFile.return_value = (
+        test_utils.get_download_responses("thermal_history_results.zip", 1024)
+    )
     additive = Additive()
 
     # act
@@ -856,7 +1523,252 @@ def test_simulate_thermal_history_returns_expected_summary(
 
     # assert
     mock_connection_with_stub.simulation_stub.UploadFile.assert_called_once()
-    mock_connection_with_stub.simulation_stub.Simulate.assert_called_once_with(simulation_request)
+    mock_connection_with_stub.simulation_stub.Simulate.assert_called_once_with(
+        simulation_request, timeout=ANY
+    )
+    mock_connection_with_stub.simulation_stub.DownloadFile.assert_called_once_with(
+        DownloadFileRequest(remote_file_name="zip-file")
+    )
+    assert not (out_dir / id / "coax_ave_output" / "zip-file").exists()
     assert summary.input == input
     assert summary.coax_ave_output_folder == str(out_dir / id / "coax_ave_output")
     assert len(list(pathlib.Path(summary.coax_ave_output_folder).glob("*.vtk"))) == 6
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_thermal_history_applies_remaining_deadline_to_each_call(_):
+    # arrange
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    upload_response = UploadFileResponse(
+        remote_file_name="remote/file/name",
+        progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED, message="done"),
+    )
+    server = Mock()
+    server.simulation_stub.UploadFile.return_value = [upload_response]
+    server.simulation_stub.Simulate.return_value = []
+    additive = Additive()
+
+    # act
+    additive._simulate_thermal_history(input, "out_dir", server, deadline=100)
+
+    # assert
+    upload_timeout = server.simulation_stub.UploadFile.call_args.kwargs["timeout"]
+    simulate_timeout = server.simulation_stub.Simulate.call_args.kwargs["timeout"]
+    assert 0 < simulate_timeout <= upload_timeout <= 100
+
+
+def _thermal_history_server(remote_file_name: str = "remote/file/name") -> Mock:
+    server = Mock()
+    server.simulation_stub.UploadFile.return_value = [
+        UploadFileResponse(
+            remote_file_name=remote_file_name,
+            progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED, message="done"),
+        )
+    ]
+    server.simulation_stub.Simulate.return_value = []
+    return server
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_thermal_history_uploads_identical_geometry_once_per_server(
+    _, tmp_path: pathlib.Path
+):
+    # arrange
+    geometry = tmp_path / "part.stl"
+    copy = tmp_path / "copy.stl"
+    shutil.copyfile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"), geometry)
+    shutil.copyfile(geometry, copy)
+    server1 = _thermal_history_server()
+    server2 = _thermal_history_server()
+    additive = Additive()
+
+    # act
+    for id, path, server in [("a", geometry, server1), ("b", copy, server1), ("c", copy, server2)]:
+        input = ThermalHistoryInput(id=id, geometry=StlFile(str(path)))
+        additive._simulate_thermal_history(input, str(tmp_path), server)
+
+    # assert
+    server1.simulation_stub.UploadFile.assert_called_once()
+    server2.simulation_stub.UploadFile.assert_called_once()
+    for request in server1.simulation_stub.Simulate.call_args_list:
+        assert request.args[0].thermal_history_input.stl_file.name == "remote/file/name"
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_thermal_history_uploads_geometry_again_when_server_rejects_it(_):
+    # arrange
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    server = _thermal_history_server()
+    additive = Additive()
+    additive._simulate_thermal_history(input, "out_dir", server)
+    server.simulation_stub.UploadFile.return_value = [
+        UploadFileResponse(
+            remote_file_name="new/file/name",
+            progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED, message="done"),
+        )
+    ]
+    rejected = SimulationResponse(
+        id="id",
+        progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="file not found"),
+    )
+    server.simulation_stub.Simulate.side_effect = [[rejected], []]
+
+    # act
+    additive._simulate_thermal_history(input, "out_dir", server)
+
+    # assert
+    assert server.simulation_stub.UploadFile.call_count == 2
+    requests = [c.args[0] for c in server.simulation_stub.Simulate.call_args_list]
+    assert [r.thermal_history_input.stl_file.name for r in requests] == [
+        "remote/file/name",
+        "remote/file/name",
+        "new/file/name",
+    ]
+    digest = additive._uploads.digest(input.geometry.path)
+    assert additive._uploads.get(server, digest) == "new/file/name"
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_simulate_thermal_history_does_not_upload_again_when_simulation_fails(_):
+    # arrange
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    server = _thermal_history_server()
+    additive = Additive()
+    additive._simulate_thermal_history(input, "out_dir", server)
+    server.simulation_stub.Simulate.return_value = [
+        SimulationResponse(
+            id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_EXECUTING)
+        ),
+        SimulationResponse(
+            id="id",
+            progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="solver failed"),
+        ),
+    ]
+
+    # act, assert
+    with pytest.raises(Exception, match="solver failed"):
+        additive._simulate_thermal_history(input, "out_dir", server)
+    server.simulation_stub.UploadFile.assert_called_once()
+    assert server.simulation_stub.Simulate.call_count == 2
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_with_cache_returns_cached_summary_without_rpc(_, tmp_path: pathlib.Path):
+    # arrange
+    material = test_utils.get_test_material()
+    response = SimulationResponse(id="id1", porosity_result=PorosityResult(solid_ratio=0.5))
+    server = Mock()
+    server.simulation_stub.Simulate.return_value = [response]
+    additive = Additive(cache_dir=str(tmp_path / "cache"))
+    first = additive._simulate(PorosityInput(id="id1", material=material), server)
+    server.simulation_stub.Simulate.reset_mock()
+
+    # act
+    second = additive._simulate(PorosityInput(id="id2", material=material), server)
+
+    # assert
+    server.simulation_stub.Simulate.assert_not_called()
+    assert isinstance(second, PorositySummary)
+    assert second.input.id == "id2"
+    assert second.relative_density == first.relative_density
+    assert additive.cache.statistics.hits == 1
+    assert additive.cache.statistics.misses == 1
+
+
+# patch needed for Additive() call
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_with_cache_does_not_cache_errors(_, tmp_path: pathlib.Path):
+    # arrange
+    input = SingleBeadInput(id="id", material=test_utils.get_test_material())
+    response = SimulationResponse(
+        id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="error")
+    )
+    server = Mock()
+    server.simulation_stub.Simulate.return_value = [response]
+    additive = Additive(cache_dir=str(tmp_path / "cache"))
+
+    # act
+    summary = additive._simulate(input, server)
+
+    # assert
+    assert isinstance(summary, SimulationError)
+    assert additive.cache.statistics.entries == 0
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_with_cache_hashes_thermal_history_geometry_once(
+    _, tmp_path: pathlib.Path
+):
+    # arrange
+    geometry = StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    upload_response = UploadFileResponse(
+        remote_file_name="remote/file/name",
+        progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+    )
+    server = Mock()
+    server.simulation_stub.UploadFile.return_value = [upload_response]
+    server.simulation_stub.Simulate.return_value = []
+    additive = Additive(cache_dir=str(tmp_path / "cache"))
+    input = ThermalHistoryInput(id="id", geometry=geometry, material=test_utils.get_test_material())
+
+    # act
+    with patch("ansys.additive.core.upload.file_digest", side_effect=file_digest) as digest:
+        with patch("ansys.additive.core.cache.file_digest", side_effect=file_digest) as key_digest:
+            additive._simulate(input, server)
+
+    # assert
+    digest.assert_called_once_with(geometry.path)
+    key_digest.assert_not_called()
+    server.simulation_stub.UploadFile.assert_called_once()
+
+
+@patch("ansys.additive.core.additive.ServerConnection")
+def test_internal_simulate_with_cache_caches_thermal_history_results(_, tmp_path: pathlib.Path):
+    # arrange
+    geometry = StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    material = test_utils.get_test_material()
+    upload_response = UploadFileResponse(
+        remote_file_name="remote/file/name",
+        progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+    )
+    simulation_response = SimulationResponse(
+        id="id", thermal_history_result=ThermalHistoryResult(coax_ave_zip_file="zip-file")
+    )
+    server = Mock()
+    server.simulation_stub.UploadFile.return_value = [upload_response]
+    server.simulation_stub.Simulate.return_value = [simulation_response]
+    server.simulation_stub.DownloadFile.return_value = test_utils.get_download_responses(
+        "thermal_history_results.zip"
+    )
+    additive = Additive(cache_dir=str(tmp_path / "cache"))
+    first = additive._simulate(
+        ThermalHistoryInput(id="th-cache-1", geometry=geometry, material=material), server
+    )
+    shutil.rmtree(pathlib.Path(first.coax_ave_output_folder).parent)
+    server.simulation_stub.reset_mock()
+    get = Mock(wraps=additive.cache.get)
+    additive.cache.get = get
+
+    # act
+    summary = additive._simulate(
+        ThermalHistoryInput(id="th-cache-2", geometry=geometry, material=material), server
+    )
+
+    # assert
+    get.assert_not_called()
+    server.simulation_stub.UploadFile.assert_not_called()
+    server.simulation_stub.Simulate.assert_not_called()
+    assert isinstance(summary, ThermalHistorySummary)
+    assert len(list(pathlib.Path(summary.coax_ave_output_folder).glob("*.vtk"))) == 6
+    shutil.rmtree(pathlib.Path(summary.coax_ave_output_folder).parent)
@@ -0,0 +1,637 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import pathlib
+from unittest.mock import AsyncMock, Mock, call, patch
+
+from ansys.api.additive.v0.additive_domain_pb2 import (
+    MaterialTuningResult,
+    PorosityResult,
+    Progress,
+    ProgressState,
+    ThermalHistoryResult,
+)
+from ansys.api.additive.v0.additive_materials_pb2 import (
+    GetMaterialRequest,
+    GetMaterialsListResponse,
+    TuneMaterialResponse,
+)
+from ansys.api.additive.v0.additive_simulation_pb2 import SimulationResponse, UploadFileResponse
+import grpc
+import pytest
+
+from ansys.additive.core import (
+    AsyncAdditive,
+    MicrostructureInput,
+    PorosityInput,
+    PorositySummary,
+    SimulationError,
+    SimulationType,
+    SingleBeadInput,
+    SingleBeadSummary,
+    StlFile,
+    ThermalHistoryInput,
+)
+from ansys.additive.core.material_tuning import MaterialTuningInput
+from ansys.additive.core.server_connection import AsyncServerConnection
+from ansys.additive.core.server_connection.server_connection import ServerStatistics
+
+from . import test_utils
+
+
+async def _aiter(items):
+    for item in items:
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def _mock_server(channel_str="server"):
+    server = test_utils.get_mock_server_connection(AsyncServerConnection, channel_str=channel_str)
+    server.ready = AsyncMock(return_value=True)
+    server.close = AsyncMock()
+    return server
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_connect_to_servers_with_server_connections_creates_server_connections(mock_connection):
+    # arrange
+    async def create_channel():
+        return grpc.aio.insecure_channel("target")
+
+    channel = asyncio.run(create_channel())
+    connections = ["localhost:1234", channel]
+
+    # act
+    servers = AsyncAdditive._connect_to_servers(server_connections=connections, log=None)
+
+    # assert
+    assert len(servers) == 2
+    mock_connection.assert_has_calls(
+        [call(addr="localhost:1234", log=None), call(channel=channel, log=None)]
+    )
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_connect_to_servers_with_nservers_creates_server_connections(mock_connection):
+    # act
+    servers = AsyncAdditive._connect_to_servers(nservers=3, product_version="123", log=None)
+
+    # assert
+    assert len(servers) == 3
+    mock_connection.assert_called_with(product_version="123", log=None)
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_context_manager_connects_and_closes_servers(mock_connection):
+    # arrange
+    server = _mock_server()
+    mock_connection.return_value = server
+
+    async def run():
+        async with AsyncAdditive() as additive:
+            assert additive._servers == [server]
+            server.close.assert_not_awaited()
+
+    # act
+    asyncio.run(run())
+
+    # assert
+    server.ready.assert_awaited_once()
+    server.close.assert_awaited_once()
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_connect_raises_exception_when_server_not_ready(mock_connection):
+    # arrange
+    server = _mock_server("bad-server:1234")
+    server.ready.return_value = False
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act, assert
+    with pytest.raises(RuntimeError, match="Unable to connect to server bad-server:1234"):
+        asyncio.run(additive.connect())
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_with_single_input_returns_summary(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(
+        [
+            SimulationResponse(
+                id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_EXECUTING)
+            ),
+            SimulationResponse(id="id", melt_pool=test_utils.get_test_melt_pool_message()),
+        ]
+    )
+    mock_connection.return_value = server
+    input = SingleBeadInput(id="id", material=test_utils.get_test_material())
+    additive = AsyncAdditive()
+
+    # act
+    summary = asyncio.run(additive.simulate(input))
+
+    # assert
+    assert isinstance(summary, SingleBeadSummary)
+    assert summary.input == input
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_with_input_list_distributes_inputs_over_servers(mock_connection):
+    # arrange
+    servers = [_mock_server("server1"), _mock_server("server2")]
+    mock_connection.side_effect = servers
+    additive = AsyncAdditive(server_connections=["server1:1", "server2:2"])
+    material = test_utils.get_test_material()
+    inputs = [PorosityInput(id=f"id{i}", material=material) for i in range(6)]
+    used_servers = []
+
+    def simulate_on(server):
+        async def simulate(request):
+            used_servers.append(server.channel_str)
+            await asyncio.sleep(0)
+            yield SimulationResponse(id=request.id, porosity_result=PorosityResult(solid_ratio=1))
+
+        return simulate
+
+    for server in servers:
+        server.simulation_stub.Simulate.side_effect = simulate_on(server)
+
+    # act
+    summaries = asyncio.run(additive.simulate(inputs))
+
+    # assert
+    assert len(summaries) == len(inputs)
+    assert all(isinstance(s, PorositySummary) for s in summaries)
+    assert sorted(s.input.id for s in summaries) == sorted(i.id for i in inputs)
+    assert set(used_servers) == {"server1", "server2"}
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_with_longest_first_starts_longest_simulations_first(mock_connection):
+    # arrange
+    mock_connection.return_value = _mock_server()
+    started = []
+
+    async def simulate(input, server):
+        started.append(input.id)
+        return input.id
+
+    additive = AsyncAdditive()
+    additive._simulate = simulate
+    inputs = [SingleBeadInput(id="sb"), MicrostructureInput(id="ms"), PorosityInput(id="p")]
+
+    # act
+    summaries = asyncio.run(additive.simulate(inputs, longest_first=True))
+
+    # assert
+    assert started == ["ms", "p", "sb"]
+    assert summaries == started
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_runs_max_concurrency_simulations_per_server(mock_connection):
+    # arrange
+    server = _mock_server()
+    mock_connection.return_value = server
+    additive = AsyncAdditive(max_concurrency=3)
+    server.concurrency_limit.return_value = server.max_concurrency
+    running = 0
+    max_running = 0
+
+    async def simulate(input, server):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(running, max_running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return input.id
+
+    additive._simulate = simulate
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(7)]
+
+    # act
+    summaries = asyncio.run(additive.simulate(inputs))
+
+    # assert
+    assert sorted(summaries) == sorted(i.id for i in inputs)
+    assert max_running == 3
+    assert server._simulation_started.call_count == len(inputs)
+    assert server._simulation_finished.call_count == len(inputs)
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_applies_concurrency_limit_of_simulation_type(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.concurrency_limit.side_effect = lambda t: {SimulationType.SINGLE_BEAD: 2}.get(t, 1)
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+    running = []
+    running_with_ms = []
+
+    async def simulate(input, server):
+        running.append(input.id)
+        if input.id == "ms":
+            running_with_ms.extend(running)
+        await asyncio.sleep(0.01)
+        running.remove(input.id)
+        return input.id
+
+    additive._simulate = simulate
+    inputs = [SingleBeadInput(id="sb1"), MicrostructureInput(id="ms"), SingleBeadInput(id="sb2")]
+
+    # act
+    summaries = asyncio.run(additive.simulate(inputs))
+
+    # assert
+    assert summaries[-1] == "ms"
+    assert running_with_ms == ["ms"]
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_server_statistics_returns_statistics_of_each_server(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.statistics = ServerStatistics("server", finished=1)
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act, assert
+    assert additive.server_statistics() == [server.statistics]
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_with_duplicate_simulation_ids_raises_exception(mock_connection):
+    # arrange
+    additive = AsyncAdditive()
+    inputs = [SingleBeadInput(id="id"), PorosityInput(id="id")]
+
+    # act, assert
+    with pytest.raises(ValueError, match="Duplicate simulation ID"):
+        asyncio.run(additive.simulate(inputs))
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_without_material_raises_exception(mock_connection):
+    # arrange
+    mock_connection.return_value = _mock_server()
+    additive = AsyncAdditive()
+
+    # act, assert
+    with pytest.raises(ValueError, match="A material is not assigned"):
+        asyncio.run(additive.simulate([SingleBeadInput(id="id")]))
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_returns_SimulationError_for_server_error(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(
+        [
+            SimulationResponse(
+                id="id",
+                progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="error"),
+            )
+        ]
+    )
+    mock_connection.return_value = server
+    input = SingleBeadInput(id="id", material=test_utils.get_test_material())
+    additive = AsyncAdditive()
+
+    # act
+    summary = asyncio.run(additive.simulate(input))
+
+    # assert
+    assert isinstance(summary, SimulationError)
+    assert summary.message == "error"
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_thermal_history_returns_expected_summary(mock_connection, tmp_path: pathlib.Path):
+    # arrange
+    server = _mock_server()
+    upload_response = UploadFileResponse(
+        remote_file_name="remote/file/name",
+        progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+    )
+    server.simulation_stub.UploadFile.side_effect = lambda requests: _aiter([upload_response])
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(
+        [
+            SimulationResponse(
+                id="id",
+                progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="WARN"),
+            ),
+            SimulationResponse(
+                id="id", thermal_history_result=ThermalHistoryResult(coax_ave_zip_file="zip")
+            ),
+        ]
+    )
+    server.simulation_stub.DownloadFile.side_effect = lambda request: _aiter(
+        test_utils.get_download_responses("thermal_history_results.zip", 1024)
+    )
+    mock_connection.return_value = server
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    additive = AsyncAdditive()
+
+    # act
+    summary = asyncio.run(additive._simulate_thermal_history(input, str(tmp_path), server))
+
+    # assert
+    server.simulation_stub.Simulate.assert_called_once_with(
+        input._to_simulation_request(remote_geometry_path="remote/file/name")
+    )
+    assert summary.coax_ave_output_folder == str(tmp_path / "id" / "coax_ave_output")
+    assert len(list(pathlib.Path(summary.coax_ave_output_folder).glob("*.vtk"))) == 6
+    assert not (tmp_path / "id" / "coax_ave_output" / "zip").exists()
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_thermal_history_streams_archive_into_cache(
+    mock_connection, tmp_path: pathlib.Path
+):
+    # arrange
+    server = _mock_server()
+    server.simulation_stub.UploadFile.side_effect = lambda requests: _aiter(
+        [
+            UploadFileResponse(
+                remote_file_name="remote/file/name",
+                progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+            )
+        ]
+    )
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(
+        [
+            SimulationResponse(
+                id="id", thermal_history_result=ThermalHistoryResult(coax_ave_zip_file="zip")
+            ),
+        ]
+    )
+    server.simulation_stub.DownloadFile.side_effect = lambda request: _aiter(
+        test_utils.get_download_responses("thermal_history_results.zip", 1024)
+    )
+    mock_connection.return_value = server
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    additive = AsyncAdditive(cache_dir=str(tmp_path / "cache"))
+
+    # act
+    asyncio.run(
+        additive._simulate_thermal_history(input, str(tmp_path / "out"), server, cache_key="abcd")
+    )
+
+    # assert
+    zip_path = test_utils.get_test_file_path("thermal_history_results.zip")
+    assert additive.cache.get("abcd") == pathlib.Path(zip_path).read_bytes()
+    assert list((tmp_path / "cache").rglob("*.tmp")) == []
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_thermal_history_reuses_uploaded_geometry(mock_connection):
+    # arrange
+    server = _mock_server()
+    remote_names = iter(["remote/file/name", "new/file/name"])
+    server.simulation_stub.UploadFile.side_effect = lambda requests: _aiter(
+        [
+            UploadFileResponse(
+                remote_file_name=next(remote_names),
+                progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+            )
+        ]
+    )
+    rejected = SimulationResponse(
+        id="id", progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="not found")
+    )
+    responses = iter([[], [], [rejected], []])
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(next(responses))
+    mock_connection.return_value = server
+    input = ThermalHistoryInput(
+        id="id", geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    )
+    additive = AsyncAdditive()
+
+    async def simulate_three_times():
+        for _ in range(3):
+            await additive._simulate_thermal_history(input, "out_dir", server)
+
+    # act
+    asyncio.run(simulate_three_times())
+
+    # assert
+    assert server.simulation_stub.UploadFile.call_count == 2
+    assert [
+        c.args[0].thermal_history_input.stl_file.name
+        for c in server.simulation_stub.Simulate.call_args_list
+    ] == ["remote/file/name", "remote/file/name", "remote/file/name", "new/file/name"]
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_thermal_history_uploads_geometry_once_for_concurrent_simulations(
+    mock_connection,
+):
+    # arrange
+    server = _mock_server()
+
+    async def upload(requests):
+        # yield to the other simulations while the upload is in progress
+        await asyncio.sleep(0.01)
+        yield UploadFileResponse(
+            remote_file_name="remote/file/name",
+            progress=Progress(state=ProgressState.PROGRESS_STATE_COMPLETED),
+        )
+
+    server.simulation_stub.UploadFile.side_effect = upload
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter([])
+    mock_connection.return_value = server
+    geometry = StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"))
+    inputs = [ThermalHistoryInput(id=f"id_{i}", geometry=geometry) for i in range(3)]
+    additive = AsyncAdditive()
+
+    async def simulate_concurrently():
+        await asyncio.gather(
+            *(additive._simulate_thermal_history(input, "out_dir", server) for input in inputs)
+        )
+
+    # act
+    asyncio.run(simulate_concurrently())
+
+    # assert
+    server.simulation_stub.UploadFile.assert_called_once()
+    assert server.simulation_stub.Simulate.call_count == 3
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_upload_file_raises_exception_for_progress_error(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.simulation_stub.UploadFile.side_effect = lambda requests: _aiter(
+        [
+            UploadFileResponse(
+                progress=Progress(state=ProgressState.PROGRESS_STATE_ERROR, message="bad")
+            )
+        ]
+    )
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act, assert
+    with pytest.raises(Exception, match="bad"):
+        asyncio.run(additive.upload_file(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl")))
+
+
+@patch("ansys.additive.core.async_additive.download_file_async")
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_download_file_calls_download_file_async(mock_connection, mock_download):
+    # arrange
+    server = _mock_server()
+    mock_connection.return_value = server
+    mock_download.return_value = "local/file"
+    additive = AsyncAdditive()
+
+    # act
+    result = asyncio.run(additive.download_file("remote/file", "local"))
+
+    # assert
+    assert result == "local/file"
+    mock_download.assert_awaited_once_with(server.simulation_stub, "remote/file", "local")
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_materials_list_returns_list_of_material_names(mock_connection):
+    # arrange
+    server = _mock_server()
+    server.materials_stub.GetMaterialsList = AsyncMock(
+        return_value=GetMaterialsListResponse(names=["material1", "material2"])
+    )
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act
+    result = asyncio.run(additive.materials_list())
+
+    # assert
+    assert result == ["material1", "material2"]
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_material_returns_material(mock_connection):
+    # arrange
+    material = test_utils.get_test_material()
+    server = _mock_server()
+    server.materials_stub.GetMaterial = AsyncMock(return_value=material._to_material_message())
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act
+    result = asyncio.run(additive.material(material.name))
+
+    # assert
+    assert result == material
+    server.materials_stub.GetMaterial.assert_awaited_once_with(
+        GetMaterialRequest(name=material.name)
+    )
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_tune_material_returns_expected_result(mock_connection, tmp_path: pathlib.Path):
+    # arrange
+    input = MaterialTuningInput(
+        id="id",
+        experiment_data_file=test_utils.get_test_file_path(
+            pathlib.Path("Material") / "experimental_data.csv"
+        ),
+        material_parameters_file=test_utils.get_test_file_path(
+            pathlib.Path("Material") / "material-data.json"
+        ),
+        thermal_properties_lookup_file=test_utils.get_test_file_path(
+            pathlib.Path("Material") / "Test_Lookup.csv"
+        ),
+    )
+    server = _mock_server()
+    server.materials_stub.TuneMaterial.side_effect = lambda request: _aiter(
+        [
+            TuneMaterialResponse(
+                id="id",
+                progress=Progress(state=ProgressState.PROGRESS_STATE_EXECUTING, message="tuning"),
+            ),
+            TuneMaterialResponse(
+                id="id",
+                result=MaterialTuningResult(log=b"log", characteristic_width_lookup=b"width"),
+            ),
+        ]
+    )
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act
+    summary = asyncio.run(additive.tune_material(input, out_dir=tmp_path / "tuning"))
+
+    # assert
+    assert summary.input == input
+    with open(summary.log_file, "r") as f:
+        assert "log" in f.read()
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_about_prints_server_status(mock_connection, capsys: pytest.CaptureFixture[str]):
+    # arrange
+    server = _mock_server()
+    server.status = AsyncMock(return_value="server running")
+    mock_connection.return_value = server
+    additive = AsyncAdditive()
+
+    # act
+    asyncio.run(additive.about())
+
+    # assert
+    assert "server running" in capsys.readouterr().out
+
+
+@patch("ansys.additive.core.async_additive.AsyncServerConnection")
+def test_simulate_with_cache_returns_cached_summary_without_rpc(
+    mock_connection, tmp_path: pathlib.Path
+):
+    # arrange
+    server = _mock_server()
+    server.simulation_stub.Simulate.side_effect = lambda request: _aiter(
+        [SimulationResponse(id=request.id, porosity_result=PorosityResult(solid_ratio=0.5))]
+    )
+    mock_connection.return_value = server
+    material = test_utils.get_test_material()
+    additive = AsyncAdditive(cache_dir=str(tmp_path / "cache"))
+    asyncio.run(additive.simulate(PorosityInput(id="id1", material=material)))
+    server.simulation_stub.Simulate.reset_mock()
+
+    # act
+    summary = asyncio.run(additive.simulate(PorosityInput(id="id2", material=material)))
+
+    # assert
+    server.simulation_stub.Simulate.assert_not_called()
+    assert isinstance(summary, PorositySummary)
+    assert summary.input.id == "id2"
+    assert additive.cache.statistics.hits == 1
@@ -0,0 +1,261 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import threading
+from unittest.mock import ANY, Mock
+
+import pytest
+
+from ansys.additive.core.autoscaler import Autoscaler
+from ansys.additive.core.server_connection.server_connection import ServerStatistics
+
+from . import test_utils
+
+
+def get_server(in_progress: int = 0, max_concurrency: int = 1) -> Mock:
+    server = test_utils.get_mock_server_connection(max_concurrency=max_concurrency)
+    server.statistics = ServerStatistics("server", in_progress=in_progress)
+    return server
+
+
+def get_additive(servers: list, pending: int = 0) -> Mock:
+    additive = Mock()
+    additive.servers = servers
+    additive.pending_simulations.return_value = pending
+
+    def add_server():
+        server = get_server()
+        additive.servers = additive.servers + [server]
+        return server
+
+    def remove_server(server):
+        additive.servers = [s for s in additive.servers if s is not server]
+
+    additive.add_server.side_effect = add_server
+    additive.remove_server.side_effect = remove_server
+    return additive
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"min_servers": 0},
+        {"min_servers": 3, "max_servers": 2},
+        {"idle_cooldown": -1},
+        {"interval": 0},
+    ],
+)
+def test_init_with_invalid_values_raises_exception(kwargs):
+    # arrange, act, assert
+    with pytest.raises(ValueError):
+        Autoscaler(Mock(), **kwargs)
+
+
+def test_scale_starts_servers_up_to_min_servers():
+    # arrange
+    additive = get_additive([get_server()])
+    autoscaler = Autoscaler(additive, min_servers=3, max_servers=4)
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    assert additive.add_server.call_count == 2
+    assert len(autoscaler.started_servers) == 2
+
+
+def test_scale_starts_servers_for_queued_simulations_up_to_max_servers():
+    # arrange
+    additive = get_additive([get_server(in_progress=1, max_concurrency=2)], pending=9)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=4)
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    assert additive.add_server.call_count == 3
+    assert len(additive.servers) == 4
+
+
+def test_scale_starts_enough_servers_for_queued_simulations():
+    # arrange
+    additive = get_additive([get_server(in_progress=1, max_concurrency=2)], pending=3)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=8)
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    assert additive.add_server.call_count == 1
+
+
+def test_scale_does_not_start_servers_when_free_slots_are_available():
+    # arrange
+    additive = get_additive([get_server(max_concurrency=4)], pending=2)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=4)
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    additive.add_server.assert_not_called()
+
+
+def test_scale_ignores_servers_that_fail_to_start():
+    # arrange
+    additive = get_additive([get_server()], pending=4)
+    additive.add_server.side_effect = RuntimeError("Unable to start server")
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=2)
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    assert autoscaler.started_servers == []
+
+
+def test_scale_removes_started_servers_after_idle_cooldown(monkeypatch):
+    # arrange
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    original = get_server()
+    additive = get_additive([original], pending=4)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=2, idle_cooldown=60)
+    autoscaler.scale()
+    started = autoscaler.started_servers[0]
+    additive.pending_simulations.return_value = 0
+
+    # act
+    now[0] = 150.0
+    autoscaler.scale()
+    kept = list(additive.servers)
+    now[0] = 161.0
+    autoscaler.scale()
+
+    # assert
+    assert kept == [original, started]
+    additive.remove_server.assert_called_once_with(started)
+    started.close.assert_called_once()
+    assert additive.servers == [original]
+    assert autoscaler.started_servers == []
+
+
+def test_scale_closes_removed_server_after_simulations_finish(monkeypatch):
+    # arrange
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    additive = get_additive([get_server()], pending=4)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=2, idle_cooldown=0)
+    autoscaler.scale()
+    started = autoscaler.started_servers[0]
+    additive.pending_simulations.return_value = 0
+    now[0] = 110.0
+
+    # act
+    original_remove = additive.remove_server.side_effect
+
+    def remove_server(server):
+        # a simulation started before the server was removed
+        server.statistics = ServerStatistics("server", in_progress=1)
+        original_remove(server)
+
+    additive.remove_server.side_effect = remove_server
+    autoscaler.scale()
+    closed_while_busy = started.close.called
+    started.statistics = ServerStatistics("server", in_progress=0)
+    autoscaler.scale()
+
+    # assert
+    assert not closed_while_busy
+    started.close.assert_called_once()
+
+
+def test_scale_keeps_busy_and_preexisting_servers(monkeypatch):
+    # arrange
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    original = get_server()
+    additive = get_additive([original, get_server()], pending=0)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=3, idle_cooldown=10)
+    autoscaler._launch(1)
+    started = autoscaler.started_servers[0]
+    started.statistics = ServerStatistics("server", in_progress=1)
+
+    # act
+    now[0] = 200.0
+    autoscaler.scale()
+
+    # assert
+    additive.remove_server.assert_not_called()
+    assert len(additive.servers) == 3
+
+
+def test_scale_forgets_servers_removed_by_user():
+    # arrange
+    additive = get_additive([get_server()], pending=4)
+    autoscaler = Autoscaler(additive, min_servers=1, max_servers=2)
+    autoscaler.scale()
+    additive.remove_server(autoscaler.started_servers[0])
+    additive.pending_simulations.return_value = 0
+
+    # act
+    autoscaler.scale()
+
+    # assert
+    assert autoscaler.started_servers == []
+
+
+def test_start_runs_scale_until_stopped():
+    # arrange
+    additive = get_additive([get_server()])
+    autoscaler = Autoscaler(additive, min_servers=2, max_servers=2, interval=0.01)
+
+    # act
+    autoscaler.start()
+    autoscaler.start()
+    for _ in range(500):
+        if len(additive.servers) == 2:
+            break
+        threading.Event().wait(0.01)
+    autoscaler.stop()
+
+    # assert
+    assert len(additive.servers) == 2
+    assert not autoscaler._thread.is_alive()
+
+
+def test_run_logs_scaling_errors():
+    # arrange
+    additive = Mock()
+    additive.pending_simulations.side_effect = Exception("error")
+    log = Mock()
+    autoscaler = Autoscaler(additive, interval=0.01, log=log)
+
+    # act
+    autoscaler.start()
+    for _ in range(500):
+        if log.warning.called:
+            break
+        threading.Event().wait(0.01)
+    autoscaler.stop()
+
+    # assert
+    log.warning.assert_called_with("Autoscaling failed: %s", ANY)
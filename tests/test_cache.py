@@ -0,0 +1,387 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import pathlib
+import shutil
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from ansys.additive.core import PorosityInput, SingleBeadInput, StlFile, ThermalHistoryInput
+from ansys.additive.core.cache import CacheStatistics, ExpiringCache, SimulationCache, file_digest
+
+from . import test_utils
+
+
+def test_key_ignores_simulation_id():
+    # arrange
+    input1 = SingleBeadInput(id="id1", material=test_utils.get_test_material())
+    input2 = SingleBeadInput(id="id2", material=test_utils.get_test_material())
+
+    # act, assert
+    assert SimulationCache.key(input1) == SimulationCache.key(input2)
+
+
+def test_key_depends_on_simulation_parameters():
+    # arrange
+    input1 = SingleBeadInput(bead_length=0.001)
+    input2 = SingleBeadInput(bead_length=0.002)
+    input3 = PorosityInput()
+
+    # act
+    keys = {SimulationCache.key(i) for i in [input1, input2, input3]}
+
+    # assert
+    assert len(keys) == 3
+
+
+def test_key_for_thermal_history_depends_on_geometry_content(tmp_path: pathlib.Path):
+    # arrange
+    stl = tmp_path / "part.stl"
+    shutil.copyfile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl"), stl)
+    input = ThermalHistoryInput(id="id", geometry=StlFile(str(stl)))
+    key1 = SimulationCache.key(input)
+    key_other_id = SimulationCache.key(ThermalHistoryInput(id="other", geometry=StlFile(str(stl))))
+
+    # act
+    with open(stl, "ab") as f:
+        f.write(b"\n")
+    key2 = SimulationCache.key(input)
+
+    # assert
+    assert key1 == key_other_id
+    assert key1 != key2
+
+
+def test_key_for_thermal_history_uses_given_digest_function():
+    # arrange
+    path = test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl")
+    input = ThermalHistoryInput(id="id", geometry=StlFile(path))
+    digest_file = Mock(return_value=file_digest(path))
+
+    # act
+    key = SimulationCache.key(input, digest_file)
+
+    # assert
+    digest_file.assert_called_once_with(path)
+    assert key == SimulationCache.key(input)
+
+
+def test_key_for_thermal_history_without_geometry_raises_exception():
+    # arrange, act, assert
+    with pytest.raises(ValueError, match="geometry path is not defined"):
+        SimulationCache.key(ThermalHistoryInput())
+
+
+def test_file_digest_returns_sha256_of_file(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "file.txt"
+    file.write_bytes(b"abc")
+
+    # act, assert
+    assert file_digest(str(file), chunk_size=2) == (
+        "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+    )
+
+
+def test_init_raises_exception_for_negative_max_size(tmp_path: pathlib.Path):
+    # arrange, act, assert
+    with pytest.raises(ValueError, match="max_size"):
+        SimulationCache(str(tmp_path), max_size=-1)
+
+
+def test_get_returns_none_and_counts_miss_for_missing_key(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path / "cache"))
+
+    # act
+    data = cache.get("abcd")
+
+    # assert
+    assert data is None
+    assert cache.statistics == CacheStatistics(misses=1, max_size=cache.max_size)
+
+
+def test_open_returns_file_of_cached_data_and_counts_hit(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path))
+    cache.put("abcd", b"data")
+    os.utime(cache._entry_path("abcd"), (1, 1))
+
+    # act
+    f = cache.open("abcd")
+
+    # assert
+    with f:
+        assert f.read() == b"data"
+    assert os.stat(cache._entry_path("abcd")).st_mtime > 1
+    assert cache.statistics.hits == 1
+    assert cache.statistics.bytes_read == 4
+    assert cache.open("efgh") is None
+    assert cache.statistics.misses == 1
+
+
+def test_get_returns_data_written_by_put(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path))
+
+    # act
+    cache.put("abcd", b"data")
+    data = cache.get("abcd")
+
+    # assert
+    assert data == b"data"
+    stats = cache.statistics
+    assert stats.hits == 1
+    assert stats.misses == 0
+    assert stats.bytes_read == 4
+    assert stats.bytes_written == 4
+    assert stats.entries == 1
+    assert stats.size == 4
+    assert stats.hit_rate == 1.0
+
+
+def test_cache_directory_is_shared_between_instances(tmp_path: pathlib.Path):
+    # arrange
+    writer = SimulationCache(str(tmp_path))
+    reader = SimulationCache(str(tmp_path))
+
+    # act
+    writer.put("abcd", b"data")
+
+    # assert
+    assert reader.get("abcd") == b"data"
+
+
+def test_put_evicts_least_recently_used_entries(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path), max_size=10)
+    cache.put("aaaa", b"12345")
+    cache.put("bbbb", b"12345")
+    os.utime(cache._entry_path("aaaa"), (1, 1))
+    os.utime(cache._entry_path("bbbb"), (2, 2))
+    cache.get("aaaa")
+
+    # act
+    cache.put("cccc", b"12345")
+
+    # assert
+    assert cache.get("bbbb") is None
+    assert cache.get("aaaa") == b"12345"
+    assert cache.get("cccc") == b"12345"
+    assert cache.statistics.size == 10
+
+
+def test_put_removes_stale_temporary_files_when_evicting(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path), max_size=10)
+    cache.put("aaaa", b"12345")
+    subdir = tmp_path / "aa"
+    stale = subdir / "stale.tmp"
+    stale.write_bytes(b"12345")
+    expired = time.time() - 2 * 60 * 60
+    os.utime(stale, (expired, expired))
+    in_progress = subdir / "in-progress.tmp"
+    in_progress.write_bytes(b"12345")
+
+    # act
+    cache.put("aaab", b"123456")
+
+    # assert
+    assert not stale.exists()
+    assert in_progress.exists()
+    assert cache.get("aaab") == b"123456"
+
+
+def test_put_only_scans_cache_when_running_size_exceeds_max_size(
+    monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    cache = SimulationCache(str(tmp_path), max_size=10)
+    cache.put("aaaa", b"1234")
+    entries = Mock(wraps=cache._entries)
+    monkeypatch.setattr(cache, "_entries", entries)
+
+    # act
+    cache.put("bbbb", b"1234")
+    cache.put("aaaa", b"123")
+    scans_below_max_size = entries.call_count
+    cache.put("cccc", b"1234")
+
+    # assert
+    assert scans_below_max_size == 0
+    assert entries.call_count == 1
+    assert cache.statistics.size <= 10
+
+
+def test_put_ignores_data_larger_than_max_size(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path), max_size=3)
+
+    # act
+    cache.put("abcd", b"data")
+
+    # assert
+    assert cache.get("abcd") is None
+    assert cache.statistics.entries == 0
+
+
+def test_put_logs_warning_when_entry_cannot_be_written(monkeypatch, tmp_path: pathlib.Path):
+    # arrange
+    log = Mock()
+    cache = SimulationCache(str(tmp_path), log=log)
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    # act
+    cache.put("abcd", b"data")
+
+    # assert
+    log.warning.assert_called_once()
+    assert list(tmp_path.rglob("*.tmp")) == []
+    assert cache.statistics.bytes_written == 0
+
+
+def test_writer_streams_chunks_into_entry(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path))
+
+    # act
+    with cache.writer("abcd") as writer:
+        writer.write(b"da")
+        partial = cache.get("abcd")
+        writer.write(b"ta")
+
+    # assert
+    assert partial is None
+    assert cache.get("abcd") == b"data"
+    assert cache.statistics.bytes_written == 4
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+def test_writer_discards_entry_when_context_raises(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path))
+
+    # act
+    with pytest.raises(ValueError):
+        with cache.writer("abcd") as writer:
+            writer.write(b"data")
+            raise ValueError("download failed")
+
+    # assert
+    assert cache.get("abcd") is None
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+def test_writer_discards_data_larger_than_max_size(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path), max_size=3)
+
+    # act
+    with cache.writer("abcd") as writer:
+        writer.write(b"da")
+        writer.write(b"ta")
+
+    # assert
+    assert cache.get("abcd") is None
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+def test_clear_removes_all_entries(tmp_path: pathlib.Path):
+    # arrange
+    cache = SimulationCache(str(tmp_path))
+    cache.put("abcd", b"data")
+    cache.put("efgh", b"data")
+
+    # act
+    cache.clear()
+
+    # assert
+    assert cache.statistics.entries == 0
+    assert cache.get("abcd") is None
+
+
+def test_cache_statistics_hit_rate_is_zero_without_lookups():
+    # arrange, act, assert
+    assert CacheStatistics().hit_rate == 0.0
+
+
+def test_ExpiringCache_get_returns_stored_value_until_it_expires(monkeypatch):
+    # arrange
+    now = [100.0]
+    monkeypatch.setattr("time.monotonic", lambda: now[0])
+    cache = ExpiringCache(ttl=10)
+    cache.put("key", "value")
+
+    # act
+    before = cache.get("key")
+    now[0] = 110.0
+    after = cache.get("key")
+
+    # assert
+    assert before == "value"
+    assert after is None
+    assert cache.get("missing") is None
+
+
+def test_ExpiringCache_with_zero_ttl_does_not_store_values():
+    # arrange
+    cache = ExpiringCache(ttl=0)
+
+    # act
+    cache.put("key", "value")
+
+    # assert
+    assert cache.ttl == 0
+    assert cache.get("key") is None
+
+
+def test_ExpiringCache_invalidate_removes_entries():
+    # arrange
+    cache = ExpiringCache(ttl=10)
+    cache.put("key1", 1)
+    cache.put("key2", 2)
+    cache.put("key3", 3)
+
+    # act
+    cache.invalidate("key1")
+    cache.invalidate("missing")
+    remaining = cache.get("key2")
+    cache.invalidate()
+
+    # assert
+    assert cache.get("key1") is None
+    assert remaining == 2
+    assert cache.get("key2") is None
+    assert cache.get("key3") is None
+
+
+def test_ExpiringCache_init_with_negative_ttl_raises_exception():
+    # arrange, act, assert
+    with pytest.raises(ValueError):
+        ExpiringCache(ttl=-1)
@@ -0,0 +1,108 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+from unittest.mock import Mock
+
+from ansys.additive.core import CancellationToken
+from ansys.additive.core.cancellation import cancel_on
+
+
+def test_cancel_calls_callbacks_once():
+    # arrange
+    token = CancellationToken()
+    callback = Mock()
+    token.add_callback(callback)
+
+    # act
+    token.cancel()
+    token.cancel()
+
+    # assert
+    assert token.cancelled
+    callback.assert_called_once_with()
+
+
+def test_add_callback_after_cancel_calls_callback_immediately():
+    # arrange
+    token = CancellationToken()
+    token.cancel()
+    callback = Mock()
+
+    # act
+    token.add_callback(callback)
+
+    # assert
+    callback.assert_called_once_with()
+
+
+def test_remove_callback_prevents_call_on_cancel():
+    # arrange
+    token = CancellationToken()
+    callback = Mock()
+    token.add_callback(callback)
+
+    # act
+    token.remove_callback(callback)
+    token.remove_callback(callback)
+    token.cancel()
+
+    # assert
+    callback.assert_not_called()
+
+
+def test_cancel_on_cancels_call_while_active():
+    # arrange
+    token = CancellationToken()
+    call = Mock()
+
+    # act
+    with cancel_on(token, call) as result:
+        token.cancel()
+
+    # assert
+    assert result is call
+    call.cancel.assert_called_once_with()
+
+
+def test_cancel_on_does_not_cancel_call_after_context_exits():
+    # arrange
+    token = CancellationToken()
+    call = Mock()
+
+    # act
+    with cancel_on(token, call):
+        pass
+    token.cancel()
+
+    # assert
+    call.cancel.assert_not_called()
+
+
+def test_cancel_on_without_token_returns_call():
+    # arrange
+    call = Mock()
+
+    # act
+    with cancel_on(None, call) as result:
+        pass
+
+    # assert
+    assert result is call
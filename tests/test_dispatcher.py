@@ -0,0 +1,697 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+import time
+from unittest.mock import ANY, call
+
+import grpc
+import pytest
+
+from ansys.additive.core import (
+    CancellationToken,
+    MicrostructureInput,
+    PorosityInput,
+    RetryPolicy,
+    SimulationCancelled,
+    SimulationError,
+    SimulationType,
+    SingleBeadInput,
+    StlFile,
+    ThermalHistoryInput,
+)
+from ansys.additive.core.dispatcher import (
+    SimulationDispatcher,
+    expected_duration,
+    max_slots,
+    sort_longest_first,
+    take_job,
+)
+from ansys.additive.core.retry import HealthMonitor
+
+from . import test_utils
+
+
+def test_expected_duration_ranks_simulation_types():
+    # arrange
+    th = ThermalHistoryInput(geometry=StlFile(test_utils.get_test_file_path("5x5x1_0x_0y_0z.stl")))
+    ms = MicrostructureInput()
+    p = PorosityInput()
+    sb = SingleBeadInput()
+
+    # act, assert
+    assert expected_duration(th) > expected_duration(ms)
+    assert expected_duration(ms) > expected_duration(p)
+    assert expected_duration(p) > expected_duration(sb)
+
+
+def test_expected_duration_uses_input_size():
+    # arrange, act, assert
+    assert expected_duration(SingleBeadInput(bead_length=0.009)) > expected_duration(
+        SingleBeadInput(bead_length=0.001)
+    )
+    assert expected_duration(PorosityInput(size_x=0.002, size_y=0.002, size_z=0.002)) > (
+        expected_duration(PorosityInput(size_x=0.001, size_y=0.001, size_z=0.001))
+    )
+    assert expected_duration(
+        MicrostructureInput(sample_size_x=0.003, sample_size_y=0.003, sample_size_z=0.003)
+    ) > expected_duration(
+        MicrostructureInput(sample_size_x=0.002, sample_size_y=0.002, sample_size_z=0.002)
+    )
+
+
+def test_sort_longest_first_returns_inputs_by_decreasing_expected_duration():
+    # arrange
+    sb_short = SingleBeadInput(id="sb_short", bead_length=0.001)
+    sb_long = SingleBeadInput(id="sb_long", bead_length=0.009)
+    sb_equal = SingleBeadInput(id="sb_equal", bead_length=0.001)
+    p = PorosityInput(id="p")
+    ms = MicrostructureInput(id="ms")
+
+    # act
+    result = sort_longest_first([sb_short, p, sb_long, ms, sb_equal])
+
+    # assert
+    assert [i.id for i in result] == ["ms", "p", "sb_long", "sb_short", "sb_equal"]
+
+
+def test_run_yields_summary_for_each_input():
+    # arrange
+    servers = [test_utils.get_mock_server_connection(), test_utils.get_mock_server_connection()]
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(5)]
+    dispatcher = SimulationDispatcher(servers, lambda input, server: input.id)
+
+    # act
+    results = list(dispatcher.run(inputs))
+
+    # assert
+    assert sorted(results) == sorted(i.id for i in inputs)
+
+
+def test_run_calls_on_start_before_each_simulation():
+    # arrange
+    servers = [test_utils.get_mock_server_connection()]
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(3)]
+    started = []
+
+    def simulate(input, server):
+        assert input.id in started
+        return input.id
+
+    dispatcher = SimulationDispatcher(servers, simulate)
+
+    # act
+    results = list(dispatcher.run(inputs, on_start=lambda input: started.append(input.id)))
+
+    # assert
+    assert sorted(started) == sorted(results) == ["id0", "id1", "id2"]
+
+
+def test_run_lets_idle_servers_take_remaining_inputs():
+    # arrange
+    slow_server, fast_server = (
+        test_utils.get_mock_server_connection(),
+        test_utils.get_mock_server_connection(),
+    )
+    release_slow = threading.Event()
+    assignments = {}
+
+    def simulate(input, server):
+        assignments[input.id] = server
+        if server is slow_server:
+            release_slow.wait(5)
+        return input.id
+
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(6)]
+    dispatcher = SimulationDispatcher([slow_server, fast_server], simulate)
+
+    # act
+    results = dispatcher.run(inputs)
+    fast_results = [next(results) for _ in range(5)]
+    release_slow.set()
+    slow_results = list(results)
+
+    # assert
+    assert len(slow_results) == 1
+    assert all(assignments[id] is fast_server for id in fast_results)
+    assert assignments[slow_results[0]] is slow_server
+
+
+def test_run_with_longest_first_starts_long_simulations_first():
+    # arrange
+    started = []
+
+    def simulate(input, server):
+        started.append(input.id)
+        return input.id
+
+    inputs = [
+        SingleBeadInput(id="sb"),
+        MicrostructureInput(id="ms"),
+        PorosityInput(id="p"),
+    ]
+    dispatcher = SimulationDispatcher([test_utils.get_mock_server_connection()], simulate)
+
+    # act
+    list(dispatcher.run(inputs, longest_first=True))
+
+    # assert
+    assert started == ["ms", "p", "sb"]
+
+
+def test_run_without_longest_first_keeps_input_order():
+    # arrange
+    started = []
+
+    def simulate(input, server):
+        started.append(input.id)
+        return input.id
+
+    inputs = [SingleBeadInput(id="sb"), MicrostructureInput(id="ms"), PorosityInput(id="p")]
+    dispatcher = SimulationDispatcher([test_utils.get_mock_server_connection()], simulate)
+
+    # act
+    list(dispatcher.run(inputs))
+
+    # assert
+    assert started == ["sb", "ms", "p"]
+
+
+def test_run_yields_simulation_errors():
+    # arrange
+    input = SingleBeadInput(id="id")
+    dispatcher = SimulationDispatcher(
+        [test_utils.get_mock_server_connection()],
+        lambda input, server: SimulationError(input, "msg"),
+    )
+
+    # act
+    results = list(dispatcher.run([input]))
+
+    # assert
+    assert len(results) == 1
+    assert results[0].message == "msg"
+
+
+def test_run_raises_exception_from_simulate():
+    # arrange
+    def simulate(input, server):
+        raise ValueError("bad input")
+
+    dispatcher = SimulationDispatcher([test_utils.get_mock_server_connection()], simulate)
+
+    # act, assert
+    with pytest.raises(ValueError, match="bad input"):
+        list(dispatcher.run([SingleBeadInput()]))
+
+
+def test_run_does_not_start_new_simulations_after_consumer_stops():
+    # arrange
+    started = []
+    second_started = threading.Event()
+    gate = threading.Event()
+    second_finished = threading.Event()
+
+    def simulate(input, server):
+        started.append(input.id)
+        if len(started) > 1:
+            second_started.set()
+            gate.wait(5)
+            second_finished.set()
+        return input.id
+
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(10)]
+    dispatcher = SimulationDispatcher([test_utils.get_mock_server_connection()], simulate)
+
+    # act
+    results = dispatcher.run(inputs)
+    next(results)
+    second_started.wait(5)
+    close_start = time.monotonic()
+    results.close()
+    close_time = time.monotonic() - close_start
+    gate.set()
+    second_finished.wait(5)
+    time.sleep(0.1)
+
+    # assert
+    assert close_time < 1
+    assert started == ["id0", "id1"]
+
+
+def test_run_raises_exception_from_on_start():
+    # arrange
+    def on_start(input):
+        raise ValueError("on_start failed")
+
+    server = test_utils.get_mock_server_connection()
+    dispatcher = SimulationDispatcher([server], lambda input, server: input.id)
+    errors = []
+
+    def consume():
+        try:
+            list(dispatcher.run([SingleBeadInput(id="id0")], on_start=on_start))
+        except ValueError as e:
+            errors.append(e)
+
+    # act
+    thread = threading.Thread(target=consume, daemon=True)
+    thread.start()
+    thread.join(5)
+
+    # assert
+    assert not thread.is_alive()
+    assert str(errors[0]) == "on_start failed"
+    server._simulation_started.assert_not_called()
+    server._simulation_finished.assert_not_called()
+
+
+def test_take_job_skips_jobs_that_exceed_concurrency_limit():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    server.concurrency_limit.side_effect = lambda t: {SimulationType.SINGLE_BEAD: 2}.get(t, 1)
+    ms = MicrostructureInput(id="ms")
+    sb = SingleBeadInput(id="sb")
+    jobs = [ms, sb]
+
+    # act
+    result = take_job(jobs, server, in_progress=1)
+
+    # assert
+    assert result is sb
+    assert jobs == [ms]
+    assert take_job(jobs, server, in_progress=1) is None
+    assert take_job(jobs, server, in_progress=0) is ms
+
+
+def test_max_slots_returns_largest_concurrency_limit():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    server.concurrency_limit.side_effect = lambda t: {SimulationType.POROSITY: 4}.get(t, 2)
+
+    # act, assert
+    assert max_slots(server) == 4
+
+
+def test_run_runs_max_concurrency_simulations_per_server():
+    # arrange
+    barrier = threading.Barrier(3, timeout=5)
+
+    def simulate(input, server):
+        barrier.wait()
+        return input.id
+
+    server = test_utils.get_mock_server_connection(max_concurrency=3)
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(6)]
+    dispatcher = SimulationDispatcher([server], simulate)
+
+    # act
+    results = list(dispatcher.run(inputs))
+
+    # assert
+    assert sorted(results) == sorted(i.id for i in inputs)
+
+
+def test_run_applies_concurrency_limit_of_simulation_type():
+    # arrange
+    barrier = threading.Barrier(2, timeout=5)
+    lock = threading.Lock()
+    running = []
+    running_with_ms = []
+
+    def simulate(input, server):
+        with lock:
+            running.append(input.id)
+            if input.id == "ms":
+                running_with_ms.extend(running)
+        if input.id != "ms":
+            barrier.wait()
+        with lock:
+            running.remove(input.id)
+        return input.id
+
+    server = test_utils.get_mock_server_connection()
+    server.concurrency_limit.side_effect = lambda t: {SimulationType.SINGLE_BEAD: 2}.get(t, 1)
+    inputs = [SingleBeadInput(id="sb1"), MicrostructureInput(id="ms"), SingleBeadInput(id="sb2")]
+    dispatcher = SimulationDispatcher([server], simulate)
+
+    # act
+    results = list(dispatcher.run(inputs))
+
+    # assert
+    assert results[-1] == "ms"
+    assert running_with_ms == ["ms"]
+
+
+def test_run_records_server_statistics():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    inputs = [SingleBeadInput(id="ok"), SingleBeadInput(id="error")]
+
+    def simulate(input, server):
+        return input.id if input.id == "ok" else SimulationError(input, "msg")
+
+    dispatcher = SimulationDispatcher([server], simulate)
+
+    # act
+    list(dispatcher.run(inputs))
+
+    # assert
+    assert server._simulation_started.call_count == 2
+    server._simulation_finished.assert_has_calls([call(ANY, False), call(ANY, True)])
+
+
+def test_run_with_retry_policy_resubmits_failed_simulation_to_other_server():
+    # arrange
+    failing_server = test_utils.get_mock_server_connection(channel_str="failing")
+    healthy_server = test_utils.get_mock_server_connection(channel_str="healthy")
+    attempts = []
+
+    def simulate(input, server):
+        attempts.append(server)
+        if server is failing_server:
+            raise test_utils.RpcError(grpc.StatusCode.UNAVAILABLE)
+        return input.id
+
+    policy = RetryPolicy(initial_backoff=0)
+    dispatcher = SimulationDispatcher([failing_server, healthy_server], simulate, policy)
+
+    # act
+    results = list(dispatcher.run([SingleBeadInput(id=f"id{i}") for i in range(4)]))
+
+    # assert
+    assert sorted(results) == ["id0", "id1", "id2", "id3"]
+    assert attempts.count(failing_server) <= policy.eject_after
+    assert dispatcher._health.is_ejected(failing_server) == (
+        attempts.count(failing_server) == policy.eject_after
+    )
+    dispatcher._health.stop()
+
+
+def test_run_with_retry_policy_returns_error_after_max_attempts():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    input = SingleBeadInput(id="id")
+    calls = []
+
+    def simulate(input, server):
+        calls.append(input)
+        raise test_utils.RpcError(grpc.StatusCode.UNAVAILABLE)
+
+    policy = RetryPolicy(max_attempts=3, initial_backoff=0.01, eject_after=10)
+    dispatcher = SimulationDispatcher([server], simulate, policy)
+
+    # act
+    results = list(dispatcher.run([input]))
+
+    # assert
+    assert len(calls) == 3
+    assert isinstance(results[0], SimulationError)
+    assert results[0].input is input
+
+
+def test_run_with_retry_policy_waits_for_backoff():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    times = []
+
+    def simulate(input, server):
+        times.append(time.monotonic())
+        if len(times) == 1:
+            raise test_utils.RpcError()
+        return input.id
+
+    dispatcher = SimulationDispatcher(
+        [server], simulate, RetryPolicy(initial_backoff=0.1, eject_after=10)
+    )
+
+    # act
+    results = list(dispatcher.run([SingleBeadInput(id="id")]))
+
+    # assert
+    assert results == ["id"]
+    assert times[1] - times[0] >= 0.1
+
+
+def test_run_with_retry_policy_raises_non_retryable_errors():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+
+    def simulate(input, server):
+        raise test_utils.RpcError(grpc.StatusCode.INVALID_ARGUMENT)
+
+    dispatcher = SimulationDispatcher([server], simulate, RetryPolicy())
+
+    # act, assert
+    with pytest.raises(grpc.RpcError):
+        list(dispatcher.run([SingleBeadInput()]))
+
+
+def test_run_skips_ejected_servers_while_other_servers_are_in_rotation():
+    # arrange
+    ejected_server = test_utils.get_mock_server_connection(channel_str="ejected")
+    server = test_utils.get_mock_server_connection(channel_str="server")
+    health = HealthMonitor(RetryPolicy(eject_after=1), probe=lambda server: False)
+    health.record_failure(ejected_server)
+    assignments = []
+
+    def simulate(input, server):
+        assignments.append(server)
+        return input.id
+
+    dispatcher = SimulationDispatcher([ejected_server, server], simulate, RetryPolicy(), health)
+
+    # act
+    list(dispatcher.run([SingleBeadInput(id=f"id{i}") for i in range(4)]))
+
+    # assert
+    assert assignments == [server] * 4
+    health.stop()
+
+
+def test_run_removes_health_callback_when_finished():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    health = HealthMonitor(RetryPolicy(), probe=lambda server: True)
+    dispatchers = [
+        SimulationDispatcher([server], lambda input, server: input.id, RetryPolicy(), health)
+        for _ in range(3)
+    ]
+
+    # act
+    for dispatcher in dispatchers:
+        list(dispatcher.run([SingleBeadInput()]))
+
+    # assert
+    assert health._callbacks == []
+    health.stop()
+
+
+def test_run_starts_jobs_on_server_as_soon_as_it_is_readmitted():
+    # arrange
+    ejected_server = test_utils.get_mock_server_connection(channel_str="ejected")
+    server = test_utils.get_mock_server_connection(channel_str="server")
+    recovered = threading.Event()
+    health = HealthMonitor(
+        RetryPolicy(eject_after=1, probe_interval=0.01), probe=lambda s: recovered.is_set()
+    )
+    health.record_failure(ejected_server)
+    release = threading.Event()
+    assignments = {}
+
+    def simulate(input, server):
+        assignments[input.id] = server
+        if server.channel_str == "server":
+            # Keep the server in rotation busy until the ejected server has run a job.
+            release.wait(5)
+        else:
+            release.set()
+        return input.id
+
+    dispatcher = SimulationDispatcher([ejected_server, server], simulate, RetryPolicy(), health)
+    results = dispatcher.run([SingleBeadInput(id="first"), SingleBeadInput(id="second")])
+
+    # act
+    threading.Timer(0.1, recovered.set).start()
+    order = list(results)
+
+    # assert
+    assert release.is_set()
+    assert order == ["second", "first"]
+    assert assignments == {"first": server, "second": ejected_server}
+    health.stop()
+
+
+def test_run_uses_ejected_servers_when_all_servers_are_ejected():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    health = HealthMonitor(RetryPolicy(eject_after=1), probe=lambda server: False)
+    health.record_failure(server)
+    dispatcher = SimulationDispatcher(
+        [server], lambda input, server: input.id, RetryPolicy(), health
+    )
+
+    # act
+    results = list(dispatcher.run([SingleBeadInput(id="id")]))
+
+    # assert
+    assert results == ["id"]
+    health.stop()
+
+
+def test_take_job_skips_jobs_that_are_not_eligible():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    jobs = [SingleBeadInput(id="a"), SingleBeadInput(id="b")]
+
+    # act
+    job = take_job(jobs, server, 0, lambda input: input.id == "b")
+
+    # assert
+    assert job.id == "b"
+    assert jobs[0].id == "a"
+
+
+def test_add_server_starts_simulations_on_new_server_during_run():
+    # arrange
+    server = test_utils.get_mock_server_connection(channel_str="server")
+    new_server = test_utils.get_mock_server_connection(channel_str="new")
+    started = threading.Event()
+    release = threading.Event()
+    assignments = {}
+
+    def simulate(input, server):
+        assignments[input.id] = server
+        if server is not new_server:
+            started.set()
+            release.wait(5)
+        return input.id
+
+    dispatcher = SimulationDispatcher([server], simulate)
+    results = dispatcher.run([SingleBeadInput(id=f"id{i}") for i in range(3)])
+    completed = []
+    results_thread = threading.Thread(target=lambda: completed.extend(results))
+
+    # act
+    results_thread.start()
+    assert started.wait(5)
+    dispatcher.add_server(new_server)
+    dispatcher.add_server(new_server)
+    for _ in range(500):
+        if len(completed) == 2:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    results_thread.join(5)
+
+    # assert
+    assert [assignments[id] for id in completed[:2]] == [new_server, new_server]
+    assert assignments[completed[2]] is server
+    assert dispatcher.pending == 0
+
+
+def test_remove_server_stops_starting_simulations_on_server():
+    # arrange
+    removed_server = test_utils.get_mock_server_connection(channel_str="removed")
+    server = test_utils.get_mock_server_connection(channel_str="server")
+    started = threading.Event()
+    release = threading.Event()
+    assignments = []
+
+    def simulate(input, server):
+        assignments.append(server)
+        if input.id == "id0":
+            started.set()
+            release.wait(5)
+        return input.id
+
+    dispatcher = SimulationDispatcher([removed_server], simulate)
+    results = dispatcher.run([SingleBeadInput(id=f"id{i}") for i in range(3)])
+    results_thread = threading.Thread(target=lambda: assignments.append(list(results)))
+
+    # act
+    results_thread.start()
+    assert started.wait(5)
+    pending = dispatcher.pending
+    dispatcher.remove_server(removed_server)
+    dispatcher.remove_server(removed_server)
+    dispatcher.add_server(server)
+    release.set()
+    results_thread.join(5)
+
+    # assert
+    assert pending == 2
+    assert assignments[:3] == [removed_server, server, server]
+    assert sorted(assignments[3]) == ["id0", "id1", "id2"]
+
+
+def test_run_with_cancelled_token_returns_cancelled_results_for_queued_simulations():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    token = CancellationToken()
+    started = threading.Event()
+    release = threading.Event()
+
+    def simulate(input, server):
+        started.set()
+        release.wait(5)
+        return SimulationCancelled(input) if token.cancelled else input.id
+
+    inputs = [SingleBeadInput(id=f"id{i}") for i in range(3)]
+    dispatcher = SimulationDispatcher([server], simulate)
+    results = dispatcher.run(inputs, cancellation=token)
+    completed = []
+    results_thread = threading.Thread(target=lambda: completed.extend(results))
+
+    # act
+    results_thread.start()
+    assert started.wait(5)
+    token.cancel()
+    release.set()
+    results_thread.join(5)
+
+    # assert
+    assert len(completed) == 3
+    assert all(isinstance(result, SimulationCancelled) for result in completed)
+    assert server._simulation_started.call_count == 1
+    assert token._callbacks == []
+
+
+def test_run_with_retry_policy_does_not_retry_cancelled_simulations():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    token = CancellationToken()
+    calls = []
+
+    def simulate(input, server):
+        calls.append(input)
+        token.cancel()
+        raise test_utils.RpcError(grpc.StatusCode.UNAVAILABLE)
+
+    dispatcher = SimulationDispatcher([server], simulate, RetryPolicy(initial_backoff=0))
+
+    # act
+    results = list(dispatcher.run([SingleBeadInput(id="id")], cancellation=token))
+
+    # assert
+    assert len(calls) == 1
+    assert isinstance(results[0], SimulationCancelled)
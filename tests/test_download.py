@@ -20,17 +20,29 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import asyncio
 import hashlib
+import io
 import os
+import pathlib
 import tempfile
 from unittest.mock import Mock
+import zipfile
 
 from ansys.api.additive.v0.additive_domain_pb2 import Progress, ProgressState
 from ansys.api.additive.v0.additive_simulation_pb2 import DownloadFileRequest, DownloadFileResponse
 from ansys.api.additive.v0.additive_simulation_pb2_grpc import SimulationServiceStub
 import pytest
 
-from ansys.additive.core.download import download_file
+import ansys.additive.core.download as download
+from ansys.additive.core.download import (
+    download_and_extract,
+    download_and_extract_async,
+    download_file,
+    download_file_async,
+)
+
+from . import test_utils
 
 
 def test_download_file_calls_service_with_expected_params():
@@ -99,3 +111,316 @@ def test_download_raises_exception_if_md5_check_fails():
 
     # assert
     mock_stub.DownloadFile.assert_called_once_with(expected_request)
+
+
+def test_download_file_async_writes_expected_file():
+    # arrange
+    remote_file_name = os.path.join("remote", "myfile.txt")
+    expected_request = DownloadFileRequest(remote_file_name=remote_file_name)
+    content = bytes(range(255))
+
+    async def mock_download_endpoint(request: DownloadFileRequest):
+        for chunk in (content[:100], content[100:]):
+            yield DownloadFileResponse(
+                file_name="ignored",
+                total_size=len(content),
+                content=chunk,
+                content_md5=hashlib.md5(chunk).hexdigest(),
+                progress=Progress(state=ProgressState.PROGRESS_STATE_EXECUTING),
+            )
+
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(side_effect=mock_download_endpoint)
+    tmp_dir = tempfile.TemporaryDirectory().name
+
+    # act
+    local_file = asyncio.run(download_file_async(mock_stub, remote_file_name, tmp_dir))
+
+    # assert
+    mock_stub.DownloadFile.assert_called_once_with(expected_request)
+    assert local_file == os.path.join(tmp_dir, "myfile.txt")
+    with open(local_file, "rb") as f:
+        assert f.read() == content
+
+
+def test_download_file_async_raises_exception_if_md5_check_fails():
+    # arrange
+    async def mock_download_endpoint(request: DownloadFileRequest):
+        yield DownloadFileResponse(
+            file_name="ignored",
+            total_size=3,
+            content=b"abc",
+            content_md5="invalid md5",
+        )
+
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(side_effect=mock_download_endpoint)
+    tmp_dir = tempfile.TemporaryDirectory().name
+
+    # act, assert
+    with pytest.raises(ValueError, match="Download error, MD5 sums did not match"):
+        asyncio.run(download_file_async(mock_stub, "remote/myfile.txt", tmp_dir))
+
+
+def _responses(content: bytes, chunk_size: int = 100) -> list[DownloadFileResponse]:
+    return [
+        DownloadFileResponse(
+            file_name="ignored",
+            total_size=len(content),
+            content=content[i : i + chunk_size],
+            content_md5=hashlib.md5(content[i : i + chunk_size]).hexdigest(),
+        )
+        for i in range(0, len(content), chunk_size)
+    ]
+
+
+class _Unseekable(io.RawIOBase):
+    """Write-only stream, so that zipfile writes data descriptors."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def _zip(
+    files: dict[str, bytes],
+    seekable: bool = True,
+    force_zip64: bool = False,
+    methods: list[int] = None,
+) -> bytes:
+    stream = io.BytesIO() if seekable else _Unseekable()
+    with zipfile.ZipFile(stream, "w") as zip:
+        for i, (name, content) in enumerate(files.items()):
+            if methods is not None:
+                method = methods[i]
+            else:
+                method = zipfile.ZIP_STORED if i % 2 and seekable else zipfile.ZIP_DEFLATED
+            info = zipfile.ZipInfo(name)
+            info.compress_type = method
+            with zip.open(info, "w", force_zip64=force_zip64) as f:
+                f.write(content)
+    return stream.getvalue() if seekable else bytes(stream.data)
+
+
+_FILES = {
+    "a.txt": b"first file " * 1000,
+    "folder/b.bin": bytes(range(256)) * 100,
+    "folder/c.txt": b"",
+    "d.txt": os.urandom(5000),
+}
+
+
+def _assert_extracted(folder: pathlib.Path, files: dict[str, bytes], paths: list[str]):
+    assert sorted(paths) == sorted(str(folder / name) for name in files)
+    for name, content in files.items():
+        assert (folder / name).read_bytes() == content
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_download_and_extract_extracts_thermal_history_results(
+    in_memory, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    if not in_memory:
+        monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(
+        return_value=test_utils.get_download_responses("thermal_history_results.zip", 1000)
+    )
+    with zipfile.ZipFile(test_utils.get_test_file_path("thermal_history_results.zip")) as zip:
+        expected = {i.filename: zip.read(i) for i in zip.infolist() if not i.is_dir()}
+
+    # act
+    paths = download_and_extract(mock_stub, "remote/results.zip", str(tmp_path))
+
+    # assert
+    mock_stub.DownloadFile.assert_called_once_with(
+        DownloadFileRequest(remote_file_name="remote/results.zip")
+    )
+    _assert_extracted(tmp_path, expected, paths)
+    assert not (tmp_path / "results.zip").exists()
+
+
+@pytest.mark.parametrize(
+    "seekable, force_zip64", [(True, False), (True, True), (False, False), (False, True)]
+)
+@pytest.mark.parametrize("chunk_size", [7, 1000, 1_000_000])
+def test_download_and_extract_streams_archives(
+    seekable, force_zip64, chunk_size, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    content = _zip(_FILES, seekable, force_zip64)
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(return_value=_responses(content, chunk_size))
+    archive = io.BytesIO()
+
+    # act
+    paths = download_and_extract(mock_stub, "remote/file.zip", str(tmp_path), archive=archive)
+
+    # assert
+    _assert_extracted(tmp_path, _FILES, paths)
+    assert archive.getvalue() == content
+
+
+@pytest.mark.parametrize(
+    "seekable, method", [(False, zipfile.ZIP_STORED), (True, zipfile.ZIP_BZIP2)]
+)
+def test_download_and_extract_falls_back_to_zipfile_for_unsupported_entries(
+    seekable, method, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    methods = [zipfile.ZIP_DEFLATED, method, zipfile.ZIP_DEFLATED, method]
+    content = _zip(_FILES, seekable, methods=methods)
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(return_value=_responses(content, 1000))
+
+    # act
+    paths = download_and_extract(mock_stub, "remote/file.zip", str(tmp_path))
+
+    # assert
+    _assert_extracted(tmp_path, _FILES, paths)
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_download_and_extract_raises_exception_if_md5_check_fails(
+    in_memory, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    if not in_memory:
+        monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    responses = _responses(_zip(_FILES))
+    responses[1].content_md5 = "invalid md5"
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(return_value=responses)
+
+    # act, assert
+    with pytest.raises(ValueError, match="Download error, MD5 sums did not match"):
+        download_and_extract(mock_stub, "remote/file.zip", str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (b"", "the archive is empty"),
+        (_zip(_FILES)[:-1000], "the archive is incomplete"),
+        (
+            _zip(_FILES, methods=[zipfile.ZIP_BZIP2] * len(_FILES))[:-1000],
+            "the archive is incomplete",
+        ),
+        (b"not a zip file", "not a valid ZIP file"),
+    ],
+)
+def test_download_and_extract_raises_exception_for_invalid_archives(
+    content, message, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(return_value=_responses(content))
+
+    # act
+    with pytest.raises(ValueError, match=message):
+        download_and_extract(mock_stub, "remote/file.zip", str(tmp_path))
+
+    # assert
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_download_and_extract_removes_partial_output_when_download_fails(
+    in_memory, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    if not in_memory:
+        monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    responses = _responses(_zip(_FILES), 1000)
+
+    def download_endpoint(request: DownloadFileRequest):
+        yield from responses[: len(responses) // 2]
+        raise ConnectionError("connection lost")
+
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(side_effect=download_endpoint)
+
+    # act
+    with pytest.raises(ConnectionError):
+        download_and_extract(mock_stub, "remote/file.zip", str(tmp_path))
+
+    # assert
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_download_and_extract_async_removes_partial_output_when_download_fails(
+    monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    responses = _responses(_zip(_FILES), 1000)
+
+    async def download_endpoint(request: DownloadFileRequest):
+        for response in responses[: len(responses) // 2]:
+            yield response
+        raise ConnectionError("connection lost")
+
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(side_effect=download_endpoint)
+
+    # act
+    with pytest.raises(ConnectionError):
+        asyncio.run(download_and_extract_async(mock_stub, "remote/file.zip", str(tmp_path)))
+
+    # assert
+    assert [p for p in tmp_path.rglob("*") if p.is_file()] == []
+
+
+def test_download_and_extract_does_not_write_outside_local_folder(
+    monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(return_value=_responses(_zip({"../../evil.txt": b"evil"})))
+    folder = tmp_path / "a" / "b"
+
+    # act
+    paths = download_and_extract(mock_stub, "remote/file.zip", str(folder))
+
+    # assert
+    assert paths == [str(folder / "evil.txt")]
+    assert not (tmp_path / "evil.txt").exists()
+
+
+@pytest.mark.parametrize("in_memory", [True, False])
+def test_download_and_extract_async_extracts_archive(
+    in_memory, monkeypatch, tmp_path: pathlib.Path
+):
+    # arrange
+    if not in_memory:
+        monkeypatch.setattr(download, "IN_MEMORY_EXTRACT_SIZE", 0)
+    content = _zip(_FILES)
+
+    async def mock_download_endpoint(request: DownloadFileRequest):
+        for response in _responses(content):
+            yield response
+
+    mock_stub = Mock(SimulationServiceStub)
+    mock_stub.DownloadFile = Mock(side_effect=mock_download_endpoint)
+    archive = io.BytesIO()
+
+    # act
+    paths = asyncio.run(
+        download_and_extract_async(mock_stub, "remote/file.zip", str(tmp_path), archive=archive)
+    )
+
+    # assert
+    _assert_extracted(tmp_path, _FILES, paths)
+    assert archive.getvalue() == content
@@ -0,0 +1,141 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+
+from ansys.api.additive.v0.additive_domain_pb2 import GrainStatistics, MicrostructureResult
+import numpy as np
+import pytest
+
+from ansys.additive.core import MicrostructureStatistics, grain_statistics
+from ansys.additive.core.microstructure import MicrostructureInput, MicrostructureSummary
+
+
+def _summary(id: str, xy: list, xz: list = None, yz: list = None) -> MicrostructureSummary:
+    """Create a summary from (area fraction, diameter, orientation in degrees) tuples."""
+    result = MicrostructureResult()
+    for plane, grains in (("xy", xy), ("xz", xz or xy), ("yz", yz or xy)):
+        for i, (area_fraction, diameter, orientation) in enumerate(grains):
+            getattr(result, f"{plane}_circle_equivalence").append(
+                GrainStatistics(
+                    grain_number=i + 1,
+                    area_fraction=area_fraction,
+                    diameter_um=diameter,
+                    orientation_angle=math.radians(orientation),
+                )
+            )
+    return MicrostructureSummary(MicrostructureInput(id=id), result, "unused")
+
+
+def test_grain_statistics_returns_expected_values_for_summary():
+    # arrange
+    summary = _summary(
+        "id",
+        xy=[(0.25, 4, 5), (0.5, 1, 105), (0.25, 2, 365)],
+        xz=[(0.5, 8, 0), (0.5, 2, 90)],
+    )
+
+    # act
+    stats = grain_statistics(summary, percentiles=[0, 25, 50, 75, 100], diameter_bins=4)
+
+    # assert
+    assert isinstance(stats, MicrostructureStatistics)
+    row = stats.data_frame.loc["id"]
+    assert row["xy_grain_count"] == 3
+    assert row["xy_average_grain_size"] == summary.xy_average_grain_size == 2
+    assert [row[f"xy_d{q}"] for q in [0, 25, 50, 75, 100]] == [1, 1, 1, 2, 4]
+    assert row["xz_average_grain_size"] == 5
+    assert row["xz_d50"] == 2
+    assert row["xz_xy_anisotropy"] == 2.5
+    assert row["yz_xy_anisotropy"] == 1
+    np.testing.assert_array_equal(stats.diameter_bin_edges, [0, 2, 4, 6, 8])
+    np.testing.assert_array_equal(stats.diameter_histograms["xy"], [[0.5, 0.25, 0.25, 0]])
+    np.testing.assert_array_equal(stats.diameter_histograms["xz"], [[0, 0.5, 0, 0.5]])
+    assert stats.orientation_bin_edges[1] == 10
+    xy_orientation = stats.orientation_histograms["xy"][0]
+    assert xy_orientation.sum() == pytest.approx(1)
+    assert xy_orientation[0] == pytest.approx(0.5)
+    assert xy_orientation[10] == pytest.approx(0.5)
+
+
+def test_grain_statistics_computes_each_summary_of_batch_separately():
+    # arrange
+    summaries = [
+        _summary("a", xy=[(1, 3, 0)]),
+        _summary("empty", xy=[]),
+        _summary("b", xy=[(0.5, 1, 0), (0.5, 5, 0)]),
+    ]
+
+    # act
+    stats = grain_statistics(iter(summaries), percentiles=[50])
+
+    # assert
+    df = stats.data_frame
+    assert df.index.tolist() == ["a", "empty", "b"]
+    assert df["xy_grain_count"].tolist() == [1, 0, 2]
+    assert df["xy_average_grain_size"].tolist() == [3, 0, 3]
+    assert df.loc["a", "xy_d50"] == 3
+    assert np.isnan(df.loc["empty", "xy_d50"])
+    assert df.loc["b", "xy_d50"] == 1
+    assert np.isnan(df.loc["empty", "xz_xy_anisotropy"])
+    assert stats.diameter_histograms["yz"].shape == (3, 20)
+    assert np.isnan(stats.diameter_histograms["yz"][1]).all()
+    for s in summaries:
+        row = df.loc[s.input.id]
+        for plane in ["xy", "xz", "yz"]:
+            assert row[f"{plane}_average_grain_size"] == getattr(s, f"{plane}_average_grain_size")
+
+
+def test_grain_statistics_uses_diameter_bin_edges():
+    # arrange
+    summary = _summary("id", xy=[(0.25, 1, 0), (0.25, 2, 0), (0.5, 10, 0)])
+
+    # act
+    stats = grain_statistics([summary], diameter_bins=[1, 2, 3])
+
+    # assert
+    np.testing.assert_array_equal(stats.diameter_histograms["xy"], [[0.25, 0.25]])
+
+
+def test_grain_statistics_returns_empty_statistics_without_summaries():
+    # act
+    stats = grain_statistics([])
+
+    # assert
+    assert stats.data_frame.empty
+    assert "xy_d50" in stats.data_frame.columns
+    assert stats.orientation_histograms["xz"].shape == (0, 36)
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"percentiles": [101]}, "Percentiles"),
+        ({"diameter_bins": 0}, "diameter_bins"),
+        ({"diameter_bins": [2, 1]}, "diameter_bins"),
+        ({"orientation_bins": 0}, "orientation_bins"),
+    ],
+)
+def test_grain_statistics_raises_for_invalid_arguments(kwargs, message):
+    # act, assert
+    with pytest.raises(ValueError, match=message):
+        grain_statistics(_summary("id", xy=[(1, 1, 0)]), **kwargs)
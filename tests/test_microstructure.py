@@ -542,3 +542,69 @@ def test_MicrostructureSummary_repr_returns_expected_string():
 
     # cleanup
     shutil.rmtree(user_data_path)
+
+
+def test_MicrostructureSummary_writes_vtk_files_when_accessed(tmp_path):
+    # arrange
+    result = MicrostructureResult(xy_vtk=b"xy", xz_vtk=b"xz", yz_vtk=b"yz")
+    output_path = tmp_path / "id"
+
+    # act
+    summary = MicrostructureSummary(MicrostructureInput(id="id"), result, str(tmp_path))
+
+    # assert
+    assert not output_path.exists()
+    assert summary.xz_vtk == str(output_path / "xz.vtk")
+    assert [p.name for p in output_path.iterdir()] == ["xz.vtk"]
+    assert (output_path / "xz.vtk").read_bytes() == b"xz"
+
+
+def test_MicrostructureSummary_save_writes_vtk_files(tmp_path):
+    # arrange
+    result = MicrostructureResult(xy_vtk=b"xy", xz_vtk=b"xz", yz_vtk=b"yz")
+    summary = MicrostructureSummary(MicrostructureInput(id="id"), result, str(tmp_path))
+
+    # act
+    output_path = summary.save()
+
+    # assert
+    assert output_path == str(tmp_path / "id")
+    for plane in ["xy", "xz", "yz"]:
+        assert (tmp_path / "id" / f"{plane}.vtk").read_bytes() == plane.encode()
+
+
+def test_MicrostructureSummary_discard_vtk_keeps_written_files(tmp_path):
+    # arrange
+    result = MicrostructureResult(xy_vtk=b"xy", xz_vtk=b"xz", yz_vtk=b"yz")
+    summary = MicrostructureSummary(MicrostructureInput(id="id"), result, str(tmp_path))
+    xy_vtk = summary.xy_vtk
+
+    # act
+    summary.discard_vtk()
+
+    # assert
+    assert summary.xy_vtk == xy_vtk
+    with pytest.raises(ValueError, match="VTK data of simulation id was discarded"):
+        summary.yz_vtk
+    with pytest.raises(ValueError, match="discarded"):
+        summary.save()
+    assert not (tmp_path / "id" / "xz.vtk").exists()
+
+
+def test_MicrostructureSummary_circle_equivalence_has_compact_types(tmp_path):
+    # arrange
+    result = MicrostructureResult()
+    result.xy_circle_equivalence.append(
+        GrainStatistics(grain_number=1, area_fraction=0.1, diameter_um=2.5, orientation_angle=1)
+    )
+
+    # act
+    summary = MicrostructureSummary(MicrostructureInput(id="id"), result, str(tmp_path))
+
+    # assert
+    df = summary.xy_circle_equivalence
+    assert df.dtypes.tolist() == ["int32", "float32", "float32", "float64"]
+    assert df["orientation_angle"][0] == math.degrees(1)
+    assert summary.xy_average_grain_size == pytest.approx(0.25)
+    assert summary.xz_circle_equivalence.empty
+    assert summary.xz_average_grain_size == 0
@@ -0,0 +1,177 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+import threading
+from unittest.mock import Mock
+
+import grpc
+import pytest
+
+from ansys.additive.core import RetryPolicy
+from ansys.additive.core.retry import HealthMonitor
+
+from . import test_utils
+
+
+def test_RetryPolicy_init_returns_expected_defaults():
+    # arrange, act
+    policy = RetryPolicy()
+
+    # assert
+    assert policy.max_attempts == 3
+    assert policy.initial_backoff == 1.0
+    assert policy.max_backoff == 30.0
+    assert policy.backoff_multiplier == 2.0
+    assert policy.retryable_codes == (grpc.StatusCode.UNAVAILABLE,)
+    assert policy.eject_after == 2
+    assert policy.probe_interval == 10.0
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_attempts": 0},
+        {"eject_after": 0},
+        {"initial_backoff": -1},
+        {"max_backoff": -1},
+        {"backoff_multiplier": 0.5},
+        {"probe_interval": 0},
+    ],
+)
+def test_RetryPolicy_init_with_invalid_values_raises_exception(kwargs):
+    # arrange, act, assert
+    with pytest.raises(ValueError):
+        RetryPolicy(**kwargs)
+
+
+def test_is_retryable_returns_true_for_retryable_codes():
+    # arrange
+    policy = RetryPolicy()
+
+    # act, assert
+    assert policy.is_retryable(test_utils.RpcError(grpc.StatusCode.UNAVAILABLE))
+    assert not policy.is_retryable(test_utils.RpcError(grpc.StatusCode.DEADLINE_EXCEEDED))
+    assert not policy.is_retryable(test_utils.RpcError(grpc.StatusCode.INVALID_ARGUMENT))
+    assert not policy.is_retryable(grpc.RpcError())
+    assert not policy.is_retryable(Exception("error"))
+
+
+def test_backoff_grows_exponentially_up_to_max_backoff():
+    # arrange
+    policy = RetryPolicy(initial_backoff=1, backoff_multiplier=3, max_backoff=20)
+
+    # act, assert
+    assert [policy.backoff(attempt) for attempt in range(1, 5)] == [1, 3, 9, 20]
+
+
+def test_HealthMonitor_ejects_server_after_consecutive_failures():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    monitor = HealthMonitor(RetryPolicy(eject_after=2), probe=lambda server: False)
+
+    # act
+    monitor.record_failure(server)
+    ejected_after_one = monitor.is_ejected(server)
+    monitor.record_failure(server)
+
+    # assert
+    assert not ejected_after_one
+    assert monitor.is_ejected(server)
+    assert monitor.ejected() == [server]
+    monitor.stop()
+
+
+def test_HealthMonitor_success_resets_failure_count():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    monitor = HealthMonitor(RetryPolicy(eject_after=2), probe=lambda server: False)
+
+    # act
+    monitor.record_failure(server)
+    monitor.record_success(server)
+    monitor.record_failure(server)
+
+    # assert
+    assert not monitor.is_ejected(server)
+
+
+def test_HealthMonitor_readmits_server_when_probe_succeeds():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    probed = threading.Event()
+    recovered = threading.Event()
+
+    def probe(s):
+        probed.set()
+        if recovered.is_set():
+            return True
+        raise Exception("unavailable")
+
+    monitor = HealthMonitor(RetryPolicy(eject_after=1, probe_interval=0.01), probe=probe)
+
+    # act
+    monitor.record_failure(server)
+    assert probed.wait(5)
+    still_ejected = monitor.is_ejected(server)
+    recovered.set()
+    for _ in range(500):
+        if not monitor.is_ejected(server):
+            break
+        threading.Event().wait(0.01)
+
+    # assert
+    assert still_ejected
+    assert not monitor.is_ejected(server)
+    assert monitor.ejected() == []
+
+
+def test_HealthMonitor_default_probe_calls_server_ready():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    server.ready.return_value = True
+    monitor = HealthMonitor(RetryPolicy(eject_after=1, probe_interval=0.01))
+
+    # act
+    monitor.record_failure(server)
+    for _ in range(500):
+        if not monitor.is_ejected(server):
+            break
+        threading.Event().wait(0.01)
+
+    # assert
+    assert not monitor.is_ejected(server)
+    server.ready.assert_called_with(timeout=0.01)
+
+
+def test_HealthMonitor_stop_stops_probing():
+    # arrange
+    server = test_utils.get_mock_server_connection()
+    probe = Mock(return_value=False)
+    monitor = HealthMonitor(RetryPolicy(eject_after=1, probe_interval=0.01), probe=probe)
+    monitor.record_failure(server)
+
+    # act
+    monitor.stop()
+    monitor._thread.join(5)
+
+    # assert
+    assert not monitor._thread.is_alive()
+    assert monitor.is_ejected(server)
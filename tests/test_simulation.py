@@ -20,7 +20,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from ansys.additive.core import SimulationError, SingleBeadInput
+from ansys.additive.core import (
+    SimulationCancelled,
+    SimulationError,
+    SimulationTimeout,
+    SingleBeadInput,
+)
 
 
 def test_SimulationError_init_assigns_values():
@@ -33,3 +38,30 @@ def test_SimulationError_init_assigns_values():
     # assert
     assert error.input == input
     assert error.message == "message"
+
+
+def test_SimulationCancelled_init_assigns_values():
+    # arrange
+    input = SingleBeadInput(id="id")
+
+    # act
+    error = SimulationCancelled(input)
+
+    # assert
+    assert isinstance(error, SimulationError)
+    assert error.input == input
+    assert error.message == "Simulation was cancelled."
+
+
+def test_SimulationTimeout_init_assigns_values():
+    # arrange
+    input = SingleBeadInput(id="id")
+
+    # act
+    error = SimulationTimeout(input, 60)
+
+    # assert
+    assert isinstance(error, SimulationError)
+    assert error.input == input
+    assert error.deadline == 60
+    assert error.message == "Simulation did not complete within 60 seconds."
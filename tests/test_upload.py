@@ -0,0 +1,241 @@
+# Copyright (C) 2023 ANSYS, Inc. and/or its affiliates.
+# SPDX-License-Identifier: MIT
+#
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy of
+# this software and associated documentation files (the "Software"), to deal in
+# the Software without restriction, including without limitation the rights to
+# use, copy, modify, merge, publish, distribute, sublicense, and/or sell copies
+# of the Software, and to permit persons to whom the Software is furnished to do
+# so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import hashlib
+import os
+import pathlib
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from ansys.additive.core import upload
+from ansys.additive.core.cache import file_digest
+from ansys.additive.core.upload import (
+    UploadCache,
+    _ChunkSizer,
+    async_file_upload_reader,
+    file_upload_reader,
+)
+
+
+def test_file_upload_reader_with_chunk_size_returns_file_in_chunks(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    content = os.urandom(10 * 1024 + 1)
+    file.write_bytes(content)
+
+    # act
+    requests = list(file_upload_reader(str(file), 1024))
+
+    # assert
+    assert len(requests) == 11
+    assert b"".join(r.content for r in requests) == content
+    for request in requests:
+        assert request.name == "part.stl"
+        assert request.total_size == len(content)
+        assert len(request.content) <= 1024
+        assert request.content_md5 == hashlib.md5(request.content).hexdigest()
+
+
+def test_file_upload_reader_returns_no_requests_for_empty_file(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "empty.stl"
+    file.write_bytes(b"")
+
+    # act, assert
+    assert list(file_upload_reader(str(file))) == []
+
+
+def test_file_upload_reader_raises_read_error(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    file.write_bytes(b"solid")
+
+    # act, assert
+    with patch("ansys.additive.core.upload.mmap.mmap", side_effect=OSError("read error")):
+        with pytest.raises(OSError, match="read error"):
+            list(file_upload_reader(str(file)))
+
+
+def test_file_upload_reader_stops_reading_when_closed(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    file.write_bytes(os.urandom(1024 * 1024))
+    threads = threading.active_count()
+    requests = file_upload_reader(str(file), 1024)
+    next(requests)
+
+    # act
+    requests.close()
+
+    # assert
+    end = time.monotonic() + 5
+    while threading.active_count() > threads and time.monotonic() < end:
+        time.sleep(0.01)
+    assert threading.active_count() == threads
+
+
+def test_file_upload_reader_sizes_chunks_from_send_time(monkeypatch, tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    file.write_bytes(os.urandom(16 * 1024**2))
+    monkeypatch.setattr(upload, "TARGET_CHUNK_TIME", 0.0001)
+    sizes = []
+
+    # act
+    for request in file_upload_reader(str(file)):
+        sizes.append(len(request.content))
+        # slow link
+        time.sleep(0.01)
+
+    # assert
+    assert sizes[0] == upload.DEFAULT_UPLOAD_CHUNK_SIZE
+    assert sizes[-2] == upload.MIN_UPLOAD_CHUNK_SIZE
+    assert sum(sizes) == 16 * 1024**2
+
+
+def test_chunk_sizer_adapts_size_to_throughput():
+    # arrange
+    sizer = _ChunkSizer(None)
+    slow_sizer = _ChunkSizer(None)
+
+    # act
+    initial = sizer.size
+    sizer.record(1024**2, 0)
+    unchanged = sizer.size
+    sizer.record(10 * 1024**2, 1)
+    measured = sizer.size
+    sizer.record(10 * 1024**3, 1)
+    fast = sizer.size
+    slow_sizer.record(1024, 1)
+
+    # assert
+    assert initial == unchanged == upload.DEFAULT_UPLOAD_CHUNK_SIZE
+    assert measured == int(10 * 1024**2 * upload.TARGET_CHUNK_TIME)
+    assert fast == upload.MAX_UPLOAD_CHUNK_SIZE
+    assert slow_sizer.size == upload.MIN_UPLOAD_CHUNK_SIZE
+
+
+def test_chunk_sizer_with_fixed_size_ignores_throughput():
+    # arrange
+    sizer = _ChunkSizer(1024)
+
+    # act
+    sizer.record(1024**3, 1)
+
+    # assert
+    assert sizer.size == 1024
+
+
+def test_async_file_upload_reader_returns_same_requests(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    file.write_bytes(os.urandom(10 * 1024))
+
+    async def read():
+        return [r async for r in async_file_upload_reader(str(file), 1024)]
+
+    # act
+    requests = asyncio.run(read())
+
+    # assert
+    assert requests == list(file_upload_reader(str(file), 1024))
+
+
+def test_digest_is_computed_once_per_file_version(tmp_path: pathlib.Path):
+    # arrange
+    file = tmp_path / "part.stl"
+    file.write_bytes(b"solid")
+    cache = UploadCache()
+
+    # act
+    with patch("ansys.additive.core.upload.file_digest", side_effect=file_digest) as mock_digest:
+        digest1 = cache.digest(str(file))
+        digest2 = cache.digest(str(file))
+        file.write_bytes(b"solid part")
+        os.utime(file, ns=(0, 0))
+        digest3 = cache.digest(str(file))
+
+    # assert
+    assert mock_digest.call_count == 2
+    assert digest1 == digest2
+    assert digest3 != digest1
+
+
+def test_get_returns_remote_file_name_of_each_server():
+    # arrange
+    cache = UploadCache()
+    server1 = Mock()
+    server2 = Mock()
+
+    # act
+    cache.put(server1, "digest", "remote1")
+    cache.put(server2, "digest", "remote2")
+
+    # assert
+    assert cache.get(server1, "digest") == "remote1"
+    assert cache.get(server2, "digest") == "remote2"
+    assert cache.get(server1, "other") is None
+    assert cache.get(Mock(), "digest") is None
+
+
+def test_discard_forgets_remote_file_name():
+    # arrange
+    cache = UploadCache()
+    server = Mock()
+    cache.put(server, "digest", "remote")
+
+    # act
+    cache.discard(server, "digest")
+    cache.discard(Mock(), "digest")
+
+    # assert
+    assert cache.get(server, "digest") is None
+
+
+def test_entries_are_dropped_with_server():
+    # arrange
+    cache = UploadCache()
+    server = Mock()
+    cache.put(server, "digest", "remote")
+    cache.upload_lock(server, "digest")
+
+    # act
+    del server
+
+    # assert
+    assert len(cache._remote) == 0
+    assert len(cache._upload_locks) == 0
+
+
+def test_upload_lock_is_shared_by_uploads_of_same_file_to_same_server():
+    # arrange
+    cache = UploadCache()
+    server = Mock()
+
+    # act, assert
+    assert cache.upload_lock(server, "a") is cache.upload_lock(server, "a")
+    assert cache.upload_lock(server, "a") is not cache.upload_lock(server, "b")
+    assert cache.upload_lock(server, "a") is not cache.upload_lock(Mock(), "a")
@@ -20,15 +20,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import hashlib
 import os
+from unittest.mock import Mock
 
 from ansys.api.additive.v0.additive_domain_pb2 import MeltPoolTimeStep
+from ansys.api.additive.v0.additive_simulation_pb2 import DownloadFileResponse
+import grpc
 
 from ansys.additive.core.material import (
     AdditiveMaterial,
     CharacteristicWidthDataPoint,
     ThermalPropertiesDataPoint,
 )
+from ansys.additive.core.server_connection import ServerConnection
 from ansys.additive.core.single_bead import MeltPoolMessage, SingleBeadInput, SingleBeadSummary
 
 
@@ -118,3 +123,38 @@ def get_test_file_path(name: str) -> str:
     """Retrieve the absolute path to a test file in the data folder."""
     dir_name = os.path.dirname(os.path.abspath(__file__))
     return os.path.join(dir_name, "data", name)
+
+
+def get_download_responses(file_name: str, chunk_size: int = 64 * 1024) -> list:
+    """Create the responses of a ``DownloadFile`` call that returns a test file."""
+    with open(get_test_file_path(file_name), "rb") as f:
+        content = f.read()
+    return [
+        DownloadFileResponse(
+            file_name=file_name,
+            total_size=len(content),
+            content=content[i : i + chunk_size],
+            content_md5=hashlib.md5(content[i : i + chunk_size]).hexdigest(),
+        )
+        for i in range(0, len(content), chunk_size)
+    ]
+
+
+def get_mock_server_connection(
+    spec: type = ServerConnection, max_concurrency: int = 1, channel_str: str = "server"
+) -> Mock:
+    """Create a mock server connection that allows ``max_concurrency`` simulations."""
+    server = Mock(spec)
+    server.channel_str = channel_str
+    server.concurrency_limit.return_value = max_concurrency
+    return server
+
+
+class RpcError(grpc.RpcError):
+    """gRPC error with a status code, as raised by a failed call."""
+
+    def __init__(self, code: grpc.StatusCode = grpc.StatusCode.UNAVAILABLE):
+        self._code = code
+
+    def code(self) -> grpc.StatusCode:
+        return self._code